@@ -1,6 +1,7 @@
-from fastapi import Depends, HTTPException, status, Header
+from fastapi import Depends, HTTPException, status, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from typing import Optional
 from contextlib import contextmanager
@@ -8,16 +9,17 @@ import uuid
 import logging
 from gotrue.errors import AuthError
 from jose import jwt, JWTError
-import httpx
 
 # New import for on-the-fly user creation
 from app.schemas.user import UserCreate
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.auth.supabase_client import supabase_client
 from app.services.user_service import UserService
 from app.models.user import User
 from app.auth.auth_service import AuthService
+from app.auth.token_verifier import token_verifier, auth_user_cache
+from app.auth.plaid_webhook_verifier import plaid_webhook_verifier
 from app.config import settings
 
 logger = logging.getLogger(__name__)
@@ -158,6 +160,46 @@ def _get_or_provision_local_user(user_data, auth_service: AuthService) -> User:
     
     return user
 
+async def _authenticate_token(token: str, auth_service: AuthService) -> User:
+    """Resolves a Supabase access token to the local user.
+    
+    Tokens are verified locally against the cached JWKS/JWT secret and the user
+    is served from the auth user cache when possible; Supabase is only called
+    when a token can't be verified locally or its user has no local row yet.
+    
+    Args:
+        token: JWT token to validate
+        auth_service: The authentication service instance
+        
+    Returns:
+        Local User instance
+        
+    Raises:
+        JWTError: If the token fails local verification
+        AuthError: If Supabase rejects the token
+    """
+    claims = await token_verifier.verify(token) if settings.AUTH_LOCAL_JWT_VERIFICATION else None
+    if claims is None:
+        user_data = _validate_supabase_token(token, auth_service)
+        return _get_or_provision_local_user(user_data, auth_service)
+
+    subject = claims["sub"]
+    user = await auth_user_cache.get(auth_service.db, subject)
+    if user:
+        return user
+
+    user = auth_service.user_service.get_by_supabase_id(
+        db=auth_service.db,
+        supabase_user_id=uuid.UUID(subject)
+    )
+    if not user:
+        # First login: provisioning needs the full Supabase profile
+        user_data = _validate_supabase_token(token, auth_service)
+        user = _get_or_provision_local_user(user_data, auth_service)
+
+    await auth_user_cache.set(subject, user, claims["exp"])
+    return user
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     auth_service: AuthService = Depends(get_auth_service)
@@ -171,11 +213,16 @@ async def get_current_user(
         return dev_user
     
     try:
-        # Single Supabase token validation path
-        user_data = _validate_supabase_token(token, auth_service)
-        user = _get_or_provision_local_user(user_data, auth_service)
-        return user
+        return await _authenticate_token(token, auth_service)
         
+    except HTTPException:
+        raise
+    except JWTError as e:
+        logger.warning(f"Access token rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials."
+        )
     except AuthError as e:
         logger.error(f"Supabase authentication failed: {e}")
         raise HTTPException(
@@ -267,6 +314,18 @@ def get_db_with_user_context(
     with user_context_db(db, current_user) as session:
         return session
 
+async def get_async_db_with_user_context(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+) -> AsyncSession:
+    """Async counterpart of get_db_with_user_context for routes that must not block the event loop."""
+    # set_config(..., true) is SET LOCAL; asyncpg cannot bind parameters in SET itself
+    await db.execute(
+        text("SELECT set_config('app.current_user_id', :user_id, true)"),
+        {"user_id": str(current_user.id)}
+    )
+    return db
+
 def verify_supabase_webhook(
     authorization: Optional[str] = Header(None)
 ) -> bool:
@@ -301,25 +360,16 @@ async def get_current_user_from_token(
     auth_service = AuthService(db)
     
     try:
-        # Supabase token validation
-        user_data = auth_service.supabase.client.auth.get_user(token)
-        if not user_data or not user_data.user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token.")
-
-# No denylist check needed - Supabase handles token validation
-
-        # Get or create local user record
-        user = auth_service.user_service.get_by_supabase_id(
-            db=auth_service.db,
-            supabase_user_id=uuid.UUID(user_data.user.id)
-        )
-
-        if not user:
-            # Auto-provision user if they exist in Supabase but not locally
-            user = _provision_user_from_supabase(auth_service, user_data)
-        
-        return user
+        return await _authenticate_token(token, auth_service)
         
+    except HTTPException:
+        raise
+    except JWTError as e:
+        logger.warning(f"Access token rejected: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials from token."
+        )
     except AuthError as e:
         logger.error(f"Supabase authentication failed for token: {e}")
         raise HTTPException(
@@ -340,39 +390,15 @@ async def get_current_user_from_token(
         )
 
 async def verify_plaid_webhook(
+    request: Request,
     plaid_verification: str = Header(..., alias="Plaid-Verification")
 ):
-    """Verifies the JWT sent by Plaid in the webhook verification header."""
+    """Verifies the JWT sent by Plaid in the webhook verification header against the request body."""
     try:
-        # 1. Fetch Plaid's public keys (JWKS)
-        # In production, these should be cached for a few hours.
-        async with httpx.AsyncClient() as client:
-            jwks_response = await client.post(
-                f"{settings.PLAID_BASE_URL}/webhook_verification_key/get", 
-                json={
-                    "client_id": settings.PLAID_CLIENT_ID, 
-                    "secret": settings.PLAID_SECRET
-                }
-            )
-            jwks_response.raise_for_status()
-            jwks = jwks_response.json()
-
-        # 2. Decode the header to find the Key ID ('kid')
-        unverified_header = jwt.get_unverified_header(plaid_verification)
-        kid = unverified_header.get("kid")
-        
-        # 3. Find the matching public key
-        key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
-        if not key:
-            raise HTTPException(status_code=401, detail="Webhook public key not found.")
-
-        # 4. Verify the token's signature and claims
-        jwt.decode(
-            plaid_verification,
-            key,
-            algorithms=[key["alg"]],
-            options={"verify_aud": False}  # Audience is not standard
-        )
+        # Starlette caches the body, so the route's request.json() doesn't read the stream again
+        body = await request.body()
+        source = request.client.host if request.client else None
+        await plaid_webhook_verifier.verify(plaid_verification, body, source)
         return True
 
     except JWTError as e:
@@ -380,4 +406,4 @@ async def verify_plaid_webhook(
         raise HTTPException(status_code=401, detail="Invalid webhook signature.")
     except Exception as e:
         logger.error(f"Plaid webhook verification failed: {e}")
-        raise HTTPException(status_code=400, detail="Webhook verification failed.")
\ No newline at end of file
+        raise HTTPException(status_code=400, detail="Webhook verification failed.")
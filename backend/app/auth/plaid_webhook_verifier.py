@@ -0,0 +1,136 @@
+"""
+Verification of Plaid webhook signatures with a cached key set
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from jose import jwt, JWTError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PlaidWebhookVerifier:
+    """
+    Verifies the Plaid-Verification header of incoming webhooks.
+
+    Verification keys are cached by kid for PLAID_WEBHOOK_KEY_CACHE_TTL, and
+    concurrent webhooks signed with a key that isn't cached yet share a single
+    /webhook_verification_key/get call. Keys Plaid reports as expired are
+    never used. A valid header is an ES256 JWT at most MAX_TOKEN_AGE_SECONDS
+    old whose request_body_sha256 claim matches the raw request body.
+
+    Since anyone can post a made-up kid, kids Plaid rejects are remembered for
+    PLAID_WEBHOOK_UNKNOWN_KEY_TTL, and each source address may start at most
+    PLAID_WEBHOOK_KEY_MISSES_PER_MINUTE key lookups a minute; otherwise a
+    flood of forged webhooks would use up the Plaid rate limit for the key
+    endpoint that real webhooks need.
+    """
+
+    MAX_TOKEN_AGE_SECONDS = 300
+    MISS_WINDOW_SECONDS = 60
+    MAX_TRACKED = 10000
+
+    def __init__(self, ttl_seconds: Optional[int] = None, unknown_key_ttl_seconds: Optional[int] = None,
+                 misses_per_minute: Optional[int] = None):
+        self._ttl_seconds = ttl_seconds
+        self._keys: Dict[str, Tuple[float, Dict[str, Any]]] = {}  # kid -> (cached_until, jwk)
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._unknown_kids: TTLCache = TTLCache(
+            maxsize=self.MAX_TRACKED,
+            ttl=unknown_key_ttl_seconds if unknown_key_ttl_seconds is not None else settings.PLAID_WEBHOOK_UNKNOWN_KEY_TTL
+        )
+        self._misses: TTLCache = TTLCache(maxsize=self.MAX_TRACKED, ttl=self.MISS_WINDOW_SECONDS)  # source -> (window_start, count)
+        self.misses_per_minute = misses_per_minute if misses_per_minute is not None else settings.PLAID_WEBHOOK_KEY_MISSES_PER_MINUTE
+        self.key_fetches = 0
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self._ttl_seconds if self._ttl_seconds is not None else settings.PLAID_WEBHOOK_KEY_CACHE_TTL
+
+    async def verify(self, token: str, body: bytes, source: Optional[str] = None) -> Dict[str, Any]:
+        """Claims of a valid verification header; raises JWTError otherwise. source is the client address."""
+        header = jwt.get_unverified_header(token)
+        if header.get("alg") != "ES256":
+            raise JWTError(f"Unexpected webhook signing algorithm: {header.get('alg')}")
+
+        key = await self.get_key(header.get("kid"), source)
+        claims = jwt.decode(token, key, algorithms=["ES256"], options={"verify_aud": False})
+
+        issued_at = claims.get("iat")
+        if not isinstance(issued_at, (int, float)) or time.time() - issued_at > self.MAX_TOKEN_AGE_SECONDS:
+            raise JWTError("Webhook verification token is too old")
+
+        body_hash = hashlib.sha256(body).hexdigest()
+        if not hmac.compare_digest(body_hash, str(claims.get("request_body_sha256", ""))):
+            raise JWTError("Webhook body does not match its signature")
+        return claims
+
+    async def get_key(self, kid: Optional[str], source: Optional[str] = None) -> Dict[str, Any]:
+        """Cached verification key for kid, fetching it (once, however many callers wait) on a miss"""
+        if not kid:
+            raise JWTError("Webhook verification token has no kid")
+
+        cached = self._keys.get(kid)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        if kid in self._unknown_kids:
+            raise JWTError(f"Plaid does not recognise webhook key {kid}")
+
+        fetch = self._inflight.get(kid)
+        if fetch is None:
+            self._count_miss(source)
+            fetch = asyncio.ensure_future(self._fetch_key(kid))
+            self._inflight[kid] = fetch
+            fetch.add_done_callback(lambda _: self._inflight.pop(kid, None))
+        # Shielded so one cancelled webhook doesn't cancel the fetch others are waiting on
+        return await asyncio.shield(fetch)
+
+    def _count_miss(self, source: Optional[str]):
+        """Charge a key lookup to source, refusing it once the source is over its per-minute budget"""
+        source = source or "unknown"
+        now = time.monotonic()
+        window_start, misses = self._misses.get(source, (now, 0))
+        if now - window_start >= self.MISS_WINDOW_SECONDS:
+            window_start, misses = now, 0
+        if misses >= self.misses_per_minute:
+            raise JWTError(f"Too many webhook key lookups from {source}")
+        self._misses[source] = (window_start, misses + 1)
+
+    async def _fetch_key(self, kid: str) -> Dict[str, Any]:
+        from app.services.plaid_client_service import plaid_client_service, PlaidAPIError
+
+        try:
+            key = await plaid_client_service.fetch_webhook_verification_key(kid)
+        except PlaidAPIError as e:
+            if e.status_code == 400:
+                self._unknown_kids[kid] = True
+                raise JWTError(f"Plaid does not recognise webhook key {kid}")
+            raise
+        finally:
+            self.key_fetches += 1
+
+        if key.get("expired_at"):
+            self._keys.pop(kid, None)
+            self._unknown_kids[kid] = True
+            raise JWTError(f"Webhook key {kid} has expired")
+
+        self._keys[kid] = (time.monotonic() + self.ttl_seconds, key)
+        logger.info(f"Cached Plaid webhook verification key {kid}")
+        return key
+
+    def clear(self):
+        self._keys.clear()
+        self._unknown_kids.clear()
+        self._misses.clear()
+
+
+# Create singleton instance
+plaid_webhook_verifier = PlaidWebhookVerifier()
@@ -0,0 +1,288 @@
+"""
+Local verification of Supabase access tokens, and the authenticated-user cache
+"""
+
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import httpx
+from cachetools import TLRUCache
+from jose import jwt, JWTError
+from jose.exceptions import ExpiredSignatureError, JWTClaimsError
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseTokenVerifier:
+    """
+    Verifies Supabase access tokens without a round-trip to Supabase.
+
+    HS256 tokens are checked against SUPABASE_JWT_SECRET (several comma-separated
+    secrets are tried in order while one is being rotated out). Asymmetric tokens
+    are checked against the project's JWKS, fetched once and cached for
+    AUTH_JWKS_CACHE_TTL; a kid that isn't cached triggers a single refetch, so
+    key rotation is picked up without waiting for the TTL.
+
+    verify() raises JWTError for tokens that are provably bad (signature,
+    expiry, audience) and returns None when there is no key material to check
+    them with, in which case the caller falls back to Supabase.
+    """
+
+    ASYMMETRIC_ALGORITHMS = ("RS256", "ES256")
+    MIN_REFETCH_SECONDS = 30  # Unknown kids can't force JWKS fetches more often than this
+
+    def __init__(
+        self,
+        jwks_url: Optional[str] = None,
+        jwt_secret: Optional[str] = None,
+        audience: Optional[str] = None,
+        jwks_ttl_seconds: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self._jwks_url = jwks_url
+        self._jwt_secret = jwt_secret
+        self._audience = audience
+        self._jwks_ttl_seconds = jwks_ttl_seconds
+        self.transport = transport
+
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Optional[float] = None
+        self._last_attempt: Optional[float] = None
+        self._refresh_lock: Optional[asyncio.Lock] = None
+        self.jwks_fetches = 0
+
+    @property
+    def jwks_url(self) -> str:
+        if self._jwks_url is not None:
+            return self._jwks_url
+        if settings.SUPABASE_JWKS_URL:
+            return settings.SUPABASE_JWKS_URL
+        if settings.SUPABASE_URL:
+            return f"{settings.SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json"
+        return ""
+
+    @property
+    def jwt_secrets(self) -> List[str]:
+        raw = self._jwt_secret if self._jwt_secret is not None else settings.SUPABASE_JWT_SECRET
+        return [secret.strip() for secret in raw.split(",") if secret.strip()]
+
+    @property
+    def audience(self) -> str:
+        return self._audience if self._audience is not None else settings.SUPABASE_JWT_AUDIENCE
+
+    @property
+    def jwks_ttl_seconds(self) -> int:
+        return self._jwks_ttl_seconds if self._jwks_ttl_seconds is not None else settings.AUTH_JWKS_CACHE_TTL
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """Verified claims, or None if the token can't be checked locally"""
+        header = jwt.get_unverified_header(token)
+        algorithm = header.get("alg")
+
+        if algorithm == "HS256":
+            secrets = self.jwt_secrets
+            if not secrets:
+                return None
+            claims = self._decode_with_any(token, secrets, algorithm)
+        elif algorithm in self.ASYMMETRIC_ALGORITHMS:
+            key = await self.get_signing_key(header.get("kid"))
+            if key is None:
+                return None
+            claims = jwt.decode(token, key, algorithms=[algorithm], audience=self.audience)
+        else:
+            raise JWTError(f"Unsupported token algorithm: {algorithm}")
+
+        if not claims.get("sub") or not claims.get("exp"):
+            raise JWTError("Token is missing sub or exp")
+        return claims
+
+    def _decode_with_any(self, token: str, secrets: List[str], algorithm: str) -> Dict[str, Any]:
+        last_error: Optional[JWTError] = None
+        for secret in secrets:
+            try:
+                return jwt.decode(token, secret, algorithms=[algorithm], audience=self.audience)
+            except (ExpiredSignatureError, JWTClaimsError):
+                raise  # Signature matched; the claims themselves are bad
+            except JWTError as e:
+                last_error = e
+        raise last_error
+
+    async def get_signing_key(self, kid: Optional[str]) -> Optional[Dict[str, Any]]:
+        """JWK for kid from the cached key set, refetching on expiry or an unknown kid"""
+        if not kid or not self.jwks_url:
+            return None
+
+        now = time.monotonic()
+        expired = self._fetched_at is None or now - self._fetched_at > self.jwks_ttl_seconds
+        unknown = kid not in self._keys  # Possibly a freshly rotated key
+        recently_tried = self._last_attempt is not None and now - self._last_attempt < self.MIN_REFETCH_SECONDS
+        if (expired or unknown) and not recently_tried:
+            await self._refresh_jwks(now)
+
+        return self._keys.get(kid)
+
+    async def _refresh_jwks(self, requested_at: float):
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            # Someone else fetched while we waited
+            if self._last_attempt is not None and self._last_attempt >= requested_at:
+                return
+            self._last_attempt = time.monotonic()
+            try:
+                async with httpx.AsyncClient(transport=self.transport, timeout=5.0) as client:
+                    response = await client.get(self.jwks_url)
+                    response.raise_for_status()
+                    jwks = response.json()
+                self.jwks_fetches += 1
+                self._keys = {key["kid"]: key for key in jwks.get("keys", []) if key.get("kid")}
+                self._fetched_at = self._last_attempt
+                logger.info(f"Loaded {len(self._keys)} Supabase signing keys")
+            except Exception as e:
+                # Keep serving the previous key set; unknown kids fall back to Supabase
+                logger.warning(f"Failed to fetch Supabase JWKS from {self.jwks_url}: {e}")
+
+    def clear(self):
+        self._keys = {}
+        self._fetched_at = None
+        self._last_attempt = None
+
+
+class AuthUserCache:
+    """
+    Token subject -> local User, so authenticated requests skip the user lookup.
+
+    An in-process LRU holds a column snapshot per Supabase user id; each entry
+    expires at the earlier of the token's exp and AUTH_USER_CACHE_TTL. With
+    AUTH_USER_REDIS_CACHE the snapshot is also shared between workers through
+    Redis. Hits are merged into the request session without a SELECT, so the
+    returned User behaves like a loaded one (relationships lazy-load as usual).
+
+    Call invalidate() whenever a user row changes; with the Redis cache it is
+    broadcast so every worker drops its in-process copy.
+    """
+
+    REDIS_KEY = "auth_user:{subject}"
+    INVALIDATION_CHANNEL = "auth_user:invalidate"
+
+    def __init__(self, maxsize: Optional[int] = None, max_ttl_seconds: Optional[int] = None,
+                 use_redis: Optional[bool] = None):
+        self.max_ttl_seconds = max_ttl_seconds if max_ttl_seconds is not None else settings.AUTH_USER_CACHE_TTL
+        self.use_redis = use_redis if use_redis is not None else settings.AUTH_USER_REDIS_CACHE
+        self._cache: TLRUCache = TLRUCache(
+            maxsize=maxsize or settings.AUTH_USER_CACHE_MAX_SIZE,
+            ttu=lambda key, value, now: value[0],
+            timer=time.time
+        )
+
+    async def get(self, db: Session, subject: str) -> Optional[User]:
+        entry: Optional[Tuple[float, Dict[str, Any]]] = self._cache.get(subject)
+        if entry is None and self.use_redis:
+            entry = await self._get_from_redis(subject)
+            if entry is not None:
+                self._cache[subject] = entry
+        if entry is None:
+            return None
+        return self.restore(db, entry[1])
+
+    async def set(self, subject: str, user: User, token_expires_at: float):
+        expires_at = min(float(token_expires_at), time.time() + self.max_ttl_seconds)
+        if expires_at <= time.time():
+            return
+        snapshot = self.snapshot(user)
+        self._cache[subject] = (expires_at, snapshot)
+        if self.use_redis:
+            await self._set_in_redis(subject, expires_at, snapshot)
+
+    async def invalidate(self, subject: str):
+        subject = str(subject)
+        self._cache.pop(subject, None)
+        if self.use_redis:
+            from app.core.redis_client import redis_client
+            await redis_client.delete_cache(self.REDIS_KEY.format(subject=subject))
+            await redis_client.publish(self.INVALIDATION_CHANNEL, {"subject": subject})
+
+    async def listen_for_invalidations(self):
+        """Drop subjects other workers invalidated; runs until cancelled"""
+        from app.core.redis_client import redis_client
+
+        async def evict(message: Dict[str, Any]):
+            self._cache.pop(message.get("subject"), None)
+
+        try:
+            await redis_client.subscribe(self.INVALIDATION_CHANNEL, evict)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Auth user cache invalidation listener stopped: {e}")
+
+    def clear(self):
+        self._cache.clear()
+
+    @staticmethod
+    def snapshot(user: User) -> Dict[str, Any]:
+        return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+    @staticmethod
+    def restore(db: Session, snapshot: Dict[str, Any]) -> User:
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    async def _get_from_redis(self, subject: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        from app.core.redis_client import redis_client
+
+        cached = await redis_client.get_cache(self.REDIS_KEY.format(subject=subject))
+        if not isinstance(cached, dict) or cached.get("expires_at", 0) <= time.time():
+            return None
+        try:
+            return float(cached["expires_at"]), self._decode(cached["user"])
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Discarding malformed cached user for {subject}: {e}")
+            return None
+
+    async def _set_in_redis(self, subject: str, expires_at: float, snapshot: Dict[str, Any]):
+        from app.core.redis_client import redis_client
+
+        await redis_client.set_cache(
+            self.REDIS_KEY.format(subject=subject),
+            {"expires_at": expires_at, "user": self._encode(snapshot)},
+            max(1, int(expires_at - time.time()))
+        )
+
+    @staticmethod
+    def _encode(snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            key: value.isoformat() if isinstance(value, (datetime, date)) else str(value) if isinstance(value, UUID) else value
+            for key, value in snapshot.items()
+        }
+
+    @staticmethod
+    def _decode(data: Dict[str, Any]) -> Dict[str, Any]:
+        columns = {attr.key: attr.columns[0] for attr in inspect(User).column_attrs}
+        decoded = {}
+        for key, value in data.items():
+            if key not in columns:
+                continue
+            python_type = columns[key].type.python_type
+            if value is not None and python_type is UUID:
+                value = UUID(value)
+            elif value is not None and python_type is datetime:
+                value = datetime.fromisoformat(value)
+            decoded[key] = value
+        return decoded
+
+
+# Create singleton instances
+token_verifier = SupabaseTokenVerifier()
+auth_user_cache = AuthUserCache()
@@ -1,10 +1,12 @@
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 import logging
 from contextlib import contextmanager
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
 from app.config import settings
 
@@ -35,6 +37,41 @@ SessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Async engine for routes that must not block the event loop. It shares the
+# database with `engine` but talks asyncpg; see get_async_db.
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
+def _create_async_engine() -> Optional[AsyncEngine]:
+    url = make_url(DATABASE_URL)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        logger.warning(f"No async driver for {url.get_backend_name()}; async sessions are unavailable")
+        return None
+    try:
+        pool_options = {} if driver.startswith("sqlite") else {
+            "pool_size": settings.ASYNC_DB_POOL_SIZE,
+            "max_overflow": settings.ASYNC_DB_MAX_OVERFLOW,
+            "pool_recycle": 3600,
+            "connect_args": {"server_settings": {"application_name": "finance-tracker-async"}},
+        }
+        return create_async_engine(
+            url.set(drivername=driver),
+            pool_pre_ping=True,
+            echo=settings.DEBUG,
+            **pool_options
+        )
+    except ImportError as e:
+        logger.warning(f"Async database driver not installed ({e}); async sessions are unavailable")
+        return None
+
+async_engine = _create_async_engine()
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+) if async_engine is not None else None
+
 # Base class for models
 Base = declarative_base()
 
@@ -47,6 +84,21 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+# Async database session dependency
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get an async database session as a generator.
+
+    Existing sync services run on it through `await db.run_sync(fn, ...)`:
+    fn receives a regular Session whose queries go over asyncpg, so they
+    never block the event loop. Build responses inside fn, since lazy loads
+    are not possible once it returns.
+    """
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Async database sessions are unavailable; install asyncpg")
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Context manager for database sessions
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
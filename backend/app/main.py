@@ -9,12 +9,13 @@ from fastapi.exception_handlers import (
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
 import uvicorn
+import asyncio
 import logging
 import time
 from datetime import datetime, timezone
 
 from app.config import settings
-from app.database import engine, check_database_health, create_database
+from app.database import engine, async_engine, check_database_health, create_database
 from app.models import Base
 from app.routes import auth, users, health, categories, transactions, budget, analytics, webhooks, notifications, ml, saved_filters, websockets, categorization_rules, merchants
 from app.routes import accounts_basic, accounts_plaid, accounts_sync, accounts_reconciliation
@@ -89,12 +90,53 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"⚠️ Financial health service initialization failed: {e}")
     
+    # Budget alerts committed from sync routes are delivered on this loop
+    from app.services.budget_usage_service import budget_usage_service
+    budget_usage_service.bind_loop(asyncio.get_running_loop())
+    
+    # Open the shared ML service connection pool
+    from app.services.ml_service import get_ml_client, close_ml_client
+    await get_ml_client().start()
+    
+    # Open the shared Plaid connection pool
+    from app.services.plaid_client_service import plaid_client_service
+    await plaid_client_service.start()
+
+    # Consume queued Plaid webhooks in this process
+    from app.services.webhook_queue_service import webhook_queue_service
+    if settings.WEBHOOK_QUEUE_ENABLED:
+        try:
+            await webhook_queue_service.start()
+            logger.info("✅ Webhook queue worker started")
+        except Exception as e:
+            logger.warning(f"⚠️ Webhook queue worker failed to start: {e}")
+
+    # Evict users other workers changed from this worker's auth user cache
+    from app.auth.token_verifier import auth_user_cache
+    invalidation_listener = None
+    if settings.AUTH_USER_REDIS_CACHE:
+        invalidation_listener = asyncio.create_task(auth_user_cache.listen_for_invalidations())
+
+    # Every replica leases jobs from the shared sync schedule
+    from app.services.automatic_sync_scheduler import automatic_sync_scheduler
+    if settings.SYNC_SCHEDULER_ENABLED and settings.ENABLE_PLAID:
+        await automatic_sync_scheduler.start_scheduler()
+        logger.info("✅ Automatic sync scheduler started")
+
     logger.info("🎉 Finance Tracker API started successfully!")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Finance Tracker API...")
+    if invalidation_listener:
+        invalidation_listener.cancel()
+    await webhook_queue_service.stop()
+    await automatic_sync_scheduler.stop_scheduler()
+    await close_ml_client()
+    await plaid_client_service.aclose()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # Create FastAPI app - Development Configuration
 app = FastAPI(
@@ -5,12 +5,16 @@ from .user import User
 from .user_session import UserSession
 from .category import Category  
 from .account import Account
+from .account_balance_history import AccountBalanceHistory
 from .transaction import Transaction
+from .transaction_daily_rollup import TransactionDailyRollup
 from .plaid_recurring_transaction import PlaidRecurringTransaction
+from .plaid_sync_cursor import PlaidSyncCursor
 from .categorization_rule import CategorizationRule
 from .categorization_rule_template import CategorizationRuleTemplate
 from .budget import Budget
 from .budget_alert_settings import BudgetAlertSettings
+from .budget_usage_counter import BudgetUsageCounter
 from .goal import Goal
 from .notification import Notification, NotificationType, NotificationPriority
 from .ml_model import MLModelPerformance
@@ -31,12 +35,16 @@ __all__ = [
     "UserSession",
     "Category",
     "Account", 
+    "AccountBalanceHistory",
     "Transaction",
+    "TransactionDailyRollup",
     "PlaidRecurringTransaction",
+    "PlaidSyncCursor",
     "CategorizationRule",
     "CategorizationRuleTemplate",
     "Budget",
     "BudgetAlertSettings",
+    "BudgetUsageCounter",
     "Goal",
     "Notification",
     "NotificationType",
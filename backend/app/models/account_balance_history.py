@@ -0,0 +1,38 @@
+# Standard library imports
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+# Third-party imports
+from sqlalchemy import String, BigInteger, Date, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, relationship, mapped_column
+
+# Local imports
+from .base import BaseModel
+
+class AccountBalanceHistory(BaseModel):
+    """End-of-day account balance snapshot, written when balances are refreshed"""
+    __tablename__ = "account_balance_history"
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    account_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    snapshot_date: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    # Balances in cents
+    balance_cents: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    available_balance_cents: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    
+    # Where the snapshot came from: plaid, manual
+    source: Mapped[str] = mapped_column(String(20), default="plaid", nullable=False)
+    
+    # Relationships
+    account = relationship("Account")
+    
+    __table_args__ = (
+        UniqueConstraint('account_id', 'snapshot_date', name='uq_balance_history_account_date'),
+        Index('idx_balance_history_user_date', 'user_id', 'snapshot_date'),
+    )
+    
+    def __repr__(self):
+        return f"<AccountBalanceHistory(account_id={self.account_id}, date={self.snapshot_date}, balance_cents={self.balance_cents})>"
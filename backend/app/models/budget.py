@@ -31,6 +31,7 @@ class Budget(BaseModel):
     user = relationship("User", back_populates="budgets")
     category = relationship("Category", back_populates="budgets")
     alert_settings = relationship("BudgetAlertSettings", back_populates="budget", cascade="all, delete-orphan")
+    usage_counters = relationship("BudgetUsageCounter", back_populates="budget", cascade="all, delete-orphan", passive_deletes=True)
     
     def __repr__(self):
         return f"<Budget(id={self.id}, name='{self.name}', amount_cents={self.amount_cents}, period={self.period.value}, is_active={self.is_active})>"
@@ -0,0 +1,49 @@
+# Standard library imports
+from datetime import date
+from uuid import UUID
+
+# Third-party imports
+from sqlalchemy import BigInteger, Integer, Date, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, relationship, mapped_column
+
+# Local imports
+from .base import BaseModel
+
+class BudgetUsageCounter(BaseModel):
+    """
+    Spend for one budget over one budget period.
+    
+    Derived data: kept current by BudgetUsageService whenever the transaction
+    rollups for a day inside the period are refreshed, so budget reads are a
+    lookup instead of an aggregate over `transactions`.
+    """
+    __tablename__ = "budget_usage_counters"
+
+    # Alert levels reached during the period
+    ALERT_NONE = 0
+    ALERT_THRESHOLD = 1
+    ALERT_EXCEEDED = 2
+
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    budget_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("budgets.id", ondelete="CASCADE"), nullable=False)
+    period_start: Mapped[date] = mapped_column(Date, nullable=False)
+    period_end: Mapped[date] = mapped_column(Date, nullable=False)
+    
+    # Expenses only, stored as positive cents
+    spent_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Highest alert already sent for this period (ALERT_* above)
+    alert_level: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Relationships
+    budget = relationship("Budget", back_populates="usage_counters")
+    
+    __table_args__ = (
+        Index('idx_budget_usage_budget_period', 'budget_id', 'period_start', unique=True),
+        Index('idx_budget_usage_user_period', 'user_id', 'period_end'),
+    )
+    
+    def __repr__(self):
+        return f"<BudgetUsageCounter(budget_id={self.budget_id}, period_start={self.period_start}, spent_cents={self.spent_cents})>"
@@ -0,0 +1,47 @@
+# Standard library imports
+from datetime import datetime
+from typing import Optional, Dict, Any
+from uuid import UUID
+
+# Third-party imports
+from sqlalchemy import String, Integer, Text, ForeignKey, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
+from sqlalchemy.orm import Mapped, relationship, mapped_column
+
+# Local imports
+from .base import BaseModel
+
+class PlaidSyncCursor(BaseModel):
+    """Per-item /transactions/sync cursor used for incremental Plaid syncs"""
+    __tablename__ = "plaid_sync_cursors"
+
+    # Core identifiers
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    plaid_item_id: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    
+    # Cursor state - NULL means the item has never been synced incrementally
+    cursor: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    # Sync tracking
+    last_synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_added_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_modified_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_removed_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    sync_metadata: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB, nullable=True)
+    
+    # Relationships
+    user = relationship("User")
+    
+    __table_args__ = (
+        Index('idx_plaid_sync_cursor_user', 'user_id'),
+        Index('idx_plaid_sync_cursor_synced', 'last_synced_at'),
+    )
+    
+    @property
+    def has_cursor(self) -> bool:
+        """Whether the item has completed at least one incremental sync"""
+        return bool(self.cursor)
+    
+    def __repr__(self):
+        return f"<PlaidSyncCursor(item_id={self.plaid_item_id}, synced={self.last_synced_at})>"
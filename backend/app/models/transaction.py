@@ -75,6 +75,7 @@ class Transaction(BaseModel):
     
     __table_args__ = (
         Index('idx_transaction_user_date', 'user_id', 'transaction_date'),
+        Index('idx_transaction_user_date_id', 'user_id', 'transaction_date', 'id'),
         Index('idx_transaction_account_date', 'account_id', 'transaction_date'),
         Index('idx_transaction_category', 'category_id'),
         Index('idx_transaction_merchant', 'merchant'),
@@ -0,0 +1,52 @@
+# Standard library imports
+from datetime import date
+from typing import Optional
+from uuid import UUID
+
+# Third-party imports
+from sqlalchemy import BigInteger, Integer, Date, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from sqlalchemy.orm import Mapped, relationship, mapped_column
+
+# Local imports
+from .base import BaseModel
+
+class TransactionDailyRollup(BaseModel):
+    """
+    Per-user, per-day, per-category, per-account transaction totals.
+    
+    Derived data: rows are rebuilt from `transactions` by TransactionRollupService
+    whenever a day is touched, so they can always be dropped and backfilled.
+    """
+    __tablename__ = "transaction_daily_rollups"
+
+    # Grain
+    user_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    rollup_date: Mapped[date] = mapped_column(Date, nullable=False)
+    account_id: Mapped[UUID] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("accounts.id", ondelete="CASCADE"), nullable=False)
+    category_id: Mapped[Optional[UUID]] = mapped_column(PG_UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
+    
+    # Totals - both stored as positive cents
+    income_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    expense_cents: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    
+    # Counts (transaction_count also includes zero-amount rows)
+    income_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    expense_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    transaction_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    
+    # Relationships
+    category = relationship("Category")
+    
+    __table_args__ = (
+        Index('idx_rollup_user_date', 'user_id', 'rollup_date'),
+        Index('idx_rollup_user_category_date', 'user_id', 'category_id', 'rollup_date'),
+        Index('idx_rollup_account_date', 'account_id', 'rollup_date'),
+    )
+    
+    @property
+    def net_cents(self) -> int:
+        return self.income_cents - self.expense_cents
+    
+    def __repr__(self):
+        return f"<TransactionDailyRollup(user_id={self.user_id}, date={self.rollup_date}, category_id={self.category_id})>"
@@ -4,11 +4,12 @@ Handles core CRUD operations for user accounts.
 """
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 import logging
 
 from app.database import get_db
-from app.auth.dependencies import get_current_active_user, get_db_with_user_context
+from app.auth.dependencies import get_current_active_user, get_db_with_user_context, get_async_db_with_user_context
 from app.dependencies import get_account_service, get_owned_account
 from app.models.user import User
 from app.schemas.account import (
@@ -27,12 +28,15 @@ router = APIRouter()
 @router.get("/", response_model=List[AccountSchema])
 async def get_user_accounts(
     current_user: User = Depends(get_current_active_user),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     account_service: AccountService = Depends(get_account_service)
 ):
     """Get all accounts for the current user"""
-    accounts = account_service.get_by_user(db=db, user_id=current_user.id)
-    return accounts
+    def list_accounts(session: Session) -> List[AccountSchema]:
+        accounts = account_service.get_by_user(db=session, user_id=current_user.id)
+        return [AccountSchema.model_validate(account) for account in accounts]
+
+    return await db.run_sync(list_accounts)
 
 
 @router.post("/", response_model=AccountSchema, status_code=status.HTTP_201_CREATED)
@@ -228,7 +228,7 @@ async def schedule_automatic_sync(
             await automatic_sync_scheduler.start_scheduler()
         
         # Get scheduler status
-        status = automatic_sync_scheduler.get_scheduler_status()
+        status = await automatic_sync_scheduler.get_scheduler_status()
         
         return {
             "success": True,
@@ -248,7 +248,7 @@ async def get_scheduler_status(
 ):
     """Get current scheduler status"""
     try:
-        status = automatic_sync_scheduler.get_scheduler_status()
+        status = await automatic_sync_scheduler.get_scheduler_status()
         return {
             "success": True,
             "data": status
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date, datetime
 from typing import Optional
 from uuid import UUID
@@ -7,7 +8,7 @@ import logging
 
 from app.core.exceptions import ValidationError, BusinessLogicError
 
-from app.auth.dependencies import get_current_active_user, get_db_with_user_context
+from app.auth.dependencies import get_current_active_user, get_db_with_user_context, get_async_db_with_user_context
 from app.database import get_db
 from app.models.user import User
 from app.services.analytics_service import analytics_service
@@ -20,13 +21,13 @@ router = APIRouter()
 
 @router.get("/dashboard")
 async def get_dashboard_analytics(
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Get aggregated analytics data for the main dashboard.
     """
-    analytics_data = await analytics_service.get_dashboard_summary(db, current_user.id)
+    analytics_data = await db.run_sync(analytics_service.get_dashboard_summary, current_user.id)
     return {"success": True, "data": analytics_data}
 
 
@@ -34,7 +35,7 @@ async def get_dashboard_analytics(
 async def get_money_flow(
     start_date: date = Query(..., description="Start date for money flow analysis (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date for money flow analysis (YYYY-MM-DD)"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -52,7 +53,7 @@ async def get_money_flow(
         if (end_date - start_date).days > 365:
             raise ValidationError("Date range cannot exceed 365 days")
         
-        flow_data = await analytics_service.get_money_flow_data(db, current_user.id, start_date, end_date)
+        flow_data = await db.run_sync(analytics_service.get_money_flow_data, current_user.id, start_date, end_date)
         
         # Check if there's any data to show
         if not flow_data.get("links") or len(flow_data["links"]) == 0:
@@ -75,7 +76,7 @@ async def get_money_flow(
 async def get_spending_heatmap(
     start_date: date = Query(..., description="Start date for spending heatmap (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date for spending heatmap (YYYY-MM-DD)"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -93,7 +94,7 @@ async def get_spending_heatmap(
         if (end_date - start_date).days > 366:
             raise ValidationError("Date range cannot exceed one year")
         
-        heatmap_data = await analytics_service.get_spending_heatmap_data(db, current_user.id, start_date, end_date)
+        heatmap_data = await db.run_sync(analytics_service.get_spending_heatmap_data, current_user.id, start_date, end_date)
         
         return {"success": True, "data": heatmap_data}
         
@@ -108,7 +109,7 @@ async def get_spending_heatmap(
 async def get_financial_timeline(
     start_date: date = Query(..., description="Start date for timeline (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date for timeline (YYYY-MM-DD)"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -128,8 +129,8 @@ async def get_financial_timeline(
         if (end_date - start_date).days > 730:
             raise ValidationError("Date range cannot exceed 2 years")
         
-        timeline_data = await analytics_service.get_financial_timeline(
-            db, current_user.id, start_date, end_date
+        timeline_data = await db.run_sync(
+            analytics_service.get_financial_timeline, current_user.id, start_date, end_date
         )
         
         return TimelineEventsList(
@@ -149,7 +150,9 @@ async def get_financial_timeline(
 @router.get("/net-worth-trend")
 async def get_net_worth_trend(
     period: str = Query(default="90d", description="Time period: '90d', '1y', or 'all'"),
-    db: Session = Depends(get_db_with_user_context),
+    granularity: Optional[str] = Query(default=None, pattern="^(daily|weekly|monthly)$", description="Data point spacing; defaults per period"),
+    include_accounts: bool = Query(default=False, description="Include a per-account balance breakdown"),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -159,7 +162,7 @@ async def get_net_worth_trend(
     Period options:
     - '90d': Last 90 days with weekly data points
     - '1y': Last year with monthly data points  
-    - 'all': All available data with adaptive intervals
+    - 'all': All available data (weekly, or monthly beyond a year)
     """
     try:
         # Validate period parameter
@@ -167,7 +170,11 @@ async def get_net_worth_trend(
         if period not in valid_periods:
             raise ValidationError(f"Invalid period. Must be one of: {', '.join(valid_periods)}")
         
-        trend_data = await analytics_service.get_net_worth_trend(db, current_user.id, period)
+        trend_data = await db.run_sync(
+            lambda session: analytics_service.get_net_worth_trend(
+                session, current_user.id, period, granularity=granularity, include_accounts=include_accounts
+            )
+        )
         
         # Check if there's any data to show
         if not trend_data:
@@ -190,7 +197,7 @@ async def get_net_worth_trend(
 async def get_cash_flow_waterfall(
     start_date: date = Query(..., description="Start date for cash flow analysis (YYYY-MM-DD)"),
     end_date: date = Query(..., description="End date for cash flow analysis (YYYY-MM-DD)"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -208,8 +215,8 @@ async def get_cash_flow_waterfall(
         if (end_date - start_date).days > 365:
             raise ValidationError("Date range cannot exceed 365 days")
         
-        waterfall_data = await analytics_service.get_cash_flow_waterfall(
-            db, current_user.id, start_date, end_date
+        waterfall_data = await db.run_sync(
+            analytics_service.get_cash_flow_waterfall, current_user.id, start_date, end_date
         )
         
         return {"success": True, "data": waterfall_data}
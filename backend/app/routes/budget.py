@@ -1,6 +1,7 @@
 from typing import List, Optional, Tuple
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import date
 from uuid import UUID
@@ -13,9 +14,10 @@ from app.dependencies import get_budget_service, get_owned_budget
 from ..services.budget_service import BudgetService
 from ..schemas.budget import (
     BudgetCreate, BudgetUpdate, BudgetResponse, BudgetFilter,
-    BudgetListResponse, BudgetProgress, BudgetPeriod, BudgetCalendarResponse
+    BudgetListResponse, BudgetProgress, BudgetPeriod, BudgetCalendarResponse,
+    BudgetCalendarOverviewResponse
 )
-from ..auth.dependencies import get_current_user, get_db_with_user_context
+from ..auth.dependencies import get_current_user, get_db_with_user_context, get_async_db_with_user_context
 from ..models.user import User
 from ..models.category import Category
 
@@ -79,14 +81,14 @@ def create_budget(
 
 
 @router.get("", response_model=BudgetListResponse)
-def get_budgets(
+async def get_budgets(
     category_id: Optional[str] = Query(None, description="Filter by category ID"),
     period: Optional[BudgetPeriod] = Query(None, description="Filter by period"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     over_budget: Optional[bool] = Query(None, description="Filter over-budget items"),
     skip: int = Query(0, ge=0, description="Number of budgets to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of budgets to return"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
     """Get budgets with optional filters"""
@@ -97,10 +99,15 @@ def get_budgets(
         over_budget=over_budget
     )
     
+    return await db.run_sync(_build_budget_list, current_user.id, filters, skip, limit)
+
+
+def _build_budget_list(db: Session, user_id: UUID, filters: BudgetFilter, skip: int, limit: int) -> BudgetListResponse:
+    """Load budgets and build the list response on the sync side of AsyncSession.run_sync"""
     # Use optimized method to get budgets with usage data in minimal queries
-    budgets_with_usage = BudgetService.get_budgets_with_usage(db, current_user.id, filters, skip, limit)
-    summary = BudgetService.get_budget_summary(db, current_user.id)
-    alerts = BudgetService.get_budget_alerts(db, current_user.id)
+    budgets_with_usage = BudgetService.get_budgets_with_usage(db, user_id, filters, skip, limit)
+    summary = BudgetService.get_budget_summary(db, user_id)
+    alerts = BudgetService.get_budget_alerts(db, user_id)
     
     # Build response using pre-calculated usage data
     budget_responses = []
@@ -136,6 +143,25 @@ def get_budgets(
     )
 
 
+@router.get("/calendar", response_model=BudgetCalendarOverviewResponse)
+async def get_budgets_calendar(
+    months: int = Query(1, ge=1, le=12, description="Number of months to include, ending at `month`"),
+    month: Optional[str] = Query(None, description="Last month in YYYY-MM format (defaults to the current month)"),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
+    current_user: User = Depends(get_current_user)
+):
+    """Get calendar data for every active budget across one or more months"""
+    try:
+        return await db.run_sync(
+            BudgetService.get_budgets_calendar, current_user.id, months=months, end_month=month
+        )
+    except ValueError as e:
+        raise ValidationError(str(e))
+    except Exception as e:
+        logger.error(f"Error getting budgets calendar: {e}", exc_info=True)
+        raise BusinessLogicError("An error occurred while retrieving budget calendars")
+
+
 @router.get("/{budget_id}", response_model=BudgetResponse)
 def get_budget(
     budget = Depends(get_owned_budget),
@@ -246,21 +272,21 @@ def get_budget_progress(
 
 
 @router.get("/analytics/summary")
-def get_budget_summary(
-    db: Session = Depends(get_db_with_user_context),
+async def get_budget_summary(
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
     """Get budget summary statistics"""
-    return BudgetService.get_budget_summary(db, current_user.id)
+    return await db.run_sync(BudgetService.get_budget_summary, current_user.id)
 
 
 @router.get("/analytics/alerts")
-def get_budget_alerts(
-    db: Session = Depends(get_db_with_user_context),
+async def get_budget_alerts(
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
     """Get current budget alerts"""
-    return BudgetService.get_budget_alerts(db, current_user.id)
+    return await db.run_sync(BudgetService.get_budget_alerts, current_user.id)
 
 
 @router.get("/{budget_id}/calendar", response_model=BudgetCalendarResponse)
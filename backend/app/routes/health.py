@@ -10,6 +10,7 @@ from app.database import get_db, check_database_health
 from app.config import settings
 from app.auth.supabase_client import supabase_client
 from app.core.exceptions import ExternalServiceError
+from app.services.webhook_queue_service import webhook_queue_service
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -55,6 +56,23 @@ async def health_check(detailed: bool = False, db: Session = Depends(get_db)):
         health_status["checks"]["redis"] = {"status": "unhealthy", "error": str(e)}
         health_status["status"] = "degraded"
     
+    # Check the Plaid webhook queue backlog (aggregates only, no worker details)
+    if settings.WEBHOOK_QUEUE_ENABLED:
+        try:
+            queue_stats = await webhook_queue_service.get_stats()
+            health_status["checks"]["webhook_queue"] = {
+                "status": "healthy",
+                **{
+                    key: queue_stats.get(key)
+                    for key in ("stream_length", "pending", "undelivered", "dead_letter_length",
+                                "consumers", "oldest_unprocessed_age_seconds")
+                }
+            }
+        except Exception as e:
+            logger.error(f"Webhook queue health check failed: {e}")
+            health_status["checks"]["webhook_queue"] = {"status": "unhealthy", "error": str(e)}
+            health_status["status"] = "degraded"
+    
     # Check Supabase
     try:
         if supabase_client.is_configured():
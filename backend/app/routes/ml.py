@@ -109,7 +109,8 @@ async def ml_service_health():
             "success": response.success,
             "data": response.data.model_dump() if response.data else None,
             "error": response.error.model_dump() if response.error else None,
-            "duration_ms": response.request_duration_ms
+            "duration_ms": response.request_duration_ms,
+            "client": ml_client.client_metrics()
         }
         
     except Exception as e:
@@ -14,6 +14,7 @@ from app.auth.dependencies import get_current_user, get_db_with_user_context
 from app.dependencies import get_plaid_service, get_account_service
 from app.models.user import User
 from app.services.account_service import AccountService
+from app.services.recurring_insights_service import recurring_insights_service
 from app.core.exceptions import (
     PlaidIntegrationError,
     ExternalServiceError,
@@ -37,10 +38,15 @@ async def get_plaid_recurring_insights(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db_with_user_context),
     account_id: Optional[UUID] = Query(None, description="Filter by account ID"),
-    plaid_service = Depends(get_plaid_service),
+    refresh: bool = Query(False, description="Schedule a background refresh from Plaid"),
     account_service: AccountService = Depends(get_account_service)
 ):
-    """Get recurring transaction insights from Plaid."""
+    """
+    Get recurring transaction insights from the persisted Plaid streams.
+    
+    Served from cache; `freshness` reports when the streams were last synced and
+    whether a background refresh was scheduled.
+    """
     try:
         # Verify account ownership if account_id provided
         if account_id:
@@ -51,7 +57,9 @@ async def get_plaid_recurring_insights(
             if not account.plaid_access_token:
                 raise ValidationError("Account is not connected to Plaid")
         
-        insights = await plaid_service.sync_recurring_transactions_for_user(db, current_user.id)
+        insights = await recurring_insights_service.get_insights(
+            db, current_user.id, account_id=account_id, refresh=refresh
+        )
         
         return {
             "success": True,
@@ -2,19 +2,24 @@ from email.policy import default
 from typing import List, Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, status
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 import csv
-from io import StringIO
 from datetime import datetime, date
 import asyncio
 import logging
 
 from app.core.exceptions import DataIntegrityError, BusinessLogicError, ValidationError
 
-from ..database import get_db
+from ..database import get_db, SessionLocal
 from app.dependencies import get_transaction_service, get_websocket_manager_dep, get_owned_transaction
 from ..services.transaction_service import TransactionService
+from ..services.transaction_search_service import transaction_search_service
+from ..services.transaction_import_service import transaction_import_service
+from ..services.transaction_export_service import transaction_export_service
+from ..websocket.events import WebSocketEvents
 from ..schemas.transaction import (
     TransactionCreate,
     TransactionUpdate,
@@ -23,7 +28,7 @@ from ..schemas.transaction import (
     TransactionPagination,
     TransactionListResponse
 )
-from app.auth.dependencies import get_current_user, get_db_with_user_context
+from app.auth.dependencies import get_current_user, get_db_with_user_context, get_async_db_with_user_context
 from ..models.user import User
 from ..models.transaction import Transaction
 
@@ -106,105 +111,77 @@ async def delete_transaction(
     return {"message": "Transaction deleted successfully"}
 
 @router.get("")
-def get_transactions(
+async def get_transactions(
     filters: TransactionFilter = Depends(),
     pagination: TransactionPagination = Depends(),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
-    # Check if grouping is requested
-    if filters.group_by and filters.group_by != "none":
-        # Use the new grouped method - returns TransactionGroupedResponse
-        return TransactionService.get_transactions_with_grouping(
-            db, current_user.id, filters, pagination
-        )
-    else:
+    def list_transactions(session: Session):
+        # Check if grouping is requested
+        if filters.group_by and filters.group_by != "none":
+            # Use the new grouped method - returns TransactionGroupedResponse
+            return TransactionService.get_transactions_with_grouping(
+                session, current_user.id, filters, pagination
+            )
+
         # Use the original flat method
-        transactions, total_count = TransactionService.get_transactions_with_filters(
-            db, current_user.id, filters, pagination
+        transactions, total_count, next_cursor, is_estimate = TransactionService.get_transactions_page(
+            session, current_user.id, filters, pagination
         )
         
-        # Calculate pagination values
-        has_more = total_count > pagination.offset + len(transactions)
-        
         return TransactionListResponse(
             transactions=transactions,
             total=total_count,
             limit=pagination.limit,
             offset=pagination.offset,
-            has_more=has_more
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
+            total_is_estimate=is_estimate
         )
 
+    return await db.run_sync(list_transactions)
+
 @router.post("/import")
 async def import_transactions(
     file: UploadFile = File(...),
-    notify: bool = Query(default=True, description="Send real-time notification"),
+    account_id: Optional[UUID] = Query(default=None, description="Import every row into this account"),
+    skip_invalid_rows: bool = Query(default=False, description="Import valid rows even if some rows are invalid"),
+    notify: bool = Query(default=True, description="Send real-time progress notifications"),
     db: Session = Depends(get_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
+    """
+    Stream a CSV upload into transactions.
+
+    Rows are parsed and loaded in chunks; progress is pushed over the websocket
+    and the response is a summary rather than the imported rows.
+    """
     if not file.filename.endswith('.csv'):
         raise ValidationError("Only CSV files are supported")
 
-    content = await file.read()
-    csv_content = StringIO(content.decode())
-    csv_reader = csv.DictReader(csv_content)
-    
-    transactions = []
-    errors = []
-    for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 because row 1 is headers
-        try:
-            # Parse amount (convert dollars to cents)
-            amount_dollars = float(row['amount'])
-            amount_cents = int(amount_dollars * 100)
-            
-            # Parse transaction type and adjust amount sign
-            transaction_type = row['transaction_type'].lower()
-            if transaction_type == 'expense' and amount_cents > 0:
-                amount_cents = -amount_cents  # Expenses should be negative
-            
-            # Parse date
-            transaction_date = datetime.strptime(row['transaction_date'], "%Y-%m-%d").date()
-            
-            # Create transaction object
-            transaction = TransactionCreate(
-                account_id=UUID('00000000-0000-0000-0000-000000000000'),  # Default account, will be updated by service
-                amount_cents=amount_cents,
-                description=row.get('description', ''),
-                transaction_date=transaction_date,
-                category_id=None  # Will be set by ML categorization
-            )
-            transactions.append(transaction)
-        except (ValueError, KeyError) as e:
-            errors.append(f"Row {row_num}: {str(e)}")
-        except Exception as e:
-            logger.error(f"CSV import error on row {row_num}: {str(e)}", exc_info=True)
-            errors.append(f"Row {row_num}: Invalid data format")
-    
-    if errors:
-        raise ValidationError(f"Invalid data in CSV rows: {'; '.join(errors)}")
-
-    imported_transactions = TransactionService.import_transactions_from_csv(
-        db, current_user.id, transactions
-    )
+    async def report_progress(progress: dict):
+        await WebSocketEvents.emit_transaction_import_progress(str(current_user.id), progress)
 
-    if notify and manager.is_user_connected(str(current_user.id)):
-        try:
-            await manager.send_to_user(str(current_user.id), {
-                "type": "transactions_imported",
-                "payload": {
-                    # TODO: Large Imports: For very large CSV imports, consider sending progress updates
-                    "count": len(imported_transactions),
-                    "transactions": [_serialize_transaction(t) for t in imported_transactions]
-                }
-            })
-        except Exception as e:
-            logger.warning(f"Error sending real-time notification: {str(e)}")
+    try:
+        summary = await transaction_import_service.import_csv(
+            db,
+            current_user.id,
+            file.file,
+            account_id=account_id,
+            skip_invalid_rows=skip_invalid_rows,
+            progress_callback=report_progress if notify else None
+        )
+    except (ValidationError, BusinessLogicError):
+        raise
+    except SQLAlchemyError as e:
+        logger.error(f"Database error importing transactions: {str(e)}", exc_info=True)
+        raise DataIntegrityError("Failed to import transactions due to database error")
     
     return {
-        "message": f"Successfully imported {len(imported_transactions)} transactions",
-        "imported_count": len(imported_transactions),
-        "errors": errors,
-        "transactions": [_serialize_transaction(t) for t in imported_transactions]
+        "message": f"Successfully imported {summary.imported} transactions",
+        "imported_count": summary.imported,
+        **summary.to_dict()
     }
 
 @router.post("/bulk-delete")
@@ -254,144 +231,69 @@ async def search_transactions(
     transaction_type: Optional[str] = Query(None, description="Transaction type filter"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(25, ge=1, le=100, description="Items per page"),
-    db: Session = Depends(get_db_with_user_context),
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
-    """Advanced search for transactions with multiple filters"""
+    """Ranked search for transactions, with optional date filters"""
     filters = TransactionFilter(
-        search_query=q,
         start_date=start_date,
-        end_date=end_date,
-        category=category,
-        transaction_type=transaction_type
+        end_date=end_date
     )
-    pagination = TransactionPagination(page=page, per_page=per_page)
     
-    transactions, total_count = TransactionService.get_transactions_with_filters(
-        db, current_user.id, filters, pagination
-    )
+    def search(session: Session):
+        transactions, total_count = transaction_search_service.search(
+            session, current_user.id, q, filters, limit=per_page, offset=(page - 1) * per_page
+        )
+        return [TransactionResponse.model_validate(t) for t in transactions], total_count
+    
+    items, total_count = await db.run_sync(search)
     
     return {
-        "items": transactions,
+        "items": items,
         "total": total_count,
-        "page": pagination.page,
-        "per_page": pagination.per_page,
-        "pages": (total_count + pagination.per_page - 1) // pagination.per_page,
+        "page": page,
+        "per_page": per_page,
+        "pages": (total_count + per_page - 1) // per_page,
         "search_query": q
     }
 
 @router.get("/categories", response_model=List[str])
-def get_transaction_categories(
-    db: Session = Depends(get_db_with_user_context),
+async def get_transaction_categories(
+    db: AsyncSession = Depends(get_async_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
     """Get all unique transaction categories for the current user"""
-    categories = db.query(Transaction.category).filter(
-        Transaction.user_id == current_user.id
-    ).distinct().all()
-    return [category[0] for category in categories if category[0]]
+    result = await db.execute(
+        select(Transaction.category).where(Transaction.user_id == current_user.id).distinct()
+    )
+    return [category for category in result.scalars() if category]
 
 @router.get("/export")
 async def export_transactions(
-    format: str = Query("csv", pattern="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", pattern="^(csv|json|ndjson)$", description="Export format"),
+    compress: bool = Query(False, description="Gzip-compress the export"),
     start_date: Optional[datetime] = Query(None, description="Start date filter"),
     end_date: Optional[datetime] = Query(None, description="End date filter"),
     category: Optional[str] = Query(None, description="Category filter"),
-    db: Session = Depends(get_db_with_user_context),
     current_user: User = Depends(get_current_user)
 ):
-    """Export transactions in CSV or JSON format using streaming for efficient memory usage"""
+    """Export transactions as CSV, JSON or NDJSON, streamed from a server-side cursor"""
     from fastapi.responses import StreamingResponse
-    import json
-    import csv
-    import io
     
     filters = TransactionFilter(
-        start_date=start_date,
-        end_date=end_date,
-        category=category
+        start_date=start_date.date() if start_date else None,
+        end_date=end_date.date() if end_date else None
     )
     
-    def format_transaction_for_export(transaction):
-        """Helper function to format a transaction for export"""
-        amount_dollars = transaction.amount_cents / 100
-        transaction_type = 'expense' if transaction.amount_cents < 0 else 'income'
-        return {
-            'id': str(transaction.id),
-            'amount': abs(amount_dollars),
-            'category': getattr(transaction.category, 'name', '') if transaction.category else '',
-            'description': transaction.description or '',
-            'transaction_date': transaction.transaction_date.strftime('%Y-%m-%d'),
-            'transaction_type': transaction_type,
-            'created_at': transaction.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': transaction.updated_at.strftime('%Y-%m-%d %H:%M:%S')
+    return StreamingResponse(
+        transaction_export_service.stream_export(
+            SessionLocal, current_user.id, filters, format, compress=compress, category_name=category
+        ),
+        media_type=transaction_export_service.media_type(format, compress),
+        headers={
+            "Content-Disposition": f"attachment; filename={transaction_export_service.filename(format, compress)}"
         }
-    
-    if format == "csv":
-        def generate_csv():
-            """Generator function for CSV streaming"""
-            # Create in-memory buffer for CSV header
-            output = io.StringIO()
-            fieldnames = ['id', 'amount', 'category', 'description', 'transaction_date', 'transaction_type', 'created_at', 'updated_at']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            
-            # Write header
-            writer.writeheader()
-            yield output.getvalue()
-            
-            # Stream transactions in chunks
-            for transaction_chunk in TransactionService.stream_transactions_for_export(db, current_user.id, filters):
-                # Clear buffer for next chunk
-                output.seek(0)
-                output.truncate(0)
-                
-                # Write chunk to buffer
-                for transaction in transaction_chunk:
-                    formatted_transaction = format_transaction_for_export(transaction)
-                    # Remove updated_at for CSV to match original format
-                    formatted_transaction.pop('updated_at')
-                    writer.writerow(formatted_transaction)
-                
-                # Yield chunk content
-                yield output.getvalue()
-        
-        return StreamingResponse(
-            generate_csv(),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=transactions.csv"}
-        )
-    
-    else:  # json format
-        def generate_json():
-            """Generator function for JSON streaming"""
-            yield "["  # Start JSON array
-            first_item = True
-            
-            # Stream transactions in chunks
-            for transaction_chunk in TransactionService.stream_transactions_for_export(db, current_user.id, filters):
-                for transaction in transaction_chunk:
-                    formatted_transaction = format_transaction_for_export(transaction)
-                    # Update date formatting for JSON
-                    formatted_transaction['transaction_date'] = transaction.transaction_date.isoformat()
-                    formatted_transaction['created_at'] = transaction.created_at.isoformat()
-                    formatted_transaction['updated_at'] = transaction.updated_at.isoformat()
-                    
-                    # Add comma separator between items (except for first item)
-                    if not first_item:
-                        yield ","
-                    else:
-                        first_item = False
-                    
-                    # Yield formatted transaction
-                    yield json.dumps(formatted_transaction, indent=2)
-            
-            yield "]"  # Close JSON array
-        
-        return StreamingResponse(
-            generate_json(),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=transactions.json"}
-        )
+    )
 
 def _serialize_transaction(transaction: Transaction) -> dict:
     """Serialize a transaction to a dictionary"""
@@ -8,6 +8,7 @@ import logging
 from app.database import get_db
 from app.dependencies import get_user_service
 from app.auth.dependencies import get_current_user, get_current_active_user, get_db_with_user_context
+from app.auth.token_verifier import auth_user_cache
 from app.schemas.user import UserResponse, UserUpdate, UserProfile
 from app.schemas.user_session import UserSessionPublic, SessionStatsResponse
 from app.services.user_service import UserService
@@ -42,6 +43,7 @@ async def update_current_user_profile(
             db_obj=current_user,
             obj_in=user_update
         )
+        await auth_user_cache.invalidate(str(current_user.supabase_user_id))
         return updated_user
     except SQLAlchemyError as e:
         logger.error(f"Database error updating user profile: {str(e)}", exc_info=True)
@@ -58,6 +60,7 @@ async def delete_current_user_account(
 ):
     """Delete current user's account"""
     user_service.deactivate_user(db=db, user_id=current_user.id)
+    await auth_user_cache.invalidate(str(current_user.supabase_user_id))
     return {"message": "Account deactivated successfully"}
 
 @router.get("/search", response_model=List[UserProfile])
@@ -129,6 +129,11 @@ class BudgetCalendarResponse(BaseModel):
     summary: Dict[str, Any]  # Monthly summary stats
 
 
+class BudgetCalendarOverviewResponse(BaseModel):
+    months: List[str]  # YYYY-MM, oldest first
+    calendars: List[BudgetCalendarResponse]  # One per active budget and month
+
+
 class BudgetListResponse(BaseModel):
     budgets: List[BudgetResponse]
     summary: BudgetSummary
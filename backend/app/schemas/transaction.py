@@ -13,6 +13,11 @@ class TransactionGroupBy(str, Enum):
     CATEGORY = "category"
     MERCHANT = "merchant"
 
+class TransactionCountMode(str, Enum):
+    EXACT = "exact"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
 class TransactionStatus(str, Enum):
     PENDING = "pending"
     POSTED = "posted"
@@ -197,13 +202,20 @@ class TransactionFilter(BaseModel):
 class TransactionPagination(BaseModel):
     limit: int = Field(25, ge=1, le=100)
     offset: int = Field(0, ge=0)
+    cursor: str | None = Field(None, description="Opaque keyset cursor from a previous page; overrides offset")
+    count_mode: TransactionCountMode = Field(
+        TransactionCountMode.EXACT,
+        description="Total count: 'exact', 'estimated' (cached/planner estimate) or 'none' (infinite scroll)"
+    )
 
 class TransactionListResponse(BaseModel):
     transactions: List[TransactionResponse]
-    total: int
+    total: int | None
     limit: int
     offset: int
     has_more: bool
+    next_cursor: str | None = None
+    total_is_estimate: bool = False
 
 class TransactionStats(BaseModel):
     total_income_cents: int
@@ -245,7 +257,9 @@ class TransactionGroup(BaseModel):
 class TransactionGroupedResponse(BaseModel):
     """Schema for grouped transaction list response"""
     groups: List[TransactionGroup] = Field(..., description="Grouped transactions")
-    total: int = Field(..., description="Total number of transactions across all groups")
+    total: int | None = Field(..., description="Total number of transactions across all groups")
     limit: int = Field(..., description="Items per page")
     offset: int = Field(..., description="Offset for pagination")
-    has_more: bool = Field(..., description="Whether there are more results")
\ No newline at end of file
+    has_more: bool = Field(..., description="Whether there are more results")
+    next_cursor: str | None = Field(None, description="Cursor for the next page")
+    total_is_estimate: bool = Field(False, description="Whether total is an estimate")
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Compare requests/second of sync and async database sessions under concurrency
+
+Serves two endpoints from one event loop, as a single uvicorn worker would:
+`/sync` runs a query on a SessionLocal session inside an `async def` route (the
+old route pattern), `/async` awaits the same query on an AsyncSession.
+
+    python -m app.scripts.benchmark_async_db
+    python -m app.scripts.benchmark_async_db --requests 500 --concurrency 50 --query-ms 20
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# Add the parent directory to Python path so we can import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import async_engine, get_async_db, get_db
+
+
+def build_app(query_seconds: float) -> FastAPI:
+    query = text("SELECT pg_sleep(:seconds)")
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def sync_route(db: Session = Depends(get_db)):
+        db.execute(query, {"seconds": query_seconds})
+        return {"ok": True}
+
+    @app.get("/async")
+    async def async_route(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(query, {"seconds": query_seconds})
+        return {"ok": True}
+
+    return app
+
+
+async def run(app: FastAPI, path: str, total: int, concurrency: int) -> float:
+    """Issue `total` requests with at most `concurrency` in flight; returns requests/second"""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark") as client:
+        async def request():
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        await client.get(path)  # warm up the pool
+        started = time.perf_counter()
+        await asyncio.gather(*(request() for _ in range(total)))
+        return total / (time.perf_counter() - started)
+
+
+async def benchmark(total: int, concurrency: int, query_ms: float):
+    if async_engine is None:
+        print("❌ Async engine unavailable; install asyncpg and point DATABASE_URL at PostgreSQL")
+        return
+
+    app = build_app(query_ms / 1000.0)
+    print(f"Benchmarking {total} requests, concurrency {concurrency}, {query_ms:g}ms per query...")
+
+    results = {}
+    for path in ("/sync", "/async"):
+        results[path] = await run(app, path, total, concurrency)
+        print(f"  {path:<7} {results[path]:8.1f} req/s")
+
+    print(f"✅ Async sessions: {results['/async'] / results['/sync']:.1f}x the throughput of sync sessions")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async database sessions")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--query-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.requests, args.concurrency, args.query_ms))
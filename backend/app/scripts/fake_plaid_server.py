@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Local fake Plaid server for offline development and tests.
+
+Implements the subset of the Plaid API the sync pipeline uses
+(/transactions/sync, /transactions/get, /accounts/balance/get, /item/get)
+on top of an in-memory per-item change log, so cursors behave like the real thing.
+It also signs webhooks and serves /webhook_verification_key/get for them.
+
+Run it and point the backend at it:
+    python -m app.scripts.fake_plaid_server --port 8100
+    PLAID_BASE_URL=http://localhost:8100 uvicorn app.main:app
+"""
+import argparse
+import base64
+import hashlib
+import json
+import threading
+import time
+from copy import deepcopy
+from typing import Dict, Any, List, Optional, Tuple
+from uuid import uuid4
+
+
+class FakePlaidServer:
+    """In-memory Plaid stand-in; every mutation is appended to the item's change log"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.tokens: Dict[str, str] = {}  # access_token -> item_id
+        self.requests: List[Tuple[str, Dict[str, Any]]] = []
+        # Number of upcoming /transactions/sync calls that should fail with a pagination mutation
+        self.mutations_during_pagination = 0
+        # Number of upcoming calls that should be rejected with RATE_LIMIT_EXCEEDED
+        self.rate_limited_calls = 0
+        self.webhook_keys: Dict[str, Tuple[str, Dict[str, Any]]] = {}  # kid -> (private_pem, public_jwk)
+
+    # ------------------------------------------------------------------
+    # Fixture helpers
+    # ------------------------------------------------------------------
+
+    def create_item(self, item_id: Optional[str] = None, access_token: Optional[str] = None,
+                    accounts: Optional[List[Dict[str, Any]]] = None) -> Tuple[str, str]:
+        """Register an item and return (item_id, access_token)"""
+        item_id = item_id or f"item-{uuid4().hex[:12]}"
+        access_token = access_token or f"access-sandbox-{uuid4()}"
+        with self._lock:
+            self.items[item_id] = {
+                'accounts': accounts or [{
+                    'account_id': f"acc-{uuid4().hex[:12]}",
+                    'name': 'Fake Checking',
+                    'type': 'depository',
+                    'subtype': 'checking',
+                    'balances': {'current': 1000.0, 'available': 1000.0, 'iso_currency_code': 'USD'}
+                }],
+                'transactions': {},
+                'log': []
+            }
+            self.tokens[access_token] = item_id
+        return item_id, access_token
+
+    def add_transaction(self, item_id: str, **fields) -> Dict[str, Any]:
+        """Add a transaction; unspecified fields get sensible defaults"""
+        item = self.items[item_id]
+        txn = {
+            'transaction_id': fields.pop('transaction_id', f"txn-{uuid4().hex[:16]}"),
+            'account_id': fields.pop('account_id', item['accounts'][0]['account_id']),
+            'amount': 10.0,
+            'iso_currency_code': 'USD',
+            'date': '2025-08-01',
+            'authorized_date': None,
+            'name': 'Fake Merchant',
+            'merchant_name': None,
+            'pending': False,
+            'pending_transaction_id': None,
+            'category': [],
+            'payment_channel': 'online',
+        }
+        txn.update(fields)
+        with self._lock:
+            item['transactions'][txn['transaction_id']] = txn
+            item['log'].append(('added', deepcopy(txn)))
+        return txn
+
+    def modify_transaction(self, item_id: str, transaction_id: str, **changes) -> Dict[str, Any]:
+        item = self.items[item_id]
+        with self._lock:
+            txn = item['transactions'][transaction_id]
+            txn.update(changes)
+            item['log'].append(('modified', deepcopy(txn)))
+        return txn
+
+    def remove_transaction(self, item_id: str, transaction_id: str) -> None:
+        item = self.items[item_id]
+        with self._lock:
+            item['transactions'].pop(transaction_id, None)
+            item['log'].append(('removed', {'transaction_id': transaction_id}))
+
+    def post_pending(self, item_id: str, pending_id: str, **changes) -> Dict[str, Any]:
+        """Simulate a pending transaction posting: remove the pending id, add a posted one"""
+        pending = deepcopy(self.items[item_id]['transactions'][pending_id])
+        self.remove_transaction(item_id, pending_id)
+        pending.pop('transaction_id')
+        pending.update({'pending': False, 'pending_transaction_id': pending_id})
+        pending.update(changes)
+        return self.add_transaction(item_id, **pending)
+
+    def rotate_webhook_key(self) -> str:
+        """Create a new ES256 webhook signing key and return its kid"""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from jose import jwk
+
+        private_key = ec.generate_private_key(ec.SECP256R1())
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+
+        kid = uuid4().hex
+        public_jwk = {
+            **jwk.construct(public_pem, 'ES256').to_dict(),
+            'kid': kid, 'alg': 'ES256', 'use': 'sig',
+            'created_at': int(time.time()), 'expired_at': None
+        }
+        with self._lock:
+            self.webhook_keys[kid] = (private_pem, public_jwk)
+        return kid
+
+    def expire_webhook_key(self, kid: str) -> None:
+        with self._lock:
+            self.webhook_keys[kid][1]['expired_at'] = int(time.time())
+
+    def sign_webhook(self, body: bytes, kid: Optional[str] = None, iat: Optional[int] = None) -> str:
+        """Plaid-Verification header value for a webhook body"""
+        from jose import jwt
+
+        if kid is None:
+            kid = next(reversed(self.webhook_keys), None) or self.rotate_webhook_key()
+        private_pem = self.webhook_keys[kid][0]
+        claims = {
+            'iat': iat if iat is not None else int(time.time()),
+            'request_body_sha256': hashlib.sha256(body).hexdigest()
+        }
+        return jwt.encode(claims, private_pem, algorithm='ES256', headers={'kid': kid})
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def handle(self, endpoint: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        """Dispatch a Plaid API call and return (status_code, body)"""
+        endpoint = endpoint.strip('/')
+        self.requests.append((endpoint, payload))
+
+        if self.rate_limited_calls > 0:
+            self.rate_limited_calls -= 1
+            return self._error(429, 'RATE_LIMIT_EXCEEDED', 'RATE_LIMIT', 'rate limit exceeded for attempts to access this item')
+
+        if endpoint == 'webhook_verification_key/get':
+            return self._webhook_verification_key_get(payload)
+
+        item_id = self.tokens.get(payload.get('access_token'))
+        if item_id is None:
+            return self._error(400, 'INVALID_INPUT', 'INVALID_ACCESS_TOKEN', 'provided access token is invalid')
+
+        handler = {
+            'transactions/sync': self._transactions_sync,
+            'transactions/get': self._transactions_get,
+            'accounts/balance/get': self._accounts_get,
+            'accounts/get': self._accounts_get,
+            'item/get': self._item_get,
+        }.get(endpoint)
+        if handler is None:
+            return self._error(404, 'INVALID_REQUEST', 'NOT_FOUND', f'fake server does not implement /{endpoint}')
+        return handler(item_id, payload)
+
+    def _transactions_sync(self, item_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        if self.mutations_during_pagination > 0 and payload.get('cursor'):
+            self.mutations_during_pagination -= 1
+            return self._error(
+                400, 'TRANSACTIONS_ERROR', 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION',
+                'Underlying transaction data changed since last page was fetched'
+            )
+
+        try:
+            position = self._decode_cursor(payload.get('cursor'), item_id)
+        except ValueError:
+            return self._error(400, 'INVALID_INPUT', 'INVALID_FIELD', 'cursor is invalid')
+
+        count = max(1, min(int(payload.get('count', 100)), 500))
+        log = self.items[item_id]['log']
+        page = log[position:position + count]
+        next_position = position + len(page)
+
+        body = {'added': [], 'modified': [], 'removed': []}
+        for kind, data in page:
+            body[kind].append(deepcopy(data))
+        body.update({
+            'next_cursor': self._encode_cursor(item_id, next_position),
+            'has_more': next_position < len(log),
+            'request_id': uuid4().hex
+        })
+        return 200, body
+
+    def _transactions_get(self, item_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        item = self.items[item_id]
+        account_ids = set(payload.get('account_ids') or [])
+        start, end = payload.get('start_date', ''), payload.get('end_date', '9999-12-31')
+        matching = sorted(
+            (t for t in item['transactions'].values()
+             if start <= t['date'] <= end and (not account_ids or t['account_id'] in account_ids)),
+            key=lambda t: t['date'], reverse=True
+        )
+        offset, count = int(payload.get('offset', 0)), int(payload.get('count', 100))
+        return 200, {
+            'transactions': deepcopy(matching[offset:offset + count]),
+            'accounts': deepcopy(item['accounts']),
+            'total_transactions': len(matching),
+            'request_id': uuid4().hex
+        }
+
+    def _accounts_get(self, item_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        return 200, {'accounts': deepcopy(self.items[item_id]['accounts']), 'request_id': uuid4().hex}
+
+    def _item_get(self, item_id: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        return 200, {
+            'item': {'item_id': item_id, 'error': None, 'available_products': [], 'billed_products': ['transactions']},
+            'request_id': uuid4().hex
+        }
+
+    def _webhook_verification_key_get(self, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        key = self.webhook_keys.get(payload.get('key_id'))
+        if key is None:
+            return self._error(400, 'INVALID_INPUT', 'INVALID_WEBHOOK_VERIFICATION_KEY_ID', 'key_id is invalid')
+        return 200, {'key': deepcopy(key[1]), 'request_id': uuid4().hex}
+
+    def _encode_cursor(self, item_id: str, position: int) -> str:
+        return base64.urlsafe_b64encode(json.dumps([item_id, position]).encode()).decode()
+
+    def _decode_cursor(self, cursor: Optional[str], item_id: str) -> int:
+        if not cursor:
+            return 0
+        try:
+            cursor_item, position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except Exception:
+            raise ValueError("malformed cursor")
+        if cursor_item != item_id:
+            raise ValueError("cursor belongs to another item")
+        return int(position)
+
+    def _error(self, status: int, error_type: str, error_code: str, message: str) -> Tuple[int, Dict[str, Any]]:
+        return status, {
+            'error_type': error_type,
+            'error_code': error_code,
+            'error_message': message,
+            'request_id': uuid4().hex
+        }
+
+    # ------------------------------------------------------------------
+    # Adapters
+    # ------------------------------------------------------------------
+
+    def httpx_transport(self):
+        """An httpx transport serving this fake, so PlaidClientService can run unchanged in tests"""
+        import httpx
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            status, body = self.handle(request.url.path, json.loads(request.content or b'{}'))
+            headers = {'Retry-After': '0'} if status == 429 else None
+            return httpx.Response(status, json=body, headers=headers)
+
+        return httpx.MockTransport(handler)
+
+    def create_app(self):
+        """Build a FastAPI app serving this fake over HTTP"""
+        from fastapi import FastAPI, Request
+        from fastapi.responses import JSONResponse
+
+        app = FastAPI(title="Fake Plaid")
+
+        @app.post("/{endpoint:path}")
+        async def dispatch(endpoint: str, request: Request):
+            status, body = self.handle(endpoint, await request.json())
+            return JSONResponse(status_code=status, content=body)
+
+        return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local fake Plaid server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--seed", type=int, default=25, help="Transactions to create on a demo item")
+    args = parser.parse_args()
+
+    server = FakePlaidServer()
+    item_id, access_token = server.create_item(item_id="fake-item", access_token="access-fake-item")
+    for i in range(args.seed):
+        server.add_transaction(item_id, amount=round(5 + i * 1.37, 2), date=f"2025-08-{(i % 28) + 1:02d}",
+                               name=f"Demo Merchant {i % 7}")
+    print(f"🧪 Fake Plaid listening on http://{args.host}:{args.port} (item={item_id}, token={access_token})")
+    uvicorn.run(server.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Local fake Supabase auth signer for offline development and tests.
+
+Issues RS256 access tokens the way Supabase does and serves the matching
+/auth/v1/.well-known/jwks.json, with key rotation, so local JWT verification
+can run without a Supabase project.
+
+Run it and point the backend at it:
+    python -m app.scripts.fake_supabase_auth --port 8200
+    SUPABASE_JWKS_URL=http://localhost:8200/auth/v1/.well-known/jwks.json uvicorn app.main:app
+"""
+import argparse
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import uuid4
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+JWKS_PATH = "/auth/v1/.well-known/jwks.json"
+
+
+class FakeSupabaseAuth:
+    """In-memory signing keys; the newest key signs, every published key verifies"""
+
+    def __init__(self, audience: str = "authenticated"):
+        self._lock = threading.Lock()
+        self.audience = audience
+        self.keys: List[Tuple[str, str, Dict[str, Any]]] = []  # (kid, private_pem, public_jwk)
+        self.jwks_requests = 0
+        self.rotate()
+
+    # ------------------------------------------------------------------
+    # Fixture helpers
+    # ------------------------------------------------------------------
+
+    def rotate(self, keep_previous: bool = True) -> str:
+        """Generate a new signing key and return its kid"""
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo
+        ).decode()
+
+        kid = f"kid-{uuid4().hex[:12]}"
+        public_jwk = {**jwk.construct(public_pem, "RS256").to_dict(), "kid": kid, "alg": "RS256", "use": "sig"}
+        with self._lock:
+            self.keys = ([*self.keys] if keep_previous else []) + [(kid, private_pem, public_jwk)]
+        return kid
+
+    def issue_token(self, sub: Optional[str] = None, email: str = "user@example.com",
+                    expires_in: int = 3600, kid: Optional[str] = None, **claims) -> str:
+        """Sign an access token shaped like Supabase's"""
+        with self._lock:
+            signing = next((key for key in self.keys if key[0] == kid), None) if kid else self.keys[-1]
+        if signing is None:
+            raise KeyError(f"Unknown kid {kid}")
+
+        now = int(time.time())
+        payload = {
+            "sub": sub or str(uuid4()),
+            "email": email,
+            "aud": self.audience,
+            "role": "authenticated",
+            "iat": now,
+            "exp": now + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, signing[1], algorithm="RS256", headers={"kid": signing[0]})
+
+    def jwks(self) -> Dict[str, Any]:
+        with self._lock:
+            self.jwks_requests += 1
+            return {"keys": [public_jwk for _, _, public_jwk in self.keys]}
+
+    # ------------------------------------------------------------------
+    # Transports
+    # ------------------------------------------------------------------
+
+    def transport(self) -> httpx.MockTransport:
+        """httpx transport serving the JWKS in-process"""
+        def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == JWKS_PATH:
+                return httpx.Response(200, json=self.jwks())
+            return httpx.Response(404, json={"error": "not_found"})
+
+        return httpx.MockTransport(handler)
+
+    def create_app(self):
+        """Build a FastAPI app serving the JWKS over HTTP, plus a token minting endpoint"""
+        from fastapi import FastAPI
+
+        app = FastAPI(title="Fake Supabase Auth")
+
+        @app.get(JWKS_PATH)
+        async def get_jwks():
+            return self.jwks()
+
+        @app.post("/token")
+        async def mint(sub: Optional[str] = None, email: str = "user@example.com", expires_in: int = 3600):
+            return {"access_token": self.issue_token(sub=sub, email=email, expires_in=expires_in)}
+
+        @app.post("/rotate")
+        async def rotate():
+            return {"kid": self.rotate()}
+
+        return app
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local fake Supabase auth signer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    server = FakeSupabaseAuth()
+    print(f"🧪 Fake Supabase auth listening on http://{args.host}:{args.port}{JWKS_PATH}")
+    uvicorn.run(server.create_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
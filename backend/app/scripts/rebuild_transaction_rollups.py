@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Rebuild transaction_daily_rollups from the transactions table
+
+    python -m app.scripts.rebuild_transaction_rollups                 # all users
+    python -m app.scripts.rebuild_transaction_rollups --user-id <id>  # one user
+    python -m app.scripts.rebuild_transaction_rollups --start-date 2025-01-01 --end-date 2025-03-31
+"""
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+from uuid import UUID
+
+# Add the parent directory to Python path so we can import app modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import SessionLocal
+from app.services.transaction_rollup_service import transaction_rollup_service
+
+
+def rebuild_rollups(user_id: UUID = None, start_date: date = None, end_date: date = None):
+    """Backfill daily rollups, committing one batch of days at a time"""
+    print("Rebuilding transaction daily rollups...")
+    
+    db = SessionLocal()
+    try:
+        result = transaction_rollup_service.rebuild(db, user_id=user_id, start_date=start_date, end_date=end_date)
+        print(f"✅ Rebuilt rollups for {result['users_rebuilt']} users ({result['rows_written']} rows)")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild transaction daily rollups")
+    parser.add_argument("--user-id", type=UUID, default=None)
+    parser.add_argument("--start-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+    
+    rebuild_rollups(args.user_id, args.start_date, args.end_date)
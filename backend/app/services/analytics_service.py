@@ -3,17 +3,20 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_, or_
 from uuid import UUID
 from datetime import date, datetime, timedelta
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from app.models.account import Account
 from app.models.transaction import Transaction
 from app.models.category import Category
 from app.models.goal import Goal
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+from app.services.balance_history_service import balance_history_service
+from app.services.transaction_rollup_service import transaction_rollup_service
 
 logger = logging.getLogger(__name__)
 
 class AnalyticsService:
-    async def get_dashboard_summary(self, db: Session, user_id: UUID) -> dict:
+    def get_dashboard_summary(self, db: Session, user_id: UUID) -> dict:
         """
         Generates a summary of dashboard analytics for a user.
         """
@@ -23,11 +26,6 @@ class AnalyticsService:
                 Account.user_id == user_id
             ).scalar() or 0
 
-            # Get total number of transactions
-            total_transactions = db.query(func.count(Transaction.id)).filter(
-                Transaction.user_id == user_id
-            ).scalar() or 0
-
             # Get 10 most recent transactions (displayed in scrollable container)
             recent_transactions_query = db.query(Transaction).filter(
                 Transaction.user_id == user_id
@@ -44,30 +42,28 @@ class AnalyticsService:
                 } for t in recent_transactions_query
             ]
 
-            # Get spending by category
-            spending_by_category_query = db.query(
-                Category.name,
-                func.sum(Transaction.amount_cents).label('total_spent')
-            ).join(Category, Transaction.category_id == Category.id).filter(
-                Transaction.user_id == user_id,
-                Transaction.amount_cents < 0  # Only expenses
-            ).group_by(Category.name).order_by(desc('total_spent')).limit(5).all()
+            # Income/expense totals and category spend come from the daily rollups
+            totals = transaction_rollup_service.get_totals(db, user_id)
+            category_totals = transaction_rollup_service.get_category_totals(db, user_id)
             
-            spending_by_category = {name: abs(total) for name, total in spending_by_category_query}
+            # Top 5 spending categories (uncategorized spend is not a named category)
+            top_categories = sorted(
+                (c for c in category_totals if c['category_name'] and c['expense_cents'] > 0),
+                key=lambda c: c['expense_cents'],
+                reverse=True
+            )[:5]
+            spending_by_category = {c['category_name']: c['expense_cents'] for c in top_categories}
 
-            # Calculate financial summary using same logic as transaction service
-            # Get all transactions for this user to calculate income/expense breakdown
-            all_transactions = db.query(Transaction).filter(Transaction.user_id == user_id).all()
-            
             # Calculate totals (convert from cents to dollars)
-            total_income = sum(t.amount_cents for t in all_transactions if t.amount_cents > 0) / 100.0
-            total_expenses = sum(abs(t.amount_cents) for t in all_transactions if t.amount_cents < 0) / 100.0
+            total_income = totals['income_cents'] / 100.0
+            total_expenses = totals['expense_cents'] / 100.0
             net_amount = total_income - total_expenses
-            transaction_count = len(all_transactions)
+            transaction_count = totals['transaction_count']
+            total_transactions = transaction_count
             
             # Count income vs expense transactions
-            income_count = sum(1 for t in all_transactions if t.amount_cents > 0)
-            expense_count = sum(1 for t in all_transactions if t.amount_cents < 0)
+            income_count = totals['income_count']
+            expense_count = totals['expense_count']
             average_transaction = (total_income + total_expenses) / transaction_count if transaction_count > 0 else 0
 
             return {
@@ -111,25 +107,19 @@ class AnalyticsService:
                 }
             }
 
-    async def get_spending_heatmap_data(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+    def get_spending_heatmap_data(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> List[Dict[str, Any]]:
         """
         Aggregates total daily expenses for a calendar heatmap visualization.
         Returns data in format expected by Nivo Calendar component.
         """
         try:
-            daily_expenses = db.query(
-                func.date(Transaction.transaction_date).label('day'),
-                func.sum(func.abs(Transaction.amount_cents)).label('value')
-            ).filter(
-                Transaction.user_id == user_id,
-                Transaction.amount_cents < 0,  # Only expenses
-                Transaction.transaction_date.between(start_date, end_date)
-            ).group_by(func.date(Transaction.transaction_date)).all()
+            daily_totals = transaction_rollup_service.get_daily_totals(db, user_id, start_date, end_date)
 
-            # Format the data for the Nivo chart - convert to list of dicts
+            # Format the data for the Nivo chart - only days with expenses
             heatmap_data = [
-                {"day": result.day.isoformat(), "value": int(result.value)}
-                for result in daily_expenses
+                {"day": day.isoformat(), "value": expense_cents}
+                for day, _, expense_cents in daily_totals
+                if expense_cents > 0
             ]
             
             return heatmap_data
@@ -137,37 +127,27 @@ class AnalyticsService:
             logger.error(f"Error generating spending heatmap data for user {user_id}: {e}", exc_info=True)
             return []
 
-    async def get_money_flow_data(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> Dict[str, Any]:
+    def get_money_flow_data(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> Dict[str, Any]:
         """
         Generates money flow data for Sankey diagram visualization.
         Returns nodes and links structure suitable for Sankey charts.
         """
         try:
-            # Get all income transactions, grouped by category
-            income_query = db.query(
-                Category.name,
-                func.sum(Transaction.amount_cents).label('total_amount')
-            ).join(
-                Transaction, Transaction.category_id == Category.id
-            ).filter(
-                Transaction.user_id == user_id,
-                Transaction.amount_cents > 0,  # Only income
-                Transaction.transaction_date.between(start_date, end_date)
-            ).group_by(Category.name).all()
-
-            # Get all expense transactions, grouped by category, limited to top 10
-            expense_query = db.query(
-                Category.name,
-                func.sum(func.abs(Transaction.amount_cents)).label('total_amount')
-            ).join(
-                Transaction, Transaction.category_id == Category.id
-            ).filter(
-                Transaction.user_id == user_id,
-                Transaction.amount_cents < 0,  # Only expenses
-                Transaction.transaction_date.between(start_date, end_date)
-            ).group_by(Category.name).order_by(
-                func.sum(func.abs(Transaction.amount_cents)).desc()
-            ).limit(10).all()
+            category_totals = [
+                c for c in transaction_rollup_service.get_category_totals(db, user_id, start_date, end_date)
+                if c['category_name']
+            ]
+            
+            # Income sources and the top 10 expense categories
+            income_query = [
+                (c['category_name'], c['income_cents'])
+                for c in category_totals if c['income_cents'] > 0
+            ]
+            expense_query = [
+                (c['category_name'], c['expense_cents'])
+                for c in sorted(category_totals, key=lambda c: c['expense_cents'], reverse=True)
+                if c['expense_cents'] > 0
+            ][:10]
 
             # Structure data for Sankey diagram
             nodes: List[Dict[str, str]] = [{"id": "Total Income"}]
@@ -254,7 +234,7 @@ class AnalyticsService:
                 }
             }
 
-    async def get_financial_timeline(
+    def get_financial_timeline(
         self, 
         db: Session, 
         user_id: UUID, 
@@ -383,75 +363,54 @@ class AnalyticsService:
                 }
             }
 
-    async def get_net_worth_trend(self, db: Session, user_id: UUID, period: str = '90d') -> List[Dict[str, Any]]:
+    def get_net_worth_trend(
+        self,
+        db: Session,
+        user_id: UUID,
+        period: str = '90d',
+        granularity: Optional[str] = None,
+        include_accounts: bool = False
+    ) -> List[Dict[str, Any]]:
         """
-        Calculate net worth trend over time by aggregating account balances at different points.
-        Since we don't store historical balance data, we calculate it based on transactions.
+        Calculate net worth trend over time from current balances, daily rollups
+        and any stored balance snapshots, in a single pass.
         
         Args:
             period: Time period for the trend ('90d', '1y', 'all')
+            granularity: 'daily', 'weekly' or 'monthly' (defaults per period)
+            include_accounts: Add a per-account breakdown to every data point
         """
         try:
             # Determine date range based on period
             end_date = datetime.utcnow().date()
             if period == '90d':
                 start_date = end_date - timedelta(days=90)
-                interval_days = 7  # Weekly data points
+                default_granularity = 'weekly'
             elif period == '1y':
                 start_date = end_date - timedelta(days=365)
-                interval_days = 30  # Monthly data points
+                default_granularity = 'monthly'
             else:  # 'all'
                 # Get the earliest transaction date
-                earliest_tx = db.query(func.min(Transaction.transaction_date)).filter(
-                    Transaction.user_id == user_id
+                earliest_tx = db.query(func.min(TransactionDailyRollup.rollup_date)).filter(
+                    TransactionDailyRollup.user_id == user_id
                 ).scalar()
                 start_date = earliest_tx if earliest_tx else end_date - timedelta(days=90)
-                total_days = (end_date - start_date).days
-                interval_days = max(7, total_days // 20)  # Aim for ~20 data points
+                default_granularity = 'monthly' if (end_date - start_date).days > 365 else 'weekly'
             
-            # Get current account balances
-            current_accounts = db.query(Account).filter(
-                Account.user_id == user_id,
-                Account.is_active == True
-            ).all()
-            
-            if not current_accounts:
-                return []
-            
-            current_net_worth = sum(account.balance_cents for account in current_accounts)
-            
-            # Generate data points by going backwards in time
-            data_points = []
-            current_date = end_date
-            
-            while current_date >= start_date:
-                # Calculate net worth at this date by subtracting future transactions from current balance
-                future_transactions = db.query(func.sum(Transaction.amount_cents)).filter(
-                    Transaction.user_id == user_id,
-                    Transaction.transaction_date > current_date
-                ).scalar() or 0
-                
-                # Net worth at this date = current balance - future transactions
-                net_worth_at_date = current_net_worth - future_transactions
-                
-                data_points.append({
-                    "date": current_date.isoformat(),
-                    "net_worth_cents": int(net_worth_at_date),
-                    "net_worth": net_worth_at_date / 100
-                })
-                
-                current_date -= timedelta(days=interval_days)
-            
-            # Sort chronologically (oldest first)
-            data_points.reverse()
-            
-            return data_points
+            return balance_history_service.get_balance_series(
+                db,
+                user_id,
+                start_date,
+                end_date,
+                granularity=granularity or default_granularity,
+                include_accounts=include_accounts
+            )
             
         except Exception as e:
             logger.error(f"Error generating net worth trend for user {user_id}: {e}", exc_info=True)
             return []
 
-    async def get_cash_flow_waterfall(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> Dict[str, Any]:
+    def get_cash_flow_waterfall(self, db: Session, user_id: UUID, start_date: date, end_date: date) -> Dict[str, Any]:
         """
         Generate cash flow waterfall data showing how balance changes from start to end.
         Shows: Starting Balance → Income → Expenses → Ending Balance
@@ -477,15 +436,10 @@ class AnalyticsService:
             
             current_balance_cents = sum(account.balance_cents for account in current_accounts)
             
-            # Get transactions in the period
-            period_transactions = db.query(Transaction).filter(
-                Transaction.user_id == user_id,
-                Transaction.transaction_date.between(start_date, end_date)
-            ).all()
-            
-            # Calculate totals
-            total_income_cents = sum(tx.amount_cents for tx in period_transactions if tx.amount_cents > 0)
-            total_expenses_cents = sum(abs(tx.amount_cents) for tx in period_transactions if tx.amount_cents < 0)
+            # Period totals from the daily rollups
+            totals = transaction_rollup_service.get_totals(db, user_id, start_date, end_date)
+            total_income_cents = totals['income_cents']
+            total_expenses_cents = totals['expense_cents']
             
             # Calculate starting balance (current balance minus period net change)
             period_net_change = total_income_cents - total_expenses_cents
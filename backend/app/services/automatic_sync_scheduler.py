@@ -5,15 +5,20 @@ Handles scheduled synchronization of accounts and transactions
 
 import logging
 import asyncio
+import json
+import os
+import random
+import socket
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 from enum import Enum
-from cachetools import TTLCache
 
 from app.database import get_db
 from app.config import settings
+from app.core.redis_client import redis_client
 from app.models.account import Account
 from app.models.user import User
 from app.services import plaid_service
@@ -25,6 +30,61 @@ from app.websocket.events import WebSocketEvent, EventType
 
 logger = logging.getLogger(__name__)
 
+# Leases up to ARGV[2] jobs to consumer ARGV[4] until ARGV[3]: user-triggered jobs
+# first, then background jobs whose next run is due. Expired leases (their worker
+# died) are put back at the front of their queue before anything is leased.
+LEASE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local expired = redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)
+for _, job_id in ipairs(expired) do
+    redis.call('ZREM', KEYS[3], job_id)
+    redis.call('HDEL', KEYS[4], job_id)
+    if string.sub(job_id, 1, 10) == 'immediate_' then
+        redis.call('ZADD', KEYS[1], 0, job_id)
+    else
+        redis.call('ZADD', KEYS[2], now, job_id)
+    end
+end
+local leased = {}
+for i, key in ipairs({KEYS[1], KEYS[2]}) do
+    local remaining = limit - #leased
+    if remaining <= 0 then
+        break
+    end
+    local max_score = (i == 1) and '+inf' or ARGV[1]
+    local job_ids = redis.call('ZRANGEBYSCORE', key, '-inf', max_score, 'LIMIT', 0, remaining)
+    for _, job_id in ipairs(job_ids) do
+        redis.call('ZREM', key, job_id)
+        redis.call('ZADD', KEYS[3], ARGV[3], job_id)
+        redis.call('HSET', KEYS[4], job_id, ARGV[4])
+        table.insert(leased, job_id)
+    end
+end
+return leased
+"""
+
+# Releases job ARGV[1] if consumer ARGV[2] still holds its lease: stores the job
+# state ARGV[4] (or deletes it when empty) and reschedules it at ARGV[3] if given.
+# State is kept if the job was queued again in KEYS[5] while leased, since that
+# state belongs to the new request.
+COMPLETE_SCRIPT = """
+if redis.call('HGET', KEYS[2], ARGV[1]) ~= ARGV[2] then
+    return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('HDEL', KEYS[2], ARGV[1])
+if ARGV[4] ~= '' then
+    redis.call('HSET', KEYS[4], ARGV[1], ARGV[4])
+elseif not redis.call('ZSCORE', KEYS[5], ARGV[1]) then
+    redis.call('HDEL', KEYS[4], ARGV[1])
+end
+if ARGV[3] ~= '' then
+    redis.call('ZADD', KEYS[3], ARGV[3], ARGV[1])
+end
+return 1
+"""
+
 class SyncFrequency(Enum):
     HOURLY = "hourly"
     DAILY = "daily"
@@ -43,9 +103,44 @@ class SyncJob:
     enabled: bool
     retry_count: int
     max_retries: int = 3
+    priority: bool = False  # User-triggered; leased ahead of background jobs and not rescheduled
+    disabled_at: Optional[datetime] = None
+    
+    def to_json(self) -> str:
+        data = asdict(self)
+        data['frequency'] = self.frequency.value
+        for key in ('last_run', 'next_run', 'disabled_at'):
+            data[key] = data[key].isoformat() if data[key] else None
+        return json.dumps(data)
+    
+    @classmethod
+    def from_json(cls, payload: str) -> 'SyncJob':
+        data = json.loads(payload)
+        data['frequency'] = SyncFrequency(data['frequency'])
+        for key in ('last_run', 'next_run', 'disabled_at'):
+            data[key] = datetime.fromisoformat(data[key]) if data.get(key) else None
+        return cls(**data)
 
 class AutomaticSyncScheduler:
-    """Service for managing automatic account synchronization"""
+    """
+    Service for managing automatic account synchronization.
+    
+    Every replica runs a worker against shared Redis state. Background jobs sit
+    in a sorted set scored by next run time; user-triggered syncs sit in a second
+    sorted set that is always drained first. Workers lease due jobs atomically,
+    so each job runs on one replica only, and a lease held past
+    SYNC_SCHEDULER_LEASE_SECONDS (its worker died) is handed to another worker.
+    One replica per SYNC_SCHEDULER_RECONCILE_SECONDS registers accounts from the
+    database.
+    """
+    
+    SCHEDULE_KEY = "sync:schedule"
+    PRIORITY_KEY = "sync:priority"
+    LEASES_KEY = "sync:leases"
+    LEASE_OWNERS_KEY = "sync:lease-owners"
+    JOBS_KEY = "sync:jobs"
+    RECONCILE_LOCK_KEY = "sync:reconcile-lock"
+    IMMEDIATE_PREFIX = "immediate_"
     
     def __init__(self):
         self.plaid_service = plaid_service
@@ -61,16 +156,14 @@ class AutomaticSyncScheduler:
             SyncFrequency.MONTHLY: timedelta(days=30)
         }
         
-        # Active sync jobs with TTL cache to prevent memory leaks
-        self.sync_jobs: TTLCache[str, SyncJob] = TTLCache(
-            maxsize=settings.SYNC_JOBS_CACHE_MAX_SIZE,
-            ttl=settings.SYNC_JOBS_CACHE_TTL
-        )
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
         self.is_running = False
         self.scheduler_task = None
+        self._running_jobs: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
         
-        # Rate limiting
-        self.max_concurrent_syncs = 5
+        # Rate limiting (per replica)
+        self.max_concurrent_syncs = max(1, settings.SYNC_SCHEDULER_CONCURRENCY)
         self.sync_semaphore = asyncio.Semaphore(self.max_concurrent_syncs)
         
         # Metrics
@@ -78,6 +171,8 @@ class AutomaticSyncScheduler:
             'total_syncs': 0,
             'successful_syncs': 0,
             'failed_syncs': 0,
+            'jobs_leased': 0,
+            'leases_lost': 0,
             'last_scheduler_run': None,
             'next_scheduler_run': None
         }
@@ -88,12 +183,13 @@ class AutomaticSyncScheduler:
             logger.warning("Scheduler is already running")
             return
         
+        self._wakeup = asyncio.Event()
         self.is_running = True
         self.scheduler_task = asyncio.create_task(self._scheduler_loop())
-        logger.info("Automatic sync scheduler started")
+        logger.info(f"Automatic sync scheduler {self.consumer} started")
     
     async def stop_scheduler(self):
-        """Stop the automatic sync scheduler"""
+        """Stop leasing jobs; running jobs finish and release their leases"""
         self.is_running = False
         
         if self.scheduler_task:
@@ -103,6 +199,9 @@ class AutomaticSyncScheduler:
             except asyncio.CancelledError:
                 pass
         
+        if self._running_jobs:
+            await asyncio.gather(*self._running_jobs.values(), return_exceptions=True)
+        
         logger.info("Automatic sync scheduler stopped")
     
     async def _scheduler_loop(self):
@@ -110,71 +209,109 @@ class AutomaticSyncScheduler:
         while self.is_running:
             try:
                 self.sync_metrics['last_scheduler_run'] = datetime.now(timezone.utc)
+                self._wakeup.clear()
                 
-                # Load sync jobs from database
+                # Register accounts from the database (one replica per interval)
                 await self._load_sync_jobs()
                 
-                # Execute due jobs
-                await self._execute_due_jobs()
-                
-                # Cleanup completed jobs
-                await self._cleanup_jobs()
+                # Lease as many due jobs as this replica has free slots
+                free_slots = self.max_concurrent_syncs - len(self._running_jobs)
+                if free_slots > 0:
+                    for job in await self._lease_due_jobs(free_slots):
+                        self._start_job(job)
                 
-                # Update next run time
-                self.sync_metrics['next_scheduler_run'] = datetime.now(timezone.utc) + timedelta(minutes=15)
-                
-                # Sleep for 15 minutes
-                await asyncio.sleep(900)  # 15 minutes
+                # Sleep until the next poll, a freed slot or a locally queued immediate sync
+                self.sync_metrics['next_scheduler_run'] = datetime.now(timezone.utc) + timedelta(seconds=settings.SYNC_SCHEDULER_POLL_SECONDS)
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=settings.SYNC_SCHEDULER_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Scheduler loop error: {e}")
-                await asyncio.sleep(300)  # 5 minutes on error
+                await asyncio.sleep(settings.SYNC_SCHEDULER_POLL_SECONDS)
+    
+    def _start_job(self, job: SyncJob):
+        task = asyncio.create_task(self._run_leased_job(job))
+        self._running_jobs[job.job_id] = task
+        
+        def _finished(_task, job_id=job.job_id):
+            self._running_jobs.pop(job_id, None)
+            if self._wakeup:
+                self._wakeup.set()
+        
+        task.add_done_callback(_finished)
     
     async def _load_sync_jobs(self):
-        """Load sync jobs from database"""
+        """Register Plaid-connected accounts as jobs and drop jobs of removed accounts"""
+        conn = await redis_client.get_connection()
         try:
+            claimed = await conn.set(
+                self.RECONCILE_LOCK_KEY, self.consumer,
+                nx=True, ex=settings.SYNC_SCHEDULER_RECONCILE_SECONDS
+            )
+            if not claimed:
+                return
+            
             db = next(get_db())
+            try:
+                # Get all Plaid-connected accounts
+                accounts = db.query(Account).filter(
+                    Account.plaid_access_token_encrypted.isnot(None),
+                    Account.is_active == True
+                ).all()
+            finally:
+                db.close()
             
-            # Get all Plaid-connected accounts
-            accounts = db.query(Account).filter(
-                Account.plaid_access_token_encrypted.isnot(None),
-                Account.is_active == True
-            ).all()
+            stored = await conn.hgetall(self.JOBS_KEY)
+            now = datetime.now(timezone.utc)
+            reenable_cutoff = now - timedelta(days=7)
+            pipe = conn.pipeline(transaction=False)
+            account_job_ids = set()
+            registered = 0
             
             for account in accounts:
                 job_id = f"account_{account.id}"
-                
-                # Determine sync frequency
+                account_job_ids.add(job_id)
                 frequency = self._determine_account_sync_frequency(account)
+                job = SyncJob.from_json(stored[job_id]) if job_id in stored else None
                 
-                # Calculate next run time
-                if job_id in self.sync_jobs:
-                    # Update existing job
-                    job = self.sync_jobs[job_id]
-                    job.frequency = frequency
-                else:
-                    # Create new job
-                    next_run = self._calculate_next_run_time(account, frequency)
-                    
+                if job is None or (not job.enabled and job.disabled_at and job.disabled_at < reenable_cutoff):
+                    # New account, or a permanently failed job whose cool-off has passed
                     job = SyncJob(
                         job_id=job_id,
                         account_id=str(account.id),
                         user_id=str(account.user_id),
                         frequency=frequency,
                         last_run=account.last_sync_at,
-                        next_run=next_run,
+                        next_run=self._calculate_next_run_time(account, frequency),
                         enabled=True,
                         retry_count=0
                     )
-                    
-                    self.sync_jobs[job_id] = job
+                    pipe.hset(self.JOBS_KEY, job_id, job.to_json())
+                    pipe.zadd(self.SCHEDULE_KEY, {job_id: job.next_run.timestamp()}, nx=True)
+                    registered += 1
+                elif job.frequency != frequency:
+                    job.frequency = frequency
+                    pipe.hset(self.JOBS_KEY, job_id, job.to_json())
             
-            db.close()
+            stale = [
+                job_id for job_id in stored
+                if not job_id.startswith(self.IMMEDIATE_PREFIX) and job_id not in account_job_ids
+            ]
+            if stale:
+                pipe.hdel(self.JOBS_KEY, *stale)
+                pipe.zrem(self.SCHEDULE_KEY, *stale)
+            
+            await pipe.execute()
+            logger.info(f"Sync jobs reconciled: {registered} registered, {len(stale)} removed, {len(accounts)} accounts")
             
         except Exception as e:
             logger.error(f"Failed to load sync jobs: {e}")
+        finally:
+            await conn.close()
     
     def _determine_account_sync_frequency(self, account: Account) -> SyncFrequency:
         """Determine appropriate sync frequency for an account"""
@@ -203,44 +340,80 @@ class AutomaticSyncScheduler:
         """Calculate next run time for an account"""
         
         base_time = account.last_sync_at or datetime.now(timezone.utc)
-        interval = self.sync_intervals[frequency]
+        return self._next_run_after(base_time, frequency)
+    
+    def _next_run_after(self, base_time: datetime, frequency: SyncFrequency) -> datetime:
+        """One interval after base_time, with jitter to prevent thundering herd"""
         
-        # Add some jitter to prevent thundering herd
-        import random
-        jitter_minutes = random.randint(-30, 30)
-        jitter = timedelta(minutes=jitter_minutes)
+        interval = self.sync_intervals[frequency]
+        jitter_limit = min(settings.SYNC_SCHEDULER_JITTER_SECONDS, interval.total_seconds() / 4)
+        jitter = timedelta(seconds=random.uniform(-jitter_limit, jitter_limit))
         
         return base_time + interval + jitter
     
-    async def _execute_due_jobs(self):
-        """Execute all jobs that are due for execution"""
-        
-        now = datetime.now(timezone.utc)
-        due_jobs = [
-            job for job in self.sync_jobs.values()
-            if job.enabled and job.next_run <= now and job.retry_count < job.max_retries
-        ]
-        
-        if not due_jobs:
-            return
-        
-        logger.info(f"Executing {len(due_jobs)} due sync jobs")
-        
-        # Execute jobs with rate limiting
-        tasks = []
-        for job in due_jobs:
-            task = asyncio.create_task(self._execute_sync_job(job))
-            tasks.append(task)
+    async def _lease_due_jobs(self, limit: int) -> List[SyncJob]:
+        """Atomically lease up to limit due jobs, user-triggered ones first"""
         
-        # Wait for all jobs to complete
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        now = time.time()
+        conn = await redis_client.get_connection()
+        try:
+            job_ids = await conn.eval(
+                LEASE_SCRIPT, 4,
+                self.PRIORITY_KEY, self.SCHEDULE_KEY, self.LEASES_KEY, self.LEASE_OWNERS_KEY,
+                now, limit, now + settings.SYNC_SCHEDULER_LEASE_SECONDS, self.consumer
+            )
+            if not job_ids:
+                return []
+            payloads = await conn.hmget(self.JOBS_KEY, job_ids)
+        finally:
+            await conn.close()
+        
+        jobs = []
+        for job_id, payload in zip(job_ids, payloads):
+            if payload is None:
+                # Account was removed (or its immediate sync already ran) while queued
+                await self._complete_lease(job_id, None, None)
+                continue
+            jobs.append(SyncJob.from_json(payload))
+        
+        self.sync_metrics['jobs_leased'] += len(jobs)
+        if jobs:
+            logger.info(f"Leased {len(jobs)} sync jobs")
+        return jobs
+    
+    async def _complete_lease(self, job_id: str, job: Optional[SyncJob], next_run: Optional[datetime]) -> bool:
+        """Release a lease, storing the job's state (None deletes it) and its next run"""
         
-        # Process results
-        for job, result in zip(due_jobs, results):
-            if isinstance(result, Exception):
-                await self._handle_job_failure(job, str(result))
+        conn = await redis_client.get_connection()
+        try:
+            released = await conn.eval(
+                COMPLETE_SCRIPT, 5,
+                self.LEASES_KEY, self.LEASE_OWNERS_KEY, self.SCHEDULE_KEY, self.JOBS_KEY, self.PRIORITY_KEY,
+                job_id, self.consumer,
+                next_run.timestamp() if next_run else '',
+                job.to_json() if job else ''
+            )
+        finally:
+            await conn.close()
+        
+        if not released:
+            # Lease expired and another worker took the job over; its result wins
+            self.sync_metrics['leases_lost'] += 1
+            logger.warning(f"Lease on sync job {job_id} was lost before completion")
+        return bool(released)
+    
+    async def _run_leased_job(self, job: SyncJob):
+        """Execute a leased job and record its outcome"""
+        try:
+            try:
+                result = await self._execute_sync_job(job)
+            except Exception as e:
+                await self._handle_job_failure(job, str(e))
             else:
                 await self._handle_job_success(job, result)
+        except Exception as e:
+            # The lease expires and another worker retries the job
+            logger.error(f"Failed to record outcome of sync job {job.job_id}: {e}")
     
     async def _execute_sync_job(self, job: SyncJob) -> Dict[str, Any]:
         """Execute a single sync job"""
@@ -256,10 +429,17 @@ class AutomaticSyncScheduler:
                     db, [job.account_id], force_sync=False
                 )
                 
-                # Step 2: Sync transactions (last 7 days for regular sync)
-                transaction_result = await self.sync_service.sync_account_transactions(
-                    job.account_id, db, days=7
-                )
+                # Step 2: Sync transactions - cursor-based deltas for the whole item when
+                # available, falling back to the last 7 days for accounts without an item id
+                account = db.query(Account).filter(Account.id == job.account_id).first()
+                if account and account.plaid_item_id:
+                    transaction_result = await self.sync_service.sync_item_incremental(
+                        account.plaid_item_id, db
+                    )
+                else:
+                    transaction_result = await self.sync_service.sync_account_transactions(
+                        job.account_id, db, days=7
+                    )
                 
                 # Step 3: Perform reconciliation check
                 reconciliation_result = await self.reconciliation_service.reconcile_account(
@@ -298,7 +478,12 @@ class AutomaticSyncScheduler:
         
         job.last_run = datetime.now(timezone.utc)
         job.retry_count = 0
-        job.next_run = job.last_run + self.sync_intervals[job.frequency]
+        
+        if job.priority:
+            await self._complete_lease(job.job_id, None, None)
+        else:
+            job.next_run = self._next_run_after(job.last_run, job.frequency)
+            await self._complete_lease(job.job_id, job, job.next_run)
         
         # Send success notification
         await self._send_sync_notification(job, result, success=True)
@@ -308,11 +493,19 @@ class AutomaticSyncScheduler:
     async def _handle_job_failure(self, job: SyncJob, error: str):
         """Handle failed job execution"""
         
+        if job.priority:
+            # User-triggered syncs are not retried; the account's own job still runs
+            await self._complete_lease(job.job_id, None, None)
+            await self._send_sync_notification(job, {'error': error}, success=False)
+            return
+        
         job.retry_count += 1
         
         if job.retry_count >= job.max_retries:
             # Mark job as failed and disable
             job.enabled = False
+            job.disabled_at = datetime.now(timezone.utc)
+            await self._complete_lease(job.job_id, job, None)
             logger.error(f"Sync job permanently failed for account {job.account_id} after {job.max_retries} attempts")
             
             # Send failure notification
@@ -333,8 +526,9 @@ class AutomaticSyncScheduler:
                 pass
         else:
             # Schedule retry with exponential backoff
-            backoff_minutes = 2 ** job.retry_count * 30  # 30, 60, 120 minutes
+            backoff_minutes = 2 ** job.retry_count * 30  # 60, 120 minutes
             job.next_run = datetime.now(timezone.utc) + timedelta(minutes=backoff_minutes)
+            await self._complete_lease(job.job_id, job, job.next_run)
             
             logger.warning(f"Sync job failed for account {job.account_id}, retrying in {backoff_minutes} minutes")
     
@@ -406,39 +600,45 @@ class AutomaticSyncScheduler:
         except Exception as e:
             logger.error(f"Failed to send sync notification: {e}")
     
-    async def _cleanup_jobs(self):
-        """Clean up old or disabled jobs"""
-        
-        now = datetime.now(timezone.utc)
-        cleanup_cutoff = now - timedelta(days=7)  # Remove jobs older than 7 days
-        
-        jobs_to_remove = []
-        
-        for job_id, job in self.sync_jobs.items():
-            # Remove permanently failed jobs after 7 days
-            if not job.enabled and job.last_run and job.last_run < cleanup_cutoff:
-                jobs_to_remove.append(job_id)
-        
-        for job_id in jobs_to_remove:
-            del self.sync_jobs[job_id]
-            logger.info(f"Cleaned up old sync job: {job_id}")
-    
-    def get_scheduler_status(self) -> Dict[str, Any]:
-        """Get current scheduler status"""
-        
-        active_jobs = len([job for job in self.sync_jobs.values() if job.enabled])
-        failed_jobs = len([job for job in self.sync_jobs.values() if not job.enabled])
+    async def get_scheduler_status(self) -> Dict[str, Any]:
+        """Get queue depth, lag and upcoming jobs across all replicas"""
         
-        next_jobs = sorted(
-            [job for job in self.sync_jobs.values() if job.enabled],
-            key=lambda j: j.next_run
-        )[:5]  # Next 5 jobs
+        now = time.time()
+        conn = await redis_client.get_connection()
+        try:
+            pipe = conn.pipeline(transaction=False)
+            pipe.hlen(self.JOBS_KEY)
+            pipe.zcard(self.SCHEDULE_KEY)
+            pipe.zcount(self.SCHEDULE_KEY, '-inf', now)
+            pipe.zrange(self.SCHEDULE_KEY, 0, 0, withscores=True)
+            pipe.zcard(self.PRIORITY_KEY)
+            pipe.zrange(self.PRIORITY_KEY, 0, 0, withscores=True)
+            pipe.zcard(self.LEASES_KEY)
+            pipe.zrangebyscore(self.SCHEDULE_KEY, now, '+inf', start=0, num=5)
+            (total_jobs, scheduled, due, oldest_scheduled, priority_depth,
+             oldest_priority, leased, next_job_ids) = await pipe.execute()
+            next_payloads = await conn.hmget(self.JOBS_KEY, next_job_ids) if next_job_ids else []
+        finally:
+            await conn.close()
+        
+        # How far behind schedule the oldest waiting job is
+        background_lag = max(0.0, now - oldest_scheduled[0][1]) if oldest_scheduled and due else 0.0
+        priority_lag = max(0.0, now - oldest_priority[0][1]) if oldest_priority else 0.0
+        next_jobs = [SyncJob.from_json(payload) for payload in next_payloads if payload]
         
         return {
             'is_running': self.is_running,
-            'total_jobs': len(self.sync_jobs),
-            'active_jobs': active_jobs,
-            'failed_jobs': failed_jobs,
+            'consumer': self.consumer,
+            'total_jobs': total_jobs,
+            'running_jobs': len(self._running_jobs),
+            'queue': {
+                'scheduled': scheduled,
+                'due': due,
+                'priority': priority_depth,
+                'leased': leased,
+                'background_lag_seconds': round(background_lag, 3),
+                'priority_lag_seconds': round(priority_lag, 3)
+            },
             'metrics': self.sync_metrics,
             'next_jobs': [
                 {
@@ -453,22 +653,51 @@ class AutomaticSyncScheduler:
         }
     
     async def schedule_immediate_sync(self, account_id: str, user_id: str) -> Dict[str, Any]:
-        """Schedule an immediate sync for an account"""
-        
-        job_id = f"immediate_{account_id}_{int(datetime.now().timestamp())}"
+        """Queue a sync for an account ahead of all background jobs"""
         
         job = SyncJob(
-            job_id=job_id,
+            job_id=f"{self.IMMEDIATE_PREFIX}{account_id}",
             account_id=account_id,
             user_id=user_id,
             frequency=SyncFrequency.DAILY,  # Default frequency
             last_run=None,
             next_run=datetime.now(timezone.utc),
             enabled=True,
-            retry_count=0
+            retry_count=0,
+            priority=True
         )
         
-        # Execute immediately
+        if not settings.SYNC_SCHEDULER_ENABLED:
+            return await self._run_immediate_sync(job)
+        
+        try:
+            conn = await redis_client.get_connection()
+            try:
+                # Repeated requests for the same account share one queue entry
+                pipe = conn.pipeline(transaction=True)
+                pipe.hset(self.JOBS_KEY, job.job_id, job.to_json())
+                pipe.zadd(self.PRIORITY_KEY, {job.job_id: time.time()}, nx=True)
+                pipe.zrank(self.PRIORITY_KEY, job.job_id)
+                _, _, position = await pipe.execute()
+            finally:
+                await conn.close()
+        except Exception as e:
+            logger.warning(f"Sync queue unavailable, running immediate sync inline: {e}")
+            return await self._run_immediate_sync(job)
+        
+        if self._wakeup:
+            self._wakeup.set()
+        return {
+            'success': True,
+            'message': 'Immediate sync queued',
+            'result': {
+                'job_id': job.job_id,
+                'queue_position': position
+            }
+        }
+    
+    async def _run_immediate_sync(self, job: SyncJob) -> Dict[str, Any]:
+        """Execute a user-triggered sync in the request (no scheduler queue)"""
         try:
             result = await self._execute_sync_job(job)
             return {
@@ -514,38 +743,30 @@ class AutomaticSyncScheduler:
         db.add(account)
         db.commit()
         
-        # Update existing job
+        # Reschedule the existing job; a job that is running keeps its lease and
+        # picks the new frequency up at the next reconcile
         job_id = f"account_{account_id}"
-        if job_id in self.sync_jobs:
-            job = self.sync_jobs[job_id]
-            job.frequency = sync_frequency
-            job.next_run = self._calculate_next_run_time(account, sync_frequency)
+        try:
+            conn = await redis_client.get_connection()
+            try:
+                stored = await conn.hget(self.JOBS_KEY, job_id)
+                if stored:
+                    job = SyncJob.from_json(stored)
+                    job.frequency = sync_frequency
+                    job.next_run = self._calculate_next_run_time(account, sync_frequency)
+                    pipe = conn.pipeline(transaction=True)
+                    pipe.hset(self.JOBS_KEY, job_id, job.to_json())
+                    pipe.zadd(self.SCHEDULE_KEY, {job_id: job.next_run.timestamp()}, xx=True)
+                    await pipe.execute()
+            finally:
+                await conn.close()
+        except Exception as e:
+            logger.warning(f"Failed to reschedule sync job {job_id}: {e}")
         
         return {
             'success': True,
             'message': f'Sync frequency updated to {frequency}'
         }
-    
-    def clear_sync_jobs_cache(self) -> Dict[str, Any]:
-        """Clear the sync jobs cache"""
-        jobs_cleared = len(self.sync_jobs)
-        self.sync_jobs.clear()
-        logger.info(f"Cleared {jobs_cleared} sync jobs from cache")
-        return {
-            'success': True,
-            'jobs_cleared': jobs_cleared,
-            'message': f'Cleared {jobs_cleared} sync jobs from cache'
-        }
-    
-    def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics for monitoring"""
-        return {
-            'cache_size': len(self.sync_jobs),
-            'cache_max_size': self.sync_jobs.maxsize,
-            'cache_ttl_seconds': self.sync_jobs.ttl,
-            'active_jobs': len([job for job in self.sync_jobs.values() if job.enabled]),
-            'failed_jobs': len([job for job in self.sync_jobs.values() if not job.enabled])
-        }
 
 # Global scheduler instance
-automatic_sync_scheduler = AutomaticSyncScheduler()
\ No newline at end of file
+automatic_sync_scheduler = AutomaticSyncScheduler()
@@ -0,0 +1,215 @@
+"""
+Balance History Service
+Reconstructs account balance series from daily rollups and persisted snapshots
+"""
+
+import logging
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.account import Account
+from app.models.account_balance_history import AccountBalanceHistory
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+
+logger = logging.getLogger(__name__)
+
+
+class BalanceHistoryService:
+    """
+    Builds balance-over-time series in a single pass.
+
+    Balances are anchored on each account's current balance and walked backwards
+    through per-day net deltas from transaction_daily_rollups. Where an
+    account_balance_history snapshot exists for a day the walk is re-anchored to
+    it, so stored history wins over reconstruction.
+    """
+
+    GRANULARITIES = ('daily', 'weekly', 'monthly')
+
+    def record_snapshot(
+        self,
+        db: Session,
+        account: Account,
+        available_balance_cents: Optional[int] = None,
+        source: str = 'plaid',
+        snapshot_date: Optional[date] = None
+    ) -> Optional[AccountBalanceHistory]:
+        """Upsert today's balance snapshot for an account. Does not commit."""
+        if not settings.ENABLE_BALANCE_SNAPSHOTS:
+            return None
+
+        snapshot_date = snapshot_date or datetime.now(timezone.utc).date()
+        snapshot = db.query(AccountBalanceHistory).filter(
+            AccountBalanceHistory.account_id == account.id,
+            AccountBalanceHistory.snapshot_date == snapshot_date
+        ).first()
+
+        if not snapshot:
+            snapshot = AccountBalanceHistory(
+                user_id=account.user_id,
+                account_id=account.id,
+                snapshot_date=snapshot_date
+            )
+
+        snapshot.balance_cents = account.balance_cents or 0
+        snapshot.available_balance_cents = available_balance_cents
+        snapshot.source = source
+        db.add(snapshot)
+        return snapshot
+
+    def sample_dates(self, start_date: date, end_date: date, granularity: str) -> List[date]:
+        """Data point dates (oldest first); every series ends on end_date"""
+        if granularity not in self.GRANULARITIES:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        if start_date > end_date:
+            return []
+
+        if granularity == 'daily':
+            return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+        if granularity == 'weekly':
+            points = []
+            current = end_date
+            while current >= start_date:
+                points.append(current)
+                current -= timedelta(days=7)
+            return list(reversed(points))
+
+        # Monthly: last day of each month in range, plus end_date itself
+        points = []
+        year, month = start_date.year, start_date.month
+        while (year, month) < (end_date.year, end_date.month):
+            month_end = date(year, month, calendar.monthrange(year, month)[1])
+            if month_end >= start_date:
+                points.append(month_end)
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        points.append(end_date)
+        return points
+
+    def get_balance_series(
+        self,
+        db: Session,
+        user_id: UUID,
+        start_date: date,
+        end_date: date,
+        granularity: str = 'weekly',
+        account_ids: Optional[List[UUID]] = None,
+        include_accounts: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Total (and optionally per-account) balance at each sample date"""
+        samples = self.sample_dates(start_date, end_date, granularity)
+        if not samples:
+            return []
+
+        account_query = db.query(Account).filter(
+            Account.user_id == user_id,
+            Account.is_active == True
+        )
+        if account_ids:
+            account_query = account_query.filter(Account.id.in_(account_ids))
+        accounts = account_query.all()
+        if not accounts:
+            return []
+
+        ids = [account.id for account in accounts]
+        first_sample = samples[0]
+        today = datetime.now(timezone.utc).date()
+
+        # Net change per account per day after the first sample (one grouped query)
+        delta_rows = db.query(
+            TransactionDailyRollup.account_id,
+            TransactionDailyRollup.rollup_date,
+            func.sum(TransactionDailyRollup.income_cents - TransactionDailyRollup.expense_cents)
+        ).filter(
+            TransactionDailyRollup.user_id == user_id,
+            TransactionDailyRollup.account_id.in_(ids),
+            TransactionDailyRollup.rollup_date > first_sample
+        ).group_by(
+            TransactionDailyRollup.account_id,
+            TransactionDailyRollup.rollup_date
+        ).all()
+
+        deltas: Dict[UUID, Dict[date, int]] = defaultdict(dict)
+        for account_id, day, delta in delta_rows:
+            deltas[account_id][day] = int(delta or 0)
+
+        # Persisted end-of-day snapshots re-anchor the walk (today uses the live balance)
+        snapshots: Dict[UUID, Dict[date, int]] = defaultdict(dict)
+        for account_id, day, balance in db.query(
+            AccountBalanceHistory.account_id,
+            AccountBalanceHistory.snapshot_date,
+            AccountBalanceHistory.balance_cents
+        ).filter(
+            AccountBalanceHistory.user_id == user_id,
+            AccountBalanceHistory.account_id.in_(ids),
+            AccountBalanceHistory.snapshot_date >= first_sample,
+            AccountBalanceHistory.snapshot_date < today
+        ).all():
+            snapshots[account_id][day] = balance
+
+        per_account: Dict[UUID, Dict[date, int]] = {}
+        for account in accounts:
+            per_account[account.id] = self._walk_back(
+                account.balance_cents or 0,
+                deltas.get(account.id, {}),
+                snapshots.get(account.id, {}),
+                samples
+            )
+
+        series = []
+        for sample in samples:
+            total = sum(balances[sample] for balances in per_account.values())
+            point = {
+                "date": sample.isoformat(),
+                "net_worth_cents": int(total),
+                "net_worth": total / 100
+            }
+            if include_accounts:
+                point["accounts"] = [
+                    {
+                        "account_id": str(account.id),
+                        "account_name": account.name,
+                        "balance_cents": per_account[account.id][sample],
+                        "balance": per_account[account.id][sample] / 100
+                    }
+                    for account in accounts
+                ]
+            series.append(point)
+
+        return series
+
+    def _walk_back(
+        self,
+        current_balance: int,
+        deltas: Dict[date, int],
+        snapshots: Dict[date, int],
+        samples: List[date]
+    ) -> Dict[date, int]:
+        """End-of-day balance at each sample, walking backwards from the current balance"""
+        days = sorted(set(deltas) | set(snapshots), reverse=True)
+        balances: Dict[date, int] = {}
+        running = current_balance
+        i = 0
+
+        for sample in reversed(samples):
+            # Undo every day after the sample; a snapshot resets the balance at its end-of-day
+            while i < len(days) and days[i] > sample:
+                day = days[i]
+                if day in snapshots:
+                    running = snapshots[day]
+                running -= deltas.get(day, 0)
+                i += 1
+            balances[sample] = snapshots.get(sample, running)
+
+        return balances
+
+
+# Create singleton instance
+balance_history_service = BalanceHistoryService()
@@ -12,9 +12,16 @@ from ..models.insight import Insight
 from ..schemas.budget import (
     BudgetCreate, BudgetUpdate, BudgetResponse, BudgetUsage, 
     BudgetAlert, BudgetSummary, BudgetProgress, BudgetFilter,
-    BudgetPeriod, BudgetCalendarDay, BudgetCalendarResponse
+    BudgetPeriod, BudgetCalendarDay, BudgetCalendarResponse, BudgetCalendarOverviewResponse
 )
 from .notification_service import NotificationService
+from .budget_usage_service import budget_usage_service
+
+
+# Budget fields that change what a usage counter holds or which alerts it has sent
+USAGE_COUNTER_FIELDS = frozenset({
+    'category_id', 'amount_cents', 'period', 'start_date', 'end_date', 'alert_threshold', 'is_active'
+})
 
 
 class BudgetService:
@@ -152,6 +159,10 @@ class BudgetService:
         for field, value in update_data.items():
             setattr(budget, field, value)
         
+        # Counters are reseeded (and alerts re-evaluated) on the next transaction event
+        if USAGE_COUNTER_FIELDS.intersection(update_data):
+            budget_usage_service.invalidate(db, budget.id)
+        
         budget.updated_at = datetime.utcnow()
         db.commit()
         db.refresh(budget)
@@ -297,10 +308,16 @@ class BudgetService:
                 budget_periods[period_key] = []
             budget_periods[period_key].append(result)
         
-        # Now get spending data for each period group in batch queries
-        spending_by_budget = {}
+        # Budgets with a usage counter for this period are a lookup; only the rest are aggregated
+        spending_by_budget = budget_usage_service.get_spent(
+            db, {budget_id: metadata['period_start'] for budget_id, metadata in budget_metadata.items()}
+        )
         
         for (period_start, period_end), budgets_in_period in budget_periods.items():
+            budgets_in_period = [b for b in budgets_in_period if b.id not in spending_by_budget]
+            if not budgets_in_period:
+                continue
+            
             # Get spending for all budgets in this period with a single query
             budget_ids = [b.id for b in budgets_in_period]
             category_ids = [b.category_id for b in budgets_in_period if b.category_id]
@@ -532,13 +549,16 @@ class BudgetService:
     @staticmethod
     def _get_period_boundaries(budget: Budget, current_date: date) -> Tuple[date, date]:
         """Calculate period start and end dates based on budget period"""
-        if budget.period == BudgetPeriod.WEEKLY:
+        # Loaded budgets carry the model enum, which never equals the schema's str enum
+        period = getattr(budget.period, 'value', budget.period)
+        
+        if period == BudgetPeriod.WEEKLY:
             # Start of current week (Monday)
             days_since_monday = current_date.weekday()
             period_start = current_date - timedelta(days=days_since_monday)
             period_end = period_start + timedelta(days=6)
             
-        elif budget.period == BudgetPeriod.MONTHLY:
+        elif period == BudgetPeriod.MONTHLY:
             # Start of current month
             period_start = current_date.replace(day=1)
             if current_date.month == 12:
@@ -547,7 +567,7 @@ class BudgetService:
                 next_month = current_date.replace(month=current_date.month + 1, day=1)
             period_end = next_month - timedelta(days=1)
             
-        elif budget.period == BudgetPeriod.QUARTERLY:
+        elif period == BudgetPeriod.QUARTERLY:
             # Start of current quarter
             quarter_start_month = ((current_date.month - 1) // 3) * 3 + 1
             period_start = current_date.replace(month=quarter_start_month, day=1)
@@ -675,46 +695,133 @@ class BudgetService:
         if not budget:
             return None
         
+        month_start, month_end = BudgetService._parse_month(month)
+        daily_totals = BudgetService._get_daily_expense_totals(db, user_id, month_start, month_end)
+        
+        return BudgetService._build_calendar(budget, month, daily_totals)
+    
+    @staticmethod
+    def get_budgets_calendar(
+        db: Session,
+        user_id: uuid.UUID,
+        months: int = 1,
+        end_month: Optional[str] = None  # YYYY-MM format, defaults to the current month
+    ) -> BudgetCalendarOverviewResponse:
+        """Calendars for every active budget over the `months` months ending at end_month"""
+        if months < 1:
+            raise ValueError("months must be at least 1")
+        
+        last_month_start, last_month_end = BudgetService._parse_month(
+            end_month or date.today().strftime("%Y-%m")
+        )
+        
+        month_labels = []
+        year, month_num = last_month_start.year, last_month_start.month
+        for _ in range(months):
+            month_labels.append(f"{year:04d}-{month_num:02d}")
+            year, month_num = (year - 1, 12) if month_num == 1 else (year, month_num - 1)
+        month_labels.reverse()
+        
+        budgets = db.query(Budget).filter(
+            Budget.user_id == user_id,
+            Budget.is_active == True
+        ).order_by(Budget.name).all()
+        
+        calendars = []
+        if budgets:
+            # One grouped query covers every budget and every month
+            range_start, _ = BudgetService._parse_month(month_labels[0])
+            daily_totals = BudgetService._get_daily_expense_totals(db, user_id, range_start, last_month_end)
+            calendars = [
+                BudgetService._build_calendar(budget, month_label, daily_totals)
+                for budget in budgets
+                for month_label in month_labels
+            ]
+        
+        return BudgetCalendarOverviewResponse(months=month_labels, calendars=calendars)
+    
+    @staticmethod
+    def _parse_month(month: str) -> Tuple[date, date]:
+        """First and last day of a YYYY-MM month"""
         try:
-            # Parse month
             year, month_num = map(int, month.split('-'))
             month_start = date(year, month_num, 1)
-            
-            # Calculate month end
-            if month_num == 12:
-                month_end = date(year + 1, 1, 1) - timedelta(days=1)
-            else:
-                month_end = date(year, month_num + 1, 1) - timedelta(days=1)
-            
-        except (ValueError, IndexError):
+        except (ValueError, IndexError, TypeError):
             raise ValueError("Invalid month format. Use YYYY-MM")
         
+        if month_num == 12:
+            month_end = date(year + 1, 1, 1) - timedelta(days=1)
+        else:
+            month_end = date(year, month_num + 1, 1) - timedelta(days=1)
+        return month_start, month_end
+    
+    @staticmethod
+    def _get_daily_expense_totals(
+        db: Session,
+        user_id: uuid.UUID,
+        start_date: date,
+        end_date: date
+    ) -> Dict[Tuple[date, Optional[uuid.UUID]], Tuple[int, int]]:
+        """
+        Expense spend and transaction count per (day, category) in a single
+        grouped query; callers filter by category in memory.
+        """
+        rows = db.query(
+            Transaction.transaction_date,
+            Transaction.category_id,
+            func.coalesce(func.sum(func.abs(Transaction.amount_cents)), 0).label('spent_cents'),
+            func.count(Transaction.id).label('transaction_count')
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date >= start_date,
+            Transaction.transaction_date <= end_date,
+            Transaction.amount_cents < 0  # Only expenses
+        ).group_by(
+            Transaction.transaction_date,
+            Transaction.category_id
+        ).all()
+        
+        return {
+            (row.transaction_date, row.category_id): (int(row.spent_cents), int(row.transaction_count))
+            for row in rows
+        }
+    
+    @staticmethod
+    def _build_calendar(
+        budget: Budget,
+        month: str,
+        daily_totals: Dict[Tuple[date, Optional[uuid.UUID]], Tuple[int, int]]
+    ) -> BudgetCalendarResponse:
+        """Assemble one budget's month from pre-aggregated daily totals"""
+        month_start, month_end = BudgetService._parse_month(month)
+        
         # Get budget period boundaries that overlap with requested month
         budget_period_start, budget_period_end = BudgetService._get_period_boundaries(budget, month_start)
         
-        # Calculate daily spending limit
+        # Calculate daily spending limit (months before the budget starts have no period)
         total_days_in_period = (budget_period_end - budget_period_start).days + 1
-        daily_limit_cents = budget.amount_cents // total_days_in_period
+        daily_limit_cents = budget.amount_cents // total_days_in_period if total_days_in_period > 0 else 0
+        
+        # Collapse categories into per-day totals for this budget
+        spending_by_day: Dict[date, List[int]] = {}
+        for (day, category_id), (spent_cents, transaction_count) in daily_totals.items():
+            if not (month_start <= day <= month_end):
+                continue
+            if budget.category_id and category_id != budget.category_id:
+                continue
+            day_totals = spending_by_day.setdefault(day, [0, 0])
+            day_totals[0] += spent_cents
+            day_totals[1] += transaction_count
         
-        # Get daily spending data for the month
         daily_data = []
         current_date = month_start
         
         while current_date <= month_end:
             # Check if this date is within the budget period
             if budget_period_start <= current_date <= budget_period_end:
-                # Get spending for this day
-                day_spending = BudgetService._get_daily_spending(
-                    db, budget, current_date
-                )
-                
+                day_spending, transaction_count = spending_by_day.get(current_date, (0, 0))
                 percentage_used = (day_spending / daily_limit_cents * 100) if daily_limit_cents > 0 else 0
                 
-                # Get transaction count for this day
-                transaction_count = BudgetService._get_daily_transaction_count(
-                    db, budget, current_date
-                )
-                
                 daily_data.append(BudgetCalendarDay(
                     date=current_date,
                     daily_spending_limit_cents=daily_limit_cents,
@@ -762,43 +869,3 @@ class BudgetService:
             daily_data=daily_data,
             summary=summary
         )
-    
-    @staticmethod
-    def _get_daily_spending(
-        db: Session, 
-        budget: Budget, 
-        target_date: date
-    ) -> int:
-        """Get total spending for a specific day"""
-        query = db.query(func.coalesce(func.sum(func.abs(Transaction.amount_cents)), 0))
-        query = query.filter(
-            Transaction.user_id == budget.user_id,
-            Transaction.transaction_date == target_date,
-            Transaction.amount_cents < 0  # Only expenses
-        )
-        
-        # Filter by category if budget is category-specific
-        if budget.category_id:
-            query = query.filter(Transaction.category_id == budget.category_id)
-        
-        return query.scalar() or 0
-    
-    @staticmethod
-    def _get_daily_transaction_count(
-        db: Session, 
-        budget: Budget, 
-        target_date: date
-    ) -> int:
-        """Get transaction count for a specific day"""
-        query = db.query(func.count(Transaction.id))
-        query = query.filter(
-            Transaction.user_id == budget.user_id,
-            Transaction.transaction_date == target_date,
-            Transaction.amount_cents < 0  # Only expenses
-        )
-        
-        # Filter by category if budget is category-specific
-        if budget.category_id:
-            query = query.filter(Transaction.category_id == budget.category_id)
-        
-        return query.scalar() or 0
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Budget Usage Service
+Keeps per-budget, per-period spend counters current and fires threshold alerts
+"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import event, text, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.budget import Budget
+from app.models.budget_usage_counter import BudgetUsageCounter
+from app.services.transaction_rollup_service import transaction_rollup_service, ALL_CATEGORIES
+
+logger = logging.getLogger(__name__)
+
+
+class BudgetUsageService:
+    """
+    Maintains budget_usage_counters from transaction events.
+
+    It rides on the transaction rollups: whenever a commit refreshes a user's
+    dirty days, every active budget whose current period covers one of those
+    days has its counter recomputed from the (already refreshed) rollups in
+    the same database transaction. That covers ORM writes, bulk imports and
+    Plaid syncs alike. Budget reads then look counters up instead of
+    aggregating `transactions`.
+
+    When a counter moves up past the budget's alert_threshold or past 100%, an
+    alert is queued on the session and sent once the commit succeeds, through
+    NotificationService and WebSocketEvents.emit_budget_alert.
+    """
+
+    ALERTS_KEY = "budget_usage_pending_alerts"
+
+    def __init__(self):
+        self._listeners_installed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()  # The loop only keeps weak references to tasks
+
+    # ------------------------------------------------------------------
+    # Counters
+    # ------------------------------------------------------------------
+
+    def refresh_for_days(self, db: Session, dirty: Dict[UUID, Set[date]], current_date: Optional[date] = None) -> int:
+        """Recompute counters for budgets whose current period contains a dirty day"""
+        from app.services.budget_service import BudgetService
+
+        current_date = current_date or date.today()
+        refreshed = 0
+
+        for user_id, days in dirty.items():
+            if not days:
+                continue
+            budgets = db.query(Budget).filter(
+                Budget.user_id == user_id,
+                Budget.is_active == True
+            ).all()
+
+            for budget in budgets:
+                if current_date < budget.start_date:
+                    continue
+                period_start, period_end = BudgetService._get_period_boundaries(budget, current_date)
+                if any(period_start <= day <= period_end for day in days):
+                    self.refresh_budget(db, budget, current_date)
+                    refreshed += 1
+
+        if refreshed:
+            logger.debug(f"Refreshed {refreshed} budget usage counters for {len(dirty)} users")
+        return refreshed
+
+    def refresh_budget(
+        self,
+        db: Session,
+        budget: Budget,
+        current_date: Optional[date] = None,
+        notify: bool = True
+    ) -> Optional[BudgetUsageCounter]:
+        """Recompute one budget's current-period counter; queue an alert if it crossed a threshold"""
+        from app.services.budget_service import BudgetService
+
+        current_date = current_date or date.today()
+        if current_date < budget.start_date or not budget.is_active:
+            return None
+
+        period_start, period_end = BudgetService._get_period_boundaries(budget, current_date)
+        totals = transaction_rollup_service.get_totals(
+            db, budget.user_id, period_start, period_end,
+            budget.category_id if budget.category_id else ALL_CATEGORIES
+        )
+
+        counter = db.query(BudgetUsageCounter).filter(
+            BudgetUsageCounter.budget_id == budget.id,
+            BudgetUsageCounter.period_start == period_start
+        ).first()
+        if counter is None:
+            counter = BudgetUsageCounter(
+                user_id=budget.user_id,
+                budget_id=budget.id,
+                period_start=period_start,
+                alert_level=BudgetUsageCounter.ALERT_NONE
+            )
+            db.add(counter)
+
+        counter.period_end = period_end
+        counter.spent_cents = totals['expense_cents']
+        counter.transaction_count = totals['expense_count']
+
+        level = self.alert_level(budget, counter.spent_cents)
+        previous_level = counter.alert_level or BudgetUsageCounter.ALERT_NONE
+        if notify and level > previous_level:
+            self._queue_alert(db, budget, counter, level)
+        # Falling back below a threshold (refunds, deletes) re-arms it
+        counter.alert_level = level
+        return counter
+
+    def alert_level(self, budget: Budget, spent_cents: int) -> int:
+        """ALERT_* level for spend against a budget"""
+        if budget.amount_cents <= 0:
+            return BudgetUsageCounter.ALERT_NONE
+        ratio = spent_cents / budget.amount_cents
+        if ratio > 1:
+            return BudgetUsageCounter.ALERT_EXCEEDED
+        threshold = budget.alert_threshold if budget.alert_threshold is not None else 0.8
+        if ratio >= threshold:
+            return BudgetUsageCounter.ALERT_THRESHOLD
+        return BudgetUsageCounter.ALERT_NONE
+
+    def get_spent(self, db: Session, periods: Dict[UUID, date]) -> Dict[UUID, int]:
+        """Spent cents for {budget_id: period_start}; budgets without a counter are omitted"""
+        if not periods:
+            return {}
+        rows = db.query(BudgetUsageCounter.budget_id, BudgetUsageCounter.spent_cents).filter(
+            tuple_(BudgetUsageCounter.budget_id, BudgetUsageCounter.period_start).in_(list(periods.items()))
+        ).all()
+        return {budget_id: int(spent_cents) for budget_id, spent_cents in rows}
+
+    def invalidate(self, db: Session, budget_id: UUID) -> None:
+        """Drop a budget's counters after an edit that changes what they measure"""
+        db.query(BudgetUsageCounter).filter(
+            BudgetUsageCounter.budget_id == budget_id
+        ).delete(synchronize_session=False)
+
+    # ------------------------------------------------------------------
+    # Alerts
+    # ------------------------------------------------------------------
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Event loop that alerts committed from worker threads (sync routes) are sent on"""
+        self._loop = loop
+
+    def install_listeners(self) -> None:
+        """Hook counter refreshes into rollup maintenance and alert delivery into commits"""
+        if self._listeners_installed:
+            return
+        transaction_rollup_service.add_refresh_listener(self.refresh_for_days)
+        event.listen(Session, "after_commit", self._after_commit)
+        event.listen(Session, "after_soft_rollback", self._discard_alerts)
+        self._listeners_installed = True
+
+    def _queue_alert(self, db: Session, budget: Budget, counter: BudgetUsageCounter, level: int) -> None:
+        alerts: List[Dict[str, Any]] = db.info.setdefault(self.ALERTS_KEY, [])
+        alerts.append({
+            'user_id': budget.user_id,
+            'budget_id': budget.id,
+            'budget_name': budget.name,
+            'category_name': budget.category.name if budget.category_id and budget.category else None,
+            'amount_cents': budget.amount_cents,
+            'spent_cents': counter.spent_cents,
+            'period': budget.period.value if hasattr(budget.period, 'value') else budget.period,
+            'alert_threshold': budget.alert_threshold,
+            'alert_type': "exceeded" if level == BudgetUsageCounter.ALERT_EXCEEDED else "threshold",
+        })
+
+    def _after_commit(self, session: Session) -> None:
+        alerts = session.info.pop(self.ALERTS_KEY, None)
+        if alerts:
+            self._schedule(self.send_alerts(alerts))
+
+    def _discard_alerts(self, session: Session, previous_transaction) -> None:
+        session.info.pop(self.ALERTS_KEY, None)
+
+    def _schedule(self, coro) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            self._spawn(coro)
+            return
+
+        loop = self._loop
+        if loop is not None and loop.is_running():
+            # Committed from a worker thread (sync route); hand over to the app loop
+            loop.call_soon_threadsafe(self._spawn, coro)
+            return
+
+        coro.close()
+        logger.warning("Budget alerts dropped: no running event loop to deliver them on")
+
+    def _spawn(self, coro) -> None:
+        """Start coro on the running loop, holding the task until it finishes"""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def send_alerts(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Persist a notification and push a websocket budget alert for each crossing"""
+        from app.database import SessionLocal
+        from app.services.notification_service import NotificationService
+        from app.websocket.events import WebSocketEvents
+
+        for alert in alerts:
+            percentage_used = round(alert['spent_cents'] / alert['amount_cents'] * 100, 2)
+            db = SessionLocal()
+            try:
+                if db.get_bind().dialect.name == "postgresql":
+                    db.execute(text("SET LOCAL app.current_user_id = :user_id"), {"user_id": str(alert['user_id'])})
+                await NotificationService.create_budget_alert(
+                    db=db,
+                    user_id=alert['user_id'],
+                    budget_name=alert['budget_name'],
+                    current_amount_cents=alert['spent_cents'],
+                    budget_limit_cents=alert['amount_cents'],
+                    percentage_used=percentage_used,
+                    budget_id=alert['budget_id']
+                )
+                await WebSocketEvents.emit_budget_alert(
+                    str(alert['user_id']),
+                    {
+                        'id': str(alert['budget_id']),
+                        'name': alert['budget_name'],
+                        'category': {'name': alert['category_name']},
+                        'amount_cents': alert['amount_cents'],
+                        'spent_cents': alert['spent_cents'],
+                        'remaining_cents': alert['amount_cents'] - alert['spent_cents'],
+                        'period': alert['period'],
+                        'alert_threshold': (alert['alert_threshold'] or 0.8) * 100,
+                    },
+                    alert_type=alert['alert_type']
+                )
+                logger.info(f"Sent {alert['alert_type']} alert for budget {alert['budget_id']} ({percentage_used:.1f}% used)")
+            except Exception as e:
+                logger.error(f"Failed to send budget alert for budget {alert['budget_id']}: {e}")
+            finally:
+                db.close()
+
+
+# Create singleton instance
+budget_usage_service = BudgetUsageService()
+budget_usage_service.install_listeners()
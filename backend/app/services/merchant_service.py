@@ -386,10 +386,15 @@ class MerchantService:
         Returns:
             List of recognition results in same order
         """
+        # Bank feeds repeat the same descriptor many times; recognize each
+        # distinct description once and fan the result back out
+        recognized: Dict[str, MerchantRecognitionResult] = {}
         results = []
         for description in descriptions:
-            result = self.recognize_merchant(description)
-            results.append(result)
+            key = (description or "").strip().upper()
+            if key not in recognized:
+                recognized[key] = self.recognize_merchant(description)
+            results.append(recognized[key])
         
         return results
 
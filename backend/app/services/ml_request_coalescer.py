@@ -0,0 +1,178 @@
+"""
+ML request coalescer
+Micro-batches concurrent single-transaction categorization calls into batch requests
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Set, TYPE_CHECKING
+
+from ..schemas.ml import MLErrorResponse, MLServiceResponse
+
+if TYPE_CHECKING:
+    from .ml_service import MLServiceClient
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRequest:
+    item: Dict[str, Any]
+    future: asyncio.Future
+    enqueued_at: float
+
+
+class MLRequestCoalescer:
+    """
+    Gathers concurrent categorize calls for up to max_wait_ms, or until
+    max_batch_size are waiting, and sends them as one batch_categorize call.
+
+    Requests are grouped per user (batch requests carry a single user_id).
+    A lone request is sent through the single-item endpoint, and a batch whose
+    response can't be mapped back 1:1 is retried item by item.
+    """
+
+    def __init__(self, client: "MLServiceClient", max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.client = client
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_ms / 1000
+        self._pending: Dict[Optional[str], List[_PendingRequest]] = {}
+        self._timers: Dict[Optional[str], asyncio.Task] = {}
+        self._sends: Set[asyncio.Task] = set()  # The loop only keeps weak references to tasks
+
+        # Metrics
+        self._counters = {"requests": 0, "batches": 0, "batched_requests": 0, "single_requests": 0, "fallbacks": 0}
+        self._batch_sizes: Deque[int] = deque(maxlen=1000)
+        self._wait_ms: Deque[float] = deque(maxlen=1000)
+
+    async def categorize(
+        self,
+        description: str,
+        amount_cents: int,
+        merchant: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> MLServiceResponse:
+        """Queue one categorization and wait for its share of the batch result"""
+        loop = asyncio.get_running_loop()
+        request = _PendingRequest(
+            item={"description": description, "amount_cents": amount_cents, "merchant": merchant},
+            future=loop.create_future(),
+            enqueued_at=time.monotonic()
+        )
+        self._counters["requests"] += 1
+
+        pending = self._pending.setdefault(user_id, [])
+        pending.append(request)
+        if len(pending) >= self.max_batch_size:
+            self._dispatch(user_id)
+        elif user_id not in self._timers:
+            self._timers[user_id] = loop.create_task(self._dispatch_after_wait(user_id))
+
+        return await request.future
+
+    async def _dispatch_after_wait(self, user_id: Optional[str]):
+        await asyncio.sleep(self.max_wait_seconds)
+        self._timers.pop(user_id, None)
+        self._dispatch(user_id)
+
+    def _dispatch(self, user_id: Optional[str]):
+        """Take everything queued for user_id and send it in the background"""
+        timer = self._timers.pop(user_id, None)
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        batch = self._pending.pop(user_id, [])
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._send(user_id, batch))
+            self._sends.add(task)
+            task.add_done_callback(self._sends.discard)
+
+    async def aclose(self):
+        """Send whatever is still queued and wait for in-flight batches"""
+        for user_id in list(self._pending):
+            self._dispatch(user_id)
+        if self._sends:
+            await asyncio.gather(*self._sends, return_exceptions=True)
+
+    async def _send(self, user_id: Optional[str], batch: List[_PendingRequest]):
+        sent_at = time.monotonic()
+        self._batch_sizes.append(len(batch))
+        self._wait_ms.extend((sent_at - request.enqueued_at) * 1000 for request in batch)
+
+        try:
+            if len(batch) == 1:
+                self._counters["single_requests"] += 1
+                self._resolve(batch[0], await self._categorize_single(batch[0], user_id))
+                return
+
+            self._counters["batches"] += 1
+            self._counters["batched_requests"] += len(batch)
+            response = await self.client.batch_categorize([request.item for request in batch], user_id=user_id)
+
+            if not response.success or not response.data:
+                for request in batch:
+                    self._resolve(request, response)
+                return
+
+            results = response.data.results
+            if len(results) != len(batch):
+                # Results are positional; fall back to single calls rather than guess
+                logger.warning(
+                    f"Coalesced ML batch returned {len(results)} results for {len(batch)} requests; retrying individually"
+                )
+                self._counters["fallbacks"] += 1
+                responses = await asyncio.gather(*(self._categorize_single(request, user_id) for request in batch))
+                for request, single in zip(batch, responses):
+                    self._resolve(request, single)
+                return
+
+            for request, result in zip(batch, results):
+                self._resolve(request, MLServiceResponse(
+                    success=True,
+                    data=result,
+                    request_duration_ms=response.request_duration_ms,
+                    service_version=response.service_version
+                ))
+        except Exception as e:
+            logger.error(f"Coalesced ML categorization failed: {str(e)}")
+            failure = MLServiceResponse(
+                success=False,
+                error=MLErrorResponse(error="unexpected_error", message=f"Batched categorization failed: {str(e)}")
+            )
+            for request in batch:
+                self._resolve(request, failure)
+
+    async def _categorize_single(self, request: _PendingRequest, user_id: Optional[str]) -> MLServiceResponse:
+        return await self.client._categorize_single(user_id=user_id, **request.item)
+
+    def _resolve(self, request: _PendingRequest, response: MLServiceResponse):
+        if not request.future.done():
+            request.future.set_result(response)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Batch-size and wait-time statistics over the most recent batches"""
+        sizes = sorted(self._batch_sizes)
+        waits = sorted(self._wait_ms)
+
+        def percentile(values: List[float], pct: float) -> float:
+            return values[min(len(values) - 1, int(len(values) * pct))] if values else 0.0
+
+        return {
+            **self._counters,
+            "pending": sum(len(requests) for requests in self._pending.values()),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "batch_size": {
+                "avg": round(sum(sizes) / len(sizes), 2) if sizes else 0.0,
+                "p50": percentile(sizes, 0.5),
+                "p95": percentile(sizes, 0.95),
+                "max": sizes[-1] if sizes else 0,
+            },
+            "wait_ms": {
+                "avg": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "p50": round(percentile(waits, 0.5), 3),
+                "p95": round(percentile(waits, 0.95), 3),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
@@ -8,8 +8,10 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
 import random
+import time
 
 from ..config import settings
+from .ml_request_coalescer import MLRequestCoalescer
 from ..schemas.ml import (
     MLCategorizationRequest,
     MLCategorizationResponse,
@@ -36,6 +38,75 @@ class MLServiceError(Exception):
         self.details = details or {}
         super().__init__(self.message)
 
+class MLCircuitOpenError(httpx.RequestError):
+    """Raised without touching the network while the ML circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed -> open after failure_threshold failures in a row; open -> half_open
+    once reset_timeout has passed, letting a single probe through; the probe's
+    outcome closes or re-opens the circuit.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+        # Half-open: exactly one probe at a time
+        if self._probe_in_flight:
+            return False
+        self._probe_in_flight = True
+        return True
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"ML service circuit opened after {self.consecutive_failures} consecutive failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """Give up a half-open probe whose outcome says nothing about the service (e.g. cancellation)"""
+        self._probe_in_flight = False
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": (
+                max(0.0, self.reset_timeout_seconds - (time.monotonic() - self.opened_at))
+                if self.state == self.OPEN else 0.0
+            )
+        }
+
+
 class MLServiceClient:
     """Type-safe client for ML categorization service"""
     
@@ -48,6 +119,57 @@ class MLServiceClient:
             enable_feedback=getattr(settings, 'ML_ENABLE_FEEDBACK', True),
             batch_size=getattr(settings, 'ML_BATCH_SIZE', 100)
         )
+        # One pooled, keep-alive client shared by every call (see start/aclose)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limits = httpx.Limits(
+            max_connections=settings.ML_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ML_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=30.0
+        )
+        self._concurrency = asyncio.Semaphore(settings.ML_MAX_CONCURRENT_REQUESTS)
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=settings.ML_CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout_seconds=settings.ML_CIRCUIT_RESET_SECONDS
+        )
+        self.coalescer: Optional[MLRequestCoalescer] = (
+            MLRequestCoalescer(
+                self,
+                max_batch_size=min(settings.ML_COALESCE_MAX_BATCH_SIZE, self.config.batch_size),
+                max_wait_ms=settings.ML_COALESCE_MAX_WAIT_MS
+            )
+            if settings.ML_COALESCE_ENABLED else None
+        )
+
+    async def start(self):
+        """Open the shared connection pool (called from the app lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.config.timeout_seconds,
+                limits=self._limits
+            )
+            logger.info(f"ML service client pool opened for {self.config.base_url}")
+
+    async def aclose(self):
+        """Close the shared connection pool"""
+        if self.coalescer is not None:
+            await self.coalescer.aclose()
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("ML service client pool closed")
+        self._client = None
+
+    def client_metrics(self) -> Dict[str, Any]:
+        """Circuit breaker state and request coalescing statistics"""
+        return {
+            "circuit_breaker": self.circuit_breaker.status(),
+            "coalescer": self.coalescer.metrics() if self.coalescer is not None else None
+        }
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Lazily opened for callers outside the app lifespan (scripts, workers)
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
     
     async def _make_request_with_retry(
         self,
@@ -61,6 +183,9 @@ class MLServiceClient:
         """
         Make HTTP request with exponential backoff retry logic
         
+        Requests go through the shared pool, bounded by the concurrency
+        semaphore, and are refused up front while the circuit breaker is open.
+        
         Args:
             method: HTTP method (GET, POST, etc.)
             url: Request URL
@@ -73,38 +198,47 @@ class MLServiceClient:
             httpx.Response object
             
         Raises:
+            MLCircuitOpenError: If the circuit is open (before or between attempts)
             httpx.RequestError: After all retries are exhausted
         """
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
         retries = max_retries or self.config.max_retries
         last_exception = None
+        client = await self._get_client()
         
         for attempt in range(retries + 1):  # +1 for initial attempt
+            if not self.circuit_breaker.allow_request():
+                raise MLCircuitOpenError(f"ML service circuit is open; skipping request to {url}")
+
             try:
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    if method.upper() == "GET":
-                        response = await client.get(url, headers=headers)
-                    elif method.upper() == "POST":
-                        response = await client.post(url, json=json_data, headers=headers)
-                    else:
-                        raise ValueError(f"Unsupported HTTP method: {method}")
-                    
-                    # Check if we should retry based on status code
-                    if response.status_code >= 500 or response.status_code == 429:
-                        # Server errors or rate limiting - should retry
-                        if attempt < retries:
-                            delay = self._calculate_backoff_delay(attempt)
-                            logger.warning(
-                                f"ML service returned {response.status_code}, retrying in {delay:.2f}s "
-                                f"(attempt {attempt + 1}/{retries + 1})"
-                            )
-                            await asyncio.sleep(delay)
-                            continue
-                    
-                    # Success or non-retryable error
-                    return response
+                async with self._concurrency:
+                    response = await client.request(
+                        method.upper(), url, json=json_data, headers=headers, timeout=timeout
+                    )
+                
+                # Check if we should retry based on status code
+                if response.status_code >= 500 or response.status_code == 429:
+                    self.circuit_breaker.record_failure()
+                    # Server errors or rate limiting - should retry
+                    if attempt < retries:
+                        delay = self._calculate_backoff_delay(attempt)
+                        logger.warning(
+                            f"ML service returned {response.status_code}, retrying in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{retries + 1})"
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                else:
+                    self.circuit_breaker.record_success()
+                
+                # Success or non-retryable error
+                return response
                     
-            except (httpx.TimeoutException, httpx.ConnectError, httpx.NetworkError) as e:
+            except httpx.TransportError as e:
                 last_exception = e
+                self.circuit_breaker.record_failure()
                 if attempt < retries:
                     delay = self._calculate_backoff_delay(attempt)
                     logger.warning(
@@ -120,6 +254,10 @@ class MLServiceClient:
                         f"Last error: {type(e).__name__}: {str(e)}"
                     )
                     raise e
+            except BaseException:
+                # Cancelled or an unexpected error: don't leave a half-open probe claimed forever
+                self.circuit_breaker.release_probe()
+                raise
         
         # This should never be reached, but just in case
         if last_exception:
@@ -155,6 +293,23 @@ class MLServiceClient:
         """
         Categorize a single transaction using ML service
         
+        Concurrent calls are coalesced into batch_categorize requests when
+        ML_COALESCE_ENABLED is set; the response is the same either way.
+        """
+        if self.coalescer is not None:
+            return await self.coalescer.categorize(description, amount_cents, merchant, user_id)
+        return await self._categorize_single(description, amount_cents, merchant, user_id)
+    
+    async def _categorize_single(
+        self, 
+        description: str, 
+        amount_cents: int, 
+        merchant: Optional[str] = None,
+        user_id: Optional[str] = None
+    ) -> MLServiceResponse:
+        """
+        Categorize a single transaction with one /ml/categorize request
+        
         Args:
             description: Transaction description
             amount_cents: Transaction amount in cents
@@ -213,6 +368,17 @@ class MLServiceClient:
                     request_duration_ms=duration_ms
                 )
                     
+        except MLCircuitOpenError as e:
+            logger.warning(f"{e}")
+            return MLServiceResponse(
+                success=False,
+                error=MLErrorResponse(
+                    error="circuit_open",
+                    message="ML service is temporarily unavailable",
+                    details=self.circuit_breaker.status()
+                )
+            )
+            
         except httpx.TimeoutException as e:
             logger.error(f"ML service timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -312,32 +478,43 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code == 200:
+                response_data = response.json()
+                feedback_result = MLFeedbackResponse.model_validate(response_data)
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    feedback_result = MLFeedbackResponse.model_validate(response_data)
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=feedback_result,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    try:
-                        error_data = response.json()
-                        error = MLErrorResponse.model_validate(error_data)
-                    except Exception:
-                        error = MLErrorResponse(
-                            error="http_error",
-                            message=f"HTTP {response.status_code}: {response.text}"
-                        )
-                    
-                    return MLServiceResponse(
-                        success=False,
-                        error=error,
-                        request_duration_ms=duration_ms
+                return MLServiceResponse(
+                    success=True,
+                    data=feedback_result,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                try:
+                    error_data = response.json()
+                    error = MLErrorResponse.model_validate(error_data)
+                except Exception:
+                    error = MLErrorResponse(
+                        error="http_error",
+                        message=f"HTTP {response.status_code}: {response.text}"
                     )
-                    
+                
+                return MLServiceResponse(
+                    success=False,
+                    error=error,
+                    request_duration_ms=duration_ms
+                )
+                
+        except MLCircuitOpenError as e:
+            logger.warning(f"{e}")
+            return MLServiceResponse(
+                success=False,
+                error=MLErrorResponse(
+                    error="circuit_open",
+                    message="ML service is temporarily unavailable",
+                    details=self.circuit_breaker.status()
+                )
+            )
+            
         except httpx.TimeoutException as e:
             logger.error(f"ML service feedback timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -420,32 +597,43 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code == 200:
+                response_data = response.json()
+                batch_result = MLBatchCategorizationResponse.model_validate(response_data)
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    batch_result = MLBatchCategorizationResponse.model_validate(response_data)
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=batch_result,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    try:
-                        error_data = response.json()
-                        error = MLErrorResponse.model_validate(error_data)
-                    except Exception:
-                        error = MLErrorResponse(
-                            error="http_error",
-                            message=f"HTTP {response.status_code}: {response.text}"
-                        )
-                    
-                    return MLServiceResponse(
-                        success=False,
-                        error=error,
-                        request_duration_ms=duration_ms
+                return MLServiceResponse(
+                    success=True,
+                    data=batch_result,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                try:
+                    error_data = response.json()
+                    error = MLErrorResponse.model_validate(error_data)
+                except Exception:
+                    error = MLErrorResponse(
+                        error="http_error",
+                        message=f"HTTP {response.status_code}: {response.text}"
                     )
-                    
+                
+                return MLServiceResponse(
+                    success=False,
+                    error=error,
+                    request_duration_ms=duration_ms
+                )
+                
+        except MLCircuitOpenError as e:
+            logger.warning(f"{e}")
+            return MLServiceResponse(
+                success=False,
+                error=MLErrorResponse(
+                    error="circuit_open",
+                    message="ML service is temporarily unavailable",
+                    details=self.circuit_breaker.status()
+                )
+            )
+            
         except httpx.TimeoutException as e:
             logger.error(f"ML service batch timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -504,26 +692,37 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code == 200:
+                response_data = response.json()
+                health_result = MLHealthResponse.model_validate(response_data)
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    health_result = MLHealthResponse.model_validate(response_data)
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=health_result,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    return MLServiceResponse(
-                        success=False,
-                        error=MLErrorResponse(
-                            error="health_check_failed",
-                            message=f"Health check failed with status {response.status_code}"
-                        ),
-                        request_duration_ms=duration_ms
-                    )
-                    
+                return MLServiceResponse(
+                    success=True,
+                    data=health_result,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                return MLServiceResponse(
+                    success=False,
+                    error=MLErrorResponse(
+                        error="health_check_failed",
+                        message=f"Health check failed with status {response.status_code}"
+                    ),
+                    request_duration_ms=duration_ms
+                )
+                
+        except MLCircuitOpenError as e:
+            logger.warning(f"{e}")
+            return MLServiceResponse(
+                success=False,
+                error=MLErrorResponse(
+                    error="circuit_open",
+                    message="ML service is temporarily unavailable",
+                    details=self.circuit_breaker.status()
+                )
+            )
+            
         except httpx.TimeoutException as e:
             logger.error(f"ML service health check timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -593,31 +792,31 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code in [200, 201]:
+                response_data = response.json()
                 
-                if response.status_code in [200, 201]:
-                    response_data = response.json()
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=response_data,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    try:
-                        error_data = response.json()
-                        error = MLErrorResponse.model_validate(error_data)
-                    except Exception:
-                        error = MLErrorResponse(
-                            error="http_error",
-                            message=f"HTTP {response.status_code}: {response.text}"
-                        )
-                    
-                    return MLServiceResponse(
-                        success=False,
-                        error=error,
-                        request_duration_ms=duration_ms
+                return MLServiceResponse(
+                    success=True,
+                    data=response_data,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                try:
+                    error_data = response.json()
+                    error = MLErrorResponse.model_validate(error_data)
+                except Exception:
+                    error = MLErrorResponse(
+                        error="http_error",
+                        message=f"HTTP {response.status_code}: {response.text}"
                     )
-                    
+                
+                return MLServiceResponse(
+                    success=False,
+                    error=error,
+                    request_duration_ms=duration_ms
+                )
+                
         except httpx.TimeoutException as e:
             logger.error(f"ML service add example timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -676,32 +875,32 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code == 200:
+                response_data = response.json()
+                export_result = MLModelExportResponse.model_validate(response_data)
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    export_result = MLModelExportResponse.model_validate(response_data)
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=export_result,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    try:
-                        error_data = response.json()
-                        error = MLErrorResponse.model_validate(error_data)
-                    except Exception:
-                        error = MLErrorResponse(
-                            error="http_error",
-                            message=f"HTTP {response.status_code}: {response.text}"
-                        )
-                    
-                    return MLServiceResponse(
-                        success=False,
-                        error=error,
-                        request_duration_ms=duration_ms
+                return MLServiceResponse(
+                    success=True,
+                    data=export_result,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                try:
+                    error_data = response.json()
+                    error = MLErrorResponse.model_validate(error_data)
+                except Exception:
+                    error = MLErrorResponse(
+                        error="http_error",
+                        message=f"HTTP {response.status_code}: {response.text}"
                     )
-                    
+                
+                return MLServiceResponse(
+                    success=False,
+                    error=error,
+                    request_duration_ms=duration_ms
+                )
+                
         except httpx.TimeoutException as e:
             logger.error(f"ML service export timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -759,32 +958,32 @@ class MLServiceClient:
             )
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+            
+            if response.status_code == 200:
+                response_data = response.json()
+                performance_result = MLModelPerformanceResponse.model_validate(response_data)
                 
-                if response.status_code == 200:
-                    response_data = response.json()
-                    performance_result = MLModelPerformanceResponse.model_validate(response_data)
-                    
-                    return MLServiceResponse(
-                        success=True,
-                        data=performance_result,
-                        request_duration_ms=duration_ms
-                    )
-                else:
-                    try:
-                        error_data = response.json()
-                        error = MLErrorResponse.model_validate(error_data)
-                    except Exception:
-                        error = MLErrorResponse(
-                            error="http_error",
-                            message=f"HTTP {response.status_code}: {response.text}"
-                        )
-                    
-                    return MLServiceResponse(
-                        success=False,
-                        error=error,
-                        request_duration_ms=duration_ms
+                return MLServiceResponse(
+                    success=True,
+                    data=performance_result,
+                    request_duration_ms=duration_ms
+                )
+            else:
+                try:
+                    error_data = response.json()
+                    error = MLErrorResponse.model_validate(error_data)
+                except Exception:
+                    error = MLErrorResponse(
+                        error="http_error",
+                        message=f"HTTP {response.status_code}: {response.text}"
                     )
-                    
+                
+                return MLServiceResponse(
+                    success=False,
+                    error=error,
+                    request_duration_ms=duration_ms
+                )
+                
         except httpx.TimeoutException as e:
             logger.error(f"ML service performance timeout after all retries: {str(e)}")
             return MLServiceResponse(
@@ -833,4 +1032,9 @@ def get_ml_client() -> MLServiceClient:
     global _ml_client
     if _ml_client is None:
         _ml_client = MLServiceClient()
-    return _ml_client
\ No newline at end of file
+    return _ml_client
+
+async def close_ml_client():
+    """Close the global ML client's connection pool"""
+    if _ml_client is not None:
+        await _ml_client.aclose()
@@ -13,6 +13,7 @@ from app.models.account import Account
 from app.schemas.account import AccountCreate
 from app.services.account_service import AccountService
 from app.services.account_alert_service import account_alert_service
+from app.services.balance_history_service import balance_history_service
 from app.services.plaid_client_service import plaid_client_service
 from app.services.utils.plaid_utils import group_accounts_by_token
 from app.websocket.manager import redis_websocket_manager as websocket_manager
@@ -383,6 +384,13 @@ class PlaidAccountService:
         account.account_metadata = metadata
         
         db.add(account)
+        
+        # Persist today's balance so net worth history doesn't need reconstructing
+        available = balances.get('available')
+        balance_history_service.record_snapshot(
+            db, account,
+            available_balance_cents=int(available * 100) if available is not None else None
+        )
         db.commit()
         
         # Send notification if balance changed significantly
@@ -5,18 +5,36 @@ Handles low-level Plaid API communication, authentication, and basic token opera
 
 import logging
 from typing import Dict, Any, Optional
-import requests
-import json
+import httpx
 import asyncio
+import random
+import time
 
 from app.config import settings
+from app.services.plaid_rate_limiter import (
+    PlaidRateLimiter,
+    plaid_request_duration,
+    plaid_request_errors_total,
+)
 
 logger = logging.getLogger(__name__)
 
 
+class PlaidAPIError(Exception):
+    """Plaid API error that preserves Plaid's error_code for callers that branch on it"""
+    
+    def __init__(self, message: str, status_code: Optional[int] = None, error_code: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.error_code = error_code
+
+
 class PlaidClientService:
     """Core Plaid API client for low-level operations"""
     
+    # Not safe to repeat after a response that may have been processed
+    NON_RETRYABLE_ENDPOINTS = frozenset({'item/public_token/exchange'})
+    
     def __init__(self):
         self.enabled = settings.ENABLE_PLAID
         self.client_id = settings.PLAID_CLIENT_ID
@@ -25,6 +43,15 @@ class PlaidClientService:
         self.products = settings.PLAID_PRODUCTS.split(",") if settings.PLAID_PRODUCTS else []
         self.country_codes = settings.PLAID_COUNTRY_CODES.split(",") if settings.PLAID_COUNTRY_CODES else []
         
+        # One pooled, keep-alive client shared by every call (see start/aclose)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._limits = httpx.Limits(
+            max_connections=settings.PLAID_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PLAID_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=30.0
+        )
+        self.rate_limiter = PlaidRateLimiter()
+        
         if not self.enabled:
             logger.info("Plaid integration is disabled")
             return
@@ -39,11 +66,36 @@ class PlaidClientService:
             'development': 'https://development.plaid.com',
             'production': 'https://production.plaid.com'
         }.get(self.environment, 'https://sandbox.plaid.com')
+        if settings.PLAID_BASE_URL:
+            self.base_url = settings.PLAID_BASE_URL.rstrip('/')
         
         logger.info(f"Plaid client service initialized for {self.environment} environment")
         logger.debug(f"Plaid client_id: {self.client_id[:10]}... (truncated)")
         logger.debug(f"Plaid secret: {'*' * len(self.secret) if self.secret else 'EMPTY'}")
     
+    async def start(self):
+        """Open the shared connection pool (called from the app lifespan)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=settings.PLAID_TIMEOUT_SECONDS, limits=self._limits)
+            logger.info("Plaid client pool opened")
+    
+    async def aclose(self):
+        """Close the shared connection pool"""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Plaid client pool closed")
+        self._client = None
+    
+    def client_metrics(self) -> Dict[str, Any]:
+        """Current rate limiter state; latency and error histograms are exported to Prometheus"""
+        return {"rate_limiter": self.rate_limiter.status()}
+    
+    async def _get_client(self) -> httpx.AsyncClient:
+        # Lazily opened for callers outside the app lifespan (scripts, workers)
+        if self._client is None or self._client.is_closed:
+            await self.start()
+        return self._client
+    
     async def create_link_token(self, user_id: str, update_mode: bool = False) -> Dict[str, Any]:
         """Create a link token for Plaid Link initialization or update"""
         if not self.enabled:
@@ -200,6 +252,42 @@ class PlaidClientService:
                 'error': str(e)
             }
     
+    async def sync_transactions(self, access_token: str, cursor: Optional[str] = None,
+                                count: int = 500) -> Dict[str, Any]:
+        """Fetch one page of transaction deltas from /transactions/sync"""
+        try:
+            request_data = {
+                'access_token': access_token,
+                'count': count,
+                'options': {
+                    'include_personal_finance_category': True
+                }
+            }
+            
+            # An omitted cursor asks Plaid for the full history of the item
+            if cursor:
+                request_data['cursor'] = cursor
+            
+            result = await self._make_request('transactions/sync', request_data)
+            
+            return {
+                'success': True,
+                'added': result.get('added', []),
+                'modified': result.get('modified', []),
+                'removed': result.get('removed', []),
+                'next_cursor': result.get('next_cursor'),
+                'has_more': result.get('has_more', False),
+                'request_id': result.get('request_id')
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to sync transactions: {e}")
+            return {
+                'success': False,
+                'error': str(e),
+                'error_code': getattr(e, 'error_code', None)
+            }
+    
     async def fetch_recurring_transactions(self, access_token: str) -> Dict[str, Any]:
         """Fetch recurring transactions from Plaid"""
         try:
@@ -220,6 +308,13 @@ class PlaidClientService:
                 'error': str(e)
             }
     
+    async def fetch_webhook_verification_key(self, key_id: str) -> Dict[str, Any]:
+        """Fetch the JWK Plaid signs webhooks with; raises PlaidAPIError for unknown keys"""
+        result = await self._make_request('webhook_verification_key/get', {
+            'key_id': key_id
+        })
+        return result.get('key', {})
+    
     async def get_connection_status(self, access_token: str) -> Dict[str, Any]:
         """Get connection status for a Plaid item"""
         try:
@@ -247,7 +342,13 @@ class PlaidClientService:
             }
     
     async def _make_request(self, endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Make authenticated request to Plaid API"""
+        """
+        Make authenticated request to Plaid API
+        
+        Every attempt first takes a token from the endpoint's and the item's
+        rate limit buckets. Rate-limited responses slow those buckets down and,
+        like 5xx responses and timeouts, are retried with jittered backoff.
+        """
         if not self.enabled:
             raise Exception("Plaid is disabled")
         
@@ -264,36 +365,84 @@ class PlaidClientService:
             'PLAID-SECRET': self.secret
         }
         
-        try:
-            # Run the request in a thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                lambda: requests.post(url, json=data, headers=headers, timeout=30)
-            )
+        item_key = self.rate_limiter.item_key(data.get('access_token'))
+        retries = settings.PLAID_MAX_RETRIES
+        client = await self._get_client()
+        
+        for attempt in range(retries + 1):  # +1 for initial attempt
+            await self.rate_limiter.acquire(endpoint, item_key)
+            started = time.monotonic()
             
-            if response.status_code != 200:
-                error_detail = response.text
-                try:
-                    error_json = response.json()
-                    error_detail = error_json.get('error_message', error_detail)
-                except:
-                    pass
-                raise Exception(f"Plaid API error ({response.status_code}): {error_detail}")
-            
-            result = response.json()
-            logger.debug(f"Plaid API call to {endpoint} successful")
-            return result
-            
-        except requests.exceptions.Timeout:
-            logger.error(f"Plaid API timeout for endpoint: {endpoint}")
-            raise Exception("Plaid service timeout")
-        except requests.exceptions.ConnectionError:
-            logger.error(f"Plaid API connection error for endpoint: {endpoint}")
-            raise Exception("Unable to connect to Plaid service")
-        except Exception as e:
-            logger.error(f"Plaid API request failed for {endpoint}: {e}")
-            raise
+            try:
+                response = await client.post(url, json=data, headers=headers)
+            except (httpx.TimeoutException, httpx.TransportError) as e:
+                timed_out = isinstance(e, httpx.TimeoutException)
+                plaid_request_duration.labels(endpoint=endpoint, outcome='timeout' if timed_out else 'network_error').observe(time.monotonic() - started)
+                plaid_request_errors_total.labels(endpoint=endpoint, error_code='TIMEOUT' if timed_out else 'NETWORK_ERROR').inc()
+                if attempt < retries and endpoint not in self.NON_RETRYABLE_ENDPOINTS:
+                    delay = self._calculate_backoff_delay(attempt)
+                    logger.warning(f"Plaid request to {endpoint} failed ({type(e).__name__}), retrying in {delay:.2f}s (attempt {attempt + 1}/{retries + 1})")
+                    await asyncio.sleep(delay)
+                    continue
+                if timed_out:
+                    logger.error(f"Plaid API timeout for endpoint: {endpoint}")
+                    raise Exception("Plaid service timeout")
+                logger.error(f"Plaid API connection error for endpoint: {endpoint}")
+                raise Exception("Unable to connect to Plaid service")
+            
+            if response.status_code == 200:
+                plaid_request_duration.labels(endpoint=endpoint, outcome='success').observe(time.monotonic() - started)
+                self.rate_limiter.record_success(endpoint, item_key)
+                logger.debug(f"Plaid API call to {endpoint} successful")
+                return response.json()
+            
+            plaid_request_duration.labels(endpoint=endpoint, outcome='error').observe(time.monotonic() - started)
+            error_detail = response.text
+            error_code = None
+            error_type = None
+            try:
+                error_json = response.json()
+                error_detail = error_json.get('error_message', error_detail)
+                error_code = error_json.get('error_code')
+                error_type = error_json.get('error_type')
+            except ValueError:
+                pass
+            plaid_request_errors_total.labels(endpoint=endpoint, error_code=error_code or str(response.status_code)).inc()
+            
+            rate_limited = response.status_code == 429 or error_type == 'RATE_LIMIT_EXCEEDED'
+            retry_after = self._retry_after_seconds(response)
+            if rate_limited:
+                self.rate_limiter.record_rate_limited(endpoint, item_key, retry_after)
+            
+            retryable = rate_limited or (response.status_code >= 500 and endpoint not in self.NON_RETRYABLE_ENDPOINTS)
+            if retryable and attempt < retries:
+                delay = self._calculate_backoff_delay(attempt, retry_after)
+                logger.warning(
+                    f"Plaid API returned {response.status_code} ({error_code}) for {endpoint}, "
+                    f"retrying in {delay:.2f}s (attempt {attempt + 1}/{retries + 1})"
+                )
+                await asyncio.sleep(delay)
+                continue
+            
+            logger.error(f"Plaid API request failed for {endpoint}: {response.status_code} {error_code}")
+            raise PlaidAPIError(
+                f"Plaid API error ({response.status_code}): {error_detail}",
+                status_code=response.status_code,
+                error_code=error_code
+            )
+    
+    def _calculate_backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Exponential backoff with jitter, never shorter than Retry-After"""
+        ceiling = min(30.0, settings.PLAID_RETRY_BASE_DELAY * (2 ** attempt))
+        delay = random.uniform(ceiling / 2, ceiling)
+        return max(delay, retry_after or 0.0)
+    
+    @staticmethod
+    def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
     
     def _disabled_response(self) -> Dict[str, Any]:
         """Standard response when Plaid is disabled"""
@@ -231,6 +231,17 @@ class PlaidOrchestrationService:
             access_token, start_date, end_date, account_ids, count
         )
     
+    async def fetch_transaction_updates(
+        self,
+        access_token: str,
+        cursor: Optional[str] = None,
+        count: int = 500
+    ) -> Dict[str, Any]:
+        """Fetch added/modified/removed deltas since cursor via /transactions/sync"""
+        return await plaid_transaction_service.fetch_transaction_updates(
+            access_token, cursor, count
+        )
+    
     # Recurring Transactions (delegated to webhook service)
     async def fetch_recurring_transactions(self, access_token: str) -> Dict[str, Any]:
         """Fetch recurring transactions using Plaid's /transactions/recurring/get endpoint"""
@@ -239,8 +250,13 @@ class PlaidOrchestrationService:
         
         return await plaid_client_service.fetch_recurring_transactions(access_token)
     
-    async def sync_recurring_transactions_for_user(self, db: Session, user_id: UUID) -> Dict[str, Any]:
-        """Sync all recurring transactions for a user's accounts"""
+    async def sync_recurring_transactions_for_user(
+        self,
+        db: Session,
+        user_id: UUID,
+        item_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Sync recurring transactions for a user's accounts (optionally only some Plaid items)"""
         # Lightweight type assertion for internal bug detection
         if not isinstance(user_id, UUID):
             raise TypeError(f"user_id must be UUID, got {type(user_id)}")
@@ -248,7 +264,7 @@ class PlaidOrchestrationService:
         if not self.enabled:
             return self._disabled_response()
         
-        return await plaid_webhook_service.sync_recurring_transactions_for_user(db, user_id)
+        return await plaid_webhook_service.sync_recurring_transactions_for_user(db, user_id, item_ids)
     
     # Connection Status and Health
     async def get_connection_status(self, db: Session, user_id: UUID) -> Dict[str, Any]:
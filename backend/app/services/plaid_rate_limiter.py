@@ -0,0 +1,177 @@
+"""
+Plaid Rate Limiter
+Adaptive token buckets per Plaid endpoint and per item, plus request metrics
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from prometheus_client import Counter, Histogram
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrics
+plaid_request_duration = Histogram(
+    'plaid_request_duration_seconds', 'Plaid API request duration', ['endpoint', 'outcome'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30)
+)
+plaid_request_errors_total = Counter(
+    'plaid_request_errors_total', 'Plaid API errors by error code', ['endpoint', 'error_code']
+)
+plaid_rate_limit_wait = Histogram(
+    'plaid_rate_limit_wait_seconds', 'Time spent waiting for a Plaid rate limit token', ['endpoint'],
+    buckets=(0, 0.01, 0.1, 0.5, 1, 5, 15, 60)
+)
+
+# Requests per minute as (client-wide, per item), following Plaid's published
+# production limits with some headroom; endpoints not listed use DEFAULT_LIMITS
+ENDPOINT_LIMITS: Dict[str, Tuple[float, float]] = {
+    'transactions/sync': (2000, 40),
+    'transactions/get': (800, 25),
+    'transactions/recurring/get': (800, 15),
+    'accounts/balance/get': (1000, 4),
+    'accounts/get': (12000, 12),
+    'item/get': (4000, 12),
+    'institutions/get_by_id': (400, 0),
+    'link/token/create': (4000, 0),
+    'item/public_token/exchange': (4000, 0),
+    'webhook_verification_key/get': (400, 0),
+}
+DEFAULT_LIMITS: Tuple[float, float] = (600, 12)
+
+
+class TokenBucket:
+    """
+    Token bucket whose refill rate adapts to rate-limit responses.
+
+    A 429 halves the rate (down to min_rate) and empties the bucket, blocking it
+    for Retry-After when Plaid sends one; every success then recovers 5% of the
+    configured rate until it is back to normal.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[float] = None, min_fraction: float = 0.1):
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.min_rate = self.base_rate * min_fraction
+        self.capacity = max(1.0, burst if burst is not None else rate_per_minute / 6.0)  # 10s of traffic
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def reserve(self, now: Optional[float] = None) -> float:
+        """Take a token and return 0, or return how long to wait before trying again"""
+        now = time.monotonic() if now is None else now
+        self._refill(now)
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the time spent waiting"""
+        waited = 0.0
+        while True:
+            delay = self.reserve()
+            if delay <= 0:
+                return waited
+            await asyncio.sleep(delay)
+            waited += delay
+
+    def on_rate_limited(self, retry_after: Optional[float] = None, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.tokens = 0.0
+        self.updated = now
+        self.blocked_until = max(self.blocked_until, now + (retry_after if retry_after else 1 / self.rate))
+
+    def on_success(self):
+        if self.rate < self.base_rate:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * 0.05)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'rate_per_minute': round(self.rate * 60, 2),
+            'base_rate_per_minute': round(self.base_rate * 60, 2),
+            'tokens': round(self.tokens, 2),
+            'blocked_for_seconds': round(max(0.0, self.blocked_until - time.monotonic()), 3)
+        }
+
+
+class PlaidRateLimiter:
+    """
+    Client-wide bucket per endpoint and one per (endpoint, item); item buckets
+    expire when idle. A limit of 0 leaves that scope unthrottled.
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None,
+                 default_limits: Tuple[float, float] = DEFAULT_LIMITS):
+        self.limits = limits if limits is not None else ENDPOINT_LIMITS
+        self.default_limits = default_limits
+        self.endpoint_buckets: Dict[str, TokenBucket] = {}
+        self.item_buckets: TTLCache = TTLCache(
+            maxsize=settings.PLAID_RATE_LIMIT_MAX_ITEMS, ttl=settings.PLAID_RATE_LIMIT_ITEM_TTL
+        )
+
+    @staticmethod
+    def item_key(access_token: Optional[str]) -> Optional[str]:
+        """Buckets are keyed by a digest so access tokens are never held or reported"""
+        if not access_token:
+            return None
+        return hashlib.sha256(access_token.encode()).hexdigest()[:16]
+
+    def _buckets(self, endpoint: str, item_key: Optional[str]):
+        client_limit, item_limit = self.limits.get(endpoint, self.default_limits)
+
+        endpoint_bucket = self.endpoint_buckets.get(endpoint)
+        if endpoint_bucket is None and client_limit:
+            endpoint_bucket = self.endpoint_buckets[endpoint] = TokenBucket(client_limit)
+
+        item_bucket = None
+        if item_key and item_limit:
+            item_bucket = self.item_buckets.get((endpoint, item_key))
+            if item_bucket is None:
+                # 15s of burst: Plaid's per-item limits are tight
+                item_bucket = TokenBucket(item_limit, burst=max(1.0, item_limit / 4.0))
+            # Re-inserting refreshes the idle TTL
+            self.item_buckets[(endpoint, item_key)] = item_bucket
+        return endpoint_bucket, item_bucket
+
+    async def acquire(self, endpoint: str, item_key: Optional[str] = None):
+        waited = 0.0
+        for bucket in self._buckets(endpoint, item_key):
+            if bucket is not None:
+                waited += await bucket.acquire()
+        plaid_rate_limit_wait.labels(endpoint=endpoint).observe(waited)
+
+    def record_success(self, endpoint: str, item_key: Optional[str] = None):
+        for bucket in self._buckets(endpoint, item_key):
+            if bucket is not None:
+                bucket.on_success()
+
+    def record_rate_limited(self, endpoint: str, item_key: Optional[str] = None, retry_after: Optional[float] = None):
+        """Slow down the item's bucket, or the endpoint's when the limit is not item-scoped"""
+        endpoint_bucket, item_bucket = self._buckets(endpoint, item_key)
+        bucket = item_bucket or endpoint_bucket
+        if bucket is not None:
+            bucket.on_rate_limited(retry_after)
+        logger.warning(f"Plaid rate limit hit on {endpoint}{' for item ' + item_key if item_key else ''}; backing off")
+
+    def status(self) -> Dict[str, Any]:
+        throttled_items = sum(1 for bucket in self.item_buckets.values() if bucket.rate < bucket.base_rate)
+        return {
+            'endpoints': {endpoint: bucket.status() for endpoint, bucket in self.endpoint_buckets.items()},
+            'tracked_items': len(self.item_buckets),
+            'throttled_items': throttled_items
+        }
@@ -216,6 +216,70 @@ class PlaidTransactionService:
             logger.error(f"Failed to fetch transactions: {e}")
             raise
     
+    async def fetch_transaction_updates(
+        self,
+        access_token: str,
+        cursor: Optional[str] = None,
+        count: int = 500,
+        max_restarts: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Drain /transactions/sync from the given cursor until has_more is false.
+        
+        Deltas are only returned once every page has been fetched, so callers can
+        apply them and persist next_cursor as a single unit. If Plaid reports that
+        the item changed mid-pagination the whole run restarts from the original cursor.
+        """
+        restarts = 0
+        
+        while True:
+            added: List[Dict[str, Any]] = []
+            modified: List[Dict[str, Any]] = []
+            removed: List[Dict[str, Any]] = []
+            page_cursor = cursor
+            pages = 0
+            restart = False
+            
+            while True:
+                result = await plaid_client_service.sync_transactions(
+                    access_token=access_token,
+                    cursor=page_cursor,
+                    count=count
+                )
+                
+                if not result.get('success'):
+                    if result.get('error_code') == 'TRANSACTIONS_SYNC_MUTATION_DURING_PAGINATION':
+                        restart = True
+                        break
+                    raise Exception(result.get('error', 'Failed to sync transactions'))
+                
+                pages += 1
+                added.extend(result.get('added', []))
+                modified.extend(result.get('modified', []))
+                removed.extend(result.get('removed', []))
+                page_cursor = result.get('next_cursor')
+                
+                if not result.get('has_more'):
+                    break
+            
+            if not restart:
+                logger.info(f"Plaid /transactions/sync drained {pages} pages: "
+                           f"{len(added)} added, {len(modified)} modified, {len(removed)} removed")
+                return {
+                    'added': added,
+                    'modified': modified,
+                    'removed': removed,
+                    'next_cursor': page_cursor,
+                    'pages': pages,
+                    'restarts': restarts
+                }
+            
+            restarts += 1
+            if restarts > max_restarts:
+                raise Exception("Plaid item kept changing during /transactions/sync pagination")
+            logger.warning(f"Transactions changed during sync pagination, restarting from original cursor "
+                          f"(attempt {restarts}/{max_restarts})")
+    
     async def _process_transactions(
         self, 
         plaid_transactions: List[Dict[str, Any]], 
@@ -10,10 +10,10 @@ from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from uuid import UUID
 
+from app.config import settings
 from app.models.account import Account
 from app.models.plaid_recurring_transaction import PlaidRecurringTransaction
 from app.services.plaid_client_service import plaid_client_service
-from app.services.plaid_transaction_service import plaid_transaction_service
 from app.services.utils.plaid_utils import group_accounts_by_token
 from app.websocket.manager import redis_websocket_manager as websocket_manager
 from app.websocket.events import WebSocketEvent, EventType
@@ -25,10 +25,22 @@ class PlaidWebhookService:
     """Service for handling Plaid webhooks and recurring transactions"""
     
     def __init__(self):
-        pass
+        self._recurring_semaphore: Optional[asyncio.Semaphore] = None
+        self._recurring_next_slot = 0.0
     
-    async def sync_recurring_transactions_for_user(self, db: Session, user_id: UUID) -> Dict[str, Any]:
-        """Sync all recurring transactions for a user's accounts"""
+    async def sync_recurring_transactions_for_user(
+        self,
+        db: Session,
+        user_id: UUID,
+        item_ids: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Sync recurring transactions for a user's accounts, optionally only some Plaid items.
+        
+        Each item's /transactions/recurring/get call runs concurrently, bounded by
+        PLAID_RECURRING_MAX_CONCURRENCY and spaced PLAID_RECURRING_MIN_INTERVAL_MS
+        apart; the database writes are then applied in one pass.
+        """
         
         # Lightweight type assertion for internal bug detection
         if not isinstance(user_id, UUID):
@@ -36,15 +48,18 @@ class PlaidWebhookService:
         
         try:
             # Get user's Plaid-connected accounts
-            user_accounts = db.query(Account).filter(
+            query = db.query(Account).filter(
                 Account.user_id == user_id,
                 Account.plaid_access_token_encrypted.isnot(None)
-            ).all()
+            )
+            if item_ids:
+                query = query.filter(Account.plaid_item_id.in_(item_ids))
+            user_accounts = query.all()
             
             if not user_accounts:
                 return {"success": True, "message": "No Plaid accounts to sync.", "results": []}
             
-            # Group accounts by access token
+            # Group accounts by access token (one group per Plaid item)
             token_groups = group_accounts_by_token(user_accounts)
             
             overall_results = {
@@ -57,11 +72,17 @@ class PlaidWebhookService:
                 "results": []
             }
             
-            for access_token, accounts_in_group in token_groups.items():
+            access_tokens = list(token_groups)
+            fetched = await asyncio.gather(
+                *(self._fetch_recurring_limited(access_token) for access_token in access_tokens),
+                return_exceptions=True
+            )
+            
+            for access_token, recurring_data in zip(access_tokens, fetched):
+                accounts_in_group = token_groups[access_token]
                 try:
-                    # Fetch recurring transactions for this token group
-                    recurring_data = await plaid_client_service.fetch_recurring_transactions(access_token)
-                    
+                    if isinstance(recurring_data, Exception):
+                        raise recurring_data
                     if not recurring_data.get('success'):
                         raise Exception(recurring_data.get('error', 'Failed to fetch recurring transactions'))
                     
@@ -86,6 +107,8 @@ class PlaidWebhookService:
                                 overall_results["new_recurring_transactions"] += 1
                             elif processed.get('updated'):
                                 overall_results["updated_recurring_transactions"] += 1
+                            elif processed.get('error'):
+                                overall_results["total_errors"] += 1
                                 
                         except Exception as e:
                             logger.error(f"Failed to process recurring transaction {stream.get('stream_id', 'unknown')}: {e}")
@@ -112,12 +135,13 @@ class PlaidWebhookService:
                             "success": False,
                             "error": str(e)
                         })
-                
-                # Small delay between token groups
-                await asyncio.sleep(1)
             
             db.commit()
             
+            # Cached insights were built from the rows just replaced
+            from app.services.recurring_insights_service import recurring_insights_service
+            await recurring_insights_service.invalidate(user_id)
+            
             # Send WebSocket notification
             try:
                 completion_event = WebSocketEvent(
@@ -143,6 +167,25 @@ class PlaidWebhookService:
                 "message": "Failed to sync recurring transactions"
             }
     
+    async def _fetch_recurring_limited(self, access_token: str) -> Dict[str, Any]:
+        """recurring/get under the shared concurrency limit and request spacing"""
+        if self._recurring_semaphore is None:
+            self._recurring_semaphore = asyncio.Semaphore(max(1, settings.PLAID_RECURRING_MAX_CONCURRENCY))
+        
+        async with self._recurring_semaphore:
+            await self._wait_for_recurring_slot()
+            return await plaid_client_service.fetch_recurring_transactions(access_token)
+    
+    async def _wait_for_recurring_slot(self):
+        """Space request starts at least PLAID_RECURRING_MIN_INTERVAL_MS apart, across all users"""
+        interval = settings.PLAID_RECURRING_MIN_INTERVAL_MS / 1000
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        slot = max(now, self._recurring_next_slot)
+        self._recurring_next_slot = slot + interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+    
     async def _process_plaid_recurring_transaction(
         self, 
         plaid_recurring: Dict[str, Any], 
@@ -201,21 +244,14 @@ class PlaidWebhookService:
                 existing.merchant_name = merchant_name
                 existing.amount_cents = amount_cents
                 existing.currency = currency
-                existing.frequency = frequency
-                existing.status = status
+                existing.plaid_frequency = frequency
+                existing.plaid_status = status
+                existing.plaid_category = categories or None
                 existing.last_amount_cents = last_amount_cents
                 existing.last_date = last_date
-                existing.plaid_categories = categories
-                existing.updated_at = current_time
-                
-                # Update metadata
-                metadata = existing.metadata or {}
-                metadata.update({
-                    'personal_finance_category': personal_finance_category,
-                    'last_sync': current_time.isoformat(),
-                    'is_active': status.upper() in ['ACTIVE', 'MATURE']
-                })
-                existing.metadata = metadata
+                existing.last_sync_at = current_time
+                existing.sync_count = (existing.sync_count or 0) + 1
+                existing.plaid_raw_data = plaid_recurring
                 
                 db.add(existing)
                 logger.info(f"Updated recurring transaction: {description} for account {account.name}")
@@ -228,23 +264,20 @@ class PlaidWebhookService:
                     user_id=account.user_id,
                     account_id=account.id,
                     plaid_recurring_transaction_id=stream_id,
+                    plaid_account_id=account.plaid_account_id,
                     description=description,
                     merchant_name=merchant_name,
                     amount_cents=amount_cents,
                     currency=currency,
-                    frequency=frequency,
-                    status=status,
+                    plaid_frequency=frequency,
+                    plaid_status=status,
+                    plaid_category=categories or None,
                     last_amount_cents=last_amount_cents,
                     last_date=last_date,
-                    plaid_categories=categories,
-                    metadata={
-                        'personal_finance_category': personal_finance_category,
-                        'first_sync': current_time.isoformat(),
-                        'is_active': status.upper() in ['ACTIVE', 'MATURE']
-                    },
-                    is_active=status.upper() in ['ACTIVE', 'MATURE'],
-                    created_at=current_time,
-                    updated_at=current_time
+                    first_detected_at=current_time,
+                    last_sync_at=current_time,
+                    sync_count=1,
+                    plaid_raw_data=plaid_recurring
                 )
                 
                 db.add(recurring_txn)
@@ -265,7 +298,7 @@ class PlaidWebhookService:
             
             logger.info(f"Processing Plaid webhook: {webhook_type}.{webhook_code} for item {item_id}")
             
-            if webhook_type == 'TRANSACTIONS':
+            if webhook_type in ('TRANSACTIONS', 'RECURRING_TRANSACTIONS'):
                 return await self._handle_transactions_webhook(webhook_data, db)
             elif webhook_type == 'ITEM':
                 return await self._handle_item_webhook(webhook_data, db)
@@ -291,13 +324,15 @@ class PlaidWebhookService:
             logger.warning(f"No accounts found for item_id: {item_id}")
             return {"success": True, "message": "No accounts found for webhook"}
         
-        if webhook_code in ['INITIAL_UPDATE', 'HISTORICAL_UPDATE', 'DEFAULT_UPDATE']:
-            # Trigger transaction sync for affected accounts
-            user_id = str(accounts[0].user_id)
+        if webhook_code in ['SYNC_UPDATES_AVAILABLE', 'INITIAL_UPDATE', 'HISTORICAL_UPDATE', 'DEFAULT_UPDATE']:
+            # Pull only this item's deltas via its /transactions/sync cursor
+            from app.services.transaction_sync_service import transaction_sync_service
             
             try:
-                sync_result = await plaid_transaction_service.sync_transactions_for_user(db, user_id)
-                logger.info(f"Webhook triggered transaction sync for user {user_id}: {sync_result.get('total_new_transactions', 0)} new transactions")
+                sync_result = await transaction_sync_service.sync_transactions_for_item(db, item_id)
+                if not sync_result.get('success'):
+                    return {"success": False, "error": sync_result.get('error')}
+                logger.info(f"Webhook triggered incremental sync for item {item_id}: {sync_result.get('total_new_transactions', 0)} new transactions")
                 
                 return {"success": True, "sync_result": sync_result}
             
@@ -305,8 +340,54 @@ class PlaidWebhookService:
                 logger.error(f"Failed to sync transactions from webhook: {e}")
                 return {"success": False, "error": str(e)}
         
+        if webhook_code == 'RECURRING_TRANSACTIONS_UPDATE':
+            # Refresh this item's persisted streams; insight reads never call Plaid
+            from app.services.recurring_insights_service import recurring_insights_service
+            
+            result = await recurring_insights_service.refresh(accounts[0].user_id, item_ids=[item_id])
+            if result is None:
+                return {"success": True, "message": f"Recurring refresh already running for item {item_id}"}
+
+            if result.get('success'):
+                try:
+                    event = WebSocketEvent(
+                        type=EventType.NOTIFICATION,
+                        data={
+                            "type": "recurring_transactions_updated",
+                            "title": "Recurring Transactions Updated",
+                            "message": f"Found {result.get('new_recurring_transactions', 0)} new and updated {result.get('updated_recurring_transactions', 0)} existing recurring transactions",
+                            "timestamp": datetime.now(timezone.utc).isoformat()
+                        }
+                    )
+                    await websocket_manager.send_to_user(str(accounts[0].user_id), event.to_dict())
+                except Exception as e:
+                    logger.error(f"Failed to send recurring transactions notification: {e}")
+            return {"success": result.get('success', False), "sync_result": result}
+        
+        if webhook_code == 'TRANSACTIONS_REMOVED':
+            return self._handle_removed_transactions(webhook_data.get('removed_transactions', []), db)
+        
         return {"success": True, "message": f"Transactions webhook {webhook_code} acknowledged"}
     
+    def _handle_removed_transactions(self, removed_transactions: List[Dict[str, Any]], db: Session) -> Dict[str, Any]:
+        """Mark transactions Plaid reports as removed"""
+        from app.models.transaction import Transaction
+        
+        plaid_ids = [txn.get('transaction_id') for txn in removed_transactions if txn.get('transaction_id')]
+        if not plaid_ids:
+            return {"success": True, "removed": 0}
+        
+        transactions = db.query(Transaction).filter(Transaction.plaid_transaction_id.in_(plaid_ids)).all()
+        for transaction in transactions:
+            logger.info(f"Marking transaction as removed: {transaction.plaid_transaction_id}")
+            transaction.status = "removed"
+            transaction.metadata_json = {**(transaction.metadata_json or {}), "removed_by_webhook": True}
+            db.add(transaction)
+        
+        db.commit()
+        logger.info(f"Processed {len(plaid_ids)} removed transactions")
+        return {"success": True, "removed": len(transactions)}
+    
     async def _handle_item_webhook(self, webhook_data: Dict[str, Any], db: Session) -> Dict[str, Any]:
         """Handle ITEM webhook events"""
         webhook_code = webhook_data.get('webhook_code')
@@ -0,0 +1,239 @@
+"""
+Recurring Insights Service
+Serves recurring-transaction insights from persisted Plaid streams through a Redis cache
+"""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.redis_client import redis_client
+from app.models.account import Account
+from app.models.plaid_recurring_transaction import PlaidRecurringTransaction
+
+logger = logging.getLogger(__name__)
+
+
+class RecurringInsightsService:
+    """
+    Read path for recurring-transaction insights.
+
+    Reads never call Plaid. Insights are built from the persisted
+    plaid_recurring_transactions rows and cached in Redis per user; the sync
+    drops that entry whenever it writes. Every response says how fresh the
+    streams are, and a stale read (last sync older than
+    RECURRING_INSIGHTS_STALE_AFTER_SECONDS) or a RECURRING_TRANSACTIONS_UPDATE
+    webhook schedules a background refresh, at most one per user and scope.
+    """
+
+    CACHE_KEY = "recurring_insights:{user_id}"
+    REFRESHED_KEY = "recurring_insights_refreshed:{user_id}"
+    LOCK_KEY = "recurring_insights_refresh:{user_id}:{scope}"
+    LOCK_TIMEOUT_SECONDS = 300
+
+    def __init__(self):
+        self._tasks: Set[asyncio.Task] = set()
+        # In-process guard, also used when Redis is unavailable
+        self._refreshing: Set[str] = set()
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    async def get_insights(
+        self,
+        db: Session,
+        user_id: UUID,
+        account_id: Optional[UUID] = None,
+        refresh: bool = False
+    ) -> Dict[str, Any]:
+        """Cached insights with freshness metadata; schedules a refresh when stale or asked to"""
+        cache_key = self.CACHE_KEY.format(user_id=user_id)
+        snapshot = await redis_client.get_cache(cache_key)
+        cache_hit = isinstance(snapshot, dict)
+        if not cache_hit:
+            snapshot = await self.build_snapshot(db, user_id)
+            await redis_client.set_cache(cache_key, snapshot, settings.RECURRING_INSIGHTS_CACHE_TTL_SECONDS)
+
+        streams = snapshot["recurring_transactions"]
+        if account_id:
+            streams = [stream for stream in streams if stream["account_id"] == str(account_id)]
+
+        is_stale = snapshot["has_plaid_accounts"] and self.is_stale(snapshot["last_synced_at"])
+        refresh_scheduled = False
+        if snapshot["has_plaid_accounts"] and (refresh or is_stale):
+            refresh_scheduled = await self.schedule_refresh(user_id)
+
+        return {
+            "recurring_transactions": streams,
+            "summary": self.summarize(streams),
+            "freshness": {
+                "generated_at": snapshot["generated_at"],
+                "last_synced_at": snapshot["last_synced_at"],
+                "is_stale": is_stale,
+                "cache_hit": cache_hit,
+                "refresh_scheduled": refresh_scheduled,
+            },
+        }
+
+    async def build_snapshot(self, db: Session, user_id: UUID) -> Dict[str, Any]:
+        """JSON-ready view of a user's persisted recurring streams"""
+        rows = db.query(PlaidRecurringTransaction).filter(
+            PlaidRecurringTransaction.user_id == user_id
+        ).order_by(PlaidRecurringTransaction.amount_cents.desc()).all()
+
+        has_plaid_accounts = db.query(Account.id).filter(
+            Account.user_id == user_id,
+            Account.plaid_access_token_encrypted.isnot(None)
+        ).first() is not None
+
+        # A refresh that found nothing still counts as fresh data
+        sync_times = [self._as_utc(row.last_sync_at) for row in rows if row.last_sync_at]
+        marker = await redis_client.get_cache(self.REFRESHED_KEY.format(user_id=user_id))
+        if isinstance(marker, dict) and marker.get("refreshed_at"):
+            sync_times.append(datetime.fromisoformat(marker["refreshed_at"]))
+
+        return {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "last_synced_at": max(sync_times).isoformat() if sync_times else None,
+            "has_plaid_accounts": has_plaid_accounts,
+            "recurring_transactions": [self.serialize(row) for row in rows],
+        }
+
+    def serialize(self, row: PlaidRecurringTransaction) -> Dict[str, Any]:
+        return {
+            "id": str(row.id),
+            "account_id": str(row.account_id),
+            "stream_id": row.plaid_recurring_transaction_id,
+            "description": row.description,
+            "merchant_name": row.merchant_name,
+            "amount_cents": row.amount_cents,
+            "currency": row.currency,
+            "frequency": row.plaid_frequency,
+            "status": row.plaid_status,
+            "category": row.plaid_category,
+            "last_amount_cents": row.last_amount_cents,
+            "last_date": row.last_date.isoformat() if row.last_date else None,
+            "is_muted": row.is_muted,
+            "is_mature": row.is_mature,
+            "monthly_estimated_amount_cents": row.monthly_estimated_amount_cents,
+            "last_sync_at": self._as_utc(row.last_sync_at).isoformat() if row.last_sync_at else None,
+        }
+
+    def summarize(self, streams: List[Dict[str, Any]]) -> Dict[str, Any]:
+        active = [stream for stream in streams if not stream["is_muted"]]
+        return {
+            "total_count": len(streams),
+            "active_count": len(active),
+            "muted_count": len(streams) - len(active),
+            "mature_count": sum(1 for stream in streams if stream["is_mature"]),
+            "monthly_estimated_total_cents": sum(stream["monthly_estimated_amount_cents"] for stream in active),
+            "by_frequency": dict(Counter(stream["frequency"] for stream in streams)),
+        }
+
+    def is_stale(self, last_synced_at: Optional[str], now: Optional[datetime] = None) -> bool:
+        if not last_synced_at:
+            return True
+        now = now or datetime.now(timezone.utc)
+        age = now - datetime.fromisoformat(last_synced_at)
+        return age.total_seconds() > settings.RECURRING_INSIGHTS_STALE_AFTER_SECONDS
+
+    async def invalidate(self, user_id: UUID) -> None:
+        await redis_client.delete_cache(self.CACHE_KEY.format(user_id=user_id))
+
+    # ------------------------------------------------------------------
+    # Refreshes
+    # ------------------------------------------------------------------
+
+    async def schedule_refresh(self, user_id: UUID, item_ids: Optional[List[str]] = None) -> bool:
+        """Start a background refresh; False if one for the same scope is already running"""
+        lock_key = self._lock_key(user_id, item_ids)
+        if not await self._acquire_refresh_lock(lock_key):
+            return False
+
+        task = asyncio.get_running_loop().create_task(self._run_scheduled(lock_key, user_id, item_ids))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def refresh(self, user_id: UUID, item_ids: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """Refresh now and return the sync result; None if one for the same scope is already running"""
+        lock_key = self._lock_key(user_id, item_ids)
+        if not await self._acquire_refresh_lock(lock_key):
+            return None
+        try:
+            return await self._sync(user_id, item_ids)
+        finally:
+            await self._release_refresh_lock(lock_key)
+
+    async def _run_scheduled(self, lock_key: str, user_id: UUID, item_ids: Optional[List[str]]):
+        try:
+            result = await self._sync(user_id, item_ids)
+            logger.info(
+                f"Background recurring refresh for user {user_id}: "
+                f"{result.get('new_recurring_transactions', 0)} new, {result.get('updated_recurring_transactions', 0)} updated"
+            )
+        except Exception as e:
+            logger.error(f"Background recurring refresh failed for user {user_id}: {e}")
+        finally:
+            await self._release_refresh_lock(lock_key)
+
+    async def _sync(self, user_id: UUID, item_ids: Optional[List[str]]) -> Dict[str, Any]:
+        """Sync on a dedicated session; the request's session is gone by the time this runs"""
+        from app.database import SessionLocal
+        from app.services.plaid_webhook_service import plaid_webhook_service
+
+        db = SessionLocal()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("SET LOCAL app.current_user_id = :user_id"), {"user_id": str(user_id)})
+            result = await plaid_webhook_service.sync_recurring_transactions_for_user(db, user_id, item_ids)
+        finally:
+            db.close()
+
+        if result.get("success") and not item_ids:
+            await redis_client.set_cache(
+                self.REFRESHED_KEY.format(user_id=user_id),
+                {"refreshed_at": datetime.now(timezone.utc).isoformat()},
+                settings.RECURRING_INSIGHTS_STALE_AFTER_SECONDS
+            )
+            await self.invalidate(user_id)
+        return result
+
+    def _lock_key(self, user_id: UUID, item_ids: Optional[List[str]]) -> str:
+        scope = ",".join(sorted(item_ids)) if item_ids else "all"
+        return self.LOCK_KEY.format(user_id=user_id, scope=scope)
+
+    async def _acquire_refresh_lock(self, lock_key: str) -> bool:
+        if lock_key in self._refreshing:
+            return False
+        try:
+            conn = await redis_client.get_connection()
+            acquired = await conn.set(lock_key, "1", nx=True, ex=self.LOCK_TIMEOUT_SECONDS)
+            await conn.close()
+            if not acquired:
+                return False
+        except Exception as e:
+            logger.warning(f"Redis unavailable for refresh lock {lock_key}, using in-process lock: {e}")
+        self._refreshing.add(lock_key)
+        return True
+
+    async def _release_refresh_lock(self, lock_key: str):
+        self._refreshing.discard(lock_key)
+        await redis_client.delete_cache(lock_key)
+
+    @staticmethod
+    def _as_utc(value: datetime) -> datetime:
+        # Sync columns are naive UTC
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+# Create singleton instance
+recurring_insights_service = RecurringInsightsService()
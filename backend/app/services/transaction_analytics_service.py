@@ -12,6 +12,7 @@ from sqlalchemy import or_
 from uuid import UUID
 
 from app.models.transaction import Transaction
+from app.services.transaction_rollup_service import transaction_rollup_service, ALL_CATEGORIES
 
 logger = logging.getLogger(__name__)
 
@@ -35,49 +36,26 @@ class TransactionAnalyticsService:
         if not end_date:
             end_date = datetime.now()
 
-        query = db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_date >= start_date,
-            Transaction.transaction_date <= end_date
-        )
-
-        # Get all transactions in the period
-        transactions = query.all()
+        totals = transaction_rollup_service.get_totals(db, user_id, start_date, end_date)
+        category_totals = transaction_rollup_service.get_category_totals(db, user_id, start_date, end_date)
 
         # Calculate totals (convert from cents to dollars)
-        total_income = sum(t.amount_cents for t in transactions if t.amount_cents > 0) / 100.0
-        total_expenses = sum(abs(t.amount_cents) for t in transactions if t.amount_cents < 0) / 100.0
+        total_income = totals['income_cents'] / 100.0
+        total_expenses = totals['expense_cents'] / 100.0
         net_amount = total_income - total_expenses
 
-        # Get category breakdown
-        category_stats = {}
-        for transaction in transactions:
-            # Try to get category name if there's a relationship
-            category_name = "Uncategorized"  # Default name
-            if hasattr(transaction, 'category') and transaction.category:
-                category_name = transaction.category.name
-            elif transaction.category_id:
-                category_name = f"Category {transaction.category_id}"
-            
-            if category_name not in category_stats:
-                category_stats[category_name] = {
-                    "total_amount": 0,
-                    "transaction_count": 0,
-                    "category_name": category_name
-                }
-            category_stats[category_name]["total_amount"] += abs(transaction.amount_cents / 100.0)
-            category_stats[category_name]["transaction_count"] += 1
-
-        # Convert to list and calculate percentages
+        # Category breakdown - absolute amounts of all transactions in each category
         category_breakdown = []
         total_for_percentage = total_expenses if total_expenses > 0 else 1  # Avoid division by zero
         
-        for category, stats in category_stats.items():
-            percentage = (stats["total_amount"] / total_for_percentage) * 100
+        for stats in category_totals:
+            category_name = stats['category_name'] or "Uncategorized"
+            total_amount = (stats['income_cents'] + stats['expense_cents']) / 100.0
+            percentage = (total_amount / total_for_percentage) * 100
             category_breakdown.append({
-                "category_name": category,
-                "total_amount": stats["total_amount"],
-                "transaction_count": stats["transaction_count"],
+                "category_name": category_name,
+                "total_amount": total_amount,
+                "transaction_count": stats['transaction_count'],
                 "percentage": round(percentage, 2)
             })
 
@@ -98,7 +76,7 @@ class TransactionAnalyticsService:
                 "total_income": total_income,
                 "total_expenses": total_expenses,
                 "net_amount": net_amount,
-                "transaction_count": len(transactions)
+                "transaction_count": totals['transaction_count']
             },
             "category_breakdown": category_breakdown,
             "recent_transactions": [
@@ -124,6 +102,51 @@ class TransactionAnalyticsService:
     ) -> Dict[str, Any]:
         """Get transaction summary statistics matching the frontend TransactionSummary interface"""
         
+        # Free-text search cannot be answered from rollups; fall back to row scans
+        if search_query:
+            return TransactionAnalyticsService._get_transaction_summary_from_rows(
+                db, user_id, start_date, end_date, category_id, search_query
+            )
+        
+        rollup_category = ALL_CATEGORIES
+        if category_id:
+            rollup_category = None if category_id == '__uncategorized__' else category_id
+        
+        totals = transaction_rollup_service.get_totals(db, user_id, start_date, end_date, rollup_category)
+        category_totals = transaction_rollup_service.get_category_totals(
+            db, user_id, start_date, end_date, rollup_category
+        )
+        
+        category_stats = {
+            str(c['category_id']) if c['category_id'] else "uncategorized": {
+                "categoryId": str(c['category_id']) if c['category_id'] else "uncategorized",
+                "categoryName": c['category_name'] or "Uncategorized",
+                "totalAmount": (c['income_cents'] + c['expense_cents']) / 100.0,
+                "transactionCount": c['transaction_count']
+            }
+            for c in category_totals
+        }
+        
+        return TransactionAnalyticsService._build_transaction_summary(
+            total_income=totals['income_cents'] / 100.0,
+            total_expenses=totals['expense_cents'] / 100.0,
+            transaction_count=totals['transaction_count'],
+            income_count=totals['income_count'],
+            expense_count=totals['expense_count'],
+            category_stats=category_stats
+        )
+
+    @staticmethod
+    def _get_transaction_summary_from_rows(
+        db: Session, 
+        user_id: UUID, 
+        start_date: Optional[date] = None, 
+        end_date: Optional[date] = None, 
+        category_id: Optional[UUID] = None, 
+        search_query: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Row-scanning summary used when filters cannot be served from rollups"""
+        
         # Build base query
         query = db.query(Transaction).filter(Transaction.user_id == user_id)
         
@@ -149,15 +172,8 @@ class TransactionAnalyticsService:
         # Get all matching transactions
         transactions = query.all()
         
-        # Calculate summary statistics
-        total_income = sum(t.amount_cents for t in transactions if t.amount_cents > 0) / 100.0
-        total_expenses = sum(abs(t.amount_cents) for t in transactions if t.amount_cents < 0) / 100.0
-        net_amount = total_income - total_expenses
-        transaction_count = len(transactions)
-        
         # Calculate category breakdown
         category_stats = {}
-        total_for_percentage = total_expenses if total_expenses > 0 else 1
         
         for transaction in transactions:
             # Get category info (assuming there's a relationship)
@@ -179,9 +195,31 @@ class TransactionAnalyticsService:
             category_stats[category_id_str]["totalAmount"] += abs(transaction.amount_cents) / 100.0
             category_stats[category_id_str]["transactionCount"] += 1
         
+        return TransactionAnalyticsService._build_transaction_summary(
+            total_income=sum(t.amount_cents for t in transactions if t.amount_cents > 0) / 100.0,
+            total_expenses=sum(abs(t.amount_cents) for t in transactions if t.amount_cents < 0) / 100.0,
+            transaction_count=len(transactions),
+            income_count=sum(1 for t in transactions if t.amount_cents > 0),
+            expense_count=sum(1 for t in transactions if t.amount_cents < 0),
+            category_stats=category_stats
+        )
+
+    @staticmethod
+    def _build_transaction_summary(
+        total_income: float,
+        total_expenses: float,
+        transaction_count: int,
+        income_count: int,
+        expense_count: int,
+        category_stats: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Shape summary statistics for the frontend TransactionSummary interface"""
+        net_amount = total_income - total_expenses
+        total_for_percentage = total_expenses if total_expenses > 0 else 1
+        
         # Convert to list and add percentages
         category_breakdown = []
-        for category_id_str, stats in category_stats.items():
+        for stats in category_stats.values():
             percentage = (stats["totalAmount"] / total_for_percentage) * 100 if total_for_percentage > 0 else 0
             category_breakdown.append({
                 "categoryId": stats["categoryId"],
@@ -194,9 +232,6 @@ class TransactionAnalyticsService:
         # Sort by total amount descending
         category_breakdown.sort(key=lambda x: x["totalAmount"], reverse=True)
         
-        # Calculate additional statistics  
-        income_count = sum(1 for t in transactions if t.amount_cents > 0)
-        expense_count = sum(1 for t in transactions if t.amount_cents < 0)
         average_transaction = (total_income + total_expenses) / transaction_count if transaction_count > 0 else 0
         
         return {
@@ -231,25 +266,20 @@ class TransactionAnalyticsService:
         else:  # monthly
             start_date = now - timedelta(days=365)  # Last 12 months
 
-        query = db.query(Transaction).filter(
-            Transaction.user_id == user_id,
-            Transaction.transaction_date >= start_date
-        )
-
-        transactions = query.all()
+        daily_totals = transaction_rollup_service.get_daily_totals(db, user_id, start_date.date())
 
         # Group by time period
         trends = {}
-        for transaction in transactions:
+        for day, income_cents, expense_cents in daily_totals:
             if period == "weekly":
                 # Get week number and year
-                year = transaction.transaction_date.year
-                week = transaction.transaction_date.isocalendar()[1]
+                year = day.year
+                week = day.isocalendar()[1]
                 key = f"{year}-W{week:02d}"
-                display_date = transaction.transaction_date.strftime("%Y-W%U")
+                display_date = day.strftime("%Y-W%U")
             else:  # monthly
-                key = transaction.transaction_date.strftime("%Y-%m")
-                display_date = transaction.transaction_date.strftime("%Y-%m")
+                key = day.strftime("%Y-%m")
+                display_date = day.strftime("%Y-%m")
 
             if key not in trends:
                 trends[key] = {
@@ -259,10 +289,8 @@ class TransactionAnalyticsService:
                     "net": 0
                 }
 
-            if transaction.amount_cents > 0:
-                trends[key]["income"] += transaction.amount_cents / 100.0
-            else:
-                trends[key]["expenses"] += abs(transaction.amount_cents / 100.0)
+            trends[key]["income"] += income_cents / 100.0
+            trends[key]["expenses"] += expense_cents / 100.0
             trends[key]["net"] = trends[key]["income"] - trends[key]["expenses"]
 
         # Convert to sorted list
@@ -281,71 +309,62 @@ class TransactionAnalyticsService:
     ) -> Dict[str, Any]:
         """Get detailed category spending analysis"""
         
-        # Build query with date filtering
-        query = db.query(Transaction).filter(Transaction.user_id == user_id)
+        # Category totals come from rollups; only the top categories' rows are loaded
+        category_totals = [
+            c for c in transaction_rollup_service.get_category_totals(db, user_id, start_date, end_date)
+            if c['expense_cents'] > 0
+        ]
+        total_expenses = sum(c['expense_cents'] for c in category_totals) / 100.0
         
-        if start_date:
-            query = query.filter(Transaction.transaction_date >= start_date)
-        if end_date:
-            query = query.filter(Transaction.transaction_date <= end_date)
-        
-        transactions = query.all()
+        top_categories = sorted(category_totals, key=lambda c: c['expense_cents'], reverse=True)[:limit]
         
-        # Group by category
         category_analysis = {}
-        total_expenses = 0
+        for c in top_categories:
+            category_key = str(c['category_id']) if c['category_id'] else "uncategorized"
+            total_amount = c['expense_cents'] / 100.0
+            category_analysis[c['category_id']] = {
+                "category_id": category_key,
+                "category_name": c['category_name'] or "Uncategorized",
+                "total_amount": total_amount,
+                "transaction_count": c['expense_count'],
+                "average_amount": total_amount / c['expense_count'] if c['expense_count'] > 0 else 0,
+                "transactions": [],
+                "percentage": (total_amount / total_expenses) * 100 if total_expenses > 0 else 0
+            }
         
-        for transaction in transactions:
-            if transaction.amount_cents >= 0:  # Skip income
-                continue
-                
-            category_name = "Uncategorized"
-            category_id = "uncategorized"
-            
-            if hasattr(transaction, 'category') and transaction.category:
-                category_name = transaction.category.name
-                category_id = str(transaction.category_id)
-            
-            if category_id not in category_analysis:
-                category_analysis[category_id] = {
-                    "category_id": category_id,
-                    "category_name": category_name,
-                    "total_amount": 0,
-                    "transaction_count": 0,
-                    "average_amount": 0,
-                    "transactions": []
-                }
-            
-            amount = abs(transaction.amount_cents) / 100.0
-            category_analysis[category_id]["total_amount"] += amount
-            category_analysis[category_id]["transaction_count"] += 1
-            category_analysis[category_id]["transactions"].append({
-                "id": str(transaction.id),
-                "amount": amount,
-                "description": transaction.description,
-                "date": transaction.transaction_date.isoformat(),
-                "merchant": transaction.merchant
-            })
+        if category_analysis:
+            category_ids = [cid for cid in category_analysis if cid is not None]
+            category_filter = Transaction.category_id.in_(category_ids)
+            if None in category_analysis:
+                category_filter = or_(category_filter, Transaction.category_id.is_(None))
             
-            total_expenses += amount
-        
-        # Calculate averages and percentages
-        for category_data in category_analysis.values():
-            category_data["average_amount"] = (
-                category_data["total_amount"] / category_data["transaction_count"]
-                if category_data["transaction_count"] > 0 else 0
-            )
-            category_data["percentage"] = (
-                (category_data["total_amount"] / total_expenses) * 100
-                if total_expenses > 0 else 0
+            query = db.query(
+                Transaction.id,
+                Transaction.category_id,
+                Transaction.amount_cents,
+                Transaction.description,
+                Transaction.transaction_date,
+                Transaction.merchant
+            ).filter(
+                Transaction.user_id == user_id,
+                Transaction.amount_cents < 0,
+                category_filter
             )
+            if start_date:
+                query = query.filter(Transaction.transaction_date >= start_date)
+            if end_date:
+                query = query.filter(Transaction.transaction_date <= end_date)
+            
+            for row in query.all():
+                category_analysis[row.category_id]["transactions"].append({
+                    "id": str(row.id),
+                    "amount": abs(row.amount_cents) / 100.0,
+                    "description": row.description,
+                    "date": row.transaction_date.isoformat(),
+                    "merchant": row.merchant
+                })
         
-        # Sort by total amount and limit results
-        sorted_categories = sorted(
-            category_analysis.values(), 
-            key=lambda x: x["total_amount"], 
-            reverse=True
-        )[:limit]
+        sorted_categories = list(category_analysis.values())
         
         return {
             "total_expenses": total_expenses,
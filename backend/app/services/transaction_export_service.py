@@ -0,0 +1,180 @@
+"""
+Transaction Export Service
+Constant-memory transaction exports streamed from a server-side cursor
+"""
+
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.models.category import Category
+from app.schemas.transaction import TransactionFilter
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "json", "ndjson")
+CSV_FIELDS = ("id", "amount", "category", "description", "transaction_date", "transaction_type", "created_at")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class TransactionExportService:
+    """
+    Streams a user's transactions as CSV, JSON or NDJSON, optionally gzipped.
+
+    Only the exported columns are selected, and rows are pulled through a
+    server-side cursor (stream_results + yield_per), so memory stays flat no
+    matter how many rows are exported. Each batch is encoded into a single
+    chunk of output.
+    """
+
+    def __init__(self, batch_size: int = 2000):
+        self.batch_size = batch_size
+
+    def iter_batches(
+        self,
+        db: Session,
+        user_id: UUID,
+        filters: TransactionFilter,
+        category_name: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Iterator[List[Any]]:
+        """Yield lists of export rows, newest first"""
+        from app.services.transaction_service import TransactionService
+
+        query = db.query(
+            Transaction.id,
+            Transaction.amount_cents,
+            Category.name.label("category_name"),
+            Transaction.description,
+            Transaction.transaction_date,
+            Transaction.created_at,
+            Transaction.updated_at
+        ).outerjoin(Category, Transaction.category_id == Category.id).filter(Transaction.user_id == user_id)
+
+        query = TransactionService._apply_filters(query, filters)
+        if category_name:
+            query = query.filter(Category.name.icontains(category_name, autoescape=True))
+
+        statement = query.order_by(
+            Transaction.transaction_date.desc(), Transaction.id.desc()
+        ).statement.execution_options(stream_results=True, yield_per=batch_size or self.batch_size)
+
+        for partition in db.execute(statement).partitions():
+            yield partition
+
+    def encode(self, batches: Iterable[List[Any]], export_format: str) -> Iterator[str]:
+        """Encode row batches; yields one string per batch (plus framing)"""
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(CSV_FIELDS)
+            yield buffer.getvalue()
+            for batch in batches:
+                buffer.seek(0)
+                buffer.truncate(0)
+                writer.writerows(self._csv_row(row) for row in batch)
+                yield buffer.getvalue()
+            return
+
+        if export_format == "ndjson":
+            for batch in batches:
+                yield "".join(json.dumps(self._json_row(row), separators=(",", ":")) + "\n" for row in batch)
+            return
+
+        # json: a single array, still encoded batch by batch
+        yield "["
+        separator = ""
+        for batch in batches:
+            if not batch:
+                continue
+            yield separator + ",".join(json.dumps(self._json_row(row), separators=(",", ":")) for row in batch)
+            separator = ","
+        yield "]"
+
+    def gzip(self, chunks: Iterable[str]) -> Iterator[bytes]:
+        """Gzip-compress a stream of text chunks incrementally"""
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk.encode("utf-8"))
+            if data:
+                yield data
+        yield compressor.flush()
+
+    def stream_export(
+        self,
+        session_factory: Callable[[], Session],
+        user_id: UUID,
+        filters: TransactionFilter,
+        export_format: str = "csv",
+        compress: bool = False,
+        category_name: Optional[str] = None
+    ) -> Iterator[Any]:
+        """
+        Full export pipeline on its own session.
+
+        The request-scoped session is closed before a StreamingResponse body is
+        consumed, so the export opens (and always closes) a dedicated one with
+        the RLS user context set.
+        """
+        db = session_factory()
+        try:
+            if db.get_bind().dialect.name == "postgresql":
+                db.execute(text("SET LOCAL app.current_user_id = :user_id"), {"user_id": str(user_id)})
+
+            chunks = self.encode(self.iter_batches(db, user_id, filters, category_name), export_format)
+            yield from (self.gzip(chunks) if compress else chunks)
+        except Exception as e:
+            logger.error(f"Transaction export failed for user {user_id}: {e}", exc_info=True)
+            raise
+        finally:
+            db.rollback()
+            db.close()
+
+    def media_type(self, export_format: str, compress: bool) -> str:
+        return "application/gzip" if compress else MEDIA_TYPES[export_format]
+
+    def filename(self, export_format: str, compress: bool) -> str:
+        return f"transactions.{export_format}" + (".gz" if compress else "")
+
+    def _csv_row(self, row) -> tuple:
+        return (
+            str(row.id),
+            abs(row.amount_cents / 100),
+            row.category_name or "",
+            row.description or "",
+            row.transaction_date.strftime("%Y-%m-%d"),
+            "expense" if row.amount_cents < 0 else "income",
+            row.created_at.strftime("%Y-%m-%d %H:%M:%S") if row.created_at else "",
+        )
+
+    def _json_row(self, row) -> Dict[str, Any]:
+        return {
+            "id": str(row.id),
+            "amount": abs(row.amount_cents / 100),
+            "category": row.category_name or "",
+            "description": row.description or "",
+            "transaction_date": row.transaction_date.isoformat(),
+            "transaction_type": "expense" if row.amount_cents < 0 else "income",
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+            "updated_at": row.updated_at.isoformat() if row.updated_at else None,
+        }
+
+
+# Create singleton instance
+transaction_export_service = TransactionExportService()
@@ -0,0 +1,369 @@
+"""
+Transaction Import Service
+Streaming CSV import: incremental parsing, chunked validation, COPY into a
+staging table and a set-based merge into transactions
+"""
+
+import asyncio
+import csv
+import io
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.core.exceptions import ValidationError
+from app.models.account import Account
+from app.models.transaction import Transaction
+from app.services.transaction_rollup_service import transaction_rollup_service
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+REQUIRED_COLUMNS = ("transaction_date", "amount")
+MAX_REPORTED_ERRORS = 100
+STAGING_TABLE = "transaction_import_staging"
+STAGING_COLUMNS = ("id", "account_id", "amount_cents", "currency", "description", "merchant", "transaction_date")
+
+
+@dataclass
+class ImportSummary:
+    """Outcome of a CSV import"""
+    import_id: str
+    total_rows: int = 0
+    imported: int = 0
+    duplicates_skipped: int = 0
+    invalid_rows: int = 0
+    errors: List[str] = field(default_factory=list)
+    first_date: Optional[date] = None
+    last_date: Optional[date] = None
+    duration_seconds: float = 0.0
+
+    def record_error(self, message: str):
+        self.invalid_rows += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["first_date"] = self.first_date.isoformat() if self.first_date else None
+        data["last_date"] = self.last_date.isoformat() if self.last_date else None
+        return data
+
+
+class TransactionImportService:
+    """
+    Imports bank CSV exports without holding the file or its rows in memory.
+
+    Rows are parsed straight off the upload stream and validated in chunks. On
+    PostgreSQL each chunk is COPY'd into a temporary staging table and merged
+    into transactions with one INSERT ... SELECT that skips rows already present
+    (same account, date, amount and description) from earlier imports or syncs.
+    Other dialects insert the validated chunk with executemany. The whole
+    import is one database transaction.
+
+    Parsing and SQL run in a worker thread so a large upload doesn't stall the
+    event loop; only progress callbacks run on it.
+    """
+
+    def __init__(self, chunk_size: int = 5000):
+        self.chunk_size = chunk_size
+
+    async def import_csv(
+        self,
+        db: Session,
+        user_id: UUID,
+        stream: BinaryIO,
+        account_id: Optional[UUID] = None,
+        skip_invalid_rows: bool = False,
+        progress_callback: Optional[ProgressCallback] = None
+    ) -> ImportSummary:
+        """
+        Import a CSV upload for a user.
+
+        Columns: transaction_date (YYYY-MM-DD) and amount are required;
+        description, merchant, currency, transaction_type (income/expense) and
+        account (account name, when account_id isn't given) are optional.
+
+        Raises:
+            ValidationError: On a malformed header, or on invalid rows unless skip_invalid_rows
+        """
+        loop = asyncio.get_running_loop()
+
+        def report(summary: ImportSummary, status: str):
+            if progress_callback is not None:
+                # Wait for each event to go out so progress arrives in order
+                asyncio.run_coroutine_threadsafe(self._report(progress_callback, summary, status), loop).result()
+
+        return await asyncio.to_thread(
+            self._import_csv, db, user_id, stream, account_id, skip_invalid_rows, report
+        )
+
+    def _import_csv(
+        self,
+        db: Session,
+        user_id: UUID,
+        stream: BinaryIO,
+        account_id: Optional[UUID],
+        skip_invalid_rows: bool,
+        report: Callable[[ImportSummary, str], None]
+    ) -> ImportSummary:
+        started = time.monotonic()
+        summary = ImportSummary(import_id=str(uuid4()))
+        accounts = self._load_accounts(db, user_id, account_id)
+
+        reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValidationError(f"CSV is missing required columns: {', '.join(missing)}")
+
+        use_copy = db.get_bind().dialect.name == "postgresql"
+        if use_copy:
+            self._create_staging_table(db)
+
+        try:
+            chunk: List[Dict[str, Any]] = []
+            for row_num, row in enumerate(reader, start=2):  # Row 1 is the header
+                summary.total_rows += 1
+                try:
+                    chunk.append(self._parse_row(row, accounts, account_id))
+                except ValueError as e:
+                    summary.record_error(f"Row {row_num}: {e}")
+
+                if len(chunk) >= self.chunk_size:
+                    self._flush_chunk(db, user_id, chunk, summary, use_copy, skip_invalid_rows, report)
+                    chunk = []
+
+            self._flush_chunk(db, user_id, chunk, summary, use_copy, skip_invalid_rows, report)
+
+            if summary.invalid_rows and not skip_invalid_rows:
+                raise ValidationError(
+                    f"Invalid data in {summary.invalid_rows} CSV rows",
+                    details={"errors": summary.errors}
+                )
+
+            db.commit()
+        except Exception:
+            db.rollback()
+            summary.duration_seconds = round(time.monotonic() - started, 3)
+            report(summary, "failed")
+            raise
+
+        summary.duration_seconds = round(time.monotonic() - started, 3)
+        logger.info(
+            f"CSV import {summary.import_id} for user {user_id}: {summary.imported} imported, "
+            f"{summary.duplicates_skipped} duplicates, {summary.invalid_rows} invalid in {summary.duration_seconds}s"
+        )
+        report(summary, "completed")
+        return summary
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def _load_accounts(self, db: Session, user_id: UUID, account_id: Optional[UUID]) -> Dict[str, UUID]:
+        """Lower-cased account name -> id for the user's active accounts"""
+        accounts = db.query(Account.id, Account.name).filter(
+            Account.user_id == user_id,
+            Account.is_active == True
+        ).all()
+        if account_id and account_id not in {acc_id for acc_id, _ in accounts}:
+            raise ValidationError("Account not found", details={"account_id": str(account_id)})
+        return {name.strip().lower(): acc_id for acc_id, name in accounts}
+
+    def _parse_row(self, row: Dict[str, Any], accounts: Dict[str, UUID], account_id: Optional[UUID]) -> Dict[str, Any]:
+        """Validate one CSV row into staging values; raises ValueError with a readable message"""
+        try:
+            amount_cents = int((Decimal(str(row["amount"]).replace(",", "").strip()) * 100).to_integral_value())
+        except (InvalidOperation, TypeError):
+            raise ValueError(f"invalid amount '{row.get('amount')}'")
+
+        transaction_type = (row.get("transaction_type") or "").strip().lower()
+        if transaction_type == "expense":
+            amount_cents = -abs(amount_cents)  # Expenses are stored negative
+        elif transaction_type == "income":
+            amount_cents = abs(amount_cents)
+
+        try:
+            transaction_date = datetime.strptime((row["transaction_date"] or "").strip(), "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError(f"invalid transaction_date '{row.get('transaction_date')}', expected YYYY-MM-DD")
+
+        resolved_account = account_id
+        if resolved_account is None:
+            account_name = (row.get("account") or "").strip().lower()
+            if account_name:
+                resolved_account = accounts.get(account_name)
+                if resolved_account is None:
+                    raise ValueError(f"unknown account '{row.get('account')}'")
+            elif len(accounts) == 1:
+                resolved_account = next(iter(accounts.values()))
+            else:
+                raise ValueError("account is required when importing into multiple accounts")
+
+        currency = (row.get("currency") or "USD").strip().upper()
+        if len(currency) != 3:
+            raise ValueError(f"invalid currency '{row.get('currency')}'")
+
+        return {
+            "id": uuid4(),
+            "account_id": resolved_account,
+            "amount_cents": amount_cents,
+            "currency": currency,
+            "description": (row.get("description") or "").strip() or "Imported transaction",
+            "merchant": (row.get("merchant") or "").strip()[:200] or None,
+            "transaction_date": transaction_date,
+        }
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _flush_chunk(
+        self,
+        db: Session,
+        user_id: UUID,
+        chunk: List[Dict[str, Any]],
+        summary: ImportSummary,
+        use_copy: bool,
+        skip_invalid_rows: bool,
+        report: Callable[[ImportSummary, str], None]
+    ):
+        # A strict import that already failed only keeps parsing to collect errors
+        if chunk and (skip_invalid_rows or not summary.invalid_rows):
+            if use_copy:
+                inserted_dates = self._merge_via_copy(db, user_id, chunk, summary.import_id)
+            else:
+                inserted_dates = self._merge_via_insert(db, user_id, chunk, summary.import_id)
+
+            summary.imported += len(inserted_dates)
+            summary.duplicates_skipped += len(chunk) - len(inserted_dates)
+            if inserted_dates:
+                transaction_rollup_service.mark_dirty(db, user_id, inserted_dates)
+                chunk_first, chunk_last = min(inserted_dates), max(inserted_dates)
+                summary.first_date = min(filter(None, (summary.first_date, chunk_first)))
+                summary.last_date = max(filter(None, (summary.last_date, chunk_last)))
+
+        report(summary, "processing")
+
+    def _create_staging_table(self, db: Session):
+        db.execute(text(f"""
+            CREATE TEMP TABLE IF NOT EXISTS {STAGING_TABLE} (
+                id uuid NOT NULL,
+                account_id uuid NOT NULL,
+                amount_cents bigint NOT NULL,
+                currency varchar(3) NOT NULL,
+                description text NOT NULL,
+                merchant varchar(200),
+                transaction_date date NOT NULL
+            ) ON COMMIT DROP
+        """))
+
+    def _merge_via_copy(self, db: Session, user_id: UUID, chunk: List[Dict[str, Any]], import_id: str) -> List[date]:
+        """COPY the chunk into staging, then insert the rows not already present"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in chunk:
+            writer.writerow([row[column] if row[column] is not None else "" for column in STAGING_COLUMNS])
+        buffer.seek(0)
+
+        # Raw DBAPI cursor on the session's own connection so COPY joins the same transaction
+        raw_connection = db.connection().connection
+        with raw_connection.cursor() as cursor:
+            cursor.copy_expert(
+                f"COPY {STAGING_TABLE} ({', '.join(STAGING_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+
+        inserted = db.execute(text(f"""
+            INSERT INTO transactions (
+                id, user_id, account_id, amount_cents, currency, description, merchant,
+                transaction_date, status, is_recurring, is_transfer, is_hidden, tags, metadata
+            )
+            SELECT
+                s.id, :user_id, s.account_id, s.amount_cents, s.currency, s.description, NULLIF(s.merchant, ''),
+                s.transaction_date, 'posted', false, false, false, '{{}}',
+                jsonb_build_object('source', 'csv_import', 'import_id', CAST(:import_id AS text))
+            FROM {STAGING_TABLE} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM transactions t
+                WHERE t.account_id = s.account_id
+                  AND t.transaction_date = s.transaction_date
+                  AND t.amount_cents = s.amount_cents
+                  AND t.description = s.description
+                  AND (t.metadata ->> 'import_id') IS DISTINCT FROM CAST(:import_id AS text)
+            )
+            RETURNING transaction_date
+        """), {"user_id": user_id, "import_id": import_id}).scalars().all()
+
+        db.execute(text(f"TRUNCATE {STAGING_TABLE}"))
+        return list(inserted)
+
+    def _merge_via_insert(self, db: Session, user_id: UUID, chunk: List[Dict[str, Any]], import_id: str) -> List[date]:
+        """Portable path: skip rows already present, executemany the rest"""
+        existing = self._existing_keys(db, user_id, chunk, import_id)
+        rows = []
+        for row in chunk:
+            key = (row["account_id"], row["transaction_date"], row["amount_cents"], row["description"])
+            if key in existing:
+                continue
+            rows.append({
+                **row,
+                "user_id": user_id,
+                "status": "posted",
+                "is_recurring": False,
+                "is_transfer": False,
+                "is_hidden": False,
+                "metadata_json": {"source": "csv_import", "import_id": import_id},
+            })
+
+        if rows:
+            db.execute(insert(Transaction), rows)
+        return [row["transaction_date"] for row in rows]
+
+    def _existing_keys(
+        self, db: Session, user_id: UUID, chunk: List[Dict[str, Any]], import_id: str
+    ) -> Set[Tuple[UUID, date, int, str]]:
+        dates = [row["transaction_date"] for row in chunk]
+        existing = db.query(
+            Transaction.account_id,
+            Transaction.transaction_date,
+            Transaction.amount_cents,
+            Transaction.description,
+            Transaction.metadata_json
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.account_id.in_({row["account_id"] for row in chunk}),
+            Transaction.transaction_date.between(min(dates), max(dates))
+        ).all()
+        return {
+            (account_id, day, amount, description)
+            for account_id, day, amount, description, metadata in existing
+            if (metadata or {}).get("import_id") != import_id
+        }
+
+    async def _report(self, progress_callback: Optional[ProgressCallback], summary: ImportSummary, status: str):
+        if progress_callback is None:
+            return
+        try:
+            await progress_callback({
+                "import_id": summary.import_id,
+                "status": status,
+                "processed_rows": summary.total_rows,
+                "imported": summary.imported,
+                "duplicates_skipped": summary.duplicates_skipped,
+                "invalid_rows": summary.invalid_rows,
+            })
+        except Exception as e:
+            logger.warning(f"Failed to report import progress for {summary.import_id}: {e}")
+
+
+# Create singleton instance
+transaction_import_service = TransactionImportService()
@@ -0,0 +1,354 @@
+"""
+Transaction Rollup Service
+Maintains the transaction_daily_rollups table and serves aggregate reads from it
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Any, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from sqlalchemy import event, func, case, insert, delete, text, inspect
+from sqlalchemy.orm import Session
+
+from app.models.transaction import Transaction
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+from app.models.category import Category
+
+logger = logging.getLogger(__name__)
+
+# Columns that change which bucket a transaction lands in, or what it contributes
+_ROLLUP_ATTRIBUTES = ('user_id', 'account_id', 'category_id', 'transaction_date', 'amount_cents')
+
+# Sentinel for "do not filter on category" (None means uncategorized)
+ALL_CATEGORIES = object()
+
+
+def _as_date(value) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+class TransactionRollupService:
+    """
+    Keeps per-user daily rollups in step with the transactions table.
+
+    Writes mark (user_id, day) buckets dirty; just before the session commits every
+    dirty day is re-aggregated from `transactions` inside the same database
+    transaction. Recomputing whole days instead of applying +/- deltas keeps the
+    table self-healing and makes repeated refreshes harmless.
+    """
+
+    SESSION_KEY = "transaction_rollup_dirty_days"
+
+    def __init__(self):
+        self.rebuild_batch_days = 31
+        self._listeners_installed = False
+        self._refresh_listeners: List[Callable[[Session, Dict[UUID, Set[date]]], None]] = []
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def mark_dirty(self, db: Session, user_id: UUID, days: Iterable) -> None:
+        """Queue days for refresh at commit; use for writes that bypass the ORM unit of work"""
+        dirty: Dict[UUID, Set[date]] = db.info.setdefault(self.SESSION_KEY, defaultdict(set))
+        for day in days:
+            day = _as_date(day)
+            if day is not None:
+                dirty[user_id].add(day)
+
+    def add_refresh_listener(self, listener: Callable[[Session, Dict[UUID, Set[date]]], None]) -> None:
+        """Call listener(db, {user_id: days}) after dirty days are refreshed, still inside the commit"""
+        if listener not in self._refresh_listeners:
+            self._refresh_listeners.append(listener)
+
+    def refresh_days(self, db: Session, user_id: UUID, days: Iterable) -> int:
+        """Re-aggregate the given days for a user. Returns the number of rollup rows written."""
+        days = sorted({_as_date(d) for d in days if d is not None})
+        if not days:
+            return 0
+
+        # Serialise refreshes per user so concurrent writers cannot interleave delete/insert
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"rollup:{user_id}"})
+
+        rows = db.query(
+            Transaction.transaction_date,
+            Transaction.account_id,
+            Transaction.category_id,
+            func.coalesce(func.sum(case((Transaction.amount_cents > 0, Transaction.amount_cents), else_=0)), 0),
+            func.coalesce(func.sum(case((Transaction.amount_cents < 0, -Transaction.amount_cents), else_=0)), 0),
+            func.count(case((Transaction.amount_cents > 0, 1))),
+            func.count(case((Transaction.amount_cents < 0, 1))),
+            func.count(Transaction.id),
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.transaction_date.in_(days)
+        ).group_by(
+            Transaction.transaction_date,
+            Transaction.account_id,
+            Transaction.category_id
+        ).all()
+
+        db.execute(
+            delete(TransactionDailyRollup).where(
+                TransactionDailyRollup.user_id == user_id,
+                TransactionDailyRollup.rollup_date.in_(days)
+            )
+        )
+
+        if rows:
+            db.execute(insert(TransactionDailyRollup), [
+                {
+                    'id': uuid4(),
+                    'user_id': user_id,
+                    'rollup_date': day,
+                    'account_id': account_id,
+                    'category_id': category_id,
+                    'income_cents': int(income or 0),
+                    'expense_cents': int(expense or 0),
+                    'income_count': income_count,
+                    'expense_count': expense_count,
+                    'transaction_count': count,
+                }
+                for day, account_id, category_id, income, expense, income_count, expense_count, count in rows
+            ])
+
+        return len(rows)
+
+    def flush_dirty(self, db: Session) -> int:
+        """Refresh every day queued on this session"""
+        dirty = db.info.pop(self.SESSION_KEY, None)
+        if not dirty:
+            return 0
+
+        written = 0
+        for user_id, days in dirty.items():
+            written += self.refresh_days(db, user_id, days)
+        logger.debug(f"Refreshed transaction rollups for {len(dirty)} users ({written} rows)")
+
+        # Derived state built on the rollups (e.g. budget usage counters)
+        for listener in self._refresh_listeners:
+            listener(db, dirty)
+        return written
+
+    def rebuild(
+        self,
+        db: Session,
+        user_id: Optional[UUID] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[str, Any]:
+        """Backfill rollups from transactions, committing one batch of days at a time"""
+        user_query = db.query(Transaction.user_id).distinct()
+        if user_id:
+            user_query = user_query.filter(Transaction.user_id == user_id)
+        user_ids = [row[0] for row in user_query.all()]
+
+        users_rebuilt = 0
+        rows_written = 0
+
+        for uid in user_ids:
+            span_query = db.query(
+                func.min(Transaction.transaction_date),
+                func.max(Transaction.transaction_date)
+            ).filter(Transaction.user_id == uid)
+            first_day, last_day = span_query.one()
+            if first_day is None:
+                continue
+
+            first_day = max(first_day, start_date) if start_date else first_day
+            last_day = min(last_day, end_date) if end_date else last_day
+
+            # Drop stale buckets outside the span (e.g. days whose transactions were all deleted)
+            stale = delete(TransactionDailyRollup).where(TransactionDailyRollup.user_id == uid)
+            if start_date:
+                stale = stale.where(TransactionDailyRollup.rollup_date >= start_date)
+            if end_date:
+                stale = stale.where(TransactionDailyRollup.rollup_date <= end_date)
+            db.execute(stale)
+
+            day = first_day
+            while day <= last_day:
+                batch_end = min(day + timedelta(days=self.rebuild_batch_days - 1), last_day)
+                batch = [day + timedelta(days=i) for i in range((batch_end - day).days + 1)]
+                rows_written += self.refresh_days(db, uid, batch)
+                db.commit()
+                day = batch_end + timedelta(days=1)
+
+            db.commit()
+            users_rebuilt += 1
+
+        logger.info(f"Rebuilt transaction rollups for {users_rebuilt} users ({rows_written} rows)")
+        return {'users_rebuilt': users_rebuilt, 'rows_written': rows_written}
+
+    # ------------------------------------------------------------------
+    # Session hooks
+    # ------------------------------------------------------------------
+
+    def install_listeners(self) -> None:
+        """Register session hooks that keep rollups current for ORM writes"""
+        if self._listeners_installed:
+            return
+        event.listen(Session, "after_flush", self._collect_dirty_days)
+        event.listen(Session, "before_commit", self._before_commit)
+        event.listen(Session, "after_soft_rollback", self._discard_dirty_days)
+        self._listeners_installed = True
+
+    def _collect_dirty_days(self, session: Session, flush_context) -> None:
+        for obj in session.new:
+            if isinstance(obj, Transaction):
+                self.mark_dirty(session, obj.user_id, [obj.transaction_date])
+
+        for obj in session.deleted:
+            if isinstance(obj, Transaction):
+                state = inspect(obj)
+                user_id = state.attrs.user_id.history.deleted or [obj.user_id]
+                days = list(state.attrs.transaction_date.history.deleted) + [obj.transaction_date]
+                self.mark_dirty(session, user_id[0], days)
+
+        for obj in session.dirty:
+            if not isinstance(obj, Transaction):
+                continue
+            state = inspect(obj)
+            if not any(state.attrs[name].history.has_changes() for name in _ROLLUP_ATTRIBUTES):
+                continue
+            old_days = list(state.attrs.transaction_date.history.deleted)
+            for old_user in state.attrs.user_id.history.deleted:
+                self.mark_dirty(session, old_user, old_days + [obj.transaction_date])
+            self.mark_dirty(session, obj.user_id, old_days + [obj.transaction_date])
+
+    def _before_commit(self, session: Session) -> None:
+        # before_commit runs ahead of the final flush, so flush to collect pending writes first
+        session.flush()
+        if session.info.get(self.SESSION_KEY):
+            self.flush_dirty(session)
+
+    def _discard_dirty_days(self, session: Session, previous_transaction) -> None:
+        session.info.pop(self.SESSION_KEY, None)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _filtered(self, query, user_id: UUID, start_date: Optional[date], end_date: Optional[date],
+                  category_id=ALL_CATEGORIES):
+        query = query.filter(TransactionDailyRollup.user_id == user_id)
+        if start_date:
+            query = query.filter(TransactionDailyRollup.rollup_date >= _as_date(start_date))
+        if end_date:
+            query = query.filter(TransactionDailyRollup.rollup_date <= _as_date(end_date))
+        if category_id is None:
+            query = query.filter(TransactionDailyRollup.category_id.is_(None))
+        elif category_id is not ALL_CATEGORIES:
+            query = query.filter(TransactionDailyRollup.category_id == category_id)
+        return query
+
+    def get_totals(
+        self,
+        db: Session,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id=ALL_CATEGORIES
+    ) -> Dict[str, int]:
+        """Income/expense cents and counts for a period"""
+        query = db.query(
+            func.coalesce(func.sum(TransactionDailyRollup.income_cents), 0),
+            func.coalesce(func.sum(TransactionDailyRollup.expense_cents), 0),
+            func.coalesce(func.sum(TransactionDailyRollup.income_count), 0),
+            func.coalesce(func.sum(TransactionDailyRollup.expense_count), 0),
+            func.coalesce(func.sum(TransactionDailyRollup.transaction_count), 0),
+        )
+        income, expense, income_count, expense_count, count = self._filtered(
+            query, user_id, start_date, end_date, category_id
+        ).one()
+        return {
+            'income_cents': int(income),
+            'expense_cents': int(expense),
+            'income_count': int(income_count),
+            'expense_count': int(expense_count),
+            'transaction_count': int(count),
+        }
+
+    def get_category_totals(
+        self,
+        db: Session,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_id=ALL_CATEGORIES
+    ) -> List[Dict[str, Any]]:
+        """Per-category totals, with the category name (None for uncategorized)"""
+        query = db.query(
+            TransactionDailyRollup.category_id,
+            Category.name,
+            func.sum(TransactionDailyRollup.income_cents),
+            func.sum(TransactionDailyRollup.expense_cents),
+            func.sum(TransactionDailyRollup.income_count),
+            func.sum(TransactionDailyRollup.expense_count),
+            func.sum(TransactionDailyRollup.transaction_count),
+        ).outerjoin(Category, Category.id == TransactionDailyRollup.category_id)
+        query = self._filtered(query, user_id, start_date, end_date, category_id)
+        rows = query.group_by(TransactionDailyRollup.category_id, Category.name).all()
+        return [
+            {
+                'category_id': cid,
+                'category_name': name,
+                'income_cents': int(income or 0),
+                'expense_cents': int(expense or 0),
+                'income_count': int(income_count or 0),
+                'expense_count': int(expense_count or 0),
+                'transaction_count': int(count or 0),
+            }
+            for cid, name, income, expense, income_count, expense_count, count in rows
+        ]
+
+    def get_daily_totals(
+        self,
+        db: Session,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[Tuple[date, int, int]]:
+        """(day, income_cents, expense_cents) per day, oldest first"""
+        query = db.query(
+            TransactionDailyRollup.rollup_date,
+            func.sum(TransactionDailyRollup.income_cents),
+            func.sum(TransactionDailyRollup.expense_cents),
+        )
+        query = self._filtered(query, user_id, start_date, end_date)
+        rows = query.group_by(TransactionDailyRollup.rollup_date).order_by(TransactionDailyRollup.rollup_date).all()
+        return [(day, int(income or 0), int(expense or 0)) for day, income, expense in rows]
+
+    def get_account_totals(
+        self,
+        db: Session,
+        user_id: UUID,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Dict[UUID, Dict[str, int]]:
+        """Per-account income/expense split for a period"""
+        query = db.query(
+            TransactionDailyRollup.account_id,
+            func.sum(TransactionDailyRollup.income_cents),
+            func.sum(TransactionDailyRollup.expense_cents),
+            func.sum(TransactionDailyRollup.transaction_count),
+        )
+        query = self._filtered(query, user_id, start_date, end_date)
+        return {
+            account_id: {
+                'income_cents': int(income or 0),
+                'expense_cents': int(expense or 0),
+                'transaction_count': int(count or 0),
+            }
+            for account_id, income, expense, count in query.group_by(TransactionDailyRollup.account_id).all()
+        }
+
+
+# Create singleton instance
+transaction_rollup_service = TransactionRollupService()
+transaction_rollup_service.install_listeners()
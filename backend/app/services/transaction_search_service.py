@@ -0,0 +1,145 @@
+"""
+Transaction Search Service
+Indexed full-text and substring search over transactions
+"""
+
+import logging
+import re
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import or_, func, select, literal_column, desc
+from sqlalchemy.orm import Session, joinedload
+
+from app.models.transaction import Transaction
+from app.models.category import Category
+
+logger = logging.getLogger(__name__)
+
+# Generated tsvector column; exists only on PostgreSQL (see add_transaction_search_index)
+SEARCH_VECTOR = literal_column("transactions.search_vector")
+
+# Matches the to_tsvector configuration used by the generated column
+TS_CONFIG = "simple"
+
+MAX_QUERY_TERMS = 8
+
+# Field weights for the non-PostgreSQL ranking, mirroring the tsvector weights (A/B/C)
+FALLBACK_WEIGHTS = (("merchant", 3.0), ("description", 2.0), ("notes", 1.0))
+
+
+class TransactionSearchService:
+    """
+    Transaction search backed by the search_vector tsvector column and pg_trgm
+    GIN indexes on PostgreSQL.
+
+    Word and prefix matches go through the tsvector ("coff" finds "Coffee"),
+    substrings through trigram-indexed ILIKE, and category names through a
+    small sub-select so the transactions scan stays index-driven. Other
+    dialects (SQLite in tests) get the same matching semantics with plain
+    ILIKE and ranking in Python.
+    """
+
+    def tokenize(self, search_query: str) -> List[str]:
+        """Lower-cased word terms usable in a tsquery"""
+        return re.findall(r"\w+", search_query.lower())[:MAX_QUERY_TERMS]
+
+    def build_tsquery(self, terms: List[str]):
+        """Prefix tsquery requiring every term, e.g. 'coff:* & shop:*'"""
+        # Terms are \w+ only, so no tsquery operators can leak in
+        return func.to_tsquery(TS_CONFIG, " & ".join(f"{term}:*" for term in terms))
+
+    def is_postgres(self, db: Session) -> bool:
+        return db.get_bind().dialect.name == "postgresql"
+
+    def apply_search_filter(self, query, search_query: str, db: Session):
+        """Restrict a Transaction query to rows matching search_query"""
+        search_query = search_query.strip()
+        if not search_query:
+            return query
+
+        category_match = Transaction.category_id.in_(
+            select(Category.id).where(Category.name.icontains(search_query, autoescape=True))
+        )
+        substring_match = [
+            Transaction.description.icontains(search_query, autoescape=True),
+            Transaction.merchant.icontains(search_query, autoescape=True),
+            Transaction.notes.icontains(search_query, autoescape=True),
+            category_match,
+        ]
+
+        terms = self.tokenize(search_query)
+        if terms and self.is_postgres(db):
+            return query.filter(or_(SEARCH_VECTOR.op("@@")(self.build_tsquery(terms)), *substring_match))
+        return query.filter(or_(*substring_match))
+
+    def rank_expression(self, search_query: str):
+        """PostgreSQL relevance: full-text rank plus best trigram similarity"""
+        terms = self.tokenize(search_query) or [search_query]
+        return func.ts_rank_cd(SEARCH_VECTOR, self.build_tsquery(terms)) + func.greatest(
+            func.similarity(func.coalesce(Transaction.merchant, ""), search_query),
+            func.similarity(Transaction.description, search_query)
+        )
+
+    def search(
+        self,
+        db: Session,
+        user_id: UUID,
+        search_query: str,
+        filters=None,
+        limit: int = 25,
+        offset: int = 0
+    ) -> Tuple[List[Transaction], int]:
+        """Ranked search; returns (transactions, total) ordered by relevance, then date"""
+        from app.services.transaction_service import TransactionService
+
+        query = db.query(Transaction).filter(Transaction.user_id == user_id)
+        if filters is not None:
+            query = TransactionService._apply_filters(query, filters.model_copy(update={"search_query": None}))
+        query = self.apply_search_filter(query, search_query, db)
+
+        total = query.order_by(None).count()
+        query = query.options(joinedload(Transaction.account), joinedload(Transaction.category))
+
+        if self.is_postgres(db):
+            ranked = query.order_by(
+                desc(self.rank_expression(search_query)),
+                Transaction.transaction_date.desc(),
+                Transaction.id.desc()
+            )
+            return ranked.offset(offset).limit(limit).all(), total
+
+        # Fallback: rank the (small, test-sized) match set in Python
+        matches = query.all()
+        matches.sort(
+            key=lambda t: (self.fallback_score(t, search_query), t.transaction_date, str(t.id)),
+            reverse=True
+        )
+        return matches[offset:offset + limit], total
+
+    def fallback_score(self, transaction: Transaction, search_query: str) -> float:
+        """Weighted term/prefix/substring score used when the tsvector is unavailable"""
+        needle = search_query.strip().lower()
+        terms = self.tokenize(search_query)
+        score = 0.0
+
+        for field, weight in FALLBACK_WEIGHTS:
+            value = (getattr(transaction, field) or "").lower()
+            if not value:
+                continue
+            words = re.findall(r"\w+", value)
+            for term in terms:
+                if term in words:
+                    score += weight
+                elif any(word.startswith(term) for word in words):
+                    score += weight * 0.5
+            if needle and needle in value:
+                score += weight * 0.25
+
+        if transaction.category and needle in (transaction.category.name or "").lower():
+            score += 0.5
+        return score
+
+
+# Create singleton instance
+transaction_search_service = TransactionSearchService()
@@ -1,4 +1,6 @@
 # Standard library imports
+import base64
+import binascii
 import json
 import logging
 from datetime import datetime, timedelta, date
@@ -8,8 +10,11 @@ from uuid import UUID
 
 # Third-party imports
 from fastapi import HTTPException, status
+from cachetools import TTLCache
 from sqlalchemy import or_, and_, func, extract, case, desc
 from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
 # Local imports
 from ..config import settings
@@ -29,13 +34,35 @@ from ..schemas.transaction import (
     TransactionUpdate, 
     TransactionFilter, 
     TransactionPagination, 
-    TransactionResponse
+    TransactionResponse,
+    TransactionCountMode
 )
 from .ml_service import get_ml_client, MLServiceError
 from .merchant_service import merchant_service
+from .transaction_rollup_service import transaction_rollup_service
+from .transaction_search_service import transaction_search_service
 
 logger = logging.getLogger(__name__)
 
+# Below this planner estimate an exact count is cheap enough to run instead
+ESTIMATED_COUNT_EXACT_THRESHOLD = 10_000
+
+# Cached totals for count_mode=estimated, keyed by user and filter set
+_estimated_count_cache: TTLCache[str, int] = TTLCache(maxsize=2048, ttl=300)
+
+class _ExplainJSON(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) of a statement, executed with the statement's own bound parameters"""
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+@compiles(_ExplainJSON, "postgresql")
+def _compile_explain_json(element, compiler, **kw):
+    # Compiling through the dialect keeps the driver's bind style ($n for asyncpg,
+    # %(name)s for psycopg2) and casts such as to_tsquery's REGCONFIG
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 class TransactionService:
     @staticmethod
     async def create_transaction(db: Session, transaction: TransactionCreate, user_id: UUID) -> Transaction:
@@ -209,7 +236,7 @@ class TransactionService:
         """
         try:
             # First verify ownership and get existing transactions in one query
-            existing_transactions = db.query(Transaction.id).filter(
+            existing_transactions = db.query(Transaction.id, Transaction.transaction_date).filter(
                 Transaction.user_id == user_id,
                 Transaction.id.in_(transaction_ids)
             ).all()
@@ -219,6 +246,11 @@ class TransactionService:
             if not existing_ids:
                 return []
             
+            # Query.delete bypasses the ORM unit of work, so queue the rollup refresh by hand
+            transaction_rollup_service.mark_dirty(
+                db, user_id, [tx.transaction_date for tx in existing_transactions]
+            )
+            
             # Perform bulk delete in single query
             num_deleted = db.query(Transaction).filter(
                 Transaction.user_id == user_id,
@@ -236,19 +268,8 @@ class TransactionService:
             raise DataIntegrityError("Failed to delete transactions due to database constraints")
 
     @staticmethod
-    def get_transactions_with_filters(
-        db: Session,
-        user_id: UUID,
-        filters: TransactionFilter,
-        pagination: TransactionPagination
-    ) -> Tuple[List[Transaction], int]:
-        # Use eager loading to prevent N+1 queries
-        query = db.query(Transaction).options(
-            joinedload(Transaction.account),
-            joinedload(Transaction.category)
-        ).join(Transaction.account).filter(Transaction.user_id == user_id)
-
-        # Apply filters
+    def _apply_filters(query, filters: TransactionFilter):
+        """Apply TransactionFilter criteria to a Transaction query"""
         if filters.start_date:
             query = query.filter(Transaction.transaction_date >= filters.start_date)
         if filters.end_date:
@@ -271,92 +292,155 @@ class TransactionService:
         if filters.is_transfer is not None:
             query = query.filter(Transaction.is_transfer == filters.is_transfer)
         if filters.search_query:
-            search = f"%{filters.search_query}%"
-            query = query.filter(
-                or_(
-                    Transaction.description.ilike(search),
-                    Transaction.merchant.ilike(search),
-                    Transaction.notes.ilike(search),
-                    Category.name.ilike(search)
-                )
-            )
+            query = transaction_search_service.apply_search_filter(query, filters.search_query, query.session)
         if filters.tags:
             # Assuming tags is stored as JSON array - adjust based on actual implementation
             for tag in filters.tags:
                 query = query.filter(Transaction.tags.contains([tag]))
+        return query
+
+    @staticmethod
+    def encode_cursor(transaction: Transaction) -> str:
+        """Opaque keyset cursor pointing just past the given transaction"""
+        payload = json.dumps([transaction.transaction_date.isoformat(), str(transaction.id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[date, UUID]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            day, transaction_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return date.fromisoformat(day), UUID(transaction_id)
+        except (ValueError, TypeError, binascii.Error):
+            raise ValidationError("Invalid pagination cursor", details={"cursor": cursor})
+
+    @staticmethod
+    def _count_transactions(
+        db: Session,
+        user_id: UUID,
+        filters: TransactionFilter,
+        count_mode: TransactionCountMode
+    ) -> Tuple[Optional[int], bool]:
+        """Return (total, is_estimate) for the filtered set according to count_mode"""
+        if count_mode == TransactionCountMode.NONE:
+            return None, False
 
-        # Get total count for pagination
-        total_count = query.count()
+        # Count over the bare filtered table - no eager loads or ordering
+        count_query = TransactionService._apply_filters(
+            db.query(Transaction.id).filter(Transaction.user_id == user_id), filters
+        )
+        if count_mode == TransactionCountMode.EXACT:
+            return count_query.count(), False
 
-        # Apply pagination
-        query = query.order_by(Transaction.transaction_date.desc())
-        query = query.offset((pagination.page - 1) * pagination.per_page)
-        query = query.limit(pagination.per_page)
+        cache_key = f"{user_id}:{filters.model_dump_json(exclude={'group_by'})}"
+        cached = _estimated_count_cache.get(cache_key)
+        if cached is not None:
+            return cached, True
 
-        return query.all(), total_count
+        estimate = TransactionService._planner_row_estimate(db, count_query)
+        if estimate is None or estimate < ESTIMATED_COUNT_EXACT_THRESHOLD:
+            # Small (or unknown) result sets are cheap to count exactly
+            total = count_query.count()
+        else:
+            total = estimate
+        _estimated_count_cache[cache_key] = total
+        return total, True
 
     @staticmethod
-    def get_transactions_with_grouping(
+    def _planner_row_estimate(db: Session, query) -> Optional[int]:
+        """PostgreSQL planner row estimate for a query, or None when unavailable"""
+        if db.get_bind().dialect.name != "postgresql":
+            return None
+        try:
+            # A failed EXPLAIN must not abort the request's transaction
+            with db.begin_nested():
+                plan = db.execute(_ExplainJSON(query.statement)).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except Exception as e:
+            logger.warning(f"Could not get planner estimate for transaction count: {e}")
+            return None
+
+    @staticmethod
+    def _fetch_page(
         db: Session,
         user_id: UUID,
         filters: TransactionFilter,
         pagination: TransactionPagination
-    ) -> Dict[str, Any]:
-        """Get transactions with server-side grouping"""
-        from ..schemas.transaction import TransactionGroupBy
-        
-        # Use eager loading to prevent N+1 queries for grouping
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """
+        Fetch one page ordered by (transaction_date, id) descending.
+
+        With a cursor the page starts after the cursor position (keyset), so
+        deep pages cost the same as the first one; otherwise offset is used.
+        """
+        # Use eager loading to prevent N+1 queries
         query = db.query(Transaction).options(
             joinedload(Transaction.account),
             joinedload(Transaction.category)
-        ).join(Transaction.account).filter(Transaction.user_id == user_id)
+        ).filter(Transaction.user_id == user_id)
+        query = TransactionService._apply_filters(query, filters)
 
-        # Apply all the same filters as the regular method
-        if filters.start_date:
-            query = query.filter(Transaction.transaction_date >= filters.start_date)
-        if filters.end_date:
-            query = query.filter(Transaction.transaction_date <= filters.end_date)
-        if filters.category_id:
-            if filters.category_id == '__uncategorized__':
-                query = query.filter(Transaction.category_id.is_(None))
-            else:
-                query = query.filter(Transaction.category_id == filters.category_id)
-        if filters.status:
-            query = query.filter(Transaction.status == filters.status)
-        if filters.min_amount_cents is not None:
-            query = query.filter(Transaction.amount_cents >= filters.min_amount_cents)
-        if filters.max_amount_cents is not None:
-            query = query.filter(Transaction.amount_cents <= filters.max_amount_cents)
-        if filters.account_id:
-            query = query.filter(Transaction.account_id == filters.account_id)
-        if filters.is_recurring is not None:
-            query = query.filter(Transaction.is_recurring == filters.is_recurring)
-        if filters.is_transfer is not None:
-            query = query.filter(Transaction.is_transfer == filters.is_transfer)
-        if filters.search_query:
-            search = f"%{filters.search_query}%"
+        if pagination.cursor:
+            cursor_date, cursor_id = TransactionService.decode_cursor(pagination.cursor)
             query = query.filter(
                 or_(
-                    Transaction.description.ilike(search),
-                    Transaction.merchant.ilike(search),
-                    Transaction.notes.ilike(search),
-                    Category.name.ilike(search)
+                    Transaction.transaction_date < cursor_date,
+                    and_(Transaction.transaction_date == cursor_date, Transaction.id < cursor_id)
                 )
             )
-        if filters.tags:
-            for tag in filters.tags:
-                query = query.filter(Transaction.tags.contains([tag]))
 
-        # Get total count for pagination
-        total_count = query.count()
+        query = query.order_by(Transaction.transaction_date.desc(), Transaction.id.desc())
+        if not pagination.cursor:
+            query = query.offset(pagination.offset)
 
-        # Apply pagination to the query
-        query = query.order_by(Transaction.transaction_date.desc())
-        query = query.offset((pagination.page - 1) * pagination.per_page)
-        query = query.limit(pagination.per_page)
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(pagination.limit + 1).all()
+        transactions = rows[:pagination.limit]
+        next_cursor = TransactionService.encode_cursor(transactions[-1]) if len(rows) > pagination.limit else None
+        return transactions, next_cursor
+
+    @staticmethod
+    def get_transactions_page(
+        db: Session,
+        user_id: UUID,
+        filters: TransactionFilter,
+        pagination: TransactionPagination
+    ) -> Tuple[List[Transaction], Optional[int], Optional[str], bool]:
+        """Return (transactions, total, next_cursor, total_is_estimate)"""
+        transactions, next_cursor = TransactionService._fetch_page(db, user_id, filters, pagination)
+        total_count, is_estimate = TransactionService._count_transactions(
+            db, user_id, filters, pagination.count_mode
+        )
+        return transactions, total_count, next_cursor, is_estimate
+
+    @staticmethod
+    def get_transactions_with_filters(
+        db: Session,
+        user_id: UUID,
+        filters: TransactionFilter,
+        pagination: TransactionPagination
+    ) -> Tuple[List[Transaction], Optional[int]]:
+        transactions, total_count, _, _ = TransactionService.get_transactions_page(
+            db, user_id, filters, pagination
+        )
+        return transactions, total_count
+
+    @staticmethod
+    def get_transactions_with_grouping(
+        db: Session,
+        user_id: UUID,
+        filters: TransactionFilter,
+        pagination: TransactionPagination
+    ) -> Dict[str, Any]:
+        """Get transactions with server-side grouping"""
+        from ..schemas.transaction import TransactionGroupBy
         
-        # Get the transactions
-        transactions = query.all()
+        transactions, next_cursor = TransactionService._fetch_page(db, user_id, filters, pagination)
+        total_count, is_estimate = TransactionService._count_transactions(
+            db, user_id, filters, pagination.count_mode
+        )
         
         # Group the transactions based on group_by parameter
         groups = {}
@@ -396,9 +480,11 @@ class TransactionService:
         return {
             "groups": sorted_groups,
             "total": total_count,
-            "page": pagination.page,
-            "per_page": pagination.per_page,
-            "pages": (total_count + pagination.per_page - 1) // pagination.per_page,
+            "limit": pagination.limit,
+            "offset": pagination.offset,
+            "has_more": next_cursor is not None,
+            "next_cursor": next_cursor,
+            "total_is_estimate": is_estimate,
             "grouped": True
         }
 
@@ -427,51 +513,138 @@ class TransactionService:
         return db_transactions
 
     @staticmethod
-    def stream_transactions_for_export(
-        db: Session, 
-        user_id: UUID, 
-        filters: TransactionFilter, 
-        chunk_size: int = 1000
-    ):
+    async def enrich_transactions_bulk(
+        transactions: List[TransactionCreate],
+        user_id: UUID
+    ) -> Dict[int, float]:
         """
-        Stream transactions in chunks for efficient export processing.
-        Yields batches of transactions to avoid loading all data into memory.
+        Batch counterpart of the enrichment done in create_transaction.
+
+        Recognizes merchants for the whole list in one pass and categorizes
+        uncategorized rows with MLServiceClient.batch_categorize, chunked to the
+        client's configured batch size. Transactions are updated in place.
+
+        Returns:
+            Mapping of list index -> ML confidence for rows that were auto-categorized
         """
-        from sqlalchemy.orm import joinedload
-        
-        # Build base query with filters
-        query = db.query(Transaction).options(
-            joinedload(Transaction.account),
-            joinedload(Transaction.category)
-        ).join(Transaction.account).filter(Transaction.user_id == user_id)
-        
-        # Apply filters (same logic as get_transactions_with_filters)
-        if filters.start_date:
-            query = query.filter(Transaction.transaction_date >= filters.start_date)
-        if filters.end_date:
-            query = query.filter(Transaction.transaction_date <= filters.end_date)
-        if filters.category:
-            query = query.join(Transaction.category).filter(Category.name.ilike(f"%{filters.category}%"))
-        if filters.search_query:
-            search_term = f"%{filters.search_query}%"
-            query = query.filter(
-                or_(
-                    Transaction.description.ilike(search_term),
-                    Transaction.merchant_name.ilike(search_term)
+        # Merchant enrichment for rows without a merchant
+        needs_merchant = [
+            i for i, transaction in enumerate(transactions)
+            if not transaction.merchant and transaction.description
+        ]
+        if needs_merchant:
+            try:
+                recognitions = merchant_service.bulk_recognize_merchants(
+                    [transactions[i].description for i in needs_merchant]
                 )
-            )
-        
-        # Order by transaction_date for consistent export ordering
-        query = query.order_by(desc(Transaction.transaction_date), desc(Transaction.created_at))
-        
-        # Stream in chunks
-        offset = 0
-        while True:
-            chunk = query.offset(offset).limit(chunk_size).all()
-            if not chunk:
-                break
-            yield chunk
-            offset += chunk_size
+                for i, merchant_result in zip(needs_merchant, recognitions):
+                    if merchant_result.recognized_merchant and merchant_result.confidence_score >= 0.6:
+                        transactions[i].merchant = merchant_result.recognized_merchant
+            except Exception as e:
+                logger.warning(f"Bulk merchant enrichment failed: {str(e)}")
+
+        # ML categorization for rows without a category
+        confidences: Dict[int, float] = {}
+        needs_category = [
+            i for i, transaction in enumerate(transactions)
+            if not transaction.category_id and transaction.description
+        ]
+        if not needs_category:
+            return confidences
+
+        ml_client = get_ml_client()
+        chunk_size = max(ml_client.config.batch_size, 1)
+
+        for start in range(0, len(needs_category), chunk_size):
+            chunk = needs_category[start:start + chunk_size]
+            try:
+                ml_response = await ml_client.batch_categorize(
+                    transactions=[
+                        {
+                            "description": transactions[i].description,
+                            "amount_cents": transactions[i].amount_cents,
+                            "merchant": transactions[i].merchant,
+                        }
+                        for i in chunk
+                    ],
+                    user_id=str(user_id)
+                )
+            except Exception as e:
+                logger.warning(f"Unexpected error during batch ML categorization: {str(e)}")
+                continue
+
+            if not ml_response.success or not ml_response.data:
+                error_msg = ml_response.error.message if ml_response.error else "Category prediction service unavailable"
+                logger.warning(f"Batch ML categorization failed: {error_msg}")
+                continue
+
+            results = ml_response.data.results
+            if len(results) != len(chunk):
+                # Results are positional; without a 1:1 response we cannot map them back safely
+                logger.warning(
+                    f"Batch ML categorization returned {len(results)} results for {len(chunk)} transactions; skipping chunk"
+                )
+                continue
+
+            for i, categorization in zip(chunk, results):
+                if categorization.confidence < settings.ML_CONFIDENCE_THRESHOLD:
+                    continue
+                transaction = transactions[i]
+                transaction.category_id = categorization.category_id
+                metadata = transaction.metadata_json or {}
+                metadata.update({
+                    "ml_predicted": True,
+                    "ml_confidence": categorization.confidence,
+                    "ml_reasoning": categorization.reasoning
+                })
+                transaction.metadata_json = metadata
+                confidences[i] = categorization.confidence
+
+        return confidences
+
+    @staticmethod
+    def bulk_insert_transactions(
+        db: Session,
+        user_id: UUID,
+        transactions: List[TransactionCreate],
+        confidences: Optional[Dict[int, float]] = None
+    ) -> List[UUID]:
+        """
+        Write many transactions with a single multi-row
+        INSERT ... ON CONFLICT (plaid_transaction_id) DO NOTHING.
+
+        PostgreSQL only. Does not commit - the caller owns the transaction.
+
+        Returns:
+            IDs of the rows that were actually inserted (conflicting rows are skipped)
+        """
+        from uuid import uuid4
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        if not transactions:
+            return []
+
+        confidences = confidences or {}
+        rows = []
+        for i, transaction in enumerate(transactions):
+            row = transaction.model_dump(exclude={'amount', 'transaction_type'})
+            row['id'] = uuid4()
+            row['user_id'] = user_id
+            row['status'] = getattr(row['status'], 'value', row['status'])
+            row['tags'] = row.get('tags') or []
+            row['confidence_score'] = confidences.get(i)
+            rows.append(row)
+
+        stmt = (
+            pg_insert(Transaction)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[Transaction.plaid_transaction_id])
+            .returning(Transaction.id)
+        )
+        inserted_ids = [row[0] for row in db.execute(stmt).fetchall()]
+        if inserted_ids:
+            transaction_rollup_service.mark_dirty(db, user_id, [row['transaction_date'] for row in rows])
+        return inserted_ids
 
     @staticmethod
     def get_dashboard_analytics(db: Session, user_id: UUID, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Dict[str, Any]:
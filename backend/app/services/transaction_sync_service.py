@@ -12,11 +12,15 @@ import asyncio
 from collections import defaultdict
 
 from app.models.account import Account
+from app.models.goal import GoalContribution
 from app.models.transaction import Transaction
 from app.models.user import User
+from app.models.plaid_sync_cursor import PlaidSyncCursor
+from app.config import settings
 from app.schemas.transaction import TransactionCreate
 from app.services import plaid_service
 from app.services.transaction_service import TransactionService
+from app.services.transaction_rollup_service import transaction_rollup_service
 from app.websocket.manager import redis_websocket_manager as websocket_manager
 from app.websocket.events import WebSocketEvent, EventType
 from app.core.redis_client import redis_client
@@ -34,6 +38,21 @@ class SyncResult:
     sync_duration_seconds: float
     date_range: str
 
+@dataclass
+class IncrementalSyncResult:
+    """Result of a cursor-based /transactions/sync run for one Plaid item"""
+    item_id: str
+    added: int
+    modified: int
+    removed: int
+    new_transactions: int
+    updated_transactions: int
+    duplicates_skipped: int
+    removed_transactions: int
+    errors: List[str]
+    sync_duration_seconds: float
+    cursor_advanced: bool = False
+
 class TransactionSyncService:
     """Service for synchronizing transactions with Plaid"""
     
@@ -46,6 +65,16 @@ class TransactionSyncService:
         self.default_sync_days = 30  # Default sync period for new accounts
         self.batch_size = 100  # Process transactions in batches
         
+        # Bulk ingestion configuration (PostgreSQL only - relies on INSERT ... ON CONFLICT)
+        self.bulk_ingestion_enabled = True
+        self.bulk_ingestion_threshold = 25  # Smaller syncs keep the per-row path
+        self.bulk_batch_size = 500  # Rows per multi-row INSERT
+        
+        # Duplicate detection tolerances for manual <-> Plaid matching
+        self.duplicate_amount_tolerance_cents = 100  # ±$1.00
+        self.duplicate_date_tolerance_days = 2
+        self.duplicate_similarity_threshold = 0.6
+        
         # Lock configuration
         self.lock_timeout_seconds = 300  # 5 minutes timeout for distributed locks
     
@@ -341,6 +370,251 @@ class TransactionSyncService:
             'results': results
         }
     
+    async def sync_item_incremental(self, item_id: str, db: Session) -> IncrementalSyncResult:
+        """
+        Incrementally sync a Plaid item using its stored /transactions/sync cursor.
+        
+        Only the deltas since the last run are fetched. The cursor is advanced after
+        every delta has been applied, so a failed run is replayed from the previous
+        cursor; replays are safe because added rows dedupe on plaid_transaction_id,
+        modifications overwrite and removals are idempotent.
+        """
+        lock_key = f"item:{item_id}"
+        lock_acquired = await self._acquire_sync_lock(lock_key)
+        if not lock_acquired:
+            raise Exception(f"Plaid item {item_id} is already being synced")
+        
+        start_time = datetime.now(timezone.utc)
+        
+        try:
+            accounts = db.query(Account).filter(
+                Account.plaid_item_id == item_id,
+                Account.plaid_access_token_encrypted.isnot(None),
+                Account.is_active == True
+            ).all()
+            
+            if not accounts:
+                raise Exception(f"No active accounts found for item_id: {item_id}")
+            
+            sync_state = self._get_or_create_sync_cursor(db, item_id, accounts[0].user_id)
+            
+            for account in accounts:
+                account.sync_status = 'syncing'
+                db.add(account)
+            db.commit()
+            
+            deltas = await self.plaid_service.fetch_transaction_updates(
+                accounts[0].plaid_access_token,
+                sync_state.cursor,
+                settings.PLAID_SYNC_PAGE_SIZE
+            )
+            
+            result = await self._apply_transaction_deltas(item_id, accounts, deltas, db)
+            
+            # Advance the cursor only once every delta is durable
+            now = datetime.now(timezone.utc)
+            sync_state.cursor = deltas.get('next_cursor') or sync_state.cursor
+            sync_state.last_synced_at = now
+            sync_state.last_added_count = result.added
+            sync_state.last_modified_count = result.modified
+            sync_state.last_removed_count = result.removed
+            sync_state.last_error = None
+            sync_state.sync_metadata = {
+                'pages': deltas.get('pages', 0),
+                'restarts': deltas.get('restarts', 0),
+                'errors': len(result.errors)
+            }
+            db.add(sync_state)
+            
+            for account in accounts:
+                account.sync_status = 'synced'
+                account.last_sync_at = now
+                account.connection_health = 'healthy'
+                account.last_sync_error = None
+                metadata = dict(account.account_metadata or {})
+                metadata['last_transaction_sync'] = now.isoformat()
+                metadata['last_sync_method'] = 'transactions_sync'
+                account.account_metadata = metadata
+                db.add(account)
+            
+            db.commit()
+            
+            result.cursor_advanced = True
+            result.sync_duration_seconds = (datetime.now(timezone.utc) - start_time).total_seconds()
+            
+            logger.info(f"Incremental sync completed for item {item_id}: "
+                       f"{result.added} added, {result.modified} modified, {result.removed} removed")
+            
+            return result
+            
+        except Exception as e:
+            db.rollback()
+            try:
+                sync_state = db.query(PlaidSyncCursor).filter(PlaidSyncCursor.plaid_item_id == item_id).first()
+                if sync_state:
+                    sync_state.last_error = str(e)
+                    db.add(sync_state)
+                for account in db.query(Account).filter(Account.plaid_item_id == item_id).all():
+                    account.sync_status = 'error'
+                    account.last_sync_error = str(e)
+                    account.connection_health = 'failed'
+                    db.add(account)
+                db.commit()
+            except:
+                pass
+            
+            logger.error(f"Incremental sync failed for item {item_id}: {e}")
+            raise
+            
+        finally:
+            await self._release_sync_lock(lock_key)
+    
+    def _get_or_create_sync_cursor(self, db: Session, item_id: str, user_id) -> PlaidSyncCursor:
+        """Load the cursor row for an item, creating an empty one on first sync"""
+        sync_state = db.query(PlaidSyncCursor).filter(PlaidSyncCursor.plaid_item_id == item_id).first()
+        if not sync_state:
+            sync_state = PlaidSyncCursor(user_id=user_id, plaid_item_id=item_id, cursor=None)
+            db.add(sync_state)
+            db.flush()
+        return sync_state
+    
+    async def _apply_transaction_deltas(
+        self,
+        item_id: str,
+        accounts: List[Account],
+        deltas: Dict[str, Any],
+        db: Session
+    ) -> IncrementalSyncResult:
+        """Apply added/modified/removed deltas from /transactions/sync to the ledger"""
+        added = list(deltas.get('added', []))
+        modified = list(deltas.get('modified', []))
+        removed_ids = {
+            r.get('transaction_id') for r in deltas.get('removed', []) if r.get('transaction_id')
+        }
+        
+        result = IncrementalSyncResult(
+            item_id=item_id,
+            added=len(added),
+            modified=len(modified),
+            removed=len(removed_ids),
+            new_transactions=0,
+            updated_transactions=0,
+            duplicates_skipped=0,
+            removed_transactions=0,
+            errors=[],
+            sync_duration_seconds=0
+        )
+        
+        account_map = {acc.plaid_account_id: acc for acc in accounts}
+        account_ids = [acc.id for acc in accounts]
+        
+        # Pending -> posted: Plaid removes the pending id and adds a posted one that
+        # references it. Re-key the existing row so user edits survive the transition.
+        pending_ids = {t['pending_transaction_id'] for t in added if t.get('pending_transaction_id')}
+        if pending_ids:
+            pending_rows = {
+                t.plaid_transaction_id: t for t in db.query(Transaction).filter(
+                    Transaction.account_id.in_(account_ids),
+                    Transaction.plaid_transaction_id.in_(pending_ids)
+                ).all()
+            }
+            remaining = []
+            for plaid_txn in added:
+                existing = pending_rows.get(plaid_txn.get('pending_transaction_id'))
+                account = account_map.get(plaid_txn.get('account_id'))
+                if existing is None or account is None:
+                    remaining.append(plaid_txn)
+                    continue
+                removed_ids.discard(existing.plaid_transaction_id)
+                existing.plaid_transaction_id = plaid_txn.get('transaction_id')
+                self._apply_plaid_update(existing, plaid_txn, account)
+                db.add(existing)
+                result.updated_transactions += 1
+            added = remaining
+        
+        # Modified rows are overwritten in place; unknown ids fall through to the insert path
+        if modified:
+            modified_ids = [t.get('transaction_id') for t in modified]
+            existing_rows = {
+                t.plaid_transaction_id: t for t in db.query(Transaction).filter(
+                    Transaction.account_id.in_(account_ids),
+                    Transaction.plaid_transaction_id.in_(modified_ids)
+                ).all()
+            }
+            for plaid_txn in modified:
+                existing = existing_rows.get(plaid_txn.get('transaction_id'))
+                account = account_map.get(plaid_txn.get('account_id'))
+                if account is None:
+                    continue
+                if existing is None:
+                    added.append(plaid_txn)
+                    continue
+                self._apply_plaid_update(existing, plaid_txn, account)
+                db.add(existing)
+                result.updated_transactions += 1
+        
+        if removed_ids:
+            removed_rows = db.query(Transaction.id, Transaction.transaction_date).filter(
+                Transaction.account_id.in_(account_ids),
+                Transaction.plaid_transaction_id.in_(removed_ids)
+            ).all()
+            if removed_rows:
+                removed_row_ids = [row.id for row in removed_rows]
+                transaction_rollup_service.mark_dirty(
+                    db, accounts[0].user_id, [row.transaction_date for row in removed_rows]
+                )
+                # Query.delete skips the ORM cascade to goal contributions, so remove those first
+                db.query(GoalContribution).filter(
+                    GoalContribution.transaction_id.in_(removed_row_ids)
+                ).delete(synchronize_session=False)
+                result.removed_transactions = db.query(Transaction).filter(
+                    Transaction.id.in_(removed_row_ids)
+                ).delete(synchronize_session=False)
+        
+        db.commit()
+        
+        # New rows reuse the regular per-account ingestion (duplicate matching, bulk insert)
+        added_by_account: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for plaid_txn in added:
+            if plaid_txn.get('account_id') in account_map:
+                added_by_account[plaid_txn['account_id']].append(plaid_txn)
+        
+        for plaid_account_id, plaid_transactions in added_by_account.items():
+            account_result = await self._process_account_transactions(
+                account_map[plaid_account_id], plaid_transactions, db
+            )
+            result.new_transactions += account_result.new_transactions
+            result.updated_transactions += account_result.updated_transactions
+            result.duplicates_skipped += account_result.duplicates_skipped
+            result.errors.extend(account_result.errors)
+        
+        return result
+    
+    def _apply_plaid_update(self, transaction: Transaction, plaid_txn: Dict[str, Any], account: Account):
+        """Overwrite Plaid-owned fields on an existing row, keeping user categorisation"""
+        transaction.amount_cents = self._convert_plaid_amount(
+            float(plaid_txn.get('amount', 0)), account.account_type
+        )
+        transaction.description = plaid_txn.get('name') or transaction.description
+        transaction.status = 'pending' if plaid_txn.get('pending') else 'posted'
+        
+        transaction_date = self._parse_date(plaid_txn.get('date'))
+        if transaction_date:
+            transaction.transaction_date = transaction_date.date()
+        authorized_date = self._parse_date(plaid_txn.get('authorized_date'))
+        if authorized_date:
+            transaction.authorized_date = authorized_date.date()
+        
+        if plaid_txn.get('merchant_name'):
+            transaction.merchant = plaid_txn['merchant_name']
+        if plaid_txn.get('category'):
+            transaction.plaid_category = plaid_txn['category']
+        
+        metadata = dict(transaction.metadata_json or {})
+        metadata['plaid_data'] = plaid_txn
+        metadata['last_plaid_update'] = datetime.now(timezone.utc).isoformat()
+        transaction.metadata_json = metadata
+    
     async def _process_account_transactions(
         self, 
         account: Account, 
@@ -382,6 +656,11 @@ class TransactionSyncService:
         else:
             logger.info(f"   - No existing Plaid transactions found - this should be a fresh sync")
         
+        if self._should_use_bulk_ingestion(db, plaid_transactions):
+            return await self._bulk_process_account_transactions(
+                account, plaid_transactions, existing_plaid_ids, result, db
+            )
+        
         # Process transactions in batches
         logger.info(f"📝 DEBUG: Processing {len(plaid_transactions)} transactions in batches of {self.batch_size}")
         
@@ -450,6 +729,181 @@ class TransactionSyncService:
         
         return result
     
+    def _should_use_bulk_ingestion(
+        self,
+        db: Session,
+        plaid_transactions: List[Dict[str, Any]]
+    ) -> bool:
+        """Decide whether a sync is large enough for the set-based ingestion path"""
+        if not self.bulk_ingestion_enabled or len(plaid_transactions) < self.bulk_ingestion_threshold:
+            return False
+        
+        try:
+            return db.get_bind().dialect.name == 'postgresql'
+        except Exception:
+            return False
+    
+    async def _bulk_process_account_transactions(
+        self,
+        account: Account,
+        plaid_transactions: List[Dict[str, Any]],
+        existing_plaid_ids: Set[str],
+        result: SyncResult,
+        db: Session
+    ) -> SyncResult:
+        """
+        Set-based ingestion for large syncs.
+        
+        Per batch: one query to match manual duplicates, one merchant recognition
+        pass, chunked MLServiceClient.batch_categorize calls and a single
+        INSERT ... ON CONFLICT (plaid_transaction_id) DO NOTHING. Everything is
+        committed once at the end.
+        """
+        logger.info(f"📦 Bulk ingesting {len(plaid_transactions)} transactions for account {account.name} "
+                    f"in batches of {self.bulk_batch_size}")
+        
+        # Drop rows we already have, including IDs repeated within the payload
+        seen_plaid_ids = set(existing_plaid_ids)
+        pending = []
+        for plaid_txn in plaid_transactions:
+            plaid_id = plaid_txn.get('transaction_id')
+            if plaid_id and plaid_id in seen_plaid_ids:
+                result.duplicates_skipped += 1
+                continue
+            if plaid_id:
+                seen_plaid_ids.add(plaid_id)
+            pending.append(plaid_txn)
+        
+        for i in range(0, len(pending), self.bulk_batch_size):
+            batch = pending[i:i + self.bulk_batch_size]
+            
+            # CONFLICT RESOLUTION: merge into matching manual transactions
+            matches = self._find_potential_duplicates_bulk(db, account, batch)
+            for index, existing_transaction in matches.items():
+                self._merge_plaid_into_existing(existing_transaction, batch[index], db)
+                result.updated_transactions += 1
+            
+            # Everything else becomes a new row
+            to_create: List[TransactionCreate] = []
+            for index, plaid_txn in enumerate(batch):
+                if index in matches:
+                    continue
+                try:
+                    to_create.append(self._build_transaction_create(plaid_txn, account))
+                except Exception as e:
+                    error_msg = f"Failed to process transaction {plaid_txn.get('transaction_id', 'unknown')}: {str(e)}"
+                    result.errors.append(error_msg)
+                    logger.error(f"       ❌ ERROR - {error_msg}")
+            
+            if not to_create:
+                continue
+            
+            confidences = await self.transaction_service.enrich_transactions_bulk(
+                to_create, account.user_id
+            )
+            
+            try:
+                inserted_ids = self.transaction_service.bulk_insert_transactions(
+                    db, account.user_id, to_create, confidences
+                )
+            except Exception as e:
+                db.rollback()
+                raise Exception(f"Failed to bulk insert transactions: {str(e)}")
+            
+            result.new_transactions += len(inserted_ids)
+            # Rows that lost an ON CONFLICT race with a concurrent sync
+            result.duplicates_skipped += len(to_create) - len(inserted_ids)
+        
+        try:
+            db.commit()
+        except Exception as e:
+            logger.error(f"Bulk ingestion commit failed: {str(e)}")
+            db.rollback()
+            raise Exception(f"Failed to commit transactions: {str(e)}")
+        
+        logger.info(f"🏁 Bulk ingestion complete for {account.name}: "
+                    f"{result.new_transactions} new, {result.updated_transactions} merged, "
+                    f"{result.duplicates_skipped} skipped, {len(result.errors)} errors")
+        
+        return result
+    
+    def _find_potential_duplicates_bulk(
+        self,
+        db: Session,
+        account: Account,
+        plaid_transactions: List[Dict[str, Any]]
+    ) -> Dict[int, Transaction]:
+        """
+        Batch version of _find_potential_duplicate.
+        
+        Loads every manual transaction that could match any row in the batch
+        with a single query, then applies the same amount/date/description
+        rules in memory. Each manual transaction is matched at most once.
+        
+        Returns:
+            Mapping of batch index -> manual transaction to merge into
+        """
+        candidates_by_key = []
+        for index, plaid_txn in enumerate(plaid_transactions):
+            plaid_date = self._parse_date(plaid_txn.get('date'))
+            if not plaid_date:
+                continue
+            amount_cents = self._convert_plaid_amount(
+                float(plaid_txn.get('amount', 0)), account.account_type
+            )
+            candidates_by_key.append((
+                index,
+                plaid_date.date(),
+                amount_cents,
+                self._normalize_merchant_name(plaid_txn.get('name', ''))
+            ))
+        
+        if not candidates_by_key:
+            return {}
+        
+        date_tolerance = timedelta(days=self.duplicate_date_tolerance_days)
+        amount_tolerance = self.duplicate_amount_tolerance_cents
+        
+        manual_transactions = db.query(Transaction).filter(
+            Transaction.account_id == account.id,
+            Transaction.plaid_transaction_id.is_(None),  # Manual transactions only
+            Transaction.transaction_date >= min(key[1] for key in candidates_by_key) - date_tolerance,
+            Transaction.transaction_date <= max(key[1] for key in candidates_by_key) + date_tolerance,
+            Transaction.amount_cents >= min(key[2] for key in candidates_by_key) - amount_tolerance,
+            Transaction.amount_cents <= max(key[2] for key in candidates_by_key) + amount_tolerance
+        ).all()
+        
+        if not manual_transactions:
+            return {}
+        
+        # Index manual transactions by date so each lookup only scans the tolerance window
+        manual_by_date = defaultdict(list)
+        for manual in manual_transactions:
+            manual_by_date[manual.transaction_date].append(
+                (manual, self._normalize_merchant_name(manual.description, manual.merchant))
+            )
+        
+        matches: Dict[int, Transaction] = {}
+        claimed_ids = set()
+        for index, plaid_date, amount_cents, normalized_desc in candidates_by_key:
+            best_match = None
+            best_match_score = 0
+            for offset in range(-self.duplicate_date_tolerance_days, self.duplicate_date_tolerance_days + 1):
+                for manual, normalized_manual in manual_by_date.get(plaid_date + timedelta(days=offset), ()):
+                    if manual.id in claimed_ids or abs(manual.amount_cents - amount_cents) > amount_tolerance:
+                        continue
+                    score = self._description_similarity(normalized_desc, normalized_manual)
+                    if score > best_match_score and score >= self.duplicate_similarity_threshold:
+                        best_match = manual
+                        best_match_score = score
+            
+            if best_match:
+                matches[index] = best_match
+                claimed_ids.add(best_match.id)
+        
+        logger.info(f"🔍 Bulk duplicate search: {len(manual_transactions)} manual candidates, {len(matches)} matches")
+        return matches
+    
     def _find_potential_duplicate(
         self, 
         db: Session, 
@@ -489,8 +943,8 @@ class TransactionSyncService:
                 return None
             
             # Define tolerances
-            amount_tolerance_cents = 100  # ±$1.00
-            date_tolerance_days = 2
+            amount_tolerance_cents = self.duplicate_amount_tolerance_cents
+            date_tolerance_days = self.duplicate_date_tolerance_days
             
             # Calculate date range for query
             date_start = plaid_date.date() - timedelta(days=date_tolerance_days)
@@ -534,25 +988,14 @@ class TransactionSyncService:
                     candidate.description, candidate.merchant
                 )
                 
-                # Calculate simple similarity score (exact match for now, can be enhanced later)
-                if normalized_plaid_desc == normalized_candidate_desc:
-                    similarity_score = 1.0
-                elif normalized_plaid_desc in normalized_candidate_desc or normalized_candidate_desc in normalized_plaid_desc:
-                    similarity_score = 0.8
-                else:
-                    # Check for word overlap
-                    plaid_words = set(normalized_plaid_desc.split())
-                    candidate_words = set(normalized_candidate_desc.split())
-                    if plaid_words and candidate_words:
-                        overlap = len(plaid_words.intersection(candidate_words))
-                        similarity_score = overlap / max(len(plaid_words), len(candidate_words))
-                    else:
-                        similarity_score = 0
+                similarity_score = self._description_similarity(
+                    normalized_plaid_desc, normalized_candidate_desc
+                )
                 
                 logger.info(f"   - Candidate: '{candidate.description}' (normalized: '{normalized_candidate_desc}') - Score: {similarity_score:.2f}")
                 
                 # Require minimum similarity threshold
-                if similarity_score > best_match_score and similarity_score >= 0.6:  # 60% similarity threshold
+                if similarity_score > best_match_score and similarity_score >= self.duplicate_similarity_threshold:
                     best_match = candidate
                     best_match_score = similarity_score
             
@@ -569,6 +1012,72 @@ class TransactionSyncService:
             logger.error(f"Error in duplicate detection: {str(e)}")
             return None
     
+    def _description_similarity(self, normalized_a: str, normalized_b: str) -> float:
+        """
+        Score how similar two normalized descriptions are.
+        
+        Returns 1.0 for an exact match, 0.8 when one contains the other and
+        the word-overlap ratio otherwise.
+        """
+        # Calculate simple similarity score (exact match for now, can be enhanced later)
+        if normalized_a == normalized_b:
+            return 1.0
+        if normalized_a in normalized_b or normalized_b in normalized_a:
+            return 0.8
+        
+        # Check for word overlap
+        words_a = set(normalized_a.split())
+        words_b = set(normalized_b.split())
+        if words_a and words_b:
+            overlap = len(words_a.intersection(words_b))
+            return overlap / max(len(words_a), len(words_b))
+        return 0
+    
+    def _merge_plaid_into_existing(
+        self,
+        existing_transaction: Transaction,
+        plaid_txn: Dict[str, Any],
+        db: Session
+    ) -> Transaction:
+        """Merge Plaid data into a matching manually-entered transaction"""
+        logger.info(f"       🔄 MERGING: Updating existing manual transaction {existing_transaction.id} with Plaid data")
+        
+        # Update existing transaction with Plaid data
+        existing_transaction.plaid_transaction_id = plaid_txn.get('transaction_id')
+        
+        # Update status if it was pending
+        if existing_transaction.status == 'pending':
+            existing_transaction.status = 'posted'
+            logger.info(f"       📝 STATUS: Updated status from 'pending' to 'posted'")
+        
+        # Add merge metadata
+        metadata = existing_transaction.metadata_json or {}
+        metadata.update({
+            'sync_match': 'merged_from_plaid_import',
+            'match_timestamp': datetime.now(timezone.utc).isoformat(),
+            'original_plaid_data': plaid_txn,
+            'merge_method': 'conflict_resolution'
+        })
+        existing_transaction.metadata_json = metadata
+        
+        # Optionally update other fields if they were missing in manual entry
+        if not existing_transaction.merchant and plaid_txn.get('merchant_name'):
+            existing_transaction.merchant = plaid_txn.get('merchant_name')
+            logger.info(f"       🏪 MERCHANT: Added merchant info from Plaid")
+        
+        if not existing_transaction.plaid_category and plaid_txn.get('category'):
+            existing_transaction.plaid_category = plaid_txn.get('category', [])
+            logger.info(f"       🏷️  CATEGORY: Added Plaid category info")
+        
+        # Update authorized date if available
+        if plaid_txn.get('authorized_date') and not existing_transaction.authorized_date:
+            existing_transaction.authorized_date = self._parse_date(plaid_txn.get('authorized_date'))
+            logger.info(f"       📅 DATE: Added authorized date from Plaid")
+        
+        db.add(existing_transaction)
+        logger.info(f"       ✅ MERGE SUCCESS: Manual transaction merged with Plaid data")
+        return existing_transaction
+    
     async def _create_transaction_from_plaid(
         self, 
         plaid_txn: Dict[str, Any], 
@@ -582,114 +1091,11 @@ class TransactionSyncService:
             existing_transaction = self._find_potential_duplicate(db, account, plaid_txn)
             
             if existing_transaction:
-                logger.info(f"       🔄 MERGING: Updating existing manual transaction {existing_transaction.id} with Plaid data")
-                
-                # Update existing transaction with Plaid data
-                existing_transaction.plaid_transaction_id = plaid_txn.get('transaction_id')
-                
-                # Update status if it was pending
-                if existing_transaction.status == 'pending':
-                    existing_transaction.status = 'posted'
-                    logger.info(f"       📝 STATUS: Updated status from 'pending' to 'posted'")
-                
-                # Add merge metadata
-                metadata = existing_transaction.metadata_json or {}
-                metadata.update({
-                    'sync_match': 'merged_from_plaid_import',
-                    'match_timestamp': datetime.now(timezone.utc).isoformat(),
-                    'original_plaid_data': plaid_txn,
-                    'merge_method': 'conflict_resolution'
-                })
-                existing_transaction.metadata_json = metadata
-                
-                # Optionally update other fields if they were missing in manual entry
-                if not existing_transaction.merchant and plaid_txn.get('merchant_name'):
-                    existing_transaction.merchant = plaid_txn.get('merchant_name')
-                    logger.info(f"       🏪 MERCHANT: Added merchant info from Plaid")
-                
-                if not existing_transaction.plaid_category and plaid_txn.get('category'):
-                    existing_transaction.plaid_category = plaid_txn.get('category', [])
-                    logger.info(f"       🏷️  CATEGORY: Added Plaid category info")
-                
-                # Update authorized date if available
-                if plaid_txn.get('authorized_date') and not existing_transaction.authorized_date:
-                    existing_transaction.authorized_date = self._parse_date(plaid_txn.get('authorized_date'))
-                    logger.info(f"       📅 DATE: Added authorized date from Plaid")
-                
-                db.add(existing_transaction)
-                logger.info(f"       ✅ MERGE SUCCESS: Manual transaction merged with Plaid data")
-                return existing_transaction
+                return self._merge_plaid_into_existing(existing_transaction, plaid_txn, db)
             
             # NO DUPLICATE FOUND: Create new transaction as usual
             logger.info(f"       💾 NEW TRANSACTION: No duplicate found, creating new transaction")
-            # Parse amount - Plaid's sign convention varies by account type
-            raw_amount = float(plaid_txn.get('amount', 0))
-            
-            # Convert amount based on account type and Plaid's conventions
-            amount_cents = self._convert_plaid_amount(raw_amount, account.account_type)
-            
-            # Enhanced debug logging
-            transaction_type = "INCOME" if amount_cents > 0 else "EXPENSE"
-            logger.info(f"       💰 AMOUNT DEBUG: Account type: {account.account_type}")
-            logger.info(f"       💰 AMOUNT DEBUG: Raw Plaid amount: {raw_amount} → Converted: {amount_cents/100} (cents: {amount_cents}) → Type: {transaction_type}")
-            
-            # Parse dates
-            transaction_date = self._parse_date(plaid_txn.get('date'))
-            authorized_date = self._parse_date(plaid_txn.get('authorized_date'))
-            
-            # Extract merchant information
-            merchant_name = None
-            merchant_logo = None
-            
-            if 'merchant_name' in plaid_txn:
-                merchant_name = plaid_txn['merchant_name']
-            elif plaid_txn.get('counterparties'):
-                counterparty = plaid_txn['counterparties'][0]
-                merchant_name = counterparty.get('name')
-                if counterparty.get('logo_url'):
-                    merchant_logo = counterparty['logo_url']
-            
-            # Determine transaction status
-            status = 'posted'
-            if plaid_txn.get('pending'):
-                status = 'pending'
-            elif plaid_txn.get('pending_transaction_id'):
-                status = 'posted'  # This is an update to a pending transaction
-            
-            # Enhanced metadata
-            metadata = {
-                'plaid_data': plaid_txn,
-                'imported_at': datetime.now(timezone.utc).isoformat(),
-                'sync_method': 'automatic',
-                'account_owner': plaid_txn.get('account_owner'),
-                'iso_currency_code': plaid_txn.get('iso_currency_code'),
-                'unofficial_currency_code': plaid_txn.get('unofficial_currency_code'),
-                'personal_finance_category': plaid_txn.get('personal_finance_category')
-            }
-            
-            # Add location data if available
-            if plaid_txn.get('location'):
-                metadata['location'] = plaid_txn['location']
-            
-            # Add payment channel information
-            if plaid_txn.get('payment_channel'):
-                metadata['payment_channel'] = plaid_txn['payment_channel']
-            
-            transaction_create = TransactionCreate(
-                user_id=account.user_id,
-                account_id=account.id,
-                amount_cents=amount_cents,
-                currency=plaid_txn.get('iso_currency_code', account.currency),
-                description=plaid_txn.get('name', 'Unknown Transaction'),
-                merchant=merchant_name,
-                merchant_logo=merchant_logo,
-                transaction_date=transaction_date,
-                authorized_date=authorized_date,
-                status=status,
-                plaid_transaction_id=plaid_txn.get('transaction_id'),
-                plaid_category=plaid_txn.get('category', []),
-                metadata_json=metadata
-            )
+            transaction_create = self._build_transaction_create(plaid_txn, account)
             
             transaction = await self.transaction_service.create_transaction(db=db, transaction=transaction_create, user_id=account.user_id)
             
@@ -699,6 +1105,81 @@ class TransactionSyncService:
             logger.error(f"Failed to create transaction from Plaid data: {e}")
             return None
     
+    def _build_transaction_create(
+        self,
+        plaid_txn: Dict[str, Any],
+        account: Account
+    ) -> TransactionCreate:
+        """Map a raw Plaid transaction onto a validated TransactionCreate"""
+        # Parse amount - Plaid's sign convention varies by account type
+        raw_amount = float(plaid_txn.get('amount', 0))
+        
+        # Convert amount based on account type and Plaid's conventions
+        amount_cents = self._convert_plaid_amount(raw_amount, account.account_type)
+        
+        # Enhanced debug logging
+        transaction_type = "INCOME" if amount_cents > 0 else "EXPENSE"
+        logger.debug(f"       💰 AMOUNT DEBUG: Account type: {account.account_type}")
+        logger.debug(f"       💰 AMOUNT DEBUG: Raw Plaid amount: {raw_amount} → Converted: {amount_cents/100} (cents: {amount_cents}) → Type: {transaction_type}")
+        
+        # Parse dates
+        transaction_date = self._parse_date(plaid_txn.get('date'))
+        authorized_date = self._parse_date(plaid_txn.get('authorized_date'))
+        
+        # Extract merchant information
+        merchant_name = None
+        merchant_logo = None
+        
+        if 'merchant_name' in plaid_txn:
+            merchant_name = plaid_txn['merchant_name']
+        elif plaid_txn.get('counterparties'):
+            counterparty = plaid_txn['counterparties'][0]
+            merchant_name = counterparty.get('name')
+            if counterparty.get('logo_url'):
+                merchant_logo = counterparty['logo_url']
+        
+        # Determine transaction status
+        status = 'posted'
+        if plaid_txn.get('pending'):
+            status = 'pending'
+        elif plaid_txn.get('pending_transaction_id'):
+            status = 'posted'  # This is an update to a pending transaction
+        
+        # Enhanced metadata
+        metadata = {
+            'plaid_data': plaid_txn,
+            'imported_at': datetime.now(timezone.utc).isoformat(),
+            'sync_method': 'automatic',
+            'account_owner': plaid_txn.get('account_owner'),
+            'iso_currency_code': plaid_txn.get('iso_currency_code'),
+            'unofficial_currency_code': plaid_txn.get('unofficial_currency_code'),
+            'personal_finance_category': plaid_txn.get('personal_finance_category')
+        }
+        
+        # Add location data if available
+        if plaid_txn.get('location'):
+            metadata['location'] = plaid_txn['location']
+        
+        # Add payment channel information
+        if plaid_txn.get('payment_channel'):
+            metadata['payment_channel'] = plaid_txn['payment_channel']
+        
+        return TransactionCreate(
+            user_id=account.user_id,
+            account_id=account.id,
+            amount_cents=amount_cents,
+            currency=plaid_txn.get('iso_currency_code', account.currency),
+            description=plaid_txn.get('name', 'Unknown Transaction'),
+            merchant=merchant_name,
+            merchant_logo=merchant_logo,
+            transaction_date=transaction_date,
+            authorized_date=authorized_date,
+            status=status,
+            plaid_transaction_id=plaid_txn.get('transaction_id'),
+            plaid_category=plaid_txn.get('category', []),
+            metadata_json=metadata
+        )
+    
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
         """Parse date string to datetime object"""
         if not date_str:
@@ -861,18 +1342,17 @@ class TransactionSyncService:
     async def sync_transactions_for_item(self, db: Session, item_id: str, days: int = 30) -> Dict[str, Any]:
         """
         Syncs transactions for all accounts connected to a specific Plaid Item.
-        This method is specifically designed for webhook-triggered syncs.
+        This method is specifically designed for webhook-triggered syncs and uses
+        the item's /transactions/sync cursor, so `days` is only kept for callers
+        that still pass a window.
         """
-        from app.models.account import Account
-        
         try:
-            # Find all accounts for this Plaid item
-            accounts_to_sync = db.query(Account).filter(
+            account = db.query(Account).filter(
                 Account.plaid_item_id == item_id,
                 Account.is_active == True
-            ).all()
+            ).first()
             
-            if not accounts_to_sync:
+            if not account:
                 logger.warning(f"Received webhook for unknown or inactive item_id: {item_id}")
                 return {
                     'success': False,
@@ -880,26 +1360,25 @@ class TransactionSyncService:
                     'accounts_synced': 0
                 }
 
-            user_id = accounts_to_sync[0].user_id
-            logger.info(f"Webhook-triggered sync for user {user_id}, item {item_id}, {len(accounts_to_sync)} accounts")
+            user_id = account.user_id
+            logger.info(f"Webhook-triggered incremental sync for user {user_id}, item {item_id}")
             
-            # Mark all accounts as syncing
-            for account in accounts_to_sync:
-                account.sync_status = 'syncing'
-                db.add(account)
-            db.commit()
+            sync_result = await self.sync_item_incremental(item_id, db)
             
-            # Use the existing user transaction sync method
-            result = await self.sync_user_transactions(
-                user_id=str(user_id), 
-                db=db, 
-                days=days
-            )
-            
-            # Add webhook-specific metadata
-            result['trigger'] = 'webhook'
-            result['item_id'] = item_id
-            result['webhook_sync_time'] = datetime.now(timezone.utc).isoformat()
+            result = {
+                'success': True,
+                'accounts_synced': db.query(Account).filter(
+                    Account.plaid_item_id == item_id,
+                    Account.is_active == True
+                ).count(),
+                'total_new_transactions': sync_result.new_transactions,
+                'total_updated_transactions': sync_result.updated_transactions,
+                'total_removed_transactions': sync_result.removed_transactions,
+                'total_errors': len(sync_result.errors),
+                'trigger': 'webhook',
+                'item_id': item_id,
+                'webhook_sync_time': datetime.now(timezone.utc).isoformat()
+            }
             
             # Send WebSocket notification for real-time updates
             await self._send_webhook_sync_notification(user_id, item_id, result)
@@ -912,18 +1391,6 @@ class TransactionSyncService:
         except Exception as e:
             logger.error(f"Webhook-triggered sync failed for item {item_id}: {e}")
             
-            # Update account statuses on failure
-            try:
-                accounts_to_sync = db.query(Account).filter(Account.plaid_item_id == item_id).all()
-                for account in accounts_to_sync:
-                    account.sync_status = 'error'
-                    account.last_sync_error = f"Webhook sync failed: {str(e)}"
-                    account.connection_health = 'failed'
-                    db.add(account)
-                db.commit()
-            except Exception as update_error:
-                logger.error(f"Failed to update account statuses after webhook sync failure: {update_error}")
-            
             return {
                 'success': False,
                 'error': str(e),
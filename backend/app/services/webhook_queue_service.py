@@ -0,0 +1,419 @@
+"""
+Webhook Queue Service
+Durable Plaid webhook ingestion: a Redis stream, per-item coalescing and a bounded worker pool
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redis.exceptions import ResponseError
+
+from app.config import settings
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# TRANSACTIONS codes that all mean "pull this item's deltas"
+SYNC_CODES = ("SYNC_UPDATES_AVAILABLE", "INITIAL_UPDATE", "HISTORICAL_UPDATE", "DEFAULT_UPDATE")
+HANDLED_WEBHOOK_TYPES = ("TRANSACTIONS", "ITEM", "ACCOUNTS", "RECURRING_TRANSACTIONS")
+
+
+@dataclass
+class _ItemBatch:
+    first_seen: float
+    due_at: float
+    entry_ids: List[str] = field(default_factory=list)
+    payloads: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class WebhookQueueService:
+    """
+    Plaid webhooks are appended to a Redis stream and acknowledged to Plaid
+    straight away; a worker pool processes them.
+
+    Workers read the stream through a consumer group and buffer entries per
+    item_id. An item is processed once it has been quiet for
+    WEBHOOK_DEBOUNCE_SECONDS (WEBHOOK_MAX_DEBOUNCE_SECONDS at most after its
+    first webhook), as one job in which duplicate actions are collapsed, so a
+    burst of DEFAULT_UPDATE / SYNC_UPDATES_AVAILABLE costs a single sync. At
+    most WEBHOOK_WORKER_CONCURRENCY jobs run at once, and never two for the
+    same item. Entries are acknowledged only after every action in their job
+    succeeded; entries left pending by a failed job or a dead worker are
+    reclaimed after WEBHOOK_CLAIM_IDLE_SECONDS. While a worker holds entries
+    (buffered or in a running job) it resets their idle time every third of
+    that, so a slow job is never claimed by another worker or redelivered.
+    Entries delivered more than WEBHOOK_MAX_DELIVERIES times move to the
+    dead-letter stream.
+    """
+
+    STREAM_KEY = "plaid:webhooks"
+    DEAD_LETTER_KEY = "plaid:webhooks:dead"
+    GROUP = "plaid-webhook-workers"
+    READ_COUNT = 100
+
+    def __init__(self):
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.is_running = False
+        self.worker_task: Optional[asyncio.Task] = None
+
+        self._buffer: Dict[str, _ItemBatch] = {}
+        self._held: Set[str] = set()  # Entry ids buffered or being processed here
+        self._active_items: Set[str] = set()
+        self._unparseable: List[str] = []
+        self._jobs: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.metrics = {
+            'enqueued': 0,
+            'received': 0,
+            'jobs_processed': 0,
+            'jobs_failed': 0,
+            'webhooks_coalesced': 0,
+            'reclaimed': 0,
+            'dead_lettered': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    async def enqueue(self, payload: Dict[str, Any]) -> str:
+        """Append a webhook to the stream and return its entry id"""
+        conn = await redis_client.get_connection()
+        try:
+            entry_id = await conn.xadd(
+                self.STREAM_KEY,
+                {'item_id': payload.get('item_id') or '', 'payload': json.dumps(payload)},
+                maxlen=settings.WEBHOOK_STREAM_MAX_LENGTH,
+                approximate=True
+            )
+        finally:
+            await conn.close()
+        self.metrics['enqueued'] += 1
+        return entry_id
+
+    async def process_now(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle one webhook immediately on a dedicated session (queue disabled or unavailable)"""
+        from app.database import SessionLocal
+        from app.services.plaid_webhook_service import plaid_webhook_service
+
+        db = SessionLocal()
+        try:
+            return await plaid_webhook_service.handle_webhook(payload, db)
+        finally:
+            db.close()
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Start consuming the stream in this process"""
+        if self.is_running:
+            logger.warning("Webhook worker is already running")
+            return
+
+        await self._ensure_group()
+        self._semaphore = asyncio.Semaphore(max(1, settings.WEBHOOK_WORKER_CONCURRENCY))
+        self.is_running = True
+        self.worker_task = asyncio.create_task(self._worker_loop())
+        logger.info(f"Webhook worker {self.consumer} started")
+
+    async def stop(self):
+        """Stop reading; let running jobs finish. Buffered entries stay pending and are reclaimed later."""
+        self.is_running = False
+        if self.worker_task:
+            self.worker_task.cancel()
+            try:
+                await self.worker_task
+            except asyncio.CancelledError:
+                pass
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+        logger.info(f"Webhook worker {self.consumer} stopped")
+
+    async def _ensure_group(self):
+        conn = await redis_client.get_connection()
+        try:
+            await conn.xgroup_create(self.STREAM_KEY, self.GROUP, id='0', mkstream=True)
+        except ResponseError as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        finally:
+            await conn.close()
+
+    async def _worker_loop(self):
+        conn = await redis_client.get_connection()
+        last_reclaim = last_heartbeat = 0.0
+        try:
+            while self.is_running:
+                try:
+                    if time.monotonic() - last_reclaim >= settings.WEBHOOK_CLAIM_IDLE_SECONDS:
+                        await self._reclaim(conn)
+                        last_reclaim = last_heartbeat = time.monotonic()
+                    elif time.monotonic() - last_heartbeat >= settings.WEBHOOK_CLAIM_IDLE_SECONDS / 3:
+                        await self._heartbeat(conn)
+                        last_heartbeat = time.monotonic()
+
+                    response = await conn.xreadgroup(
+                        self.GROUP, self.consumer, {self.STREAM_KEY: '>'},
+                        count=self.READ_COUNT, block=self._block_ms(time.monotonic())
+                    )
+                    now = time.monotonic()
+                    for _stream, entries in response or []:
+                        for entry_id, fields in entries:
+                            self.buffer_entry(entry_id, fields, now)
+
+                    await self._ack(conn, self._take_unparseable())
+                    self.dispatch_due(time.monotonic())
+
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Webhook worker loop error: {e}")
+                    await asyncio.sleep(1)
+        finally:
+            await conn.close()
+
+    async def _heartbeat(self, conn):
+        """Reset the idle time of entries this worker holds so they aren't reclaimed"""
+        if self._held:
+            # JUSTID claims don't count as deliveries
+            await conn.xclaim(
+                self.STREAM_KEY, self.GROUP, self.consumer,
+                min_idle_time=0, message_ids=list(self._held), justid=True
+            )
+
+    async def _reclaim(self, conn):
+        """Take over entries other (dead) consumers left unacknowledged"""
+        # Entries still held here must not come back through XAUTOCLAIM
+        await self._heartbeat(conn)
+        result = await conn.xautoclaim(
+            self.STREAM_KEY, self.GROUP, self.consumer,
+            min_idle_time=settings.WEBHOOK_CLAIM_IDLE_SECONDS * 1000,
+            start_id='0-0', count=self.READ_COUNT
+        )
+        entries = [
+            (entry_id, fields)
+            for entry_id, fields in (result[1] if result and len(result) > 1 else [])
+            if entry_id not in self._held and fields
+        ]
+        if not entries:
+            return
+
+        delivery_counts = await self._delivery_counts(conn, [entry_id for entry_id, _ in entries])
+        exhausted = [
+            (entry_id, fields) for entry_id, fields in entries
+            if delivery_counts.get(entry_id, 0) > settings.WEBHOOK_MAX_DELIVERIES
+        ]
+        if exhausted:
+            await self._dead_letter(conn, exhausted)
+
+        now = time.monotonic()
+        reclaimed = 0
+        for entry_id, fields in entries:
+            if delivery_counts.get(entry_id, 0) <= settings.WEBHOOK_MAX_DELIVERIES:
+                self.buffer_entry(entry_id, fields, now)
+                reclaimed += 1
+        if reclaimed:
+            self.metrics['reclaimed'] += reclaimed
+            logger.warning(f"Reclaimed {reclaimed} stalled webhook entries")
+
+    async def _delivery_counts(self, conn, entry_ids: List[str]) -> Dict[str, int]:
+        """Times each entry has been delivered, including the claim that just happened"""
+        counts = {}
+        for entry_id in entry_ids:
+            pending = await conn.xpending_range(
+                self.STREAM_KEY, self.GROUP, min=entry_id, max=entry_id, count=1
+            )
+            if pending:
+                counts[entry_id] = pending[0]['times_delivered']
+        return counts
+
+    async def _dead_letter(self, conn, entries: List[Tuple[str, Dict[str, str]]]):
+        """Park entries that keep failing so they stop being redelivered"""
+        for entry_id, fields in entries:
+            await conn.xadd(
+                self.DEAD_LETTER_KEY,
+                {**fields, 'entry_id': entry_id},
+                maxlen=settings.WEBHOOK_STREAM_MAX_LENGTH,
+                approximate=True
+            )
+        await self._ack(conn, [entry_id for entry_id, _ in entries])
+        self.metrics['dead_lettered'] += len(entries)
+        logger.error(
+            f"Moved {len(entries)} webhook entries to {self.DEAD_LETTER_KEY} after "
+            f"{settings.WEBHOOK_MAX_DELIVERIES} deliveries"
+        )
+
+    def _block_ms(self, now: float) -> int:
+        """Block on the stream until the next buffered item is due (at most 1s; 0 would block forever)"""
+        if not self._buffer:
+            return 1000
+        next_due = min(batch.due_at for batch in self._buffer.values())
+        return int(min(1000, max(1, (next_due - now) * 1000)))
+
+    # ------------------------------------------------------------------
+    # Coalescing
+    # ------------------------------------------------------------------
+
+    def buffer_entry(self, entry_id: str, fields: Dict[str, str], now: float):
+        """Add a stream entry to its item's batch and push the item's due time out"""
+        if entry_id in self._held:
+            return
+        self.metrics['received'] += 1
+        self._held.add(entry_id)
+
+        try:
+            payload = json.loads(fields['payload'])
+        except (KeyError, TypeError, ValueError):
+            logger.error(f"Dropping unparseable webhook entry {entry_id}")
+            self._unparseable.append(entry_id)
+            return
+
+        item_id = fields.get('item_id') or payload.get('item_id') or ''
+        batch = self._buffer.get(item_id)
+        if batch is None:
+            batch = self._buffer[item_id] = _ItemBatch(first_seen=now, due_at=now)
+        batch.entry_ids.append(entry_id)
+        batch.payloads.append(payload)
+        batch.due_at = min(batch.first_seen + settings.WEBHOOK_MAX_DEBOUNCE_SECONDS, now + settings.WEBHOOK_DEBOUNCE_SECONDS)
+
+    def _take_unparseable(self) -> List[str]:
+        entry_ids = self._unparseable[:]
+        self._unparseable.clear()
+        self._held.difference_update(entry_ids)
+        return entry_ids
+
+    def dispatch_due(self, now: float) -> List[str]:
+        """Start jobs for items whose debounce window has closed; returns their item ids"""
+        due = [
+            item_id for item_id, batch in self._buffer.items()
+            if batch.due_at <= now and item_id not in self._active_items
+        ]
+        for item_id in due:
+            batch = self._buffer.pop(item_id)
+            self._active_items.add(item_id)
+            task = asyncio.create_task(self._run_job(item_id, batch))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+        return due
+
+    @staticmethod
+    def coalesce(payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """One webhook per distinct action, keeping the latest; removal lists are merged"""
+        merged: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for payload in payloads:
+            webhook_type = payload.get('webhook_type')
+            webhook_code = payload.get('webhook_code')
+            if webhook_type == 'TRANSACTIONS' and webhook_code in SYNC_CODES:
+                webhook_code = 'SYNC'
+            key = (webhook_type, webhook_code)
+
+            previous = merged.pop(key, None)
+            if previous is not None and key == ('TRANSACTIONS', 'TRANSACTIONS_REMOVED'):
+                payload = {
+                    **payload,
+                    'removed_transactions': previous.get('removed_transactions', []) + payload.get('removed_transactions', [])
+                }
+            merged[key] = payload
+        return list(merged.values())
+
+    async def _run_job(self, item_id: str, batch: _ItemBatch):
+        processed = False
+        try:
+            async with self._semaphore:
+                actions = self.coalesce(batch.payloads)
+                self.metrics['webhooks_coalesced'] += len(batch.payloads) - len(actions)
+                failures = []
+                for payload in actions:
+                    result = await self.process_now(payload)
+                    if not result.get('success', True):
+                        failures.append(
+                            f"{payload.get('webhook_type')}.{payload.get('webhook_code')}: {result.get('error')}"
+                        )
+                if failures:
+                    # Handlers report failures instead of raising; the job still has to be retried
+                    raise RuntimeError("; ".join(failures))
+                processed = True
+                self.metrics['jobs_processed'] += 1
+                logger.info(f"Processed {len(batch.payloads)} webhooks for item {item_id} as {len(actions)} actions")
+        except Exception as e:
+            # Left unacknowledged: the entries are retried once reclaimed, up to WEBHOOK_MAX_DELIVERIES times
+            self.metrics['jobs_failed'] += 1
+            logger.error(f"Webhook job for item {item_id} failed: {e}")
+        finally:
+            self._active_items.discard(item_id)
+            self._held.difference_update(batch.entry_ids)
+            if processed:
+                conn = await redis_client.get_connection()
+                try:
+                    await self._ack(conn, batch.entry_ids)
+                finally:
+                    await conn.close()
+
+    async def _ack(self, conn, entry_ids: List[str]):
+        if entry_ids:
+            await conn.xack(self.STREAM_KEY, self.GROUP, *entry_ids)
+            await conn.xdel(self.STREAM_KEY, *entry_ids)
+
+    # ------------------------------------------------------------------
+    # Inspection
+    # ------------------------------------------------------------------
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Backlog depth and lag of the stream, plus this worker's state"""
+        stats: Dict[str, Any] = {
+            'worker': {
+                'consumer': self.consumer,
+                'is_running': self.is_running,
+                'buffered_items': len(self._buffer),
+                'buffered_webhooks': sum(len(batch.entry_ids) for batch in self._buffer.values()),
+                'jobs_in_flight': len(self._active_items),
+                **self.metrics,
+            }
+        }
+
+        conn = await redis_client.get_connection()
+        try:
+            stats['stream_length'] = await conn.xlen(self.STREAM_KEY)
+            stats['dead_letter_length'] = await conn.xlen(self.DEAD_LETTER_KEY)
+            groups = await conn.xinfo_groups(self.STREAM_KEY) if stats['stream_length'] else []
+            group = next((g for g in groups if g.get('name') == self.GROUP), None)
+            if group is None:
+                stats.update({'pending': 0, 'undelivered': stats['stream_length'], 'consumers': 0,
+                              'oldest_unprocessed_age_seconds': None})
+                return stats
+
+            stats['pending'] = group.get('pending', 0)
+            stats['consumers'] = group.get('consumers', 0)
+            stats['undelivered'] = group.get('lag')
+
+            oldest_ids = []
+            if stats['pending']:
+                summary = await conn.xpending(self.STREAM_KEY, self.GROUP)
+                if summary.get('min'):
+                    oldest_ids.append(summary['min'])
+            next_undelivered = await conn.xrange(
+                self.STREAM_KEY, min=f"({group.get('last-delivered-id', '0-0')}", count=1
+            )
+            if next_undelivered:
+                oldest_ids.append(next_undelivered[0][0])
+
+            oldest_ms = min((int(entry_id.split('-')[0]) for entry_id in oldest_ids), default=None)
+            stats['oldest_unprocessed_age_seconds'] = (
+                round(max(0.0, time.time() - oldest_ms / 1000), 3) if oldest_ms is not None else None
+            )
+            return stats
+        finally:
+            await conn.close()
+
+
+# Create singleton instance
+webhook_queue_service = WebhookQueueService()
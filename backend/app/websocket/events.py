@@ -13,7 +13,8 @@ from .schemas import (
     TransactionPayload, BudgetAlertPayload, GoalProgressPayload,
     GoalAchievedPayload, AccountSyncPayload, AccountSyncErrorPayload,
     NotificationPayload, SystemAlertPayload, AIInsightPayload,
-    PingPayload, BulkTransactionImportPayload, BalanceUpdatePayload
+    PingPayload, BulkTransactionImportPayload, BalanceUpdatePayload,
+    TransactionImportProgressPayload
 )
 
 logger = logging.getLogger(__name__)
@@ -130,6 +131,16 @@ class WebSocketEvents:
         }
         await manager.send_to_user(user_id, message)
 
+    @staticmethod
+    async def emit_transaction_import_progress(user_id: str, progress: Dict[str, Any]):
+        """Emit CSV import progress; only the final status is persisted"""
+        payload = TransactionImportProgressPayload(**progress)
+        message = {
+            "type": MessageType.TRANSACTION_IMPORT_PROGRESS,
+            "payload": payload.model_dump()
+        }
+        await manager.send_to_user(user_id, message, persist=payload.status != "processing")
+
     # ========== BUDGET EVENTS ==========
     
     @staticmethod
@@ -136,7 +136,10 @@ class RedisWebSocketManager:
 
             # Get dashboard data
             db = next(get_db())
-            dashboard_data = await analytics_service.get_dashboard_summary(db, user_id)
+            try:
+                dashboard_data = analytics_service.get_dashboard_summary(db, user_id)
+            finally:
+                db.close()
 
             sync_message = {
                 "type": "full_sync",
@@ -18,6 +18,7 @@ class MessageType(str, Enum):
     TRANSACTION_UPDATED = "transaction_updated"
     TRANSACTION_DELETED = "transaction_deleted"
     BULK_TRANSACTIONS_IMPORTED = "bulk_transactions_imported"
+    TRANSACTION_IMPORT_PROGRESS = "transaction_import_progress"
     
     # Account events
     ACCOUNT_CREATED = "account_created"
@@ -104,6 +105,14 @@ class BulkTransactionImportPayload(BaseModel):
     transaction_count: int = Field(..., description="Number of imported transactions")
     imported_at: datetime = Field(..., description="Import timestamp")
 
+class TransactionImportProgressPayload(BaseModel):
+    import_id: str = Field(..., description="Import ID")
+    status: Literal["processing", "completed", "failed"] = Field(..., description="Import status")
+    processed_rows: int = Field(..., description="CSV rows read so far")
+    imported: int = Field(..., description="Transactions inserted so far")
+    duplicates_skipped: int = Field(..., description="Rows skipped as already present")
+    invalid_rows: int = Field(..., description="Rows that failed validation")
+
 class BudgetAlertPayload(BaseModel):
     budget_id: str = Field(..., description="Budget ID")
     budget_name: str = Field(..., description="Budget name")
@@ -202,6 +211,7 @@ PayloadType = Union[
     BalanceUpdatePayload,
     TransactionPayload,
     BulkTransactionImportPayload,
+    TransactionImportProgressPayload,
     BudgetAlertPayload,
     GoalProgressPayload,
     GoalAchievedPayload,
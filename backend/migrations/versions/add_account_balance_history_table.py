@@ -0,0 +1,56 @@
+"""add_account_balance_history_table
+
+Revision ID: add_account_balance_history
+Revises: add_transaction_daily_rollups
+Create Date: 2025-08-22 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_account_balance_history'
+down_revision: Union[str, None] = 'add_transaction_daily_rollups'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create account_balance_history for end-of-day balance snapshots"""
+    op.create_table('account_balance_history',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('account_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('snapshot_date', sa.Date(), nullable=False),
+    sa.Column('balance_cents', sa.BigInteger(), nullable=False),
+    sa.Column('available_balance_cents', sa.BigInteger(), nullable=True),
+    sa.Column('source', sa.String(length=20), server_default='plaid', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'snapshot_date', name='uq_balance_history_account_date')
+    )
+    
+    op.create_index('idx_balance_history_user_date', 'account_balance_history', ['user_id', 'snapshot_date'], unique=False)
+    
+    # Row level security - same policy as the other user-owned tables
+    op.execute('ALTER TABLE account_balance_history ENABLE ROW LEVEL SECURITY;')
+    op.execute('ALTER TABLE account_balance_history FORCE ROW LEVEL SECURITY;')
+    op.execute("""
+        CREATE POLICY user_access_policy ON account_balance_history
+        FOR ALL
+        USING (user_id = current_setting('app.current_user_id')::uuid)
+        WITH CHECK (user_id = current_setting('app.current_user_id')::uuid);
+    """)
+
+
+def downgrade() -> None:
+    """Drop the account_balance_history table"""
+    op.execute("DROP POLICY IF EXISTS user_access_policy ON account_balance_history;")
+    op.drop_index('idx_balance_history_user_date', table_name='account_balance_history')
+    op.drop_table('account_balance_history')
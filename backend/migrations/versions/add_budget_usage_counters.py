@@ -0,0 +1,58 @@
+"""add_budget_usage_counters_table
+
+Revision ID: add_budget_usage_counters
+Revises: add_transaction_search_index
+Create Date: 2025-08-25 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_budget_usage_counters'
+down_revision: Union[str, None] = 'add_transaction_search_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create budget_usage_counters; rows are seeded by the app on the next write or budget edit"""
+    op.create_table('budget_usage_counters',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('budget_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('period_start', sa.Date(), nullable=False),
+    sa.Column('period_end', sa.Date(), nullable=False),
+    sa.Column('spent_cents', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('transaction_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('alert_level', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['budget_id'], ['budgets.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index('idx_budget_usage_budget_period', 'budget_usage_counters', ['budget_id', 'period_start'], unique=True)
+    op.create_index('idx_budget_usage_user_period', 'budget_usage_counters', ['user_id', 'period_end'], unique=False)
+    
+    # Row level security - same policy as the other user-owned tables
+    op.execute('ALTER TABLE budget_usage_counters ENABLE ROW LEVEL SECURITY;')
+    op.execute('ALTER TABLE budget_usage_counters FORCE ROW LEVEL SECURITY;')
+    op.execute("""
+        CREATE POLICY user_access_policy ON budget_usage_counters
+        FOR ALL
+        USING (user_id = current_setting('app.current_user_id')::uuid)
+        WITH CHECK (user_id = current_setting('app.current_user_id')::uuid);
+    """)
+
+
+def downgrade() -> None:
+    """Drop the budget_usage_counters table"""
+    op.execute("DROP POLICY IF EXISTS user_access_policy ON budget_usage_counters;")
+    op.drop_index('idx_budget_usage_user_period', table_name='budget_usage_counters')
+    op.drop_index('idx_budget_usage_budget_period', table_name='budget_usage_counters')
+    op.drop_table('budget_usage_counters')
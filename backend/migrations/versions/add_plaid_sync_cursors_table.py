@@ -0,0 +1,49 @@
+"""add_plaid_sync_cursors_table
+
+Revision ID: add_plaid_sync_cursors
+Revises: drop_recurring_transaction_rules
+Create Date: 2025-08-20 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_plaid_sync_cursors'
+down_revision: Union[str, None] = 'drop_recurring_transaction_rules'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the per-item cursor table used by /transactions/sync"""
+    op.create_table('plaid_sync_cursors',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('plaid_item_id', sa.String(length=255), nullable=False),
+    sa.Column('cursor', sa.Text(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_added_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_modified_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_removed_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('sync_metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('plaid_item_id')
+    )
+    
+    op.create_index('idx_plaid_sync_cursor_user', 'plaid_sync_cursors', ['user_id'], unique=False)
+    op.create_index('idx_plaid_sync_cursor_synced', 'plaid_sync_cursors', ['last_synced_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the plaid_sync_cursors table"""
+    op.drop_index('idx_plaid_sync_cursor_synced', table_name='plaid_sync_cursors')
+    op.drop_index('idx_plaid_sync_cursor_user', table_name='plaid_sync_cursors')
+    op.drop_table('plaid_sync_cursors')
@@ -0,0 +1,80 @@
+"""add_transaction_daily_rollups_table
+
+Revision ID: add_transaction_daily_rollups
+Revises: add_plaid_sync_cursors
+Create Date: 2025-08-21 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_transaction_daily_rollups'
+down_revision: Union[str, None] = 'add_plaid_sync_cursors'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create transaction_daily_rollups and backfill it from existing transactions"""
+    op.create_table('transaction_daily_rollups',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('rollup_date', sa.Date(), nullable=False),
+    sa.Column('account_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('category_id', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('income_cents', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('expense_cents', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('income_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('expense_count', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('transaction_count', sa.Integer(), server_default='0', nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['categories.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    
+    op.create_index('idx_rollup_user_date', 'transaction_daily_rollups', ['user_id', 'rollup_date'], unique=False)
+    op.create_index('idx_rollup_user_category_date', 'transaction_daily_rollups', ['user_id', 'category_id', 'rollup_date'], unique=False)
+    op.create_index('idx_rollup_account_date', 'transaction_daily_rollups', ['account_id', 'rollup_date'], unique=False)
+    
+    # Backfill in one set-based pass; app/scripts/rebuild_transaction_rollups.py does the same per user
+    op.execute("""
+        INSERT INTO transaction_daily_rollups (
+            id, user_id, rollup_date, account_id, category_id,
+            income_cents, expense_cents, income_count, expense_count, transaction_count
+        )
+        SELECT
+            gen_random_uuid(), user_id, transaction_date, account_id, category_id,
+            COALESCE(SUM(amount_cents) FILTER (WHERE amount_cents > 0), 0),
+            COALESCE(-SUM(amount_cents) FILTER (WHERE amount_cents < 0), 0),
+            COUNT(*) FILTER (WHERE amount_cents > 0),
+            COUNT(*) FILTER (WHERE amount_cents < 0),
+            COUNT(*)
+        FROM transactions
+        GROUP BY user_id, transaction_date, account_id, category_id
+    """)
+    
+    # Row level security - same policy as the other user-owned tables
+    op.execute('ALTER TABLE transaction_daily_rollups ENABLE ROW LEVEL SECURITY;')
+    op.execute('ALTER TABLE transaction_daily_rollups FORCE ROW LEVEL SECURITY;')
+    op.execute("""
+        CREATE POLICY user_access_policy ON transaction_daily_rollups
+        FOR ALL
+        USING (user_id = current_setting('app.current_user_id')::uuid)
+        WITH CHECK (user_id = current_setting('app.current_user_id')::uuid);
+    """)
+
+
+def downgrade() -> None:
+    """Drop the transaction_daily_rollups table"""
+    op.execute("DROP POLICY IF EXISTS user_access_policy ON transaction_daily_rollups;")
+    op.drop_index('idx_rollup_account_date', table_name='transaction_daily_rollups')
+    op.drop_index('idx_rollup_user_category_date', table_name='transaction_daily_rollups')
+    op.drop_index('idx_rollup_user_date', table_name='transaction_daily_rollups')
+    op.drop_table('transaction_daily_rollups')
@@ -0,0 +1,31 @@
+"""add_transaction_keyset_index
+
+Revision ID: add_transaction_keyset_index
+Revises: add_account_balance_history
+Create Date: 2025-08-23 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_transaction_keyset_index'
+down_revision: Union[str, None] = 'add_account_balance_history'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Supports keyset pagination ordered by (transaction_date, id) per user
+    op.create_index(
+        'idx_transaction_user_date_id',
+        'transactions',
+        ['user_id', 'transaction_date', 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transaction_user_date_id', table_name='transactions')
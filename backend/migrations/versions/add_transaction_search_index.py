@@ -0,0 +1,57 @@
+"""add_transaction_search_index
+
+Revision ID: add_transaction_search_index
+Revises: add_transaction_keyset_index
+Create Date: 2025-08-24 10:00:00.000000
+
+Adding the stored search_vector column rewrites transactions under an ACCESS
+EXCLUSIVE lock, so reads and writes wait for the whole rewrite (roughly as long
+as a full table copy); schedule the deploy accordingly. The GIN indexes are then
+built CONCURRENTLY and don't block writes. A concurrent build that fails leaves
+an INVALID index behind: drop it before re-running.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_transaction_search_index'
+down_revision: Union[str, None] = 'add_transaction_keyset_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    # Weighted document: merchant (A) > description (B) > notes (C).
+    # Uses the 'simple' config so merchant names aren't stemmed and prefix queries behave.
+    op.execute("""
+        ALTER TABLE transactions
+        ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(merchant, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(notes, '')), 'C')
+        ) STORED;
+    """)
+
+    # CREATE INDEX CONCURRENTLY cannot run inside the migration's transaction
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transaction_search_vector ON transactions USING gin (search_vector);")
+
+        # Trigram indexes serve ILIKE '%q%' substring matches and similarity ranking
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transaction_description_trgm ON transactions USING gin (description gin_trgm_ops);")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transaction_merchant_trgm ON transactions USING gin (merchant gin_trgm_ops);")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transaction_notes_trgm ON transactions USING gin (notes gin_trgm_ops);")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_category_name_trgm ON categories USING gin (name gin_trgm_ops);")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS idx_category_name_trgm;")
+    op.execute("DROP INDEX IF EXISTS idx_transaction_notes_trgm;")
+    op.execute("DROP INDEX IF EXISTS idx_transaction_merchant_trgm;")
+    op.execute("DROP INDEX IF EXISTS idx_transaction_description_trgm;")
+    op.execute("DROP INDEX IF EXISTS idx_transaction_search_vector;")
+    op.execute("ALTER TABLE transactions DROP COLUMN IF EXISTS search_vector;")
+    # pg_trgm is left installed; other objects may depend on it
@@ -4,7 +4,9 @@ Test configuration and fixtures for the Finance Tracker backend.
 This module provides shared fixtures for unit and integration testing,
 including database setup, authentication, and common test data.
 """
+import httpx
 import pytest
+from unittest.mock import patch
 from uuid import uuid4
 from datetime import datetime, timezone
 from sqlalchemy import create_engine, StaticPool
@@ -21,6 +23,9 @@ from app.models.transaction import Transaction
 from app.models.budget import Budget
 from app.models.goal import Goal
 from app.services.user_service import UserService
+from app.scripts.fake_plaid_server import FakePlaidServer
+from app.services.plaid_client_service import plaid_client_service
+from app.services.plaid_rate_limiter import PlaidRateLimiter
 
 
 @pytest.fixture(scope="function")
@@ -209,6 +214,24 @@ def sample_goal_data() -> dict:
     }
 
 
+@pytest.fixture
+def fake_plaid():
+    """
+    Route PlaidClientService HTTP calls to an in-memory fake Plaid server.
+
+    Rate limiting is disabled; tests that exercise it patch in their own limiter.
+
+    Returns:
+        FakePlaidServer: The fake, for seeding items and inspecting requests
+    """
+    server = FakePlaidServer()
+    with patch.object(plaid_client_service, 'enabled', True), \
+         patch.object(plaid_client_service, 'base_url', 'http://fake-plaid', create=True), \
+         patch.object(plaid_client_service, '_client', httpx.AsyncClient(transport=server.httpx_transport())), \
+         patch.object(plaid_client_service, 'rate_limiter', PlaidRateLimiter(limits={}, default_limits=(0, 0))):
+        yield server
+
+
 # Async fixtures for async tests
 @pytest.fixture
 async def async_test_db_session():
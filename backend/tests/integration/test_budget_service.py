@@ -613,5 +613,79 @@ class TestBudgetServiceGetBudgetAlertsIntegration:
         assert len(result) == 0  # No alerts should be generated
 
 
+class TestBudgetServiceCalendarIntegration:
+    """Integration tests for the set-based budget calendar."""
+    
+    def test_get_budgets_calendar_integration(
+        self, test_db_session, test_user, test_account, test_category
+    ):
+        """Every active budget gets one calendar per requested month."""
+        # Arrange
+        category_budget = Budget(
+            id=uuid4(),
+            user_id=test_user.id,
+            category_id=test_category.id,
+            name="Groceries",
+            amount_cents=31000,
+            period="monthly",
+            start_date=date(2025, 1, 1),
+            is_active=True
+        )
+        overall_budget = Budget(
+            id=uuid4(),
+            user_id=test_user.id,
+            name="Everything",
+            amount_cents=62000,
+            period="monthly",
+            start_date=date(2025, 1, 1),
+            is_active=True
+        )
+        inactive_budget = Budget(
+            id=uuid4(),
+            user_id=test_user.id,
+            name="Old",
+            amount_cents=10000,
+            period="monthly",
+            start_date=date(2025, 1, 1),
+            is_active=False
+        )
+        test_db_session.add_all([category_budget, overall_budget, inactive_budget])
+        
+        for amount_cents, trans_date, category_id in [
+            (-1500, date(2025, 2, 10), test_category.id),
+            (-2500, date(2025, 3, 3), test_category.id),
+            (-4000, date(2025, 3, 3), None),
+            (9000, date(2025, 3, 3), test_category.id),  # Income is ignored
+        ]:
+            test_db_session.add(Transaction(
+                id=uuid4(),
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=category_id,
+                amount_cents=amount_cents,
+                currency="USD",
+                description="Calendar transaction",
+                transaction_date=trans_date,
+                status="posted"
+            ))
+        test_db_session.commit()
+        
+        # Act
+        result = BudgetService.get_budgets_calendar(
+            test_db_session, test_user.id, months=2, end_month="2025-03"
+        )
+        
+        # Assert
+        assert result.months == ["2025-02", "2025-03"]
+        assert len(result.calendars) == 4
+        calendars = {(c.budget_name, c.month): c for c in result.calendars}
+        assert calendars[("Groceries", "2025-02")].summary["total_spending_cents"] == 1500
+        march_groceries = calendars[("Groceries", "2025-03")]
+        assert march_groceries.summary["total_spending_cents"] == 2500
+        march_3 = next(d for d in calendars[("Everything", "2025-03")].daily_data if d.date == date(2025, 3, 3))
+        assert march_3.actual_spending_cents == 6500
+        assert march_3.transactions_count == 2
+
+
 # Test markers
 pytestmark = pytest.mark.integration
\ No newline at end of file
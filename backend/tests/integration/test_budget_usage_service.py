@@ -0,0 +1,149 @@
+"""
+Integration tests for BudgetUsageService.
+
+Verifies that budget usage counters follow transaction writes through the
+rollup refresh, that budget reads use them, and that threshold crossings queue
+exactly one alert per level.
+"""
+import pytest
+from uuid import uuid4
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+from app.services.budget_service import BudgetService
+from app.services.budget_usage_service import budget_usage_service
+from app.services.transaction_rollup_service import transaction_rollup_service
+from app.schemas.budget import BudgetUpdate
+from app.models.budget import Budget, BudgetPeriod
+from app.models.budget_usage_counter import BudgetUsageCounter
+from app.models.transaction import Transaction
+
+
+def _transaction(user, account, amount_cents, category=None):
+    return Transaction(
+        id=uuid4(),
+        user_id=user.id,
+        account_id=account.id,
+        category_id=category.id if category else None,
+        amount_cents=amount_cents,
+        currency="USD",
+        description="Budget transaction",
+        transaction_date=date.today(),
+        status="posted",
+    )
+
+
+@pytest.fixture
+def monthly_budget(test_db_session, test_user, test_category):
+    budget = Budget(
+        id=uuid4(),
+        user_id=test_user.id,
+        category_id=test_category.id,
+        name="Groceries",
+        amount_cents=10000,
+        period=BudgetPeriod.MONTHLY,
+        start_date=date.today().replace(day=1),
+        alert_threshold=0.8,
+        is_active=True
+    )
+    test_db_session.add(budget)
+    test_db_session.commit()
+    return budget
+
+
+@pytest.fixture
+def sent_alerts():
+    """Capture alert batches instead of delivering them"""
+    batches = []
+    with patch.object(budget_usage_service, 'send_alerts', MagicMock(side_effect=batches.append)), \
+            patch.object(budget_usage_service, '_schedule'):
+        yield batches
+
+
+class TestBudgetUsageCounters:
+    """Counters follow transaction events."""
+
+    def test_counter_tracks_creates_and_deletes(
+        self, test_db_session, test_user, test_account, test_category, monthly_budget, sent_alerts
+    ):
+        expense = _transaction(test_user, test_account, -3000, test_category)
+        other_category = _transaction(test_user, test_account, -9000)
+        test_db_session.add_all([expense, other_category])
+        test_db_session.commit()
+
+        counter = test_db_session.query(BudgetUsageCounter).filter_by(budget_id=monthly_budget.id).one()
+        assert counter.spent_cents == 3000
+        assert counter.transaction_count == 1
+
+        test_db_session.delete(expense)
+        test_db_session.commit()
+
+        test_db_session.refresh(counter)
+        assert counter.spent_cents == 0
+
+    def test_reads_use_counters(
+        self, test_db_session, test_user, test_account, test_category, monthly_budget, sent_alerts
+    ):
+        test_db_session.add(_transaction(test_user, test_account, -2500, test_category))
+        test_db_session.commit()
+
+        counter = test_db_session.query(BudgetUsageCounter).filter_by(budget_id=monthly_budget.id).one()
+        counter.spent_cents = 4242  # Only a counter lookup can produce this
+        test_db_session.flush()
+
+        [(budget, usage)] = BudgetService.get_budgets_with_usage(test_db_session, test_user.id)
+        assert usage.spent_cents == 4242
+
+    def test_budget_edit_invalidates_counters(
+        self, test_db_session, test_user, test_account, test_category, monthly_budget, sent_alerts
+    ):
+        test_db_session.add(_transaction(test_user, test_account, -2500, test_category))
+        test_db_session.commit()
+
+        BudgetService.update_budget(test_db_session, monthly_budget, BudgetUpdate(amount_cents=20000))
+
+        assert test_db_session.query(BudgetUsageCounter).filter_by(budget_id=monthly_budget.id).count() == 0
+        [(budget, usage)] = BudgetService.get_budgets_with_usage(test_db_session, test_user.id)
+        assert usage.spent_cents == 2500
+
+
+class TestBudgetUsageAlerts:
+    """Alerts fire when a counter crosses alert_threshold or the budget amount."""
+
+    def test_alerts_fire_once_per_crossing(
+        self, test_db_session, test_user, test_account, test_category, monthly_budget, sent_alerts
+    ):
+        test_db_session.add(_transaction(test_user, test_account, -5000, test_category))
+        test_db_session.commit()
+        assert sent_alerts == []
+
+        test_db_session.add(_transaction(test_user, test_account, -3500, test_category))
+        test_db_session.commit()
+        assert [alert['alert_type'] for batch in sent_alerts for alert in batch] == ["threshold"]
+
+        # Still between 80% and 100%: no repeat
+        test_db_session.add(_transaction(test_user, test_account, -500, test_category))
+        test_db_session.commit()
+        assert len(sent_alerts) == 1
+
+        test_db_session.add(_transaction(test_user, test_account, -2000, test_category))
+        test_db_session.commit()
+        assert sent_alerts[-1][0]['alert_type'] == "exceeded"
+        assert sent_alerts[-1][0]['spent_cents'] == 11000
+
+    def test_rolled_back_alerts_are_discarded(
+        self, test_db_session, test_user, test_account, test_category, monthly_budget, sent_alerts
+    ):
+        test_db_session.add(_transaction(test_user, test_account, -9000, test_category))
+        test_db_session.flush()
+        transaction_rollup_service.flush_dirty(test_db_session)
+        assert len(test_db_session.info[budget_usage_service.ALERTS_KEY]) == 1
+
+        test_db_session.rollback()
+
+        assert sent_alerts == []
+        assert budget_usage_service.ALERTS_KEY not in test_db_session.info
+
+
+# Test markers
+pytestmark = pytest.mark.integration
@@ -0,0 +1,138 @@
+"""
+Integration tests for TransactionRollupService.
+
+Verifies that daily rollups follow ORM creates/updates/deletes, bulk deletes and
+rebuilds, and that rollup-backed analytics match the transactions table.
+"""
+import pytest
+from uuid import uuid4
+from datetime import date
+
+from app.services.transaction_rollup_service import transaction_rollup_service
+from app.services.transaction_analytics_service import TransactionAnalyticsService
+from app.services.transaction_service import TransactionService
+from app.models.transaction import Transaction
+from app.models.transaction_daily_rollup import TransactionDailyRollup
+
+
+def _transaction(user, account, amount_cents, day, category=None, description="Test transaction"):
+    return Transaction(
+        id=uuid4(),
+        user_id=user.id,
+        account_id=account.id,
+        category_id=category.id if category else None,
+        amount_cents=amount_cents,
+        currency="USD",
+        description=description,
+        transaction_date=day,
+        status="posted",
+    )
+
+
+class TestRollupMaintenance:
+    """Rollups stay in step with transaction writes."""
+
+    def test_create_update_delete_refresh_rollups(self, test_db_session, test_user, test_account, test_category):
+        expense = _transaction(test_user, test_account, -2500, date(2025, 3, 1), test_category)
+        income = _transaction(test_user, test_account, 100000, date(2025, 3, 1))
+        test_db_session.add_all([expense, income])
+        test_db_session.commit()
+
+        totals = transaction_rollup_service.get_totals(test_db_session, test_user.id)
+        assert totals == {
+            'income_cents': 100000,
+            'expense_cents': 2500,
+            'income_count': 1,
+            'expense_count': 1,
+            'transaction_count': 2,
+        }
+
+        # Moving a transaction to another day refreshes both buckets
+        expense.transaction_date = date(2025, 3, 2)
+        expense.amount_cents = -4000
+        test_db_session.commit()
+
+        daily = transaction_rollup_service.get_daily_totals(test_db_session, test_user.id)
+        assert daily == [(date(2025, 3, 1), 100000, 0), (date(2025, 3, 2), 0, 4000)]
+
+        test_db_session.delete(income)
+        test_db_session.commit()
+
+        totals = transaction_rollup_service.get_totals(test_db_session, test_user.id)
+        assert totals['income_cents'] == 0
+        assert totals['transaction_count'] == 1
+
+    def test_bulk_delete_marks_days_dirty(self, test_db_session, test_user, test_account):
+        transactions = [
+            _transaction(test_user, test_account, -100 * (i + 1), date(2025, 4, i + 1)) for i in range(3)
+        ]
+        test_db_session.add_all(transactions)
+        test_db_session.commit()
+
+        TransactionService.bulk_delete_transactions(
+            test_db_session, test_user.id, [transactions[0].id, transactions[1].id]
+        )
+
+        totals = transaction_rollup_service.get_totals(test_db_session, test_user.id)
+        assert totals['expense_cents'] == 300
+        assert totals['transaction_count'] == 1
+
+    def test_rebuild_recovers_missing_rollups(self, test_db_session, test_user, test_account, test_category):
+        test_db_session.add_all([
+            _transaction(test_user, test_account, -1000, date(2025, 5, 1), test_category),
+            _transaction(test_user, test_account, -500, date(2025, 5, 20)),
+        ])
+        test_db_session.commit()
+
+        test_db_session.query(TransactionDailyRollup).delete()
+        test_db_session.commit()
+        assert transaction_rollup_service.get_totals(test_db_session, test_user.id)['transaction_count'] == 0
+
+        result = transaction_rollup_service.rebuild(test_db_session, user_id=test_user.id)
+
+        assert result['users_rebuilt'] == 1
+        assert transaction_rollup_service.get_totals(test_db_session, test_user.id)['expense_cents'] == 1500
+        uncategorized = transaction_rollup_service.get_totals(test_db_session, test_user.id, category_id=None)
+        assert uncategorized['expense_cents'] == 500
+
+
+class TestRollupBackedAnalytics:
+    """Analytics read from rollups and agree with the raw rows."""
+
+    def test_transaction_summary_matches_row_scan(self, test_db_session, test_user, test_account, test_category):
+        test_db_session.add_all([
+            _transaction(test_user, test_account, -1250, date(2025, 6, 3), test_category, "Groceries"),
+            _transaction(test_user, test_account, -750, date(2025, 6, 9), None, "Parking"),
+            _transaction(test_user, test_account, 300000, date(2025, 6, 15), None, "Salary"),
+        ])
+        test_db_session.commit()
+
+        from_rollups = TransactionAnalyticsService.get_transaction_summary(
+            test_db_session, test_user.id, date(2025, 6, 1), date(2025, 6, 30)
+        )
+        from_rows = TransactionAnalyticsService._get_transaction_summary_from_rows(
+            test_db_session, test_user.id, date(2025, 6, 1), date(2025, 6, 30)
+        )
+
+        for key in ("total_income", "total_expenses", "net_amount", "transaction_count", "transaction_count_by_type"):
+            assert from_rollups[key] == from_rows[key]
+        assert {c["categoryId"]: c["totalAmount"] for c in from_rollups["categoryBreakdown"]} == \
+            {c["categoryId"]: c["totalAmount"] for c in from_rows["categoryBreakdown"]}
+
+    def test_uncategorized_filter_uses_rollups(self, test_db_session, test_user, test_account, test_category):
+        test_db_session.add_all([
+            _transaction(test_user, test_account, -1250, date(2025, 6, 3), test_category),
+            _transaction(test_user, test_account, -750, date(2025, 6, 9)),
+        ])
+        test_db_session.commit()
+
+        summary = TransactionAnalyticsService.get_transaction_summary(
+            test_db_session, test_user.id, category_id='__uncategorized__'
+        )
+
+        assert summary["total_expenses"] == 7.5
+        assert summary["transaction_count"] == 1
+
+
+# Test markers
+pytestmark = pytest.mark.integration
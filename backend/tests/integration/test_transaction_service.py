@@ -391,5 +391,121 @@ class TestTransactionServiceDeleteIntegration:
         assert retrieved is None
 
 
+class TestTransactionServiceKeysetPaginationIntegration:
+    """Integration tests for cursor-based pagination and count modes."""
+
+    def _create_transactions(self, session, user, account, count):
+        transactions = []
+        for i in range(count):
+            transaction = Transaction(
+                id=uuid4(),
+                user_id=user.id,
+                account_id=account.id,
+                amount_cents=-(i + 1) * 100,
+                currency="USD",
+                description=f"Transaction {i + 1}",
+                transaction_date=date(2025, 2, (i % 4) + 1),  # Several rows share a date
+                status="posted"
+            )
+            transactions.append(transaction)
+            session.add(transaction)
+        session.commit()
+        return transactions
+
+    def test_cursor_walks_every_row_once(self, test_db_session, test_user, test_account):
+        """Following next_cursor returns each transaction exactly once, newest first."""
+        created = self._create_transactions(test_db_session, test_user, test_account, 11)
+
+        seen = []
+        pagination = TransactionPagination(limit=4)
+        while True:
+            page, total, next_cursor, is_estimate = TransactionService.get_transactions_page(
+                test_db_session, test_user.id, TransactionFilter(), pagination
+            )
+            seen.extend(page)
+            assert total == 11
+            assert is_estimate is False
+            if next_cursor is None:
+                break
+            pagination = TransactionPagination(limit=4, cursor=next_cursor)
+
+        assert sorted(t.id for t in seen) == sorted(t.id for t in created)
+        dates = [t.transaction_date for t in seen]
+        assert dates == sorted(dates, reverse=True)
+
+    def test_count_free_mode_skips_total(self, test_db_session, test_user, test_account):
+        """count_mode=none returns no total but still reports whether more rows exist."""
+        self._create_transactions(test_db_session, test_user, test_account, 3)
+
+        page, total, next_cursor, _ = TransactionService.get_transactions_page(
+            test_db_session, test_user.id, TransactionFilter(), TransactionPagination(limit=2, count_mode="none")
+        )
+
+        assert len(page) == 2
+        assert total is None
+        assert next_cursor is not None
+
+    def test_estimated_count_on_small_sets_is_exact(self, test_db_session, test_user, test_account):
+        """Small result sets fall back to an exact count in estimated mode."""
+        self._create_transactions(test_db_session, test_user, test_account, 5)
+
+        _, total, _, is_estimate = TransactionService.get_transactions_page(
+            test_db_session, test_user.id, TransactionFilter(start_date=date(2025, 2, 2)),
+            TransactionPagination(limit=2, count_mode="estimated")
+        )
+
+        assert total == 3
+        assert is_estimate is True
+
+    def test_invalid_cursor_is_rejected(self, test_db_session, test_user):
+        """A malformed cursor raises a validation error."""
+        from app.core.exceptions import ValidationError
+
+        with pytest.raises(ValidationError):
+            TransactionService.get_transactions_page(
+                test_db_session, test_user.id, TransactionFilter(), TransactionPagination(cursor="not-a-cursor")
+            )
+
+
+class TestTransactionSearchIntegration:
+    """Integration tests for ranked transaction search (non-PostgreSQL fallback)."""
+
+    def test_search_ranks_and_filters(self, test_db_session, test_user, test_account, test_category):
+        from app.services.transaction_search_service import transaction_search_service
+
+        rows = [
+            ("Card purchase", "Blue Bottle Coffee", None, None),
+            ("Team lunch", None, "coffee afterwards", None),
+            ("Groceries", "Safeway", None, None),
+            ("Monthly fee", None, None, test_category),
+        ]
+        for description, merchant, notes, category in rows:
+            test_db_session.add(Transaction(
+                id=uuid4(),
+                user_id=test_user.id,
+                account_id=test_account.id,
+                category_id=category.id if category else None,
+                amount_cents=-500,
+                currency="USD",
+                description=description,
+                merchant=merchant,
+                notes=notes,
+                transaction_date=date(2025, 3, 1),
+                status="posted"
+            ))
+        test_db_session.commit()
+
+        results, total = transaction_search_service.search(test_db_session, test_user.id, "coffee")
+
+        assert total == 2
+        assert [t.merchant for t in results] == ["Blue Bottle Coffee", None]
+
+        # Category names are searchable too
+        by_category, _ = transaction_search_service.search(
+            test_db_session, test_user.id, test_category.name[:4]
+        )
+        assert [t.description for t in by_category] == ["Monthly fee"]
+
+
 # Test markers
 pytestmark = pytest.mark.integration
\ No newline at end of file
@@ -0,0 +1,80 @@
+"""
+Unit tests for the AsyncSession dependencies and the routes served from them.
+
+Routes hand their sync service calls to AsyncSession.run_sync; the session
+here runs the callable against a mock sync Session.
+"""
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+
+from app.auth.dependencies import get_async_db_with_user_context
+from app.database import get_async_db
+from app.routes.transactions import get_transactions, get_transaction_categories
+from app.schemas.transaction import TransactionFilter, TransactionPagination, TransactionListResponse
+
+pytestmark = pytest.mark.unit
+
+
+def _async_db():
+    """AsyncSession stand-in whose run_sync calls fn with a mock sync Session"""
+    sync_session = MagicMock()
+    db = MagicMock()
+    db.sync_session = sync_session
+    db.execute = AsyncMock()
+    db.run_sync = AsyncMock(side_effect=lambda fn, *args, **kwargs: fn(sync_session, *args, **kwargs))
+    return db
+
+
+class TestAsyncDbDependencies:
+    """Async sessions carry the RLS user like their sync counterparts."""
+
+    @pytest.mark.asyncio
+    async def test_user_context_is_set_locally(self):
+        db = _async_db()
+        user = MagicMock(id=uuid4())
+
+        session = await get_async_db_with_user_context(db=db, current_user=user)
+
+        assert session is db
+        statement, params = db.execute.await_args.args
+        assert "set_config('app.current_user_id', :user_id, true)" in str(statement)
+        assert params == {"user_id": str(user.id)}
+
+    @pytest.mark.asyncio
+    async def test_unavailable_without_async_driver(self):
+        with patch('app.database.AsyncSessionLocal', None):
+            with pytest.raises(RuntimeError, match="unavailable"):
+                await get_async_db().__anext__()
+
+
+class TestAsyncRoutes:
+    """Read routes run the sync services through run_sync."""
+
+    @pytest.mark.asyncio
+    async def test_transaction_list_runs_service_in_run_sync(self):
+        db = _async_db()
+        user = MagicMock(id=uuid4())
+        pagination = TransactionPagination(limit=10, count_mode="estimated")
+
+        with patch('app.routes.transactions.TransactionService.get_transactions_page',
+                   return_value=([], 25_000, "next-cursor", True)) as get_page:
+            response = await get_transactions(
+                filters=TransactionFilter(), pagination=pagination, db=db, current_user=user
+            )
+
+        db.run_sync.assert_awaited_once()
+        assert get_page.call_args.args[0] is db.sync_session
+        assert isinstance(response, TransactionListResponse)
+        assert response.total == 25_000 and response.total_is_estimate
+        assert response.has_more and response.next_cursor == "next-cursor"
+
+    @pytest.mark.asyncio
+    async def test_categories_are_read_with_the_async_session(self):
+        db = _async_db()
+        db.execute.return_value.scalars.return_value = ["Groceries", None, "Rent"]
+
+        categories = await get_transaction_categories(db=db, current_user=MagicMock(id=uuid4()))
+
+        assert categories == ["Groceries", "Rent"]
+        db.run_sync.assert_not_awaited()
@@ -0,0 +1,153 @@
+"""
+Unit tests for the Redis-backed distributed sync scheduler.
+"""
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from app.services.automatic_sync_scheduler import (
+    AutomaticSyncScheduler,
+    SyncFrequency,
+    SyncJob,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def _job(job_id="account_1", priority=False, retry_count=0):
+    return SyncJob(
+        job_id=job_id,
+        account_id="1",
+        user_id="user-1",
+        frequency=SyncFrequency.DAILY,
+        last_run=None,
+        next_run=datetime.now(timezone.utc),
+        enabled=True,
+        retry_count=retry_count,
+        priority=priority,
+    )
+
+
+@pytest.fixture
+def redis():
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[1, 1, 0])
+    conn = MagicMock()
+    conn.eval = AsyncMock(return_value=1)
+    conn.hmget = AsyncMock(return_value=[])
+    conn.pipeline = MagicMock(return_value=pipe)
+    conn.close = AsyncMock()
+    client = MagicMock()
+    client.get_connection = AsyncMock(return_value=conn)
+    with patch('app.services.automatic_sync_scheduler.redis_client', client):
+        yield conn
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = AutomaticSyncScheduler()
+    scheduler._send_sync_notification = AsyncMock()
+    return scheduler
+
+
+class TestSyncJob:
+    """Jobs round-trip through their Redis representation."""
+
+    def test_json_round_trip(self):
+        job = _job()
+        job.disabled_at = datetime.now(timezone.utc)
+
+        assert SyncJob.from_json(job.to_json()) == job
+
+
+class TestLeasing:
+    """Leased jobs are released with their next run."""
+
+    @pytest.mark.asyncio
+    async def test_leases_jobs_and_drops_removed_ones(self, redis, scheduler):
+        redis.eval.side_effect = [["account_1", "account_2"], 1]
+        redis.hmget.return_value = [_job().to_json(), None]
+
+        jobs = await scheduler._lease_due_jobs(5)
+
+        assert [job.job_id for job in jobs] == ["account_1"]
+        release = redis.eval.await_args_list[1].args
+        assert release[7] == "account_2" and release[9] == '' and release[10] == ''
+
+    @pytest.mark.asyncio
+    async def test_release_keeps_state_of_a_requeued_immediate_job(self, redis, scheduler):
+        await scheduler._complete_lease("immediate_1", None, None)
+
+        script, numkeys, *keys = redis.eval.await_args.args[:7]
+        # A new request for the account may have re-queued it while this run held the lease
+        assert keys[numkeys - 1] == scheduler.PRIORITY_KEY
+        assert "elseif not redis.call('ZSCORE', KEYS[5], ARGV[1]) then\n    redis.call('HDEL'" in script
+
+    @pytest.mark.asyncio
+    async def test_success_reschedules_with_jitter(self, redis, scheduler):
+        scheduler._complete_lease = AsyncMock(return_value=True)
+        job = _job()
+
+        await scheduler._handle_job_success(job, {})
+
+        _, stored, next_run = scheduler._complete_lease.await_args.args
+        assert stored is job
+        assert abs(next_run - (job.last_run + timedelta(days=1))) <= timedelta(minutes=30)
+
+    @pytest.mark.asyncio
+    async def test_immediate_job_is_not_rescheduled(self, redis, scheduler):
+        scheduler._complete_lease = AsyncMock(return_value=True)
+
+        await scheduler._handle_job_success(_job("immediate_1", priority=True), {})
+
+        scheduler._complete_lease.assert_awaited_once_with("immediate_1", None, None)
+
+    @pytest.mark.asyncio
+    async def test_failure_backs_off_then_disables(self, redis, scheduler):
+        scheduler._complete_lease = AsyncMock(return_value=True)
+        job = _job()
+
+        await scheduler._handle_job_failure(job, "boom")
+        _, _, next_run = scheduler._complete_lease.await_args.args
+        assert job.enabled and job.retry_count == 1
+        assert next_run > datetime.now(timezone.utc) + timedelta(minutes=59)
+
+        job.retry_count = job.max_retries - 1
+        with patch('app.services.automatic_sync_scheduler.get_db', return_value=iter([MagicMock()])):
+            await scheduler._handle_job_failure(job, "boom")
+        assert not job.enabled and job.disabled_at is not None
+        scheduler._complete_lease.assert_awaited_with(job.job_id, job, None)
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_is_counted(self, redis, scheduler):
+        redis.eval.return_value = 0
+
+        assert await scheduler._complete_lease("account_1", _job(), None) is False
+        assert scheduler.sync_metrics['leases_lost'] == 1
+
+
+class TestImmediateSync:
+    """User-triggered syncs go to the priority queue."""
+
+    @pytest.mark.asyncio
+    async def test_queues_ahead_of_background_jobs(self, redis, scheduler):
+        scheduler._execute_sync_job = AsyncMock()
+
+        result = await scheduler.schedule_immediate_sync("1", "user-1")
+
+        pipe = redis.pipeline.return_value
+        pipe.zadd.assert_called_once()
+        assert pipe.zadd.call_args.args[0] == scheduler.PRIORITY_KEY
+        assert result['result'] == {'job_id': 'immediate_1', 'queue_position': 0}
+        scheduler._execute_sync_job.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_runs_inline_when_redis_is_down(self, scheduler):
+        scheduler._execute_sync_job = AsyncMock(return_value={'status': 'success'})
+        client = MagicMock()
+        client.get_connection = AsyncMock(side_effect=ConnectionError("redis down"))
+
+        with patch('app.services.automatic_sync_scheduler.redis_client', client):
+            result = await scheduler.schedule_immediate_sync("1", "user-1")
+
+        assert result['success'] and result['result'] == {'status': 'success'}
@@ -0,0 +1,70 @@
+"""
+Unit tests for BalanceHistoryService sampling and backward balance reconstruction.
+"""
+import pytest
+from datetime import date
+
+from app.services.balance_history_service import BalanceHistoryService
+
+pytestmark = pytest.mark.unit
+
+
+class TestSampleDates:
+    """Data point selection per granularity."""
+
+    def setup_method(self):
+        self.service = BalanceHistoryService()
+
+    def test_daily_includes_every_day(self):
+        samples = self.service.sample_dates(date(2025, 1, 1), date(2025, 1, 4), 'daily')
+        assert samples == [date(2025, 1, 1), date(2025, 1, 2), date(2025, 1, 3), date(2025, 1, 4)]
+
+    def test_weekly_steps_back_from_end(self):
+        samples = self.service.sample_dates(date(2025, 1, 1), date(2025, 1, 20), 'weekly')
+        assert samples == [date(2025, 1, 6), date(2025, 1, 13), date(2025, 1, 20)]
+
+    def test_monthly_uses_month_ends_and_end_date(self):
+        samples = self.service.sample_dates(date(2025, 1, 15), date(2025, 3, 10), 'monthly')
+        assert samples == [date(2025, 1, 31), date(2025, 2, 28), date(2025, 3, 10)]
+
+    def test_rejects_unknown_granularity(self):
+        with pytest.raises(ValueError):
+            self.service.sample_dates(date(2025, 1, 1), date(2025, 1, 2), 'hourly')
+
+
+class TestWalkBack:
+    """Balances are reconstructed from the current balance and per-day deltas."""
+
+    def setup_method(self):
+        self.service = BalanceHistoryService()
+        self.samples = [date(2025, 1, 1), date(2025, 1, 3), date(2025, 1, 5)]
+
+    def test_undoes_deltas_after_each_sample(self):
+        deltas = {date(2025, 1, 2): -500, date(2025, 1, 4): 2000, date(2025, 1, 5): -100}
+
+        balances = self.service._walk_back(10000, deltas, {}, self.samples)
+
+        assert balances == {
+            date(2025, 1, 5): 10000,
+            date(2025, 1, 3): 8100,
+            date(2025, 1, 1): 8600,
+        }
+
+    def test_snapshot_reanchors_the_walk(self):
+        # Day 4 snapshot disagrees with what the deltas imply (e.g. untracked interest)
+        deltas = {date(2025, 1, 2): -500, date(2025, 1, 4): 2000}
+        snapshots = {date(2025, 1, 4): 9000}
+
+        balances = self.service._walk_back(10000, deltas, snapshots, self.samples)
+
+        assert balances[date(2025, 1, 5)] == 10000
+        assert balances[date(2025, 1, 3)] == 7000
+        assert balances[date(2025, 1, 1)] == 7500
+
+    def test_snapshot_on_sample_date_wins(self):
+        snapshots = {date(2025, 1, 3): 4200}
+
+        balances = self.service._walk_back(10000, {}, snapshots, self.samples)
+
+        assert balances[date(2025, 1, 3)] == 4200
+        assert balances[date(2025, 1, 1)] == 4200
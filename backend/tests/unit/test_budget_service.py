@@ -592,5 +592,74 @@ class TestBudgetServiceGetBudgetAlerts:
         assert len(result) == 0  # No alerts should be generated
 
 
+class TestBudgetServiceCalendar:
+    """Calendars are assembled from one grouped (day, category) aggregate."""
+    
+    def _budget(self, category_id=None):
+        budget = MagicMock()
+        budget.id = uuid4()
+        budget.name = "Groceries"
+        budget.category_id = category_id
+        budget.amount_cents = 31000  # $10.00/day over March
+        budget.period = BudgetPeriod.MONTHLY
+        budget.start_date = date(2025, 1, 1)
+        budget.end_date = None
+        return budget
+    
+    def test_build_calendar_sums_categories_per_day(self):
+        """Uncategorized budgets count every expense category on a day."""
+        groceries, dining = uuid4(), uuid4()
+        daily_totals = {
+            (date(2025, 3, 2), groceries): (800, 1),
+            (date(2025, 3, 2), dining): (700, 2),
+            (date(2025, 3, 5), groceries): (300, 1),
+            (date(2025, 4, 1), groceries): (9999, 1),  # Outside the month
+        }
+        
+        calendar = BudgetService._build_calendar(self._budget(), "2025-03", daily_totals)
+        
+        days = {day.date: day for day in calendar.daily_data}
+        assert len(calendar.daily_data) == 31
+        assert days[date(2025, 3, 2)].actual_spending_cents == 1500
+        assert days[date(2025, 3, 2)].transactions_count == 3
+        assert days[date(2025, 3, 2)].is_over_limit is True
+        assert days[date(2025, 3, 5)].is_over_limit is False
+        assert calendar.summary["total_spending_cents"] == 1800
+        assert calendar.summary["days_over_limit"] == 1
+    
+    def test_build_calendar_filters_by_budget_category(self):
+        """Category budgets only see their own category."""
+        groceries, dining = uuid4(), uuid4()
+        daily_totals = {
+            (date(2025, 3, 2), groceries): (800, 1),
+            (date(2025, 3, 2), dining): (700, 2),
+        }
+        
+        calendar = BudgetService._build_calendar(self._budget(groceries), "2025-03", daily_totals)
+        
+        day = next(day for day in calendar.daily_data if day.date == date(2025, 3, 2))
+        assert day.actual_spending_cents == 800
+        assert day.transactions_count == 1
+    
+    def test_get_budgets_calendar_issues_one_aggregate_query(self):
+        """Every budget and month is served from a single daily-totals query."""
+        mock_db = MagicMock()
+        mock_db.query.return_value.filter.return_value.order_by.return_value.all.return_value = [
+            self._budget(), self._budget()
+        ]
+        with patch.object(BudgetService, '_get_daily_expense_totals', return_value={}) as totals:
+            overview = BudgetService.get_budgets_calendar(mock_db, uuid4(), months=3, end_month="2025-01")
+        
+        assert overview.months == ["2024-11", "2024-12", "2025-01"]
+        assert len(overview.calendars) == 6
+        totals.assert_called_once()
+        assert totals.call_args.args[2:] == (date(2024, 11, 1), date(2025, 1, 31))
+    
+    def test_get_budgets_calendar_rejects_bad_month(self):
+        """Malformed months surface as ValueError."""
+        with pytest.raises(ValueError):
+            BudgetService.get_budgets_calendar(MagicMock(), uuid4(), months=1, end_month="March")
+
+
 # Test markers
 pytestmark = pytest.mark.unit
\ No newline at end of file
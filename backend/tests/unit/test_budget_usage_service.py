@@ -0,0 +1,165 @@
+"""
+Unit tests for BudgetUsageService threshold detection and alert delivery.
+"""
+import asyncio
+import pytest
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+from app.services.budget_usage_service import BudgetUsageService
+from app.models.budget import Budget, BudgetPeriod
+from app.models.budget_usage_counter import BudgetUsageCounter
+
+pytestmark = pytest.mark.unit
+
+
+def _budget(**overrides):
+    values = dict(
+        id=uuid4(),
+        user_id=uuid4(),
+        category_id=None,
+        name="Dining",
+        amount_cents=10000,
+        period=BudgetPeriod.MONTHLY,
+        start_date=date(2025, 1, 1),
+        end_date=None,
+        alert_threshold=0.8,
+        is_active=True,
+    )
+    values.update(overrides)
+    return Budget(**values)
+
+
+def _totals(expense_cents):
+    return {'income_cents': 0, 'expense_cents': expense_cents, 'income_count': 0, 'expense_count': 1, 'transaction_count': 1}
+
+
+class TestAlertLevel:
+    """Spend is classified against alert_threshold and the budget amount."""
+
+    def setup_method(self):
+        self.service = BudgetUsageService()
+
+    def test_levels(self):
+        budget = _budget()
+        assert self.service.alert_level(budget, 7999) == BudgetUsageCounter.ALERT_NONE
+        assert self.service.alert_level(budget, 8000) == BudgetUsageCounter.ALERT_THRESHOLD
+        assert self.service.alert_level(budget, 10000) == BudgetUsageCounter.ALERT_THRESHOLD
+        assert self.service.alert_level(budget, 10001) == BudgetUsageCounter.ALERT_EXCEEDED
+
+    def test_zero_amount_never_alerts(self):
+        assert self.service.alert_level(_budget(amount_cents=0), 500) == BudgetUsageCounter.ALERT_NONE
+
+
+class TestRefreshBudget:
+    """Crossings queue an alert on the session; repeats and drops do not."""
+
+    def setup_method(self):
+        self.service = BudgetUsageService()
+        self.db = MagicMock()
+        self.db.info = {}
+
+    def _refresh(self, budget, counter, spent_cents):
+        self.db.query.return_value.filter.return_value.first.return_value = counter
+        with patch('app.services.budget_usage_service.transaction_rollup_service') as rollups:
+            rollups.get_totals.return_value = _totals(spent_cents)
+            return self.service.refresh_budget(self.db, budget, date(2025, 3, 15))
+
+    def test_new_counter_covers_current_period(self):
+        counter = self._refresh(_budget(), None, 1200)
+
+        self.db.add.assert_called_once_with(counter)
+        assert counter.period_start == date(2025, 3, 1)
+        assert counter.period_end == date(2025, 3, 31)
+        assert counter.spent_cents == 1200
+
+    def test_crossing_queues_one_alert(self):
+        budget = _budget()
+        counter = BudgetUsageCounter(alert_level=BudgetUsageCounter.ALERT_NONE)
+
+        self._refresh(budget, counter, 8500)
+        self._refresh(budget, counter, 9000)
+
+        alerts = self.db.info[BudgetUsageService.ALERTS_KEY]
+        assert len(alerts) == 1
+        assert alerts[0]['alert_type'] == "threshold"
+        assert alerts[0]['spent_cents'] == 8500
+        assert counter.alert_level == BudgetUsageCounter.ALERT_THRESHOLD
+
+    def test_dropping_below_rearms_threshold(self):
+        budget = _budget()
+        counter = BudgetUsageCounter(alert_level=BudgetUsageCounter.ALERT_EXCEEDED)
+
+        self._refresh(budget, counter, 1000)
+        assert counter.alert_level == BudgetUsageCounter.ALERT_NONE
+        assert BudgetUsageService.ALERTS_KEY not in self.db.info
+
+        self._refresh(budget, counter, 12000)
+        assert self.db.info[BudgetUsageService.ALERTS_KEY][0]['alert_type'] == "exceeded"
+
+    def test_budget_not_started_is_skipped(self):
+        assert self._refresh(_budget(start_date=date(2025, 6, 1)), None, 5000) is None
+        self.db.add.assert_not_called()
+
+
+class TestAlertDelivery:
+    """Queued alerts are delivered after commit."""
+
+    def test_after_commit_schedules_queued_alerts(self):
+        service = BudgetUsageService()
+        session = MagicMock()
+        session.info = {BudgetUsageService.ALERTS_KEY: [{'budget_id': 1}]}
+
+        with patch.object(service, '_schedule') as schedule, \
+                patch.object(service, 'send_alerts', MagicMock(return_value="coro")) as send:
+            service._after_commit(session)
+
+        send.assert_called_once_with([{'budget_id': 1}])
+        schedule.assert_called_once_with("coro")
+        assert session.info == {}
+
+    def test_schedule_hands_off_to_bound_loop_from_threads(self):
+        service = BudgetUsageService()
+        service.bind_loop(MagicMock(is_running=MagicMock(return_value=True)))
+        coro = AsyncMock()()
+
+        service._schedule(coro)
+
+        service._loop.call_soon_threadsafe.assert_called_once_with(service._spawn, coro)
+        coro.close()
+
+    @pytest.mark.asyncio
+    async def test_scheduled_delivery_is_retained_until_done(self):
+        service = BudgetUsageService()
+        delivered = asyncio.Event()
+
+        async def deliver():
+            delivered.set()
+
+        service._schedule(deliver())
+        assert len(service._tasks) == 1
+
+        await delivered.wait()
+        await asyncio.sleep(0)
+        assert service._tasks == set()
+
+    @pytest.mark.asyncio
+    async def test_send_alerts_notifies_and_emits(self):
+        service = BudgetUsageService()
+        alert = {
+            'user_id': uuid4(), 'budget_id': uuid4(), 'budget_name': "Dining", 'category_name': None,
+            'amount_cents': 10000, 'spent_cents': 8500, 'period': "monthly",
+            'alert_threshold': 0.8, 'alert_type': "threshold",
+        }
+
+        with patch('app.database.SessionLocal') as session_local, \
+                patch('app.services.notification_service.NotificationService.create_budget_alert', new_callable=AsyncMock) as notify, \
+                patch('app.websocket.events.WebSocketEvents.emit_budget_alert', new_callable=AsyncMock) as emit:
+            session_local.return_value.get_bind.return_value.dialect.name = "sqlite"
+            await service.send_alerts([alert])
+
+        assert notify.await_args.kwargs['percentage_used'] == 85.0
+        assert emit.await_args.args[1]['alert_threshold'] == 80.0
+        assert emit.await_args.kwargs['alert_type'] == "threshold"
+        session_local.return_value.close.assert_called_once()
@@ -0,0 +1,190 @@
+"""
+Unit tests for micro-batching concurrent ML categorization calls.
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.schemas.ml import (
+    MLBatchCategorizationResponse,
+    MLCategorizationResponse,
+    MLErrorResponse,
+    MLServiceResponse,
+)
+from app.services.ml_request_coalescer import MLRequestCoalescer
+
+pytestmark = pytest.mark.unit
+
+
+def _result(name: str) -> MLCategorizationResponse:
+    return MLCategorizationResponse(
+        category_id="6f1c5a9e-3d9b-4c55-9a43-0a1a6f3f2c11",
+        category_name=name,
+        confidence=0.9,
+    )
+
+
+def _batch_response(names):
+    return MLServiceResponse(
+        success=True,
+        data=MLBatchCategorizationResponse(
+            results=[_result(name) for name in names],
+            processed_count=len(names),
+        ),
+    )
+
+
+def _client():
+    client = MagicMock()
+    client.batch_categorize = AsyncMock()
+    client._categorize_single = AsyncMock(
+        side_effect=lambda description, **kwargs: MLServiceResponse(success=True, data=_result(description))
+    )
+    return client
+
+
+class TestCoalescing:
+    """Concurrent calls share one batch request."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_become_one_batch(self):
+        client = _client()
+        client.batch_categorize.side_effect = lambda items, user_id=None: _batch_response(
+            [item["description"] for item in items]
+        )
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=5)
+
+        responses = await asyncio.gather(
+            *(coalescer.categorize(f"Shop {i}", -100 * i, user_id="user-1") for i in range(4))
+        )
+
+        client.batch_categorize.assert_awaited_once()
+        items = client.batch_categorize.await_args.args[0]
+        assert [item["description"] for item in items] == ["Shop 0", "Shop 1", "Shop 2", "Shop 3"]
+        assert client.batch_categorize.await_args.kwargs["user_id"] == "user-1"
+        assert [r.data.category_name for r in responses] == ["Shop 0", "Shop 1", "Shop 2", "Shop 3"]
+        client._categorize_single.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_dispatches_without_waiting(self):
+        client = _client()
+        client.batch_categorize.side_effect = lambda items, user_id=None: _batch_response(
+            [item["description"] for item in items]
+        )
+        coalescer = MLRequestCoalescer(client, max_batch_size=2, max_wait_ms=10_000)
+
+        responses = await asyncio.wait_for(
+            asyncio.gather(coalescer.categorize("A", -1), coalescer.categorize("B", -2)),
+            timeout=1
+        )
+
+        assert [r.data.category_name for r in responses] == ["A", "B"]
+
+    @pytest.mark.asyncio
+    async def test_users_are_batched_separately(self):
+        client = _client()
+        client.batch_categorize.side_effect = lambda items, user_id=None: _batch_response(
+            [item["description"] for item in items]
+        )
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=5)
+
+        await asyncio.gather(
+            coalescer.categorize("A", -1, user_id="u1"),
+            coalescer.categorize("B", -2, user_id="u1"),
+            coalescer.categorize("C", -3, user_id="u2"),
+        )
+
+        client.batch_categorize.assert_awaited_once()
+        client._categorize_single.assert_awaited_once()
+        assert client._categorize_single.await_args.kwargs["user_id"] == "u2"
+
+    @pytest.mark.asyncio
+    async def test_lone_request_uses_single_endpoint(self):
+        client = _client()
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=1)
+
+        response = await coalescer.categorize("Coffee", -450, merchant="Blue Bottle")
+
+        assert response.data.category_name == "Coffee"
+        client.batch_categorize.assert_not_awaited()
+        assert client._categorize_single.await_args.kwargs["merchant"] == "Blue Bottle"
+
+
+class TestFailures:
+    """Every caller gets an answer, even when the batch misbehaves."""
+
+    @pytest.mark.asyncio
+    async def test_result_count_mismatch_falls_back_to_single_calls(self):
+        client = _client()
+        client.batch_categorize.return_value = _batch_response(["only one"])
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=5)
+
+        responses = await asyncio.gather(coalescer.categorize("A", -1), coalescer.categorize("B", -2))
+
+        assert [r.data.category_name for r in responses] == ["A", "B"]
+        assert client._categorize_single.await_count == 2
+        assert coalescer.metrics()["fallbacks"] == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_error_is_shared_by_every_caller(self):
+        client = _client()
+        client.batch_categorize.return_value = MLServiceResponse(
+            success=False,
+            error=MLErrorResponse(error="circuit_open", message="ML service circuit is open"),
+        )
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=5)
+
+        responses = await asyncio.gather(coalescer.categorize("A", -1), coalescer.categorize("B", -2))
+
+        assert all(r.error.error == "circuit_open" for r in responses)
+        client._categorize_single.assert_not_awaited()
+
+
+class TestShutdown:
+    """In-flight batches are retained and drained on close."""
+
+    @pytest.mark.asyncio
+    async def test_aclose_waits_for_in_flight_batches(self):
+        client = _client()
+        release = asyncio.Event()
+
+        async def slow_batch(items, user_id=None):
+            await release.wait()
+            return _batch_response(["A", "B"])
+
+        client.batch_categorize = AsyncMock(side_effect=slow_batch)
+        coalescer = MLRequestCoalescer(client, max_batch_size=2, max_wait_ms=1000)
+
+        callers = [asyncio.ensure_future(coalescer.categorize(name, -1)) for name in ("A", "B")]
+        await asyncio.sleep(0)
+        assert len(coalescer._sends) == 1
+
+        closing = asyncio.ensure_future(coalescer.aclose())
+        release.set()
+        await closing
+
+        assert coalescer._sends == set()
+        assert [c.result().data.category_name for c in callers] == ["A", "B"]
+
+
+class TestMetrics:
+
+    @pytest.mark.asyncio
+    async def test_reports_batch_sizes(self):
+        client = _client()
+        client.batch_categorize.side_effect = lambda items, user_id=None: _batch_response(
+            [item["description"] for item in items]
+        )
+        coalescer = MLRequestCoalescer(client, max_batch_size=10, max_wait_ms=5)
+
+        await asyncio.gather(*(coalescer.categorize(str(i), -1) for i in range(3)))
+        await coalescer.categorize("solo", -1)
+
+        metrics = coalescer.metrics()
+        assert metrics["requests"] == 4
+        assert metrics["batches"] == 1
+        assert metrics["batched_requests"] == 3
+        assert metrics["single_requests"] == 1
+        assert metrics["pending"] == 0
+        assert metrics["batch_size"]["max"] == 3
+        assert metrics["batch_size"]["avg"] == 2.0
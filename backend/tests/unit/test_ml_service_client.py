@@ -0,0 +1,140 @@
+"""
+Unit tests for the pooled ML service client and its circuit breaker.
+"""
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+
+from app.schemas.ml import MLServiceConfig
+from app.services.ml_service import MLServiceClient, CircuitBreaker
+
+pytestmark = pytest.mark.unit
+
+CATEGORIZATION = {
+    "category_id": "6f1c5a9e-3d9b-4c55-9a43-0a1a6f3f2c11",
+    "category_name": "Food & Dining",
+    "confidence": 0.92,
+}
+
+
+def _client(handler, **config):
+    client = MLServiceClient(MLServiceConfig(**{"base_url": "http://ml.test", "max_retries": 2, **config}))
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._calculate_backoff_delay = lambda attempt: 0
+    client.coalescer = None  # coalescing is covered in test_ml_request_coalescer
+    return client
+
+
+class TestSharedPool:
+    """Every call goes through one long-lived client."""
+
+    @pytest.mark.asyncio
+    async def test_calls_reuse_the_pooled_client(self):
+        calls = []
+
+        def handler(request):
+            calls.append(request.url.path)
+            return httpx.Response(200, json=CATEGORIZATION)
+
+        client = _client(handler)
+        pooled = client._client
+
+        for _ in range(3):
+            await client.categorize_transaction("Coffee", -450)
+
+        assert calls == ["/ml/categorize"] * 3
+        assert client._client is pooled
+
+        await client.aclose()
+        assert pooled.is_closed
+
+    @pytest.mark.asyncio
+    async def test_start_reopens_closed_pool(self):
+        client = MLServiceClient(MLServiceConfig(base_url="http://ml.test"))
+
+        await client.start()
+        first = client._client
+        await client.aclose()
+        await client.start()
+
+        assert client._client is not first
+        assert not client._client.is_closed
+        await client.aclose()
+
+
+class TestCircuitBreaker:
+    """Failing fast once the ML service is degraded."""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_skips_network(self):
+        attempts = []
+
+        def handler(request):
+            attempts.append(1)
+            return httpx.Response(503, json={"error": "unavailable", "message": "down"})
+
+        client = _client(handler)
+        client.circuit_breaker = CircuitBreaker(failure_threshold=3, reset_timeout_seconds=60)
+
+        first = await client.categorize_transaction("Coffee", -450)
+        second = await client.categorize_transaction("Coffee", -450)
+
+        assert first.success is False
+        assert len(attempts) == 3  # initial attempt + 2 retries, then the circuit opens
+        assert second.error.error == "circuit_open"
+        assert len(attempts) == 3
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_closes_circuit(self):
+        responses = iter([httpx.Response(503), httpx.Response(200, json=CATEGORIZATION)])
+        client = _client(lambda request: next(responses), max_retries=0)
+        client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=10)
+
+        with patch("app.services.ml_service.time.monotonic", return_value=100.0):
+            await client.categorize_transaction("Coffee", -450)
+        assert client.circuit_breaker.state == CircuitBreaker.OPEN
+
+        with patch("app.services.ml_service.time.monotonic", return_value=111.0):
+            result = await client.categorize_transaction("Coffee", -450)
+
+        assert result.success is True
+        assert client.circuit_breaker.state == CircuitBreaker.CLOSED
+
+    def test_half_open_allows_single_probe(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+        breaker.record_failure()
+
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_protocol_error_on_probe_reopens_circuit(self):
+        def handler(request):
+            raise httpx.RemoteProtocolError("server disconnected", request=request)
+
+        client = _client(handler, max_retries=0)
+        client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+        client.circuit_breaker.record_failure()
+
+        with pytest.raises(httpx.RemoteProtocolError):
+            await client._make_request_with_retry("POST", "http://ml.test/ml/categorize")
+
+        assert client.circuit_breaker.state == CircuitBreaker.OPEN
+        assert client.circuit_breaker.allow_request() is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_is_released(self):
+        def handler(request):
+            raise asyncio.CancelledError()
+
+        client = _client(handler, max_retries=0)
+        client.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=0)
+        client.circuit_breaker.record_failure()
+
+        with pytest.raises(asyncio.CancelledError):
+            await client._make_request_with_retry("POST", "http://ml.test/ml/categorize")
+
+        assert client.circuit_breaker.allow_request() is True
@@ -0,0 +1,226 @@
+"""
+Unit tests for cursor-based /transactions/sync ingestion.
+
+Plaid traffic is served by the in-memory fake in app.scripts.fake_plaid_server,
+wired in as its httpx transport so PlaidClientService runs unchanged.
+"""
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+from datetime import date
+
+from app.services.plaid_transaction_service import PlaidTransactionService
+from app.services.transaction_sync_service import TransactionSyncService, IncrementalSyncResult
+from app.models.transaction import Transaction
+from app.models.account import Account
+from app.models.goal import Goal, GoalContribution, GoalType
+from app.models.plaid_sync_cursor import PlaidSyncCursor
+
+pytestmark = pytest.mark.unit
+
+
+class TestFetchTransactionUpdates:
+    """Draining /transactions/sync pages into a single delta set."""
+
+    @pytest.mark.asyncio
+    async def test_drains_all_pages_and_returns_final_cursor(self, fake_plaid):
+        item_id, token = fake_plaid.create_item()
+        for i in range(5):
+            fake_plaid.add_transaction(item_id, transaction_id=f"t{i}")
+
+        service = PlaidTransactionService()
+        result = await service.fetch_transaction_updates(token, cursor=None, count=2)
+
+        assert [t['transaction_id'] for t in result['added']] == ['t0', 't1', 't2', 't3', 't4']
+        assert result['pages'] == 3
+
+        # Nothing new since the returned cursor
+        fake_plaid.modify_transaction(item_id, 't1', amount=99.0)
+        fake_plaid.remove_transaction(item_id, 't2')
+        delta = await service.fetch_transaction_updates(token, cursor=result['next_cursor'], count=2)
+
+        assert delta['added'] == []
+        assert [t['transaction_id'] for t in delta['modified']] == ['t1']
+        assert delta['removed'] == [{'transaction_id': 't2'}]
+
+    @pytest.mark.asyncio
+    async def test_restarts_from_original_cursor_on_pagination_mutation(self, fake_plaid):
+        item_id, token = fake_plaid.create_item()
+        for i in range(4):
+            fake_plaid.add_transaction(item_id, transaction_id=f"t{i}")
+        fake_plaid.mutations_during_pagination = 1
+
+        result = await PlaidTransactionService().fetch_transaction_updates(token, cursor=None, count=2)
+
+        assert result['restarts'] == 1
+        # No page is duplicated by the restart
+        assert [t['transaction_id'] for t in result['added']] == ['t0', 't1', 't2', 't3']
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_restarts(self, fake_plaid):
+        item_id, token = fake_plaid.create_item()
+        for i in range(4):
+            fake_plaid.add_transaction(item_id, transaction_id=f"t{i}")
+        fake_plaid.mutations_during_pagination = 10
+
+        with pytest.raises(Exception, match="kept changing"):
+            await PlaidTransactionService().fetch_transaction_updates(
+                token, cursor=None, count=2, max_restarts=2
+            )
+
+
+class TestSyncItemIncremental:
+    """Cursor persistence and delta application in TransactionSyncService."""
+
+    def setup_method(self):
+        self.sync_service = TransactionSyncService()
+        self.sync_service._acquire_sync_lock = AsyncMock(return_value=True)
+        self.sync_service._release_sync_lock = AsyncMock(return_value=True)
+        self.mock_db = MagicMock()
+
+        self.account = Account(
+            id=uuid4(),
+            user_id=uuid4(),
+            name="Checking",
+            account_type="checking",
+            plaid_account_id="plaid-acc-1",
+            plaid_item_id="item-1",
+        )
+        self.sync_state = PlaidSyncCursor(user_id=self.account.user_id, plaid_item_id="item-1", cursor="c-1")
+
+    def _empty_result(self) -> IncrementalSyncResult:
+        return IncrementalSyncResult(
+            item_id="item-1", added=1, modified=0, removed=0, new_transactions=1,
+            updated_transactions=0, duplicates_skipped=0, removed_transactions=0,
+            errors=[], sync_duration_seconds=0
+        )
+
+    @pytest.mark.asyncio
+    async def test_advances_cursor_after_deltas_are_applied(self):
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [self.account]
+        deltas = {'added': [], 'modified': [], 'removed': [], 'next_cursor': 'c-2', 'pages': 1}
+
+        with patch.object(type(self.account), 'plaid_access_token', new='token-1'), \
+             patch.object(self.sync_service, '_get_or_create_sync_cursor', return_value=self.sync_state), \
+             patch.object(self.sync_service, '_apply_transaction_deltas',
+                          AsyncMock(return_value=self._empty_result())) as apply_mock:
+            self.sync_service.plaid_service = MagicMock()
+            self.sync_service.plaid_service.fetch_transaction_updates = AsyncMock(return_value=deltas)
+
+            result = await self.sync_service.sync_item_incremental("item-1", self.mock_db)
+
+        self.sync_service.plaid_service.fetch_transaction_updates.assert_awaited_once()
+        assert self.sync_service.plaid_service.fetch_transaction_updates.await_args.args[1] == "c-1"
+        apply_mock.assert_awaited_once()
+        assert self.sync_state.cursor == "c-2"
+        assert self.sync_state.last_added_count == 1
+        assert result.cursor_advanced is True
+        assert self.account.sync_status == 'synced'
+
+    @pytest.mark.asyncio
+    async def test_cursor_untouched_when_apply_fails(self):
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [self.account]
+        self.mock_db.query.return_value.filter.return_value.first.return_value = self.sync_state
+        deltas = {'added': [], 'modified': [], 'removed': [], 'next_cursor': 'c-2'}
+
+        with patch.object(type(self.account), 'plaid_access_token', new='token-1'), \
+             patch.object(self.sync_service, '_get_or_create_sync_cursor', return_value=self.sync_state), \
+             patch.object(self.sync_service, '_apply_transaction_deltas',
+                          AsyncMock(side_effect=Exception("db down"))):
+            self.sync_service.plaid_service = MagicMock()
+            self.sync_service.plaid_service.fetch_transaction_updates = AsyncMock(return_value=deltas)
+
+            with pytest.raises(Exception, match="db down"):
+                await self.sync_service.sync_item_incremental("item-1", self.mock_db)
+
+        assert self.sync_state.cursor == "c-1"
+        assert self.sync_state.last_error == "db down"
+        self.sync_service._release_sync_lock.assert_awaited_once_with("item:item-1")
+
+    @pytest.mark.asyncio
+    async def test_rejects_concurrent_item_sync(self):
+        self.sync_service._acquire_sync_lock = AsyncMock(return_value=False)
+
+        with pytest.raises(Exception, match="already being synced"):
+            await self.sync_service.sync_item_incremental("item-1", self.mock_db)
+
+    def test_apply_plaid_update_keeps_user_category(self):
+        category_id = uuid4()
+        transaction = Transaction(
+            id=uuid4(),
+            user_id=self.account.user_id,
+            account_id=self.account.id,
+            amount_cents=-500,
+            description="PENDING COFFEE",
+            transaction_date=date(2025, 8, 1),
+            status='pending',
+            category_id=category_id,
+            plaid_transaction_id="pending-1",
+        )
+
+        self.sync_service._apply_plaid_update(transaction, {
+            'transaction_id': 'posted-1',
+            'account_id': 'plaid-acc-1',
+            'amount': 5.75,
+            'name': 'COFFEE SHOP',
+            'date': '2025-08-02',
+            'pending': False,
+        }, self.account)
+
+        assert transaction.amount_cents == -575
+        assert transaction.status == 'posted'
+        assert transaction.transaction_date == date(2025, 8, 2)
+        assert transaction.category_id == category_id
+        assert transaction.metadata_json['plaid_data']['transaction_id'] == 'posted-1'
+
+    @pytest.mark.asyncio
+    async def test_removed_transaction_takes_its_goal_contributions(self, test_db_session, test_user, test_account):
+        test_account.plaid_account_id = "plaid-acc-1"
+        transaction = Transaction(
+            id=uuid4(),
+            user_id=test_user.id,
+            account_id=test_account.id,
+            amount_cents=-2500,
+            description="TRANSFER TO SAVINGS",
+            transaction_date=date(2025, 8, 1),
+            plaid_transaction_id="removed-1",
+        )
+        goal = Goal(id=uuid4(), user_id=test_user.id, name="Holiday", target_amount_cents=100000,
+                    goal_type=GoalType.SAVINGS)
+        test_db_session.add_all([transaction, goal])
+        test_db_session.flush()
+        test_db_session.add(GoalContribution(
+            id=uuid4(), goal_id=goal.id, amount_cents=2500,
+            contribution_date=date(2025, 8, 1), transaction_id=transaction.id
+        ))
+        test_db_session.commit()
+
+        with patch('app.services.transaction_sync_service.transaction_rollup_service'):
+            result = await self.sync_service._apply_transaction_deltas(
+                "item-1", [test_account], {'removed': [{'transaction_id': 'removed-1'}]}, test_db_session
+            )
+
+        assert result.removed_transactions == 1
+        assert test_db_session.query(Transaction).filter(Transaction.id == transaction.id).count() == 0
+        assert test_db_session.query(GoalContribution).count() == 0
+
+
+class TestTransactionsWebhookRouting:
+    """SYNC_UPDATES_AVAILABLE and legacy codes trigger an item-scoped cursor sync."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("webhook_code", ["SYNC_UPDATES_AVAILABLE", "DEFAULT_UPDATE"])
+    async def test_webhook_runs_item_sync(self, webhook_code):
+        from app.services.plaid_webhook_service import PlaidWebhookService
+
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = [MagicMock(user_id=uuid4())]
+
+        with patch('app.services.transaction_sync_service.transaction_sync_service.sync_transactions_for_item',
+                   AsyncMock(return_value={'success': True, 'total_new_transactions': 3})) as sync_mock:
+            result = await PlaidWebhookService()._handle_transactions_webhook(
+                {'webhook_type': 'TRANSACTIONS', 'webhook_code': webhook_code, 'item_id': 'item-1'}, db
+            )
+
+        sync_mock.assert_awaited_once_with(db, 'item-1')
+        assert result['success'] is True
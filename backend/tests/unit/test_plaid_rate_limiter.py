@@ -0,0 +1,96 @@
+"""
+Unit tests for Plaid rate limiting and retries in PlaidClientService.
+
+Plaid traffic is served by the in-memory fake in app.scripts.fake_plaid_server,
+wired in as its httpx transport so PlaidClientService runs unchanged.
+"""
+import pytest
+from unittest.mock import patch
+
+from app.services.plaid_client_service import PlaidAPIError, plaid_client_service
+from app.services.plaid_rate_limiter import PlaidRateLimiter, TokenBucket
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def fake_plaid(fake_plaid):
+    """The shared fake Plaid server behind a real rate limiter, without retry backoff."""
+    limiter = PlaidRateLimiter(limits={'transactions/sync': (6000, 600)})
+    with patch.object(plaid_client_service, 'rate_limiter', limiter), \
+         patch.object(plaid_client_service, '_calculate_backoff_delay', return_value=0.0) as backoff:
+        fake_plaid.backoff = backoff
+        yield fake_plaid
+
+
+class TestTokenBucket:
+    """Buckets throttle to their rate and adapt to 429s."""
+
+    def test_waits_once_burst_is_spent(self):
+        bucket = TokenBucket(60, burst=2)
+
+        assert bucket.reserve(now=bucket.updated) == 0
+        assert bucket.reserve(now=bucket.updated) == 0
+        assert bucket.reserve(now=bucket.updated) == pytest.approx(1.0)
+
+    def test_rate_limit_halves_rate_and_recovers(self):
+        bucket = TokenBucket(60, burst=5)
+        now = bucket.updated
+
+        bucket.on_rate_limited(retry_after=3, now=now)
+
+        assert bucket.rate == pytest.approx(0.5)
+        assert bucket.reserve(now=now + 1) == pytest.approx(2.0)
+        for _ in range(20):
+            bucket.on_success()
+        assert bucket.rate == pytest.approx(bucket.base_rate)
+
+    def test_rate_never_drops_below_floor(self):
+        bucket = TokenBucket(60, min_fraction=0.25)
+
+        for _ in range(10):
+            bucket.on_rate_limited(now=bucket.updated)
+
+        assert bucket.rate == pytest.approx(0.25)
+
+
+class TestPlaidClientRetries:
+    """Rate-limited calls are retried and slow the item down."""
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_call_is_retried(self, fake_plaid):
+        item_id, token = fake_plaid.create_item()
+        fake_plaid.add_transaction(item_id, transaction_id="t0")
+        fake_plaid.rate_limited_calls = 2
+
+        result = await plaid_client_service.sync_transactions(token)
+
+        assert result['success']
+        assert [t['transaction_id'] for t in result['added']] == ['t0']
+        assert len(fake_plaid.requests) == 3
+        assert fake_plaid.backoff.call_count == 2
+
+        item_key = PlaidRateLimiter.item_key(token)
+        bucket = plaid_client_service.rate_limiter.item_buckets[('transactions/sync', item_key)]
+        assert bucket.rate < bucket.base_rate
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, fake_plaid):
+        _, token = fake_plaid.create_item()
+        fake_plaid.rate_limited_calls = 100
+
+        with patch('app.services.plaid_client_service.settings.PLAID_MAX_RETRIES', 2):
+            result = await plaid_client_service.sync_transactions(token)
+
+        assert not result['success']
+        assert result['error_code'] == 'RATE_LIMIT'
+        assert len(fake_plaid.requests) == 3
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self, fake_plaid):
+        with pytest.raises(PlaidAPIError) as exc_info:
+            await plaid_client_service._make_request('transactions/sync', {'access_token': 'unknown'})
+
+        assert exc_info.value.error_code == 'INVALID_ACCESS_TOKEN'
+        assert len(fake_plaid.requests) == 1
+        fake_plaid.backoff.assert_not_called()
@@ -0,0 +1,133 @@
+"""
+Unit tests for Plaid webhook verification and its key cache.
+
+Webhooks are signed, and verification keys served, by the in-memory fake in
+app.scripts.fake_plaid_server, wired in as PlaidClientService's httpx transport.
+"""
+import asyncio
+import json
+import time
+import pytest
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from jose import JWTError
+from starlette.requests import Request
+
+from app.auth.dependencies import verify_plaid_webhook
+from app.auth.plaid_webhook_verifier import PlaidWebhookVerifier
+from app.scripts.fake_plaid_server import FakePlaidServer
+
+pytestmark = pytest.mark.unit
+
+BODY = json.dumps({"webhook_type": "TRANSACTIONS", "webhook_code": "DEFAULT_UPDATE", "item_id": "item-1"}).encode()
+
+
+def _key_requests(server):
+    return [payload for endpoint, payload in server.requests if endpoint == 'webhook_verification_key/get']
+
+
+class TestPlaidWebhookVerifier:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_webhooks_share_one_key_fetch(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=3600)
+        header = fake_plaid.sign_webhook(BODY)
+
+        results = await asyncio.gather(*(verifier.verify(header, BODY) for _ in range(20)))
+        await verifier.verify(fake_plaid.sign_webhook(BODY), BODY)
+
+        assert len(results) == 20
+        assert len(_key_requests(fake_plaid)) == 1
+        assert verifier.key_fetches == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_cache_entries_are_refetched(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=0)
+        header = fake_plaid.sign_webhook(BODY)
+
+        await verifier.verify(header, BODY)
+        await verifier.verify(header, BODY)
+
+        assert len(_key_requests(fake_plaid)) == 2
+
+    @pytest.mark.asyncio
+    async def test_rejects_tampered_body_and_stale_tokens(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=3600)
+
+        with pytest.raises(JWTError, match="does not match"):
+            await verifier.verify(fake_plaid.sign_webhook(BODY), BODY + b" ")
+        with pytest.raises(JWTError, match="too old"):
+            await verifier.verify(fake_plaid.sign_webhook(BODY, iat=int(time.time()) - 600), BODY)
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_and_expired_keys(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=3600)
+        forged = FakePlaidServer().sign_webhook(BODY)
+
+        with pytest.raises(JWTError, match="does not recognise"):
+            await verifier.verify(forged, BODY)
+
+        kid = fake_plaid.rotate_webhook_key()
+        fake_plaid.expire_webhook_key(kid)
+        with pytest.raises(JWTError, match="expired"):
+            await verifier.verify(fake_plaid.sign_webhook(BODY, kid=kid), BODY)
+
+    @pytest.mark.asyncio
+    async def test_unknown_kids_are_not_looked_up_again(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=3600, unknown_key_ttl_seconds=300)
+        forged = FakePlaidServer().sign_webhook(BODY)
+
+        for _ in range(3):
+            with pytest.raises(JWTError, match="does not recognise"):
+                await verifier.verify(forged, BODY, source="203.0.113.7")
+
+        assert len(_key_requests(fake_plaid)) == 1
+
+    @pytest.mark.asyncio
+    async def test_key_lookups_are_limited_per_source(self, fake_plaid):
+        verifier = PlaidWebhookVerifier(ttl_seconds=3600, misses_per_minute=2)
+
+        for _ in range(2):
+            with pytest.raises(JWTError, match="does not recognise"):
+                await verifier.verify(FakePlaidServer().sign_webhook(BODY), BODY, source="203.0.113.7")
+        with pytest.raises(JWTError, match="Too many"):
+            await verifier.verify(FakePlaidServer().sign_webhook(BODY), BODY, source="203.0.113.7")
+
+        # Plaid's own webhooks from another address are unaffected
+        await verifier.verify(fake_plaid.sign_webhook(BODY), BODY, source="52.21.26.131")
+        assert len(_key_requests(fake_plaid)) == 3
+
+
+class TestVerifyPlaidWebhookDependency:
+
+    def _request(self, body: bytes):
+        reads = []
+
+        async def receive():
+            reads.append(1)
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        scope = {"type": "http", "method": "POST", "path": "/webhooks/plaid", "headers": []}
+        return Request(scope, receive), reads
+
+    @pytest.mark.asyncio
+    async def test_body_is_read_once_for_verification_and_handler(self, fake_plaid):
+        request, reads = self._request(BODY)
+
+        with patch('app.auth.dependencies.plaid_webhook_verifier', PlaidWebhookVerifier(ttl_seconds=3600)):
+            assert await verify_plaid_webhook(request, fake_plaid.sign_webhook(BODY)) is True
+
+        assert (await request.json())["webhook_code"] == "DEFAULT_UPDATE"
+        assert len(reads) == 1
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_is_a_401(self, fake_plaid):
+        request, _ = self._request(BODY)
+        header = fake_plaid.sign_webhook(b"{}")
+
+        with patch('app.auth.dependencies.plaid_webhook_verifier', PlaidWebhookVerifier(ttl_seconds=3600)):
+            with pytest.raises(HTTPException) as exc_info:
+                await verify_plaid_webhook(request, header)
+
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,186 @@
+"""
+Unit tests for cached recurring insights and the concurrent recurring sync.
+"""
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+
+from app.models.plaid_recurring_transaction import PlaidRecurringTransaction
+from app.services.plaid_webhook_service import PlaidWebhookService
+from app.services.recurring_insights_service import RecurringInsightsService
+
+pytestmark = pytest.mark.unit
+
+
+def _stream(account_id, frequency="MONTHLY", amount_cents=1500, is_muted=False, is_mature=True):
+    return {
+        "id": str(uuid4()),
+        "account_id": str(account_id),
+        "frequency": frequency,
+        "amount_cents": amount_cents,
+        "is_muted": is_muted,
+        "is_mature": is_mature,
+        "monthly_estimated_amount_cents": amount_cents,
+    }
+
+
+def _snapshot(streams, last_synced_at, has_plaid_accounts=True):
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "last_synced_at": last_synced_at.isoformat() if last_synced_at else None,
+        "has_plaid_accounts": has_plaid_accounts,
+        "recurring_transactions": streams,
+    }
+
+
+@pytest.fixture
+def redis():
+    conn = MagicMock()
+    conn.set = AsyncMock(return_value=True)
+    conn.close = AsyncMock()
+    client = MagicMock()
+    client.get_cache = AsyncMock(return_value=None)
+    client.set_cache = AsyncMock(return_value=True)
+    client.delete_cache = AsyncMock(return_value=True)
+    client.get_connection = AsyncMock(return_value=conn)
+    with patch('app.services.recurring_insights_service.redis_client', client):
+        yield client
+
+
+class TestGetInsights:
+
+    @pytest.mark.asyncio
+    async def test_cache_hit_serves_snapshot_without_touching_db(self, redis):
+        account_id = uuid4()
+        streams = [_stream(account_id), _stream(uuid4(), frequency="WEEKLY", amount_cents=800, is_muted=True)]
+        redis.get_cache.return_value = _snapshot(streams, datetime.now(timezone.utc))
+        db = MagicMock()
+        service = RecurringInsightsService()
+
+        result = await service.get_insights(db, uuid4())
+
+        db.query.assert_not_called()
+        assert result["freshness"]["cache_hit"] is True
+        assert result["freshness"]["is_stale"] is False
+        assert result["freshness"]["refresh_scheduled"] is False
+        assert result["summary"]["total_count"] == 2
+        assert result["summary"]["muted_count"] == 1
+        assert result["summary"]["monthly_estimated_total_cents"] == 1500
+        assert result["summary"]["by_frequency"] == {"MONTHLY": 1, "WEEKLY": 1}
+
+        filtered = await service.get_insights(db, uuid4(), account_id=account_id)
+        assert [s["account_id"] for s in filtered["recurring_transactions"]] == [str(account_id)]
+
+    @pytest.mark.asyncio
+    async def test_cache_miss_builds_and_caches_snapshot(self, redis):
+        service = RecurringInsightsService()
+        snapshot = _snapshot([], datetime.now(timezone.utc))
+        with patch.object(service, 'build_snapshot', AsyncMock(return_value=snapshot)) as build:
+            result = await service.get_insights(MagicMock(), uuid4())
+
+        build.assert_awaited_once()
+        redis.set_cache.assert_awaited_once()
+        assert redis.set_cache.await_args.args[1] is snapshot
+        assert result["freshness"]["cache_hit"] is False
+
+    @pytest.mark.asyncio
+    async def test_stale_read_schedules_a_single_refresh(self, redis):
+        user_id = uuid4()
+        redis.get_cache.return_value = _snapshot([], datetime.now(timezone.utc) - timedelta(days=3))
+        service = RecurringInsightsService()
+        release = asyncio.Event()
+
+        async def slow_sync(*args):
+            await release.wait()
+            return {"success": True}
+
+        with patch.object(service, '_sync', side_effect=slow_sync) as sync:
+            first = await service.get_insights(MagicMock(), user_id)
+            second = await service.get_insights(MagicMock(), user_id)
+            release.set()
+            await asyncio.gather(*service._tasks)
+
+        assert first["freshness"]["is_stale"] is True
+        assert first["freshness"]["refresh_scheduled"] is True
+        assert second["freshness"]["refresh_scheduled"] is False
+        sync.assert_called_once_with(user_id, None)
+        assert not service._refreshing
+
+    @pytest.mark.asyncio
+    async def test_users_without_plaid_accounts_are_never_stale(self, redis):
+        redis.get_cache.return_value = _snapshot([], None, has_plaid_accounts=False)
+        service = RecurringInsightsService()
+
+        with patch.object(service, 'schedule_refresh', AsyncMock()) as schedule:
+            result = await service.get_insights(MagicMock(), uuid4(), refresh=True)
+
+        schedule.assert_not_called()
+        assert result["freshness"]["is_stale"] is False
+
+
+class TestConcurrentRecurringSync:
+
+    def _accounts(self, user_id, count):
+        accounts = []
+        for i in range(count):
+            account = MagicMock()
+            account.id = uuid4()
+            account.user_id = user_id
+            account.name = f"Account {i}"
+            account.plaid_access_token = f"token-{i}"
+            account.plaid_account_id = f"plaid-acc-{i}"
+            accounts.append(account)
+        return accounts
+
+    @pytest.mark.asyncio
+    async def test_items_are_fetched_concurrently_within_the_limit(self):
+        user_id = uuid4()
+        accounts = self._accounts(user_id, 5)
+        db = MagicMock()
+        db.query.return_value.filter.return_value.all.return_value = accounts
+        db.query.return_value.filter.return_value.first.return_value = None
+
+        in_flight = 0
+        peak = 0
+
+        async def fetch(access_token):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            index = access_token.split("-")[1]
+            return {
+                "success": True,
+                "inflow_streams": [],
+                "outflow_streams": [{
+                    "stream_id": f"stream-{index}",
+                    "account_id": f"plaid-acc-{index}",
+                    "description": "Gym",
+                    "average_amount": {"amount": 25.0, "iso_currency_code": "USD"},
+                    "frequency": "MONTHLY",
+                    "status": "MATURE",
+                }],
+            }
+
+        service = PlaidWebhookService()
+        with patch('app.services.plaid_webhook_service.settings.PLAID_RECURRING_MAX_CONCURRENCY', 2), \
+             patch('app.services.plaid_webhook_service.settings.PLAID_RECURRING_MIN_INTERVAL_MS', 0), \
+             patch('app.services.plaid_webhook_service.plaid_client_service.fetch_recurring_transactions', side_effect=fetch), \
+             patch('app.services.plaid_webhook_service.websocket_manager.send_to_user', AsyncMock()), \
+             patch('app.services.recurring_insights_service.recurring_insights_service.invalidate', AsyncMock()) as invalidate:
+            result = await service.sync_recurring_transactions_for_user(db, user_id)
+
+        assert peak == 2
+        assert result["new_recurring_transactions"] == 5
+        invalidate.assert_awaited_once_with(user_id)
+
+        created = [call.args[0] for call in db.add.call_args_list]
+        assert all(isinstance(row, PlaidRecurringTransaction) for row in created)
+        assert created[0].plaid_frequency == "MONTHLY"
+        assert created[0].plaid_status == "MATURE"
+        assert created[0].amount_cents == 2500
+        assert created[0].plaid_account_id == "plaid-acc-0"
+        db.commit.assert_called_once()
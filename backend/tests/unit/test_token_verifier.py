@@ -0,0 +1,230 @@
+"""
+Unit tests for local Supabase token verification and the auth user cache.
+
+Signing keys and the JWKS endpoint come from the in-process stand-in in
+app.scripts.fake_supabase_auth.
+"""
+import time
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+
+from jose import jwt, JWTError
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.auth import dependencies
+from app.auth.token_verifier import SupabaseTokenVerifier, AuthUserCache
+from app.models.user import User
+from app.scripts.fake_supabase_auth import FakeSupabaseAuth, JWKS_PATH
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def fake_auth():
+    return FakeSupabaseAuth()
+
+
+@pytest.fixture
+def verifier(fake_auth):
+    return SupabaseTokenVerifier(
+        jwks_url=f"http://fake-supabase{JWKS_PATH}",
+        jwt_secret="",
+        audience="authenticated",
+        jwks_ttl_seconds=3600,
+        transport=fake_auth.transport()
+    )
+
+
+def _user(**overrides):
+    values = dict(
+        id=uuid4(), supabase_user_id=uuid4(), email="cached@example.com", locale="en-US",
+        timezone="UTC", currency="USD", is_active=True, is_verified=True,
+        notification_push=True, theme="light"
+    )
+    values.update(overrides)
+    return User(**values)
+
+
+class TestSupabaseTokenVerifier:
+
+    @pytest.mark.asyncio
+    async def test_verifies_rs256_tokens_with_one_jwks_fetch(self, fake_auth, verifier):
+        sub = str(uuid4())
+        for _ in range(3):
+            claims = await verifier.verify(fake_auth.issue_token(sub=sub))
+            assert claims["sub"] == sub
+
+        assert fake_auth.jwks_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_rotated_key_triggers_a_refetch(self, fake_auth, verifier):
+        verifier.MIN_REFETCH_SECONDS = 0
+        await verifier.verify(fake_auth.issue_token())
+        new_kid = fake_auth.rotate()
+
+        claims = await verifier.verify(fake_auth.issue_token(kid=new_kid, email="rotated@example.com"))
+
+        assert claims["email"] == "rotated@example.com"
+        assert fake_auth.jwks_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_kid_refetches_are_rate_limited(self, fake_auth, verifier):
+        await verifier.verify(fake_auth.issue_token())
+        other = FakeSupabaseAuth()
+
+        assert await verifier.verify(other.issue_token()) is None
+        assert await verifier.verify(other.issue_token()) is None
+        # Fetched moments ago, so unknown kids fall straight back to Supabase
+        assert fake_auth.jwks_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_rejects_expired_tampered_and_wrong_audience_tokens(self, fake_auth, verifier):
+        with pytest.raises(JWTError):
+            await verifier.verify(fake_auth.issue_token(expires_in=-60))
+        with pytest.raises(JWTError):
+            await verifier.verify(fake_auth.issue_token(aud="service_role"))
+
+        header, payload, signature = fake_auth.issue_token().split(".")
+        forged = jwt.encode({"sub": "attacker", "aud": "authenticated", "exp": int(time.time()) + 60}, "x")
+        with pytest.raises(JWTError):
+            await verifier.verify(".".join([header, forged.split(".")[1], signature]))
+
+    @pytest.mark.asyncio
+    async def test_hs256_tries_each_configured_secret(self):
+        verifier = SupabaseTokenVerifier(jwks_url="", jwt_secret="new-secret, old-secret", audience="authenticated")
+        payload = {"sub": str(uuid4()), "aud": "authenticated", "exp": int(time.time()) + 60}
+
+        claims = await verifier.verify(jwt.encode(payload, "old-secret", algorithm="HS256"))
+        assert claims["sub"] == payload["sub"]
+
+        with pytest.raises(JWTError):
+            await verifier.verify(jwt.encode(payload, "unknown-secret", algorithm="HS256"))
+
+    @pytest.mark.asyncio
+    async def test_returns_none_without_key_material(self, fake_auth):
+        verifier = SupabaseTokenVerifier(jwks_url="", jwt_secret="", audience="authenticated")
+        payload = {"sub": str(uuid4()), "aud": "authenticated", "exp": int(time.time()) + 60}
+
+        assert await verifier.verify(fake_auth.issue_token()) is None
+        assert await verifier.verify(jwt.encode(payload, "secret", algorithm="HS256")) is None
+
+
+class TestAuthUserCache:
+
+    @pytest.mark.asyncio
+    async def test_hit_is_merged_into_the_session_without_a_query(self):
+        cache = AuthUserCache(maxsize=10, max_ttl_seconds=300, use_redis=False)
+        user = _user()
+        await cache.set(str(user.supabase_user_id), user, time.time() + 60)
+
+        db = MagicMock()
+        db.merge.side_effect = lambda instance, load: instance
+        cached = await cache.get(db, str(user.supabase_user_id))
+
+        db.query.assert_not_called()
+        assert db.merge.call_args.kwargs == {"load": False}
+        assert cached.id == user.id
+        assert cached.email == "cached@example.com"
+
+    @pytest.mark.asyncio
+    async def test_entries_expire_with_the_token(self):
+        cache = AuthUserCache(maxsize=10, max_ttl_seconds=300, use_redis=False)
+        user = _user()
+        await cache.set("expired", user, time.time() - 1)
+        await cache.set("short", user, time.time() + 0.05)
+
+        assert await cache.get(MagicMock(), "expired") is None
+        time.sleep(0.1)
+        assert await cache.get(MagicMock(), "short") is None
+
+    def test_redis_encoding_round_trips_column_types(self):
+        user = _user()
+        snapshot = AuthUserCache.snapshot(user)
+
+        decoded = AuthUserCache._decode(AuthUserCache._encode(snapshot))
+
+        assert decoded == snapshot
+
+    @pytest.mark.asyncio
+    async def test_invalidate_drops_the_user_everywhere(self):
+        cache = AuthUserCache(maxsize=10, max_ttl_seconds=300, use_redis=True)
+        user = _user()
+        subject = str(user.supabase_user_id)
+        cache._cache[subject] = (time.time() + 60, AuthUserCache.snapshot(user))
+
+        redis = MagicMock()
+        redis.delete_cache = AsyncMock()
+        redis.publish = AsyncMock()
+        with patch('app.core.redis_client.redis_client', redis):
+            await cache.invalidate(user.supabase_user_id)
+
+        assert subject not in cache._cache
+        redis.delete_cache.assert_awaited_once_with(f"auth_user:{subject}")
+        redis.publish.assert_awaited_once_with(AuthUserCache.INVALIDATION_CHANNEL, {"subject": subject})
+
+    @pytest.mark.asyncio
+    async def test_invalidation_from_another_worker_evicts_the_local_copy(self):
+        cache = AuthUserCache(maxsize=10, max_ttl_seconds=300, use_redis=True)
+        cache._cache["sub-1"] = (time.time() + 60, {})
+
+        async def deliver(channel, callback):
+            await callback({"subject": "sub-1"})
+
+        redis = MagicMock()
+        redis.subscribe = AsyncMock(side_effect=deliver)
+        with patch('app.core.redis_client.redis_client', redis):
+            await cache.listen_for_invalidations()
+
+        assert "sub-1" not in cache._cache
+
+
+class TestGetCurrentUser:
+
+    def _auth_service(self):
+        auth_service = MagicMock()
+        auth_service.db.merge.side_effect = lambda instance, load: instance
+        return auth_service
+
+    @pytest.mark.asyncio
+    async def test_locally_verified_token_skips_supabase_and_caches_the_user(self, fake_auth, verifier):
+        user = _user()
+        token = fake_auth.issue_token(sub=str(user.supabase_user_id))
+        auth_service = self._auth_service()
+        auth_service.user_service.get_by_supabase_id.return_value = user
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+        with patch.object(dependencies, 'token_verifier', verifier), \
+             patch.object(dependencies, 'auth_user_cache', AuthUserCache(maxsize=10, max_ttl_seconds=300, use_redis=False)):
+            first = await dependencies.get_current_user(credentials, auth_service)
+            second = await dependencies.get_current_user(credentials, auth_service)
+
+        assert first.id == second.id == user.id
+        auth_service.supabase.client.auth.get_user.assert_not_called()
+        auth_service.user_service.get_by_supabase_id.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_supabase_when_token_cannot_be_verified_locally(self):
+        user = _user()
+        auth_service = self._auth_service()
+        auth_service.supabase.client.auth.get_user.return_value.user.id = str(user.supabase_user_id)
+        auth_service.user_service.get_by_supabase_id.return_value = user
+        unverifiable = SupabaseTokenVerifier(jwks_url="", jwt_secret="", audience="authenticated")
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=FakeSupabaseAuth().issue_token())
+
+        with patch.object(dependencies, 'token_verifier', unverifiable):
+            result = await dependencies.get_current_user(credentials, auth_service)
+
+        assert result is user
+        auth_service.supabase.client.auth.get_user.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_rejected_with_401(self, fake_auth, verifier):
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=fake_auth.issue_token(expires_in=-60))
+
+        with patch.object(dependencies, 'token_verifier', verifier):
+            with pytest.raises(HTTPException) as exc_info:
+                await dependencies.get_current_user(credentials, self._auth_service())
+
+        assert exc_info.value.status_code == 401
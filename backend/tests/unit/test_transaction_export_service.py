@@ -0,0 +1,78 @@
+"""
+Unit tests for TransactionExportService encoding and compression.
+"""
+import csv
+import gzip
+import io
+import json
+import pytest
+from types import SimpleNamespace
+from uuid import uuid4
+from datetime import date, datetime
+
+from app.services.transaction_export_service import TransactionExportService
+
+pytestmark = pytest.mark.unit
+
+
+def _row(amount_cents, category_name="Food", day=date(2025, 3, 1)):
+    return SimpleNamespace(
+        id=uuid4(),
+        amount_cents=amount_cents,
+        category_name=category_name,
+        description="Lunch, with \"quotes\"",
+        transaction_date=day,
+        created_at=datetime(2025, 3, 1, 12, 30),
+        updated_at=datetime(2025, 3, 2, 8, 0),
+    )
+
+
+class TestEncode:
+    """Batch encoders for each format."""
+
+    def setup_method(self):
+        self.service = TransactionExportService()
+        self.batches = [[_row(-1250), _row(50000, None)], [_row(-99)]]
+
+    def test_csv_has_header_and_one_chunk_per_batch(self):
+        chunks = list(self.service.encode(self.batches, "csv"))
+
+        assert len(chunks) == 3
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert [r["amount"] for r in rows] == ["12.5", "500.0", "0.99"]
+        assert [r["transaction_type"] for r in rows] == ["expense", "income", "expense"]
+        assert rows[0]["description"] == "Lunch, with \"quotes\""
+        assert rows[1]["category"] == ""
+
+    def test_ndjson_emits_one_object_per_line(self):
+        lines = "".join(self.service.encode(self.batches, "ndjson")).splitlines()
+
+        assert len(lines) == 3
+        assert json.loads(lines[0])["updated_at"] == "2025-03-02T08:00:00"
+
+    def test_json_is_a_single_valid_array(self):
+        payload = json.loads("".join(self.service.encode(self.batches + [[]], "json")))
+
+        assert len(payload) == 3
+        assert payload[2]["amount"] == 0.99
+
+    def test_empty_json_export(self):
+        assert json.loads("".join(self.service.encode([], "json"))) == []
+
+    def test_rejects_unknown_format(self):
+        with pytest.raises(ValueError):
+            list(self.service.encode(self.batches, "xml"))
+
+
+class TestGzip:
+    """Incremental gzip output."""
+
+    def test_round_trips(self):
+        service = TransactionExportService()
+        chunks = list(service.encode([[_row(-100)] * 500], "ndjson"))
+
+        compressed = b"".join(service.gzip(iter(chunks)))
+
+        assert gzip.decompress(compressed).decode() == "".join(chunks)
+        assert service.media_type("ndjson", True) == "application/gzip"
+        assert service.filename("csv", True) == "transactions.csv.gz"
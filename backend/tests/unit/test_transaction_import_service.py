@@ -0,0 +1,136 @@
+"""
+Unit tests for the streaming CSV import engine.
+"""
+import io
+import threading
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+from uuid import uuid4
+from datetime import date
+
+from app.core.exceptions import ValidationError
+from app.services.transaction_import_service import TransactionImportService
+
+pytestmark = pytest.mark.unit
+
+
+def _csv(*rows, header="transaction_date,amount,transaction_type,description,account"):
+    return io.BytesIO(("\n".join((header,) + rows) + "\n").encode())
+
+
+class TestParseRow:
+    """Row validation and normalisation."""
+
+    def setup_method(self):
+        self.service = TransactionImportService()
+        self.checking = uuid4()
+        self.savings = uuid4()
+        self.accounts = {"checking": self.checking, "savings": self.savings}
+
+    def test_expense_amounts_are_negative_cents(self):
+        row = self.service._parse_row(
+            {"transaction_date": "2025-03-01", "amount": "12.34", "transaction_type": "expense",
+             "description": "Lunch", "account": "Checking"},
+            self.accounts, None
+        )
+
+        assert row["amount_cents"] == -1234
+        assert row["account_id"] == self.checking
+        assert row["transaction_date"] == date(2025, 3, 1)
+        assert row["currency"] == "USD"
+
+    def test_explicit_account_overrides_column(self):
+        row = self.service._parse_row(
+            {"transaction_date": "2025-03-01", "amount": "1,000.00", "account": "Checking"},
+            self.accounts, self.savings
+        )
+
+        assert row["account_id"] == self.savings
+        assert row["amount_cents"] == 100000
+
+    @pytest.mark.parametrize("row, message", [
+        ({"transaction_date": "03/01/2025", "amount": "1"}, "invalid transaction_date"),
+        ({"transaction_date": "2025-03-01", "amount": "abc"}, "invalid amount"),
+        ({"transaction_date": "2025-03-01", "amount": "1", "account": "Brokerage"}, "unknown account"),
+        ({"transaction_date": "2025-03-01", "amount": "1"}, "account is required"),
+    ])
+    def test_invalid_rows_raise_value_error(self, row, message):
+        with pytest.raises(ValueError, match=message):
+            self.service._parse_row(row, self.accounts, None)
+
+
+class TestImportCsv:
+    """Chunked loading, progress reporting and strict/lenient modes."""
+
+    def setup_method(self):
+        self.service = TransactionImportService(chunk_size=2)
+        self.account_id = uuid4()
+        self.db = MagicMock()
+        self.db.get_bind.return_value.dialect.name = "sqlite"
+        self.service._load_accounts = MagicMock(return_value={"checking": self.account_id})
+
+    @pytest.mark.asyncio
+    async def test_loads_in_chunks_and_reports_progress(self):
+        progress = AsyncMock()
+        upload = _csv(*(f"2025-03-0{i},5.00,expense,Coffee {i}," for i in range(1, 6)))
+
+        with patch.object(self.service, "_merge_via_insert",
+                          side_effect=lambda db, user_id, chunk, import_id: [r["transaction_date"] for r in chunk]) as merge, \
+             patch("app.services.transaction_import_service.transaction_rollup_service"):
+            summary = await self.service.import_csv(self.db, uuid4(), upload, progress_callback=progress)
+
+        assert [len(call.args[2]) for call in merge.call_args_list] == [2, 2, 1]
+        assert summary.imported == 5
+        assert summary.first_date == date(2025, 3, 1)
+        assert summary.last_date == date(2025, 3, 5)
+        self.db.commit.assert_called_once()
+        statuses = [call.args[0]["status"] for call in progress.await_args_list]
+        assert statuses == ["processing", "processing", "processing", "completed"]
+
+    @pytest.mark.asyncio
+    async def test_loading_runs_off_the_event_loop(self):
+        progress = AsyncMock()
+        merge_threads = []
+
+        def merge(db, user_id, chunk, import_id):
+            merge_threads.append(threading.current_thread())
+            return [r["transaction_date"] for r in chunk]
+
+        with patch.object(self.service, "_merge_via_insert", side_effect=merge), \
+             patch("app.services.transaction_import_service.transaction_rollup_service"):
+            await self.service.import_csv(
+                self.db, uuid4(), _csv("2025-03-01,5.00,expense,Coffee,"), progress_callback=progress
+            )
+
+        assert merge_threads and threading.current_thread() not in merge_threads
+        assert progress.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_strict_mode_rolls_back_on_invalid_rows(self):
+        upload = _csv("2025-03-01,5.00,expense,Coffee,", "not-a-date,5.00,expense,Tea,")
+
+        with patch.object(self.service, "_merge_via_insert", return_value=[]), \
+             patch("app.services.transaction_import_service.transaction_rollup_service"):
+            with pytest.raises(ValidationError):
+                await self.service.import_csv(self.db, uuid4(), upload)
+
+        self.db.rollback.assert_called_once()
+        self.db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_lenient_mode_skips_invalid_rows(self):
+        upload = _csv("2025-03-01,5.00,expense,Coffee,", "not-a-date,5.00,expense,Tea,", "2025-03-02,7.00,income,Refund,")
+
+        with patch.object(self.service, "_merge_via_insert",
+                          side_effect=lambda db, user_id, chunk, import_id: [r["transaction_date"] for r in chunk]), \
+             patch("app.services.transaction_import_service.transaction_rollup_service"):
+            summary = await self.service.import_csv(self.db, uuid4(), upload, skip_invalid_rows=True)
+
+        assert summary.imported == 2
+        assert summary.invalid_rows == 1
+        assert summary.errors == ["Row 3: invalid transaction_date 'not-a-date', expected YYYY-MM-DD"]
+
+    @pytest.mark.asyncio
+    async def test_missing_required_columns(self):
+        with pytest.raises(ValidationError, match="amount"):
+            await self.service.import_csv(self.db, uuid4(), _csv("2025-03-01", header="transaction_date"))
@@ -0,0 +1,78 @@
+"""
+Unit tests for TransactionSearchService query building and fallback ranking.
+"""
+import pytest
+from unittest.mock import MagicMock
+from uuid import uuid4
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.transaction_search_service import TransactionSearchService
+from app.models.transaction import Transaction
+
+pytestmark = pytest.mark.unit
+
+
+def _db(dialect_name):
+    db = MagicMock()
+    db.get_bind.return_value.dialect.name = dialect_name
+    return db
+
+
+class TestSearchQueryBuilding:
+    """Index-friendly predicates per dialect."""
+
+    def setup_method(self):
+        self.service = TransactionSearchService()
+
+    def test_tokenize_strips_tsquery_operators(self):
+        assert self.service.tokenize("Coffee & (shop) | !x:*") == ["coffee", "shop", "x"]
+
+    def test_postgres_uses_prefix_tsquery(self):
+        query = MagicMock()
+
+        self.service.apply_search_filter(query, "coff sho", _db("postgresql"))
+
+        predicate = query.filter.call_args.args[0]
+        compiled = predicate.compile(dialect=postgresql.dialect())
+        assert "transactions.search_vector @@ to_tsquery(" in str(compiled)
+        assert "ILIKE" in str(compiled)
+        assert "coff:* & sho:*" in compiled.params.values()
+
+    def test_sqlite_skips_tsvector(self):
+        query = MagicMock()
+
+        self.service.apply_search_filter(query, "coffee", _db("sqlite"))
+
+        predicate = query.filter.call_args.args[0]
+        assert "search_vector" not in str(predicate)
+
+    def test_blank_query_is_a_no_op(self):
+        query = MagicMock()
+
+        assert self.service.apply_search_filter(query, "   ", _db("postgresql")) is query
+        query.filter.assert_not_called()
+
+
+class TestFallbackRanking:
+    """Python ranking used when the tsvector column is unavailable."""
+
+    def setup_method(self):
+        self.service = TransactionSearchService()
+
+    def _transaction(self, **fields):
+        return Transaction(id=uuid4(), user_id=uuid4(), amount_cents=-100,
+                           transaction_date=date(2025, 1, 1), **fields)
+
+    def test_merchant_match_outranks_notes_match(self):
+        merchant_hit = self._transaction(description="Card purchase", merchant="Blue Bottle Coffee")
+        notes_hit = self._transaction(description="Team lunch", notes="coffee afterwards")
+
+        assert self.service.fallback_score(merchant_hit, "coffee") > self.service.fallback_score(notes_hit, "coffee")
+
+    def test_whole_word_outranks_prefix(self):
+        exact = self._transaction(description="Coffee")
+        prefix = self._transaction(description="Coffeehouse")
+
+        assert self.service.fallback_score(exact, "coffee") > self.service.fallback_score(prefix, "coffee")
@@ -436,5 +436,67 @@ class TestTransactionServiceDeleteTransaction:
         mock_db.commit.assert_called_once()
 
 
+
+class TestTransactionServicePlannerEstimate:
+    """Test the EXPLAIN row estimate behind estimated counts."""
+
+    def _db(self):
+        from sqlalchemy.dialects.postgresql import asyncpg
+
+        mock_db = MagicMock()
+        mock_db.get_bind.return_value.dialect = asyncpg.dialect()
+        return mock_db
+
+    def test_explain_binds_parameters_inside_a_savepoint(self):
+        """The EXPLAIN keeps the query's bound parameters and runs in a savepoint."""
+        from sqlalchemy import select
+
+        mock_db = self._db()
+        mock_db.execute.return_value.scalar.return_value = [{"Plan": {"Plan Rows": 1234}}]
+        user_id = uuid4()
+        query = MagicMock()
+        query.statement = select(Transaction.id).where(Transaction.user_id == user_id)
+
+        estimate = TransactionService._planner_row_estimate(mock_db, query)
+
+        assert estimate == 1234
+        (explain,) = mock_db.execute.call_args.args
+        compiled = explain.compile(dialect=mock_db.get_bind.return_value.dialect)
+        assert str(compiled).startswith("EXPLAIN (FORMAT JSON)")
+        assert "$1" in str(compiled) and user_id in compiled.params.values()
+        mock_db.begin_nested.assert_called_once()
+
+    def test_explain_compiles_search_filters(self):
+        """Estimated counts work with a search term, whose to_tsquery config is a REGCONFIG."""
+        from sqlalchemy import select
+        from sqlalchemy.dialects.postgresql import psycopg2
+        from app.services.transaction_search_service import transaction_search_service
+
+        for dialect in (self._db().get_bind.return_value.dialect, psycopg2.dialect()):
+            mock_db = MagicMock()
+            mock_db.get_bind.return_value.dialect = dialect
+            mock_db.execute.return_value.scalar.return_value = '[{"Plan": {"Plan Rows": 42}}]'
+            query = MagicMock()
+            query.filter.side_effect = lambda clause: select(Transaction.id).where(clause)
+            query.statement = transaction_search_service.apply_search_filter(query, "coffee shop", mock_db)
+
+            assert TransactionService._planner_row_estimate(mock_db, query) == 42
+            (explain,) = mock_db.execute.call_args.args
+            compiled = explain.compile(dialect=dialect)
+            assert "to_tsquery" in str(compiled)
+            assert "coffee:* & shop:*" not in str(compiled) and "coffee:* & shop:*" in compiled.params.values()
+
+    def test_failed_explain_returns_none(self):
+        """A failing EXPLAIN degrades to no estimate instead of raising."""
+        from sqlalchemy import select
+
+        mock_db = self._db()
+        mock_db.execute.side_effect = RuntimeError("syntax error")
+        query = MagicMock()
+        query.statement = select(Transaction.id)
+
+        assert TransactionService._planner_row_estimate(mock_db, query) is None
+
+
 # Integration test marker
 pytestmark = pytest.mark.unit
\ No newline at end of file
@@ -10,7 +10,7 @@ from uuid import uuid4
 from datetime import date, datetime, timezone, timedelta
 from typing import Dict, Any
 
-from app.services.transaction_sync_service import TransactionSyncService
+from app.services.transaction_sync_service import TransactionSyncService, SyncResult
 from app.models.transaction import Transaction
 from app.models.account import Account
 
@@ -442,5 +442,153 @@ class TestTransactionConflictResolution:
         assert result == candidate2  # Should choose the better match
 
 
+
+class TestBulkIngestion:
+    """Test the set-based ingestion path used for large syncs."""
+    
+    def setup_method(self):
+        """Set up test fixtures for each test method."""
+        self.sync_service = TransactionSyncService()
+        self.mock_db = MagicMock()
+        
+        self.mock_account = Account(
+            id=uuid4(),
+            name="Test Checking",
+            account_type="checking",
+            user_id=uuid4(),
+            currency="USD"
+        )
+    
+    def _plaid_transaction(self, plaid_id: str, name: str, amount: float, txn_date: str) -> Dict[str, Any]:
+        return {
+            'transaction_id': plaid_id,
+            'name': name,
+            'amount': amount,
+            'date': txn_date,
+            'category': ['Shops'],
+        }
+    
+    def test_should_use_bulk_ingestion_requires_postgres_and_threshold(self):
+        """Bulk mode only kicks in for PostgreSQL and large enough syncs."""
+        plaid_transactions = [
+            self._plaid_transaction(f"p_{i}", "Store", 5.0, "2025-08-15")
+            for i in range(self.sync_service.bulk_ingestion_threshold)
+        ]
+        
+        self.mock_db.get_bind.return_value.dialect.name = 'postgresql'
+        assert self.sync_service._should_use_bulk_ingestion(self.mock_db, plaid_transactions)
+        assert not self.sync_service._should_use_bulk_ingestion(self.mock_db, plaid_transactions[:1])
+        
+        self.mock_db.get_bind.return_value.dialect.name = 'sqlite'
+        assert not self.sync_service._should_use_bulk_ingestion(self.mock_db, plaid_transactions)
+    
+    def test_find_potential_duplicates_bulk_uses_single_query(self):
+        """All candidates for a batch are loaded with one query and matched in memory."""
+        manual_coffee = Transaction(
+            id=uuid4(),
+            account_id=self.mock_account.id,
+            amount_cents=-1050,
+            description="Starbucks",
+            transaction_date=date(2025, 8, 14),
+            plaid_transaction_id=None
+        )
+        manual_grocery = Transaction(
+            id=uuid4(),
+            account_id=self.mock_account.id,
+            amount_cents=-4200,
+            description="Whole Foods",
+            transaction_date=date(2025, 8, 20),
+            plaid_transaction_id=None
+        )
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [
+            manual_coffee, manual_grocery
+        ]
+        
+        batch = [
+            self._plaid_transaction("p_1", "Starbucks", 10.55, "2025-08-15"),
+            self._plaid_transaction("p_2", "Whole Foods", 42.00, "2025-08-25"),  # Date outside tolerance
+            self._plaid_transaction("p_3", "Shell Oil", 30.00, "2025-08-16"),
+        ]
+        
+        matches = self.sync_service._find_potential_duplicates_bulk(
+            self.mock_db, self.mock_account, batch
+        )
+        
+        assert matches == {0: manual_coffee}
+        assert self.mock_db.query.call_count == 1
+    
+    def test_find_potential_duplicates_bulk_claims_each_manual_once(self):
+        """A manual transaction is merged with at most one Plaid row."""
+        manual = Transaction(
+            id=uuid4(),
+            account_id=self.mock_account.id,
+            amount_cents=-1055,
+            description="Starbucks",
+            transaction_date=date(2025, 8, 15),
+            plaid_transaction_id=None
+        )
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [manual]
+        
+        batch = [
+            self._plaid_transaction("p_1", "Starbucks", 10.55, "2025-08-15"),
+            self._plaid_transaction("p_2", "Starbucks", 10.55, "2025-08-15"),
+        ]
+        
+        matches = self.sync_service._find_potential_duplicates_bulk(
+            self.mock_db, self.mock_account, batch
+        )
+        
+        assert list(matches.keys()) == [0]
+    
+    @pytest.mark.asyncio
+    async def test_bulk_process_merges_inserts_and_skips(self):
+        """Bulk processing merges matches, inserts the rest once and skips known IDs."""
+        manual = Transaction(
+            id=uuid4(),
+            account_id=self.mock_account.id,
+            amount_cents=-1055,
+            description="Starbucks",
+            transaction_date=date(2025, 8, 15),
+            plaid_transaction_id=None,
+            status='posted',
+            metadata_json={}
+        )
+        self.mock_db.query.return_value.filter.return_value.all.return_value = [manual]
+        
+        plaid_transactions = [
+            self._plaid_transaction("p_known", "Target", 20.00, "2025-08-15"),
+            self._plaid_transaction("p_1", "Starbucks", 10.55, "2025-08-15"),
+            self._plaid_transaction("p_2", "Shell Oil", 30.00, "2025-08-16"),
+            self._plaid_transaction("p_2", "Shell Oil", 30.00, "2025-08-16"),  # Repeated in payload
+        ]
+        result = SyncResult(
+            account_id=str(self.mock_account.id),
+            new_transactions=0,
+            updated_transactions=0,
+            duplicates_skipped=0,
+            errors=[],
+            sync_duration_seconds=0,
+            date_range=""
+        )
+        
+        with patch.object(self.sync_service.transaction_service, 'enrich_transactions_bulk',
+                          new=AsyncMock(return_value={})) as mock_enrich:
+            with patch.object(self.sync_service.transaction_service, 'bulk_insert_transactions',
+                              return_value=[uuid4()]) as mock_insert:
+                result = await self.sync_service._bulk_process_account_transactions(
+                    self.mock_account, plaid_transactions, {"p_known"}, result, self.mock_db
+                )
+        
+        assert result.updated_transactions == 1
+        assert result.new_transactions == 1
+        assert result.duplicates_skipped == 2
+        assert manual.plaid_transaction_id == 'p_1'
+        
+        mock_enrich.assert_awaited_once()
+        mock_insert.assert_called_once()
+        inserted = mock_insert.call_args[0][2]
+        assert [t.plaid_transaction_id for t in inserted] == ['p_2']
+        self.mock_db.commit.assert_called_once()
+
 # Marker for unit tests
 pytestmark = pytest.mark.unit
\ No newline at end of file
@@ -0,0 +1,220 @@
+"""
+Unit tests for the Plaid webhook queue: per-item coalescing and debouncing.
+"""
+import asyncio
+import json
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+
+from app.services.webhook_queue_service import WebhookQueueService
+
+pytestmark = pytest.mark.unit
+
+
+def _fields(webhook_type, webhook_code, item_id="item-1", **extra):
+    payload = {"webhook_type": webhook_type, "webhook_code": webhook_code, "item_id": item_id, **extra}
+    return {"item_id": item_id, "payload": json.dumps(payload)}
+
+
+@pytest.fixture
+def redis():
+    conn = MagicMock()
+    conn.xack = AsyncMock()
+    conn.xdel = AsyncMock()
+    conn.close = AsyncMock()
+    conn.xadd = AsyncMock()
+    conn.xautoclaim = AsyncMock()
+    conn.xclaim = AsyncMock()
+    conn.xpending_range = AsyncMock()
+    client = MagicMock()
+    client.get_connection = AsyncMock(return_value=conn)
+    with patch('app.services.webhook_queue_service.redis_client', client):
+        yield conn
+
+
+@pytest.fixture
+def debounce():
+    with patch('app.services.webhook_queue_service.settings') as settings:
+        settings.WEBHOOK_DEBOUNCE_SECONDS = 5
+        settings.WEBHOOK_MAX_DEBOUNCE_SECONDS = 30
+        settings.WEBHOOK_CLAIM_IDLE_SECONDS = 300
+        settings.WEBHOOK_MAX_DELIVERIES = 3
+        settings.WEBHOOK_STREAM_MAX_LENGTH = 1000
+        yield settings
+
+
+class TestCoalesce:
+    """Duplicate actions for one item collapse to one."""
+
+    def test_sync_codes_collapse_to_latest(self):
+        payloads = [
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "DEFAULT_UPDATE", "new_transactions": 3},
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "SYNC_UPDATES_AVAILABLE"},
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "DEFAULT_UPDATE", "new_transactions": 1},
+        ]
+
+        actions = WebhookQueueService.coalesce(payloads)
+
+        assert actions == [payloads[-1]]
+
+    def test_removed_transactions_are_merged(self):
+        payloads = [
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "TRANSACTIONS_REMOVED",
+             "removed_transactions": [{"transaction_id": "a"}]},
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "TRANSACTIONS_REMOVED",
+             "removed_transactions": [{"transaction_id": "b"}]},
+        ]
+
+        actions = WebhookQueueService.coalesce(payloads)
+
+        assert len(actions) == 1
+        assert [t["transaction_id"] for t in actions[0]["removed_transactions"]] == ["a", "b"]
+
+    def test_distinct_actions_are_kept(self):
+        payloads = [
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "SYNC_UPDATES_AVAILABLE"},
+            {"webhook_type": "ITEM", "webhook_code": "ERROR"},
+            {"webhook_type": "TRANSACTIONS", "webhook_code": "RECURRING_TRANSACTIONS_UPDATE"},
+        ]
+
+        assert len(WebhookQueueService.coalesce(payloads)) == 3
+
+
+class TestDebounce:
+    """Items are processed once quiet, at most once at a time."""
+
+    def test_each_webhook_extends_the_window_up_to_the_cap(self, debounce):
+        service = WebhookQueueService()
+
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+        service.buffer_entry("2-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=4)
+        assert service._buffer["item-1"].due_at == 9
+
+        service.buffer_entry("3-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=28)
+        assert service._buffer["item-1"].due_at == 30
+
+    def test_redelivered_entry_is_buffered_once(self, debounce):
+        service = WebhookQueueService()
+
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=1)
+
+        assert service._buffer["item-1"].entry_ids == ["1-0"]
+
+    def test_unparseable_entry_is_set_aside(self, debounce):
+        service = WebhookQueueService()
+
+        service.buffer_entry("1-0", {"item_id": "item-1", "payload": "{not json"}, now=0)
+
+        assert service._buffer == {}
+        assert service._take_unparseable() == ["1-0"]
+
+    @pytest.mark.asyncio
+    async def test_burst_for_one_item_runs_one_sync(self, redis, debounce):
+        service = WebhookQueueService()
+        service._semaphore = asyncio.Semaphore(2)
+        service.process_now = AsyncMock(return_value={"success": True})
+
+        for i in range(5):
+            service.buffer_entry(f"{i}-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=i)
+        service.buffer_entry("9-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE", item_id="item-2"), now=4)
+
+        assert service.dispatch_due(now=8) == []
+        assert sorted(service.dispatch_due(now=9)) == ["item-1", "item-2"]
+        await asyncio.gather(*service._jobs)
+
+        assert service.process_now.await_count == 2
+        assert service.metrics['webhooks_coalesced'] == 4
+        redis.xack.assert_any_await(service.STREAM_KEY, service.GROUP, "0-0", "1-0", "2-0", "3-0", "4-0")
+
+    @pytest.mark.asyncio
+    async def test_failed_job_is_left_pending(self, redis, debounce):
+        service = WebhookQueueService()
+        service._semaphore = asyncio.Semaphore(1)
+        service.process_now = AsyncMock(side_effect=RuntimeError("db down"))
+
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+        service.dispatch_due(now=5)
+        await asyncio.gather(*service._jobs)
+
+        redis.xack.assert_not_awaited()
+        assert service.metrics['jobs_failed'] == 1
+        assert service._held == set()
+
+    @pytest.mark.asyncio
+    async def test_reported_failure_is_left_pending(self, redis, debounce):
+        service = WebhookQueueService()
+        service._semaphore = asyncio.Semaphore(1)
+        service.process_now = AsyncMock(return_value={"success": False, "error": "Plaid 503"})
+
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+        service.dispatch_due(now=5)
+        await asyncio.gather(*service._jobs)
+
+        redis.xack.assert_not_awaited()
+        redis.xdel.assert_not_awaited()
+        assert service.metrics['jobs_failed'] == 1
+        assert service.metrics['jobs_processed'] == 0
+
+    @pytest.mark.asyncio
+    async def test_item_is_not_dispatched_while_its_job_runs(self, redis, debounce):
+        service = WebhookQueueService()
+        service._active_items.add("item-1")
+
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+
+        assert service.dispatch_due(now=10) == []
+        assert "item-1" in service._buffer
+
+
+class TestReclaim:
+    """Stalled entries are retried until they run out of deliveries."""
+
+    @pytest.mark.asyncio
+    async def test_reclaimed_entry_is_buffered_again(self, redis, debounce):
+        service = WebhookQueueService()
+        redis.xautoclaim.return_value = ["0-0", [("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"))], []]
+        redis.xpending_range.return_value = [{"message_id": "1-0", "times_delivered": 2}]
+
+        await service._reclaim(redis)
+
+        assert service._buffer["item-1"].entry_ids == ["1-0"]
+        assert service.metrics['reclaimed'] == 1
+        redis.xadd.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_exhausted_entry_moves_to_dead_letter_stream(self, redis, debounce):
+        service = WebhookQueueService()
+        fields = _fields("TRANSACTIONS", "DEFAULT_UPDATE")
+        redis.xautoclaim.return_value = ["0-0", [("1-0", fields)], []]
+        redis.xpending_range.return_value = [{"message_id": "1-0", "times_delivered": 4}]
+
+        await service._reclaim(redis)
+
+        assert service._buffer == {}
+        assert redis.xadd.await_args.args[0] == service.DEAD_LETTER_KEY
+        assert redis.xadd.await_args.args[1]["entry_id"] == "1-0"
+        redis.xack.assert_awaited_once_with(service.STREAM_KEY, service.GROUP, "1-0")
+        assert service.metrics['dead_lettered'] == 1
+
+    @pytest.mark.asyncio
+    async def test_held_entries_are_kept_fresh_before_reclaiming(self, redis, debounce):
+        service = WebhookQueueService()
+        service.buffer_entry("1-0", _fields("TRANSACTIONS", "DEFAULT_UPDATE"), now=0)
+        redis.xautoclaim.return_value = ["0-0", [], []]
+        calls = MagicMock()
+        calls.attach_mock(redis.xclaim, "xclaim")
+        calls.attach_mock(redis.xautoclaim, "xautoclaim")
+
+        await service._reclaim(redis)
+
+        assert [name for name, _, _ in calls.mock_calls] == ["xclaim", "xautoclaim"]
+        kwargs = redis.xclaim.await_args.kwargs
+        assert kwargs["message_ids"] == ["1-0"] and kwargs["min_idle_time"] == 0 and kwargs["justid"]
+        redis.xpending_range.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_no_heartbeat_without_held_entries(self, redis, debounce):
+        await WebhookQueueService()._heartbeat(redis)
+
+        redis.xclaim.assert_not_awaited()
@@ -7,18 +7,21 @@ import os
 import json
 import logging
 import hashlib
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Deque, Dict, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import threading
-import statistics
-from collections import defaultdict
+from collections import defaultdict, deque
 
 import numpy as np
 from scipy import stats
 import pandas as pd
 
+from experiment_store import (
+    ExperimentSummary, ResultLogWriter, TIME_SUM, CONFIDENCE_SUM
+)
+
 logger = logging.getLogger(__name__)
 
 class ExperimentStatus(Enum):
@@ -85,15 +88,42 @@ class StatisticalTest:
     sample_size_b: int
     power: float
 
+def _result_to_json(record: Any) -> str:
+    """One results-log line: an ExperimentResult or a feedback event dict"""
+    if isinstance(record, ExperimentResult):
+        record_dict = asdict(record)
+        record_dict['timestamp'] = record.timestamp.isoformat()
+    else:
+        record_dict = record
+    return json.dumps(record_dict, default=str)
+
 class ABTestingFramework:
     """A/B Testing framework for ML model experiments"""
     
-    def __init__(self, results_storage_path: str = "ab_test_results"):
+    def __init__(
+        self,
+        results_storage_path: str = "ab_test_results",
+        recent_results_size: int = 10000,
+        fsync_policy: Optional[str] = None,
+        max_results_file_bytes: Optional[int] = None
+    ):
         self.results_storage_path = results_storage_path
         self.experiments: Dict[str, ExperimentConfig] = {}
-        self.results: Dict[str, List[ExperimentResult]] = defaultdict(list)
         self.experiment_status: Dict[str, ExperimentStatus] = {}
         
+        # Statistics come from running summaries; only the most recent results
+        # stay in memory (for feedback), the full history lives in the results log
+        self.summaries: Dict[str, ExperimentSummary] = defaultdict(ExperimentSummary)
+        self.results: Dict[str, Deque[ExperimentResult]] = defaultdict(
+            lambda: deque(maxlen=recent_results_size)
+        )
+        self.result_log = ResultLogWriter(
+            results_storage_path,
+            serializer=_result_to_json,
+            fsync_policy=fsync_policy or os.getenv('AB_RESULTS_FSYNC_POLICY', 'interval'),
+            max_bytes=max_results_file_bytes or int(os.getenv('AB_RESULTS_MAX_FILE_BYTES', str(64 * 1024 * 1024)))
+        )
+        
         # Thread safety
         self.lock = threading.RLock()
         
@@ -112,7 +142,8 @@ class ABTestingFramework:
         with self.lock:
             self.experiments[config.experiment_id] = config
             self.experiment_status[config.experiment_id] = ExperimentStatus.DRAFT
-            self.results[config.experiment_id] = []
+            self.results[config.experiment_id].clear()
+            self.summaries[config.experiment_id] = ExperimentSummary([v.name for v in config.variants])
             
             # Save experiment config
             self._save_experiment_config(config)
@@ -170,6 +201,7 @@ class ABTestingFramework:
             # Generate final report
             report = self.generate_experiment_report(experiment_id)
             self._save_experiment_report(experiment_id, report)
+            self.result_log.flush()
             
             logger.info(f"Stopped experiment: {experiment_id} ({reason})")
     
@@ -298,10 +330,44 @@ class ABTestingFramework:
         
         with self.lock:
             self.results[experiment_id].append(result)
-            
-            # Periodically save results
-            if len(self.results[experiment_id]) % 100 == 0:
-                self._save_experiment_results(experiment_id)
+            self.summaries[experiment_id].add(
+                variant_name, inference_time_ms, confidence, is_correct, result.timestamp
+            )
+        
+        # Serialized and appended by the writer thread. It gets a copy, so feedback
+        # labelling the in-memory result before the batch is written stays out of this line
+        self.result_log.append(experiment_id, replace(result))
+    
+    def record_feedback(
+        self,
+        experiment_id: str,
+        user_id: Optional[str],
+        prediction: str,
+        is_correct: bool
+    ) -> bool:
+        """Label the user's most recent matching result; False if it is no longer in memory"""
+        
+        with self.lock:
+            for result in reversed(self.results[experiment_id]):
+                if result.user_id == user_id and result.prediction == prediction:
+                    self.summaries[experiment_id].label(result.variant_name, result.is_correct, is_correct)
+                    result.is_correct = is_correct
+                    break
+            else:
+                return False
+        
+        # The log is append-only, so feedback is its own event referencing the result
+        self.result_log.append(experiment_id, {
+            'event': 'feedback',
+            'timestamp': datetime.now().isoformat(),
+            'experiment_id': experiment_id,
+            'variant_name': result.variant_name,
+            'user_id': user_id,
+            'prediction': prediction,
+            'result_timestamp': result.timestamp.isoformat(),
+            'is_correct': is_correct
+        })
+        return True
     
     def _check_guard_rails(self, experiment_id: str) -> bool:
         """Check if experiment should be stopped due to guard rails"""
@@ -310,21 +376,19 @@ class ABTestingFramework:
         if not config.guard_rails:
             return False
         
-        results = self.results[experiment_id]
-        if len(results) < 50:  # Need minimum sample size
+        summary = self.summaries[experiment_id]
+        if summary.total_count < 50:  # Need minimum sample size
             return False
         
         # Check each variant against guard rails
         for variant in config.variants:
-            variant_results = [r for r in results if r.variant_name == variant.name]
-            
-            if len(variant_results) < 20:
+            if summary.count(variant.name) < 20:
                 continue
             
             # Check accuracy guard rail
-            if 'min_accuracy' in config.guard_rails:
-                correct_predictions = [r for r in variant_results if r.is_correct is True]
-                accuracy = len(correct_predictions) / len([r for r in variant_results if r.is_correct is not None])
+            correct, labeled = summary.accuracy_counts(variant.name)
+            if 'min_accuracy' in config.guard_rails and labeled:
+                accuracy = correct / labeled
                 
                 if accuracy < config.guard_rails['min_accuracy']:
                     logger.warning(f"Guard rail triggered: {variant.name} accuracy {accuracy:.3f} below {config.guard_rails['min_accuracy']}")
@@ -332,7 +396,7 @@ class ABTestingFramework:
             
             # Check inference time guard rail
             if 'max_inference_time_ms' in config.guard_rails:
-                avg_time = statistics.mean([r.inference_time_ms for r in variant_results])
+                avg_time = summary.mean(variant.name, TIME_SUM)
                 
                 if avg_time > config.guard_rails['max_inference_time_ms']:
                     logger.warning(f"Guard rail triggered: {variant.name} avg inference time {avg_time:.1f}ms above {config.guard_rails['max_inference_time_ms']}")
@@ -344,11 +408,11 @@ class ABTestingFramework:
         """Run statistical analysis comparing variants"""
         
         with self.lock:
-            results = self.results[experiment_id]
+            summary = self.summaries[experiment_id]
             config = self.experiments[experiment_id]
             
-            if len(results) < self.min_sample_size_for_test:
-                logger.warning(f"Insufficient sample size for statistical testing: {len(results)}")
+            if summary.total_count < self.min_sample_size_for_test:
+                logger.warning(f"Insufficient sample size for statistical testing: {summary.total_count}")
                 return []
             
             tests = []
@@ -363,7 +427,7 @@ class ABTestingFramework:
                     # Run tests for each success metric
                     for metric in config.success_metrics:
                         test = self._run_statistical_test(
-                            results, variant_a.name, variant_b.name, metric
+                            summary, variant_a.name, variant_b.name, metric
                         )
                         if test:
                             tests.append(test)
@@ -372,34 +436,27 @@ class ABTestingFramework:
     
     def _run_statistical_test(
         self, 
-        results: List[ExperimentResult],
+        summary: ExperimentSummary,
         variant_a: str,
         variant_b: str,
         metric: str
     ) -> Optional[StatisticalTest]:
-        """Run statistical test between two variants for a metric"""
+        """Run statistical test between two variants for a metric, from their running summaries"""
         
-        # Filter results by variant
-        results_a = [r for r in results if r.variant_name == variant_a]
-        results_b = [r for r in results if r.variant_name == variant_b]
+        n_results_a, n_results_b = summary.count(variant_a), summary.count(variant_b)
         
-        if len(results_a) < self.min_sample_size_for_test or len(results_b) < self.min_sample_size_for_test:
+        if n_results_a < self.min_sample_size_for_test or n_results_b < self.min_sample_size_for_test:
             return None
         
-        # Extract metric values
         if metric == 'accuracy':
             # Binary accuracy test
-            values_a = [1 if r.is_correct else 0 for r in results_a if r.is_correct is not None]
-            values_b = [1 if r.is_correct else 0 for r in results_b if r.is_correct is not None]
+            count_a, n_a = summary.accuracy_counts(variant_a)
+            count_b, n_b = summary.accuracy_counts(variant_b)
             
-            if not values_a or not values_b:
+            if not n_a or not n_b:
                 return None
             
-            # Two-proportion z-test
-            count_a, count_b = sum(values_a), sum(values_b)
-            n_a, n_b = len(values_a), len(values_b)
-            
-            # Calculate proportions
+            # Two-proportion z-test: calculate proportions
             p_a, p_b = count_a / n_a, count_b / n_b
             p_pooled = (count_a + count_b) / (n_a + n_b)
             
@@ -416,50 +473,34 @@ class ABTestingFramework:
             margin_error = stats.norm.ppf(0.975) * se_diff
             ci = ((p_a - p_b) - margin_error, (p_a - p_b) + margin_error)
             
-        elif metric == 'inference_time':
+        elif metric in ('inference_time', 'confidence'):
             # Continuous metric test
-            values_a = [r.inference_time_ms for r in results_a]
-            values_b = [r.inference_time_ms for r in results_b]
+            sum_column = TIME_SUM if metric == 'inference_time' else CONFIDENCE_SUM
+            mean_a, var_a = summary.mean(variant_a, sum_column), summary.variance(variant_a, sum_column)
+            mean_b, var_b = summary.mean(variant_b, sum_column), summary.variance(variant_b, sum_column)
+            n_a, n_b = n_results_a, n_results_b
             
             # Two-sample t-test
-            t_stat, p_value = stats.ttest_ind(values_a, values_b)
+            t_stat, p_value = stats.ttest_ind_from_stats(
+                mean_a, np.sqrt(var_a), n_a, mean_b, np.sqrt(var_b), n_b
+            )
             
             # Effect size (Cohen's d)
-            pooled_std = np.sqrt(((len(values_a) - 1) * np.var(values_a, ddof=1) + 
-                                 (len(values_b) - 1) * np.var(values_b, ddof=1)) / 
-                                (len(values_a) + len(values_b) - 2))
-            effect_size = (np.mean(values_a) - np.mean(values_b)) / pooled_std if pooled_std > 0 else 0
+            pooled_std = np.sqrt(((n_a - 1) * var_a + (n_b - 1) * var_b) / (n_a + n_b - 2))
+            effect_size = (mean_a - mean_b) / pooled_std if pooled_std > 0 else 0
             
             # Confidence interval for difference in means
-            se_diff = pooled_std * np.sqrt(1/len(values_a) + 1/len(values_b))
-            df = len(values_a) + len(values_b) - 2
+            se_diff = pooled_std * np.sqrt(1/n_a + 1/n_b)
+            df = n_a + n_b - 2
             margin_error = stats.t.ppf(0.975, df) * se_diff
-            mean_diff = np.mean(values_a) - np.mean(values_b)
-            ci = (mean_diff - margin_error, mean_diff + margin_error)
-            
-        elif metric == 'confidence':
-            # Continuous metric test
-            values_a = [r.confidence for r in results_a]
-            values_b = [r.confidence for r in results_b]
-            
-            t_stat, p_value = stats.ttest_ind(values_a, values_b)
-            
-            pooled_std = np.sqrt(((len(values_a) - 1) * np.var(values_a, ddof=1) + 
-                                 (len(values_b) - 1) * np.var(values_b, ddof=1)) / 
-                                (len(values_a) + len(values_b) - 2))
-            effect_size = (np.mean(values_a) - np.mean(values_b)) / pooled_std if pooled_std > 0 else 0
-            
-            se_diff = pooled_std * np.sqrt(1/len(values_a) + 1/len(values_b))
-            df = len(values_a) + len(values_b) - 2
-            margin_error = stats.t.ppf(0.975, df) * se_diff
-            mean_diff = np.mean(values_a) - np.mean(values_b)
+            mean_diff = mean_a - mean_b
             ci = (mean_diff - margin_error, mean_diff + margin_error)
         
         else:
             return None
         
         # Calculate statistical power (simplified)
-        power = self._calculate_power(len(results_a), len(results_b), effect_size)
+        power = self._calculate_power(n_results_a, n_results_b, effect_size)
         
         return StatisticalTest(
             test_name=f"{variant_a}_vs_{variant_b}_{metric}",
@@ -470,8 +511,8 @@ class ABTestingFramework:
             effect_size=effect_size,
             confidence_interval=ci,
             is_significant=p_value < 0.05,
-            sample_size_a=len(results_a),
-            sample_size_b=len(results_b),
+            sample_size_a=n_results_a,
+            sample_size_b=n_results_b,
             power=power
         )
     
@@ -492,10 +533,10 @@ class ABTestingFramework:
         
         with self.lock:
             config = self.experiments[experiment_id]
-            results = self.results[experiment_id]
+            summary = self.summaries[experiment_id]
             status = self.experiment_status[experiment_id]
             
-            if not results:
+            if not summary.total_count:
                 return {
                     'experiment_id': experiment_id,
                     'status': status.value,
@@ -508,28 +549,21 @@ class ABTestingFramework:
             # Calculate summary statistics per variant
             variant_stats = {}
             for variant in config.variants:
-                variant_results = [r for r in results if r.variant_name == variant.name]
+                sample_size = summary.count(variant.name)
                 
-                if variant_results:
+                if sample_size:
                     # Accuracy
-                    accuracy_results = [r for r in variant_results if r.is_correct is not None]
-                    accuracy = (
-                        len([r for r in accuracy_results if r.is_correct]) / len(accuracy_results)
-                        if accuracy_results else 0
-                    )
-                    
-                    # Performance metrics
-                    inference_times = [r.inference_time_ms for r in variant_results]
-                    confidences = [r.confidence for r in variant_results]
+                    correct, labeled = summary.accuracy_counts(variant.name)
                     
                     variant_stats[variant.name] = {
-                        'sample_size': len(variant_results),
-                        'accuracy': accuracy,
-                        'accuracy_samples': len(accuracy_results),
-                        'avg_inference_time_ms': statistics.mean(inference_times),
-                        'p95_inference_time_ms': np.percentile(inference_times, 95),
-                        'avg_confidence': statistics.mean(confidences),
-                        'confidence_std': statistics.stdev(confidences) if len(confidences) > 1 else 0
+                        'sample_size': sample_size,
+                        'accuracy': correct / labeled if labeled else 0,
+                        'accuracy_samples': labeled,
+                        'avg_inference_time_ms': summary.mean(variant.name, TIME_SUM),
+                        # Over the variant's most recent results
+                        'p95_inference_time_ms': summary.p95_inference_time(variant.name),
+                        'avg_confidence': summary.mean(variant.name, CONFIDENCE_SUM),
+                        'confidence_std': float(np.sqrt(summary.variance(variant.name, CONFIDENCE_SUM)))
                     }
                 else:
                     variant_stats[variant.name] = {
@@ -549,12 +583,7 @@ class ABTestingFramework:
             )
             
             # Calculate experiment duration
-            if results:
-                start_time = min(r.timestamp for r in results)
-                end_time = max(r.timestamp for r in results)
-                duration_hours = (end_time - start_time).total_seconds() / 3600
-            else:
-                duration_hours = 0
+            duration_hours = (summary.last_timestamp - summary.first_timestamp).total_seconds() / 3600
             
             return {
                 'experiment_id': experiment_id,
@@ -563,7 +592,7 @@ class ABTestingFramework:
                 'start_time': config.start_time.isoformat(),
                 'end_time': config.end_time.isoformat() if config.end_time else None,
                 'duration_hours': duration_hours,
-                'total_samples': len(results),
+                'total_samples': summary.total_count,
                 'variants': [asdict(v) for v in config.variants],
                 'variant_statistics': variant_stats,
                 'winning_variant': winning_variant,
@@ -636,16 +665,6 @@ class ABTestingFramework:
         with open(config_path, 'w') as f:
             json.dump(config_dict, f, indent=2)
     
-    def _save_experiment_results(self, experiment_id: str):
-        """Save experiment results to file"""
-        results_path = os.path.join(self.results_storage_path, f"{experiment_id}_results.jsonl")
-        
-        with open(results_path, 'w') as f:
-            for result in self.results[experiment_id]:
-                result_dict = asdict(result)
-                result_dict['timestamp'] = result.timestamp.isoformat()
-                f.write(json.dumps(result_dict) + '\n')
-    
     def _save_experiment_report(self, experiment_id: str, report: Dict[str, Any]):
         """Save experiment report to file"""
         report_path = os.path.join(self.results_storage_path, f"{experiment_id}_report.json")
@@ -653,5 +672,9 @@ class ABTestingFramework:
         with open(report_path, 'w') as f:
             json.dump(report, f, indent=2)
 
+    def close(self):
+        """Write out queued results and close the results logs"""
+        self.result_log.close()
+
 # Global A/B testing framework instance
 ab_framework = ABTestingFramework()
\ No newline at end of file
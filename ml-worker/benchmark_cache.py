@@ -0,0 +1,92 @@
+"""
+Benchmark Cache
+Model benchmark and parity results on disk, keyed by a hash of the model files
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class BenchmarkCache:
+    """
+    One JSON file per (model content, CPU count). A worker that starts with
+    models it has seen before reuses their results instead of benchmarking
+    again; any change to the model files changes the key.
+    """
+
+    def __init__(self, cache_dir: str = "models/production/benchmarks"):
+        self.cache_dir = cache_dir
+        self.lock = threading.Lock()
+        self._hashes: Dict[str, Tuple[Tuple, str]] = {}  # path -> (file signature, digest)
+
+    @staticmethod
+    def _files(model_path: str):
+        if os.path.isfile(model_path):
+            return [model_path]
+        return sorted(
+            os.path.join(root, name)
+            for root, _, names in os.walk(model_path)
+            for name in names
+        )
+
+    def model_hash(self, model_path: str) -> str:
+        """sha256 over the model file(s); hub model names hash as plain strings"""
+        if not os.path.exists(model_path):
+            return hashlib.sha256(model_path.encode()).hexdigest()
+
+        files = self._files(model_path)
+        signature = tuple((path, os.path.getsize(path), os.path.getmtime(path)) for path in files)
+        with self.lock:
+            cached = self._hashes.get(model_path)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        digest = hashlib.sha256()
+        for path in files:
+            digest.update(os.path.relpath(path, model_path).encode())
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+
+        with self.lock:
+            self._hashes[model_path] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+    def _entry_path(self, model_path: str) -> str:
+        # Latency numbers only compare across workers with the same CPU budget
+        return os.path.join(self.cache_dir, f"{self.model_hash(model_path)}_{os.cpu_count()}cpu.json")
+
+    def get(self, model_path: str) -> Optional[Dict]:
+        try:
+            with open(self._entry_path(model_path)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable benchmark cache for {model_path}: {e}")
+            return None
+
+    def put(self, model_path: str, results: Dict) -> Dict:
+        """Merge results into the model's entry and write it atomically"""
+        entry = {**(self.get(model_path) or {}), **results, 'model_path': model_path, 'last_updated': datetime.now().isoformat()}
+        entry_path = self._entry_path(model_path)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # A unique temp file per writer, so threads of one process don't share one
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                # NumPy scalars (np.float64, np.bool_) serialize as their Python values
+                json.dump(entry, f, indent=2, default=lambda o: o.item() if hasattr(o, 'item') else str(o))
+            os.replace(tmp_path, entry_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return entry
@@ -0,0 +1,108 @@
+"""
+Embedding Backends
+Pluggable text -> embedding encoders: PyTorch sentence transformers or ONNX Runtime sessions
+"""
+
+import os
+import logging
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+import onnxruntime as ort
+
+logger = logging.getLogger(__name__)
+
+def mean_pool(last_hidden_state: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average token embeddings over the attention mask, as sentence-transformers' Pooling does"""
+    mask = attention_mask[..., None].astype(last_hidden_state.dtype)
+    summed = np.sum(last_hidden_state * mask, axis=1)
+    counts = np.maximum(np.sum(mask, axis=1), 1e-9)
+    return summed / counts
+
+def create_onnx_session(onnx_path: str) -> ort.InferenceSession:
+    """ONNX Runtime session configured for low-latency CPU inference"""
+    sess_options = ort.SessionOptions()
+    sess_options.intra_op_num_threads = min(4, os.cpu_count())
+    sess_options.inter_op_num_threads = 1
+    sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    return ort.InferenceSession(
+        onnx_path,
+        sess_options=sess_options,
+        providers=['CPUExecutionProvider']
+    )
+
+def load_tokenizer(model_name: str):
+    """Tokenizer alone, without the PyTorch model weights"""
+    from transformers import AutoTokenizer
+
+    local_model_path = f"/app/models/{model_name}"
+    if os.path.exists(local_model_path):
+        return AutoTokenizer.from_pretrained(local_model_path)
+    return AutoTokenizer.from_pretrained(f"sentence-transformers/{model_name}")
+
+class EmbeddingBackend(ABC):
+    """Encodes a list of texts into a (len(texts), dim) float32 array"""
+
+    name = "base"
+
+    @abstractmethod
+    def encode(self, texts: List[str]) -> np.ndarray:
+        ...
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """PyTorch inference through a loaded SentenceTransformer"""
+
+    name = "sentence_transformer"
+
+    def __init__(self, model):
+        self.model = model
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(
+            self.model.encode(texts, convert_to_tensor=False, show_progress_bar=False),
+            dtype=np.float32
+        )
+
+class ONNXEmbeddingBackend(EmbeddingBackend):
+    """
+    tokenizer -> ONNX Runtime -> mean pooling (-> L2 normalization), matching
+    the all-MiniLM-L6-v2 sentence-transformers pipeline. Padding is to the
+    longest text in the batch rather than max_length, since the exported
+    graphs take a dynamic sequence axis.
+    """
+
+    name = "onnx"
+
+    def __init__(self, session: ort.InferenceSession, tokenizer, max_length: int = 128, normalize: bool = True):
+        self.session = session
+        self.tokenizer = tokenizer
+        self.max_length = max_length
+        self.normalize = normalize
+        self.input_names = {model_input.name for model_input in session.get_inputs()}
+
+    @classmethod
+    def from_path(cls, onnx_path: str, tokenizer, **kwargs) -> "ONNXEmbeddingBackend":
+        return cls(create_onnx_session(onnx_path), tokenizer, **kwargs)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        inputs = self.tokenizer(
+            texts,
+            max_length=self.max_length,
+            padding=True,
+            truncation=True,
+            return_tensors='np'
+        )
+        feed = {
+            name: inputs[name].astype(np.int64)
+            for name in ('input_ids', 'attention_mask', 'token_type_ids')
+            if name in self.input_names and name in inputs
+        }
+
+        last_hidden_state = self.session.run(None, feed)[0]
+        embeddings = mean_pool(last_hidden_state, inputs['attention_mask']).astype(np.float32)
+
+        if self.normalize:
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings
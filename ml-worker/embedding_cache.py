@@ -0,0 +1,272 @@
+"""
+Embedding Cache
+Bounded LRU/TTL cache of text embeddings in a preallocated NumPy arena,
+optionally memory-mapped to disk so warm caches survive worker restarts
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Raw digest bytes (an 'S16' field would strip trailing NULs) and store time; 0 marks a free row
+KEY_DTYPE = np.dtype([('key', 'u1', (16,)), ('stored_at', 'f8')])
+
+class EmbeddingCache:
+    """
+    LRU cache of embeddings stored as rows of one (capacity x dim) array.
+
+    Keys are 16-byte BLAKE2 digests of (namespace, normalized text), stable
+    across processes unlike hash(). Misses are computed outside the lock;
+    concurrent misses on the same key wait for the first caller's result
+    instead of encoding it again.
+
+    With `path`, the arena and its key table are .npy memory maps. Only one
+    process may own the files (an exclusive flock); others fall back to an
+    in-memory arena rather than corrupting shared slots.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10000,
+        ttl_seconds: Optional[float] = None,
+        dtype: str = "float16",
+        path: Optional[str] = None
+    ):
+        self.capacity = capacity
+        self.ttl_seconds = ttl_seconds or None
+        self.dtype = np.dtype(dtype)
+        self.path = path
+
+        self.lock = threading.Lock()
+        self.slots: "OrderedDict[bytes, int]" = OrderedDict()  # key -> arena row, oldest first
+        self.free_slots: List[int] = []
+        self.inflight: Dict[bytes, Future] = {}
+        self.arena: Optional[np.ndarray] = None
+        self.keys: Optional[np.ndarray] = None
+        self._lock_file = None
+
+        self.stats = {'hits': 0, 'misses': 0, 'coalesced': 0, 'evictions': 0, 'expirations': 0}
+
+        if path:
+            self._open_persistent(path)
+
+    # Keys and storage
+
+    @staticmethod
+    def make_key(text: str, namespace: str = "") -> bytes:
+        normalized = text.lower().strip()
+        return hashlib.blake2b(f"{namespace}\0{normalized}".encode(), digest_size=16).digest()
+
+    def _arena_paths(self):
+        return f"{self.path}.arena.npy", f"{self.path}.keys.npy"
+
+    def _open_persistent(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if fcntl is not None:
+            self._lock_file = open(f"{path}.lock", "w")
+            try:
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                logger.info(f"Embedding cache {path} is owned by another process; using memory only")
+                self._lock_file.close()
+                self._lock_file = None
+                self.path = None
+                return
+
+        arena_path, keys_path = self._arena_paths()
+        try:
+            arena = np.load(arena_path, mmap_mode='r+')
+            keys = np.load(keys_path, mmap_mode='r+')
+            if arena.shape[0] != self.capacity or arena.dtype != self.dtype or keys.shape != (self.capacity,):
+                logger.info("Embedding cache layout changed; starting cold")
+                return
+        except (OSError, ValueError):
+            return
+
+        self.arena, self.keys = arena, keys
+        self._restore_index()
+
+    def _restore_index(self):
+        """Rebuild the LRU order from the persisted key table, oldest first"""
+        now = time.time()
+        stored_at = np.asarray(self.keys['stored_at'])
+        occupied = np.flatnonzero(stored_at > 0)
+
+        for slot in occupied[np.argsort(stored_at[occupied], kind='stable')]:
+            slot = int(slot)
+            if self.ttl_seconds and now - stored_at[slot] > self.ttl_seconds:
+                self.keys['stored_at'][slot] = 0.0
+                continue
+            self.slots[self.keys['key'][slot].tobytes()] = slot
+
+        used = set(self.slots.values())
+        self.free_slots = [slot for slot in range(self.capacity - 1, -1, -1) if slot not in used]
+        logger.info(f"Restored {len(self.slots)} cached embeddings from {self.path}")
+
+    def _allocate(self, dim: int):
+        """Create the arena once the embedding dimension is known"""
+        if self.path:
+            arena_path, keys_path = self._arena_paths()
+            self.arena = np.lib.format.open_memmap(arena_path, mode='w+', dtype=self.dtype, shape=(self.capacity, dim))
+            self.keys = np.lib.format.open_memmap(keys_path, mode='w+', dtype=KEY_DTYPE, shape=(self.capacity,))
+        else:
+            self.arena = np.zeros((self.capacity, dim), dtype=self.dtype)
+            self.keys = np.zeros(self.capacity, dtype=KEY_DTYPE)
+        self.slots.clear()
+        self.free_slots = list(range(self.capacity - 1, -1, -1))
+
+    # Lock-held helpers
+
+    def _lookup(self, key: bytes) -> Optional[np.ndarray]:
+        slot = self.slots.get(key)
+        if slot is None:
+            return None
+        if self.ttl_seconds and time.time() - self.keys['stored_at'][slot] > self.ttl_seconds:
+            self._release(key)
+            self.stats['expirations'] += 1
+            return None
+        self.slots.move_to_end(key)
+        return self.arena[slot].astype(np.float32)
+
+    def _release(self, key: bytes):
+        slot = self.slots.pop(key)
+        self.keys['stored_at'][slot] = 0.0
+        self.free_slots.append(slot)
+
+    def _store(self, key: bytes, embedding: np.ndarray):
+        if self.arena is None or self.arena.shape[1] != embedding.shape[-1]:
+            self._allocate(embedding.shape[-1])
+
+        slot = self.slots.get(key)
+        if slot is None:
+            if not self.free_slots:
+                self._release(next(iter(self.slots)))
+                self.stats['evictions'] += 1
+            slot = self.free_slots.pop()
+        self.arena[slot] = embedding
+        self.keys['key'][slot] = np.frombuffer(key, dtype=np.uint8)
+        self.keys['stored_at'][slot] = time.time()
+        self.slots[key] = slot
+        self.slots.move_to_end(key)
+
+    # Public API
+
+    def get_or_compute(
+        self,
+        text: str,
+        compute: Callable[[str], np.ndarray],
+        namespace: str = ""
+    ) -> np.ndarray:
+        """Cached embedding for `text`, computing it (once, across threads) on a miss"""
+        key = self.make_key(text, namespace)
+
+        with self.lock:
+            embedding = self._lookup(key)
+            if embedding is not None:
+                self.stats['hits'] += 1
+                return embedding
+
+            future = self.inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self.inflight[key] = Future()
+                self.stats['misses'] += 1
+            else:
+                self.stats['coalesced'] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            embedding = np.asarray(compute(text), dtype=np.float32)
+        except Exception as e:
+            with self.lock:
+                self.inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            self._store(key, embedding)
+            self.inflight.pop(key, None)
+        future.set_result(embedding)
+        return embedding
+
+    def get_many_or_compute(
+        self,
+        texts: List[str],
+        compute_many: Callable[[List[str]], np.ndarray],
+        namespace: str = ""
+    ) -> np.ndarray:
+        """Embeddings for a batch, encoding all misses in one compute_many call"""
+        keys = [self.make_key(text, namespace) for text in texts]
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        with self.lock:
+            for i, key in enumerate(keys):
+                embeddings[i] = self._lookup(key)
+            hits = sum(embedding is not None for embedding in embeddings)
+            self.stats['hits'] += hits
+            self.stats['misses'] += len(texts) - hits
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            computed = np.asarray(compute_many([texts[i] for i in missing]), dtype=np.float32)
+            with self.lock:
+                for i, embedding in zip(missing, computed):
+                    self._store(keys[i], embedding)
+                    embeddings[i] = embedding
+
+        return np.stack(embeddings) if embeddings else np.empty((0, 0), dtype=np.float32)
+
+    def hit_rate(self) -> float:
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['coalesced'] + self.stats['misses']
+            return (self.stats['hits'] + self.stats['coalesced']) / lookups if lookups else 0.0
+
+    def get_stats(self) -> Dict:
+        hit_rate = self.hit_rate()
+        with self.lock:
+            return {
+                **self.stats,
+                'hit_rate': hit_rate,
+                'size': len(self.slots),
+                'capacity': self.capacity,
+                'arena_bytes': self.arena.nbytes if self.arena is not None else 0,
+                'dtype': self.dtype.name,
+                'persistent': bool(self.path)
+            }
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.slots):
+                self._release(key)
+
+    def flush(self):
+        """Write memory-mapped rows back to disk"""
+        with self.lock:
+            for array in (self.arena, self.keys):
+                if isinstance(array, np.memmap):
+                    array.flush()
+
+    def close(self):
+        self.flush()
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
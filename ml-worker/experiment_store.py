@@ -0,0 +1,295 @@
+"""
+Experiment Result Storage
+Append-only, rotating JSONL result logs written by a background thread, and
+running per-variant summaries that answer A/B statistics in O(1)
+"""
+
+import os
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Columns of ExperimentSummary.totals
+COUNT, TIME_SUM, TIME_SUMSQ, CONFIDENCE_SUM, CONFIDENCE_SUMSQ, LABELED, CORRECT = range(7)
+
+FSYNC_POLICIES = ('always', 'interval', 'never')
+
+class ExperimentSummary:
+    """
+    Running counts, sums and sums of squares per variant, one row of
+    `totals` per variant. Means, variances and accuracy are read straight
+    from a row; only p95 latency needs samples, taken from a bounded window
+    of each variant's most recent inference times.
+    """
+
+    def __init__(self, variant_names: List[str] = (), recent_size: int = 1000):
+        self.recent_size = recent_size
+        self.index: Dict[str, int] = {}
+        self.totals = np.zeros((0, 7), dtype=np.float64)
+        self.recent_times: Dict[str, Deque[float]] = {}
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+
+        for name in variant_names:
+            self._row(name)
+
+    def _row(self, variant_name: str) -> int:
+        row = self.index.get(variant_name)
+        if row is None:
+            # Results can arrive for models outside the experiment (e.g. the default)
+            row = self.index[variant_name] = len(self.index)
+            self.totals = np.vstack([self.totals, np.zeros((1, 7))])
+            self.recent_times[variant_name] = deque(maxlen=self.recent_size)
+        return row
+
+    def add(
+        self,
+        variant_name: str,
+        inference_time_ms: float,
+        confidence: float,
+        is_correct: Optional[bool],
+        timestamp: datetime
+    ):
+        row = self.totals[self._row(variant_name)]
+        row[COUNT] += 1
+        row[TIME_SUM] += inference_time_ms
+        row[TIME_SUMSQ] += inference_time_ms * inference_time_ms
+        row[CONFIDENCE_SUM] += confidence
+        row[CONFIDENCE_SUMSQ] += confidence * confidence
+        if is_correct is not None:
+            row[LABELED] += 1
+            row[CORRECT] += bool(is_correct)
+        self.recent_times[variant_name].append(inference_time_ms)
+
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+    def label(self, variant_name: str, previous: Optional[bool], is_correct: bool):
+        """Apply feedback to a result recorded earlier with label `previous`"""
+        row = self.totals[self._row(variant_name)]
+        if previous is None:
+            row[LABELED] += 1
+        else:
+            row[CORRECT] -= bool(previous)
+        row[CORRECT] += bool(is_correct)
+
+    @property
+    def total_count(self) -> int:
+        return int(self.totals[:, COUNT].sum())
+
+    def count(self, variant_name: str) -> int:
+        row = self.index.get(variant_name)
+        return int(self.totals[row, COUNT]) if row is not None else 0
+
+    def accuracy_counts(self, variant_name: str) -> Tuple[int, int]:
+        """(correct, labeled) results for the variant"""
+        row = self.index.get(variant_name)
+        if row is None:
+            return 0, 0
+        return int(self.totals[row, CORRECT]), int(self.totals[row, LABELED])
+
+    def mean(self, variant_name: str, sum_column: int) -> float:
+        n = self.count(variant_name)
+        return float(self.totals[self.index[variant_name], sum_column] / n) if n else 0.0
+
+    def variance(self, variant_name: str, sum_column: int) -> float:
+        """Sample variance (ddof=1) of TIME_SUM or CONFIDENCE_SUM's metric"""
+        n = self.count(variant_name)
+        if n < 2:
+            return 0.0
+        row = self.totals[self.index[variant_name]]
+        mean = row[sum_column] / n
+        # The squares column directly follows its sum column
+        return float(max(row[sum_column + 1] - n * mean * mean, 0.0) / (n - 1))
+
+    def p95_inference_time(self, variant_name: str) -> float:
+        times = self.recent_times.get(variant_name)
+        return float(np.percentile(times, 95)) if times else 0.0
+
+class ResultLogWriter:
+    """
+    Appends records to `<experiment>_results.jsonl` files from a daemon
+    thread, so callers only enqueue. Records are serialized and written in
+    batches of up to batch_size or every flush_interval seconds, whichever
+    comes first, each batch as one append.
+
+    fsync_policy is 'always' (after every batch), 'interval' (at most every
+    fsync_interval seconds) or 'never' (leave it to the OS). A file larger
+    than max_bytes is renamed to `<experiment>_results.<timestamp>.jsonl`
+    and a new one started; segments sort chronologically by name.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        serializer: Callable[[Any], str],
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        fsync_policy: str = 'interval',
+        fsync_interval: float = 5.0,
+        max_bytes: int = 64 * 1024 * 1024
+    ):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"fsync_policy must be one of {FSYNC_POLICIES}, got {fsync_policy}")
+
+        self.directory = directory
+        self.serializer = serializer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+
+        self.queue: "queue.Queue" = queue.Queue()
+        self.files: Dict[str, int] = {}  # experiment -> O_APPEND descriptor
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+        self.last_fsync = time.monotonic()
+
+        self.stats = {'records': 0, 'batches': 0, 'fsyncs': 0, 'rotations': 0, 'errors': 0}
+
+    def log_path(self, experiment_id: str) -> str:
+        return os.path.join(self.directory, f"{experiment_id}_results.jsonl")
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None or self.pid != os.getpid() or not self.thread.is_alive():
+                # The writer thread and queued records do not survive a fork
+                self.queue = queue.Queue()
+                self.files = {}
+                self.pid = os.getpid()
+                self.thread = threading.Thread(target=self._run, name="ab-results-writer", daemon=True)
+                self.thread.start()
+
+    def append(self, experiment_id: str, record: Any):
+        """Queue a record for the experiment's log; never blocks on disk"""
+        self._ensure_started()
+        self.queue.put((experiment_id, record))
+
+    def _next_batch(self) -> List:
+        batch = [self.queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+
+        while len(batch) < self.batch_size and batch[-1] is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            stop = batch[-1] is None
+            records = batch[:-1] if stop else batch
+
+            try:
+                if records:
+                    self._write(records)
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.error(f"Failed to write {len(records)} experiment results: {e}")
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            if stop:
+                return
+
+    def _write(self, records: List[Tuple[str, Any]]):
+        lines: Dict[str, List[str]] = {}
+        for experiment_id, record in records:
+            lines.setdefault(experiment_id, []).append(self.serializer(record) + '\n')
+
+        sync = self.fsync_policy == 'always' or (
+            self.fsync_policy == 'interval' and time.monotonic() - self.last_fsync >= self.fsync_interval
+        )
+
+        for experiment_id, experiment_lines in lines.items():
+            fd = self._open(experiment_id)
+            os.write(fd, ''.join(experiment_lines).encode())
+            if sync:
+                os.fsync(fd)
+            if os.fstat(fd).st_size >= self.max_bytes:
+                self._rotate(experiment_id)
+
+        if sync:
+            self.last_fsync = time.monotonic()
+            self.stats['fsyncs'] += 1
+        self.stats['records'] += len(records)
+        self.stats['batches'] += 1
+
+    def _open(self, experiment_id: str) -> int:
+        fd = self.files.get(experiment_id)
+        if fd is None:
+            os.makedirs(self.directory, exist_ok=True)
+            fd = self.files[experiment_id] = os.open(
+                self.log_path(experiment_id), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+        return fd
+
+    def _rotate(self, experiment_id: str):
+        fd = self.files.pop(experiment_id)
+        path = self.log_path(experiment_id)
+        try:
+            # Another process appending to the same log may have rotated it already
+            if os.path.exists(path) and os.stat(path).st_ino == os.fstat(fd).st_ino:
+                os.fsync(fd)
+                segment = path[:-len('.jsonl')] + f".{datetime.now().strftime('%Y%m%dT%H%M%S%f')}.jsonl"
+                os.rename(path, segment)
+                self.stats['rotations'] += 1
+                logger.info(f"Rotated experiment results to {segment}")
+        finally:
+            os.close(fd)
+
+    def segment_paths(self, experiment_id: str) -> List[str]:
+        """Rotated segments oldest first, followed by the active log"""
+        prefix = f"{experiment_id}_results."
+        segments = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.startswith(prefix) and name.endswith('.jsonl') and name != f"{experiment_id}_results.jsonl"
+        ) if os.path.isdir(self.directory) else []
+        active = self.log_path(experiment_id)
+        return segments + ([active] if os.path.exists(active) else [])
+
+    def flush(self):
+        """Block until every queued record has been written"""
+        if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+            self.queue.join()
+
+    def close(self):
+        with self.lock:
+            if self.thread is not None and self.pid == os.getpid() and self.thread.is_alive():
+                self.queue.put(None)
+                self.thread.join(timeout=10)
+                if self.thread.is_alive():
+                    # The writer still uses the descriptors; it stops once it reaches the sentinel
+                    logger.warning(
+                        f"Experiment results writer still draining {self.queue.qsize()} queued records; "
+                        f"leaving its logs open"
+                    )
+                    return
+            self.thread = None
+
+            for fd in self.files.values():
+                try:
+                    os.fsync(fd)
+                finally:
+                    os.close(fd)
+            self.files = {}
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'queued': self.queue.qsize(), 'fsync_policy': self.fsync_policy}
@@ -13,12 +13,14 @@ from datetime import datetime
 import logging
 
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 from sklearn.preprocessing import StandardScaler
 import onnx
 import onnxruntime as ort
 import torch
 
+from embedding_backends import ONNXEmbeddingBackend, SentenceTransformerBackend, load_tokenizer
+from prototype_index import PrototypeIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,9 +35,12 @@ class TransactionClassifier:
         self.model_name = model_name
         self.sentence_model = None
         self.category_prototypes = {}
+        self.prototype_index = PrototypeIndex()
+        self.top_k = 3
         self.user_feedback = {}
         self.scaler = StandardScaler()
         self.onnx_session = None
+        self.embedding_backend = None
         self.model_version = "v1.0"
         
         # Categories with example transactions for few-shot learning
@@ -104,6 +109,10 @@ class TransactionClassifier:
                 logger.info(f"Loading sentence transformer model from hub: {self.model_name}")
                 self.sentence_model = SentenceTransformer(self.model_name)
                 logger.info("Hub model loaded successfully")
+            
+            # Keep serving from ONNX if a session was loaded first
+            if self.onnx_session is None:
+                self.embedding_backend = SentenceTransformerBackend(self.sentence_model)
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise
@@ -126,6 +135,7 @@ class TransactionClassifier:
                 'examples': examples,
                 'embedding_dim': len(prototype)
             }
+        self.prototype_index.rebuild(self.category_prototypes)
         
         logger.info(f"Initialized {len(self.category_prototypes)} category prototypes")
     
@@ -149,62 +159,60 @@ class TransactionClassifier:
         embeddings = self.sentence_model.encode(examples)
         prototype = np.mean(embeddings, axis=0)
         self.category_prototypes[category]['prototype'] = prototype
+        self.prototype_index.rebuild(self.category_prototypes)
         
         logger.info(f"Added example to {category}: {example}")
     
     def classify_transaction(self, description: str, amount: float = None, 
                            merchant: str = None) -> Dict:
         """Classify a transaction using few-shot learning"""
-        if not self.sentence_model or not self.category_prototypes:
+        return self.batch_classify([{
+            'description': description,
+            'amount': amount,
+            'merchant': merchant
+        }])[0]
+    
+    def batch_classify(self, transactions: List[Dict]) -> List[Dict]:
+        """Classify multiple transactions in batch"""
+        if self.embedding_backend is None or not len(self.prototype_index):
             raise ValueError("Model not initialized. Call load_model() and initialize_category_prototypes() first.")
         
-        # Prepare input text
-        input_text = description
-        if merchant:
-            input_text = f"{merchant} {description}"
-        
-        # Encode transaction
-        transaction_embedding = self.sentence_model.encode([input_text])[0]
-        
-        # Calculate similarities to all prototypes
-        similarities = {}
-        for category, data in self.category_prototypes.items():
-            prototype = data['prototype']
-            similarity = cosine_similarity([transaction_embedding], [prototype])[0][0]
-            similarities[category] = similarity
-        
-        # Find best match
-        best_category = max(similarities, key=similarities.get)
-        confidence = similarities[best_category]
+        # Prepare input texts
+        input_texts = []
+        for transaction in transactions:
+            input_text = transaction.get('description', '')
+            if transaction.get('merchant'):
+                input_text = f"{transaction['merchant']} {input_text}"
+            input_texts.append(input_text)
         
-        # Apply confidence thresholds
-        if confidence < 0.3:
-            confidence_level = "low"
-        elif confidence < 0.7:
-            confidence_level = "medium"
-        else:
-            confidence_level = "high"
+        # Encode all transactions at once and score them against every prototype
+        # with one matrix multiplication
+        embeddings = self.embedding_backend.encode(input_texts)
         
-        return {
-            'predicted_category': best_category,
-            'confidence': float(confidence),
-            'confidence_level': confidence_level,
-            'all_similarities': {k: float(v) for k, v in similarities.items()},
-            'model_version': self.model_version,
-            'timestamp': datetime.now().isoformat()
-        }
-    
-    def batch_classify(self, transactions: List[Dict]) -> List[Dict]:
-        """Classify multiple transactions in batch"""
         results = []
-        for transaction in transactions:
-            result = self.classify_transaction(
-                description=transaction.get('description', ''),
-                amount=transaction.get('amount'),
-                merchant=transaction.get('merchant')
-            )
-            result['transaction_id'] = transaction.get('id')
-            results.append(result)
+        for transaction, top_categories in zip(transactions, self.prototype_index.classify(embeddings, self.top_k)):
+            best_category, confidence = top_categories[0]
+            
+            # Apply confidence thresholds
+            if confidence < 0.3:
+                confidence_level = "low"
+            elif confidence < 0.7:
+                confidence_level = "medium"
+            else:
+                confidence_level = "high"
+            
+            results.append({
+                'predicted_category': best_category,
+                'confidence': confidence,
+                'confidence_level': confidence_level,
+                'top_categories': [
+                    {'category': category, 'confidence': similarity}
+                    for category, similarity in top_categories
+                ],
+                'model_version': self.model_version,
+                'timestamp': datetime.now().isoformat(),
+                'transaction_id': transaction.get('id')
+            })
         
         return results
     
@@ -301,9 +309,12 @@ class TransactionClassifier:
             return model_path
     
     def load_onnx_model(self, model_path: str):
-        """Load ONNX model for inference"""
+        """Load ONNX model and serve classification embeddings from it"""
         try:
-            self.onnx_session = ort.InferenceSession(model_path)
+            tokenizer = self.sentence_model.tokenizer if self.sentence_model else load_tokenizer(self.model_name)
+            backend = ONNXEmbeddingBackend.from_path(model_path, tokenizer)
+            self.onnx_session = backend.session
+            self.embedding_backend = backend
             logger.info(f"ONNX model loaded: {model_path}")
         except Exception as e:
             logger.error(f"Failed to load ONNX model: {e}")
@@ -328,6 +339,7 @@ class TransactionClassifier:
                 data = pickle.load(f)
                 self.category_prototypes = data['prototypes']
                 self.model_version = data.get('model_version', 'v1.0')
+            self.prototype_index.rebuild(self.category_prototypes)
                 
             logger.info(f"Prototypes loaded from {filepath}")
         except Exception as e:
@@ -20,6 +20,8 @@ import numpy as np
 from sentence_transformers import SentenceTransformer
 from transformers import AutoTokenizer, AutoModel
 
+from embedding_backends import ONNXEmbeddingBackend
+
 logger = logging.getLogger(__name__)
 
 class CalibrationDataGenerator(CalibrationDataReader):
@@ -110,6 +112,22 @@ class ONNXConverter:
             logger.error(f"Failed to load model: {e}")
             raise
     
+    def use_model(self, sentence_transformer: SentenceTransformer):
+        """Convert and validate against an already-loaded model instead of loading another copy"""
+        self.sentence_transformer = sentence_transformer
+        self.model = sentence_transformer[0].auto_model
+        self.tokenizer = sentence_transformer[0].tokenizer
+        self.model.eval()
+    
+    @staticmethod
+    def production_model_paths(output_dir: str) -> Dict[str, str]:
+        """Where create_production_models writes each variant"""
+        return {
+            'base': os.path.join(output_dir, "transaction_classifier.onnx"),
+            'dynamic_quantized': os.path.join(output_dir, "transaction_classifier_dynamic_q8.onnx"),
+            'static_quantized': os.path.join(output_dir, "transaction_classifier_static_q8.onnx")
+        }
+    
     def export_to_onnx(
         self, 
         output_path: str,
@@ -322,55 +340,55 @@ class ONNXConverter:
         
         return results
     
-    def validate_onnx_model(self, onnx_path: str, tolerance: float = 1e-3) -> bool:
-        """Validate ONNX model against original PyTorch model"""
+    def validate_onnx_model(
+        self,
+        onnx_path: str,
+        tolerance: float = 1e-3,
+        min_cosine_similarity: Optional[float] = None
+    ) -> bool:
+        """
+        Validate ONNX model against original PyTorch model.
+
+        Embeddings go through ONNXEmbeddingBackend, the same path inference is
+        served from. Full-precision exports are held to a mean absolute
+        difference below `tolerance`; quantized ones, whose weights are
+        expected to drift, to a cosine similarity of at least
+        `min_cosine_similarity` on every calibration text.
+        """
+        
+        if not self.sentence_transformer:
+            self.load_model()
         
         try:
-            # Load ONNX session
-            session = ort.InferenceSession(onnx_path)
-            
-            # Test with sample input
-            test_text = "coffee shop purchase morning"
-            
-            # Get PyTorch output
-            pytorch_embedding = self.sentence_transformer.encode([test_text])[0]
-            
-            # Get ONNX output
-            inputs = self.tokenizer(
-                test_text,
-                max_length=128,
-                padding='max_length',
-                truncation=True,
-                return_tensors='np'
-            )
-            
-            onnx_outputs = session.run(None, {
-                'input_ids': inputs['input_ids'].astype(np.int64),
-                'attention_mask': inputs['attention_mask'].astype(np.int64)
-            })
+            backend = ONNXEmbeddingBackend.from_path(onnx_path, self.tokenizer)
             
-            # Extract embeddings from ONNX output (mean pooling)
-            last_hidden_state = onnx_outputs[0]
-            attention_mask = inputs['attention_mask']
+            # Test with a sample of calibration inputs
+            test_texts = list(dict.fromkeys(self.calibration_texts))
             
-            # Mean pooling
-            input_mask_expanded = np.broadcast_to(
-                attention_mask.unsqueeze(-1), last_hidden_state.shape
+            pytorch_embeddings = self.sentence_transformer.encode(
+                test_texts, convert_to_tensor=False, show_progress_bar=False
             )
-            sum_embeddings = np.sum(last_hidden_state * input_mask_expanded, axis=1)
-            sum_mask = np.sum(input_mask_expanded, axis=1)
-            onnx_embedding = sum_embeddings / np.maximum(sum_mask, 1e-9)
-            onnx_embedding = onnx_embedding[0]  # Remove batch dimension
+            onnx_embeddings = backend.encode(test_texts)
             
             # Compare embeddings
-            diff = np.mean(np.abs(pytorch_embedding - onnx_embedding))
+            diff = float(np.mean(np.abs(pytorch_embeddings - onnx_embeddings)))
+            cosine = np.sum(pytorch_embeddings * onnx_embeddings, axis=1) / np.maximum(
+                np.linalg.norm(pytorch_embeddings, axis=1) * np.linalg.norm(onnx_embeddings, axis=1), 1e-12
+            )
+            min_cosine = float(np.min(cosine))
+            
+            if min_cosine_similarity is not None:
+                passed = min_cosine >= min_cosine_similarity
+                criterion = f"min cosine: {min_cosine:.4f}, required {min_cosine_similarity}"
+            else:
+                passed = diff < tolerance
+                criterion = f"diff: {diff:.6f}, tolerance {tolerance}"
             
-            if diff < tolerance:
-                logger.info(f"ONNX model validation passed (diff: {diff:.6f})")
-                return True
+            if passed:
+                logger.info(f"ONNX model validation passed for {onnx_path} ({criterion})")
             else:
-                logger.warning(f"ONNX model validation failed (diff: {diff:.6f} > {tolerance})")
-                return False
+                logger.warning(f"ONNX model validation failed for {onnx_path} ({criterion})")
+            return passed
                 
         except Exception as e:
             logger.error(f"ONNX model validation error: {e}")
@@ -385,10 +403,11 @@ class ONNXConverter:
             self.load_model()
         
         model_paths = {}
+        output_paths = self.production_model_paths(output_dir)
         
         try:
             # 1. Export base ONNX model
-            base_onnx_path = os.path.join(output_dir, "transaction_classifier.onnx")
+            base_onnx_path = output_paths['base']
             self.export_to_onnx(base_onnx_path)
             model_paths['base'] = base_onnx_path
             
@@ -397,12 +416,12 @@ class ONNXConverter:
                 logger.warning("Base ONNX model validation failed")
             
             # 2. Create dynamic quantized version
-            dynamic_path = os.path.join(output_dir, "transaction_classifier_dynamic_q8.onnx")
+            dynamic_path = output_paths['dynamic_quantized']
             self.quantize_dynamic(base_onnx_path, dynamic_path)
             model_paths['dynamic_quantized'] = dynamic_path
             
             # 3. Create static quantized version
-            static_path = os.path.join(output_dir, "transaction_classifier_static_q8.onnx")
+            static_path = output_paths['static_quantized']
             self.quantize_static(base_onnx_path, static_path)
             model_paths['static_quantized'] = static_path
             
@@ -9,7 +9,7 @@ import json
 import pickle
 import asyncio
 import logging
-from typing import Dict, List, Tuple, Optional, Any, Union
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
 from datetime import datetime
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
@@ -19,9 +19,18 @@ import numpy as np
 import onnxruntime as ort
 from sentence_transformers import SentenceTransformer
 import torch
-from sklearn.metrics.pairwise import cosine_similarity_chunked
 import psutil
 
+from embedding_backends import (
+    EmbeddingBackend,
+    ONNXEmbeddingBackend,
+    SentenceTransformerBackend,
+    create_onnx_session,
+    load_tokenizer,
+)
+from embedding_cache import EmbeddingCache
+from prototype_index import PrototypeIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -33,7 +42,7 @@ class InferenceResult:
     confidence_level: str
     inference_time_ms: float
     model_version: str
-    all_similarities: Optional[Dict[str, float]] = None
+    top_categories: Optional[List[Tuple[str, float]]] = None
 
 @dataclass
 class BatchInferenceResult:
@@ -48,31 +57,40 @@ class OptimizedInferenceEngine:
     Production-optimized inference engine with <10ms CPU inference
     """
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", cache_path: Optional[str] = None):
         self.model_name = model_name
         self.sentence_model = None
         self.onnx_session = None
+        self.embedding_backend: Optional[EmbeddingBackend] = None
         self.category_prototypes = {}
+        self.prototype_index = PrototypeIndex()
+        self.top_k = 3
         self.model_version = "v2.0_optimized"
         
         # Performance optimization settings
-        self.embedding_cache = {}
-        self.cache_max_size = 10000
+        self.embedding_cache = EmbeddingCache(
+            capacity=int(os.getenv('EMBEDDING_CACHE_SIZE', '10000')),
+            ttl_seconds=float(os.getenv('EMBEDDING_CACHE_TTL_SECONDS', '0')),
+            dtype=os.getenv('EMBEDDING_CACHE_DTYPE', 'float16'),
+            path=cache_path
+        )
         self.batch_size_optimal = 32
         
         # Threading for concurrent processing
         self.executor = ThreadPoolExecutor(max_workers=os.cpu_count())
         self.lock = threading.RLock()
         
+        # Deferred model loading (see load_lazily)
+        self._loader: Optional[Callable[[], None]] = None
+        self._load_lock = threading.Lock()
+        
         # Performance monitoring
         self.inference_stats = {
             'total_inferences': 0,
             'total_time_ms': 0,
             'avg_time_ms': 0,
             'max_time_ms': 0,
-            'min_time_ms': float('inf'),
-            'cache_hits': 0,
-            'cache_misses': 0
+            'min_time_ms': float('inf')
         }
         
         # CPU optimization settings
@@ -93,35 +111,37 @@ class OptimizedInferenceEngine:
             except:
                 pass
     
-    def load_optimized_model(self, force_reload: bool = False):
-        """Load optimized sentence transformer model"""
+    def model_source(self) -> str:
+        """Local model directory if present, else the hub model name"""
+        local_model_path = f"/app/models/{self.model_name}"
+        return local_model_path if os.path.exists(local_model_path) else self.model_name
+    
+    def load_optimized_model(self, force_reload: bool = False, shared_model: Optional[SentenceTransformer] = None):
+        """
+        Load optimized sentence transformer model, or serve from an
+        already-loaded `shared_model` instead of holding another copy.
+        """
         if self.sentence_model and not force_reload:
             return
             
         start_time = time.time()
         
         try:
-            # Load with CPU optimization
-            device = 'cpu'
-            # Check if model exists locally first
-            local_model_path = f"/app/models/{self.model_name}"
-            if os.path.exists(local_model_path):
-                self.sentence_model = SentenceTransformer(
-                    local_model_path, 
-                    device=device,
-                    cache_folder='./model_cache'
-                )
-                print(f"Loaded local model: {local_model_path}")
+            if shared_model is not None:
+                self.sentence_model = shared_model
             else:
+                # Load with CPU optimization; safetensors weights are memory-mapped
+                # by transformers rather than read into private memory
                 self.sentence_model = SentenceTransformer(
-                    self.model_name, 
-                    device=device,
+                    self.model_source(), 
+                    device='cpu',
                     cache_folder='./model_cache'
                 )
-                print(f"Loaded hub model: {self.model_name}")
+                print(f"Loaded model: {self.model_source()}")
             
             # Optimize model for inference
             self.sentence_model.eval()
+            self.embedding_backend = SentenceTransformerBackend(self.sentence_model)
             
             # Warm up the model with a dummy input
             self._warmup_model()
@@ -143,55 +163,65 @@ class OptimizedInferenceEngine:
         
         # Perform dummy inferences to warm up
         for _ in range(3):
-            self.sentence_model.encode(dummy_texts, convert_to_tensor=False)
+            self._encode(dummy_texts)
     
-    def load_onnx_model(self, onnx_path: str, quantized: bool = True):
-        """Load ONNX model for optimized CPU inference"""
+    def load_onnx_model(self, onnx_path: str, quantized: bool = True, tokenizer=None):
+        """
+        Serve embeddings from an ONNX model instead of PyTorch.
+
+        Only the tokenizer is loaded alongside the session, so ONNX engines
+        never hold the PyTorch weights in memory.
+        """
         try:
-            # Configure ONNX Runtime for CPU optimization
-            sess_options = ort.SessionOptions()
-            sess_options.intra_op_num_threads = min(4, os.cpu_count())
-            sess_options.inter_op_num_threads = 1
-            sess_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
-            
-            providers = ['CPUExecutionProvider']
-            
-            self.onnx_session = ort.InferenceSession(
-                onnx_path,
-                sess_options=sess_options,
-                providers=providers
+            self.onnx_session = create_onnx_session(onnx_path)
+            self.embedding_backend = ONNXEmbeddingBackend(
+                self.onnx_session,
+                tokenizer or load_tokenizer(self.model_name)
             )
+            self.model_version = "v2.0_onnx_int8" if quantized else "v2.0_onnx"
             
             logger.info(f"ONNX model loaded: {onnx_path}")
             logger.info(f"Input shape: {self.onnx_session.get_inputs()[0].shape}")
             
+            self._warmup_model()
+            
         except Exception as e:
             logger.error(f"Failed to load ONNX model: {e}")
             raise
     
+    def load_lazily(self, loader: Callable[[], None]):
+        """Defer model loading until the first text needs embedding"""
+        self._loader = loader
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self.embedding_backend is not None
+    
+    def ensure_loaded(self):
+        """Run the deferred loader once, even with concurrent first requests"""
+        if self.embedding_backend is None and self._loader is not None:
+            with self._load_lock:
+                if self.embedding_backend is None:
+                    start_time = time.perf_counter()
+                    self._loader()
+                    logger.info(f"Lazily loaded {self.model_version} in {(time.perf_counter() - start_time) * 1000:.1f}ms")
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with whichever backend this engine serves from"""
+        self.ensure_loaded()
+        if self.embedding_backend is None:
+            raise ValueError("No embedding backend loaded. Call load_optimized_model() or load_onnx_model() first.")
+        return self.embedding_backend.encode(texts)
+    
     def _get_embedding_cached(self, text: str) -> np.ndarray:
         """Get embedding with caching for repeated texts"""
-        # Create cache key
-        cache_key = hash(text.lower().strip())
-        
-        with self.lock:
-            if cache_key in self.embedding_cache:
-                self.inference_stats['cache_hits'] += 1
-                return self.embedding_cache[cache_key]
-            
-            self.inference_stats['cache_misses'] += 1
-            
-            # Generate embedding
-            embedding = self.sentence_model.encode([text], convert_to_tensor=False)[0]
-            
-            # Cache management
-            if len(self.embedding_cache) >= self.cache_max_size:
-                # Remove oldest entries (simple LRU)
-                oldest_key = next(iter(self.embedding_cache))
-                del self.embedding_cache[oldest_key]
-            
-            self.embedding_cache[cache_key] = embedding
-            return embedding
+        # Encoding runs outside the cache lock; concurrent misses on one text share a single encode.
+        # Keys are namespaced by model version so ONNX and PyTorch embeddings never mix.
+        return self.embedding_cache.get_or_compute(
+            text,
+            lambda t: self._encode([t])[0],
+            namespace=self.model_version
+        )
     
     def classify_single_optimized(
         self, 
@@ -212,27 +242,10 @@ class OptimizedInferenceEngine:
             # Get embedding (cached if available)
             transaction_embedding = self._get_embedding_cached(input_text)
             
-            # Fast similarity computation using optimized numpy
-            similarities = {}
-            for category, data in self.category_prototypes.items():
-                prototype = data['prototype']
-                # Use optimized dot product for cosine similarity
-                similarity = np.dot(transaction_embedding, prototype) / (
-                    np.linalg.norm(transaction_embedding) * np.linalg.norm(prototype)
-                )
-                similarities[category] = float(similarity)
-            
-            # Find best match
-            best_category = max(similarities, key=similarities.get)
-            confidence = similarities[best_category]
-            
-            # Determine confidence level
-            if confidence >= 0.8:
-                confidence_level = "high"
-            elif confidence >= 0.6:
-                confidence_level = "medium"
-            else:
-                confidence_level = "low"
+            # One matrix-vector product against the normalized prototype matrix
+            top_categories = self.prototype_index.classify(transaction_embedding, self.top_k)[0]
+            best_category, confidence = top_categories[0]
+            confidence_level = self._confidence_level(confidence)
             
             inference_time_ms = (time.perf_counter() - start_time) * 1000
             
@@ -245,7 +258,7 @@ class OptimizedInferenceEngine:
                 confidence_level=confidence_level,
                 inference_time_ms=inference_time_ms,
                 model_version=self.model_version,
-                all_similarities=similarities
+                top_categories=top_categories
             )
             
         except Exception as e:
@@ -255,12 +268,15 @@ class OptimizedInferenceEngine:
     def classify_batch_optimized(
         self, 
         transactions: List[Dict],
-        batch_size: int = None
+        batch_size: int = None,
+        top_k: int = None
     ) -> BatchInferenceResult:
         """Optimized batch processing for maximum throughput"""
         
         if batch_size is None:
             batch_size = self.batch_size_optimal
+        if top_k is None:
+            top_k = self.top_k
         
         start_time = time.perf_counter()
         results = []
@@ -278,37 +294,22 @@ class OptimizedInferenceEngine:
                 batch_texts.append(text)
             
             # Batch embedding generation (more efficient)
-            batch_embeddings = self.sentence_model.encode(
-                batch_texts, 
-                convert_to_tensor=False,
-                show_progress_bar=False
+            batch_embeddings = self.embedding_cache.get_many_or_compute(
+                batch_texts,
+                self._encode,
+                namespace=self.model_version
             )
             
-            # Process each embedding in batch
-            for j, embedding in enumerate(batch_embeddings):
-                transaction = batch[j]
-                
-                # Fast similarity computation
-                similarities = {}
-                for category, data in self.category_prototypes.items():
-                    prototype = data['prototype']
-                    similarity = np.dot(embedding, prototype) / (
-                        np.linalg.norm(embedding) * np.linalg.norm(prototype)
-                    )
-                    similarities[category] = float(similarity)
-                
-                best_category = max(similarities, key=similarities.get)
-                confidence = similarities[best_category]
-                
-                confidence_level = "high" if confidence >= 0.8 else "medium" if confidence >= 0.6 else "low"
-                
+            # Score the whole batch with one matrix multiplication
+            for top_categories in self.prototype_index.classify(batch_embeddings, top_k):
+                best_category, confidence = top_categories[0]
                 results.append(InferenceResult(
                     predicted_category=best_category,
                     confidence=confidence,
-                    confidence_level=confidence_level,
+                    confidence_level=self._confidence_level(confidence),
                     inference_time_ms=0,  # Will calculate total time
                     model_version=self.model_version,
-                    all_similarities=similarities
+                    top_categories=top_categories
                 ))
         
         total_time_ms = (time.perf_counter() - start_time) * 1000
@@ -323,6 +324,14 @@ class OptimizedInferenceEngine:
             throughput_per_second=throughput_per_second
         )
     
+    @staticmethod
+    def _confidence_level(confidence: float) -> str:
+        if confidence >= 0.8:
+            return "high"
+        if confidence >= 0.6:
+            return "medium"
+        return "low"
+    
     async def classify_async(
         self, 
         description: str, 
@@ -360,11 +369,9 @@ class OptimizedInferenceEngine:
     
     def get_performance_metrics(self) -> Dict:
         """Get detailed performance metrics"""
+        cache_stats = self.embedding_cache.get_stats()
+        
         with self.lock:
-            cache_hit_rate = (
-                self.inference_stats['cache_hits'] / 
-                max(1, self.inference_stats['cache_hits'] + self.inference_stats['cache_misses'])
-            ) * 100
             
             # System metrics
             cpu_usage = psutil.cpu_percent(interval=0.1)
@@ -372,10 +379,14 @@ class OptimizedInferenceEngine:
             
             return {
                 **self.inference_stats.copy(),
-                'cache_hit_rate_percent': cache_hit_rate,
-                'cache_size': len(self.embedding_cache),
+                'cache_hits': cache_stats['hits'],
+                'cache_misses': cache_stats['misses'],
+                'cache_hit_rate_percent': cache_stats['hit_rate'] * 100,
+                'cache_size': cache_stats['size'],
+                'cache_bytes': cache_stats['arena_bytes'],
                 'categories_loaded': len(self.category_prototypes),
                 'model_version': self.model_version,
+                'embedding_backend': self.embedding_backend.name if self.embedding_backend else None,
                 'cpu_usage_percent': cpu_usage,
                 'memory_usage_percent': memory_info.percent,
                 'memory_available_mb': memory_info.available // (1024 * 1024),
@@ -420,6 +431,10 @@ class OptimizedInferenceEngine:
         p95_single_time = np.percentile(single_times, 95)
         p99_single_time = np.percentile(single_times, 99)
         
+        similarity_scaling = self._benchmark_similarity_scaling(
+            self._encode(test_descriptions[:num_samples])
+        )
+        
         return {
             'benchmark_samples': num_samples,
             'batch_processing': {
@@ -433,33 +448,75 @@ class OptimizedInferenceEngine:
                 'p99_time_ms': p99_single_time,
                 'target_10ms_met': avg_single_time < 10.0
             },
+            'similarity_scaling': similarity_scaling,
             'performance_metrics': self.get_performance_metrics()
         }
     
+    def _benchmark_similarity_scaling(
+        self,
+        embeddings: np.ndarray,
+        category_counts: Tuple[int, ...] = (10, 100, 1000),
+        repeats: int = 5
+    ) -> Dict[str, Dict[str, float]]:
+        """Throughput of prototype scoring alone against synthetic 10/100/1000-category setups"""
+        rng = np.random.default_rng(0)
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        results = {}
+        
+        for num_categories in category_counts:
+            index = PrototypeIndex()
+            index.rebuild({
+                f"category_{i}": {'prototype': prototype}
+                for i, prototype in enumerate(rng.standard_normal((num_categories, embeddings.shape[1])))
+            })
+            
+            start_time = time.perf_counter()
+            for _ in range(repeats):
+                index.top_k(embeddings, self.top_k)
+            elapsed = (time.perf_counter() - start_time) / repeats
+            
+            results[f"{num_categories}_categories"] = {
+                'time_ms': elapsed * 1000,
+                'throughput_per_second': len(embeddings) / max(elapsed, 1e-9)
+            }
+        
+        return results
+    
     def clear_cache(self):
         """Clear embedding cache"""
-        with self.lock:
-            self.embedding_cache.clear()
-            logger.info("Embedding cache cleared")
+        self.embedding_cache.clear()
+        logger.info("Embedding cache cleared")
+    
+    def cache_metrics(self) -> Tuple[float, int]:
+        """(hit rate, entries) in the form ModelMonitor.update_cache_metrics takes"""
+        stats = self.embedding_cache.get_stats()
+        return stats['hit_rate'], stats['size']
+    
+    def close(self):
+        """Flush the persistent embedding cache, if any"""
+        self.embedding_cache.close()
     
     def load_prototypes(self, filepath: str):
         """Load category prototypes"""
         try:
             with open(filepath, 'rb') as f:
                 data = pickle.load(f)
-                self.category_prototypes = data['prototypes']
+            self.set_category_prototypes(data['prototypes'])
             
             logger.info(f"Loaded {len(self.category_prototypes)} category prototypes")
         except Exception as e:
             logger.error(f"Failed to load prototypes: {e}")
     
+    def set_category_prototypes(self, category_prototypes: Dict[str, Dict]):
+        """Replace category prototypes and rebuild the normalized prototype matrix"""
+        with self.lock:
+            self.category_prototypes = category_prototypes
+            self.prototype_index.rebuild(category_prototypes)
+    
     def optimize_for_production(self):
         """Apply all production optimizations"""
         logger.info("Applying production optimizations...")
         
-        # Clear any existing cache
-        self.clear_cache()
-        
         # Warm up model
         self._warmup_model()
         
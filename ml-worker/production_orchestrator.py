@@ -10,11 +10,14 @@ import logging
 from typing import Dict, List, Optional, Any, Union
 from datetime import datetime
 from dataclasses import dataclass
+from pathlib import Path
 import threading
 import asyncio
 
 from optimized_inference_engine import OptimizedInferenceEngine, InferenceResult
 from onnx_converter import ONNXConverter
+from benchmark_cache import BenchmarkCache
+from embedding_backends import load_tokenizer
 from model_monitoring import ModelMonitor
 from ab_testing_framework import ABTestingFramework, ModelVariant, ExperimentConfig, TrafficSplitStrategy
 
@@ -29,6 +32,10 @@ class ProductionConfig:
     ab_testing_enabled: bool = True
     performance_targets: Dict[str, float] = None
     deployment_strategy: str = "blue_green"  # blue_green, canary, rolling
+    fast_start: bool = False  # lazy model loads, cached benchmarks, no ONNX conversion at startup
+    deferred_benchmarks: bool = True  # in fast-start mode, fill in missing benchmarks in the background
+    benchmark_delay_seconds: float = float(os.getenv('ML_BENCHMARK_DELAY_SECONDS', '30'))
+    benchmark_samples: int = 500
     
 class ProductionOrchestrator:
     """
@@ -36,18 +43,32 @@ class ProductionOrchestrator:
     optimization, monitoring, and A/B testing
     """
     
+    # Variant type (from ProductionConfig.model_variants) -> ONNXConverter model
+    ONNX_VARIANT_MODELS = {
+        'onnx': 'base',
+        'onnx_quantized': 'dynamic_quantized',
+        'onnx_static_quantized': 'static_quantized'
+    }
+    QUANTIZED_MIN_COSINE_SIMILARITY = 0.98
+    MODELS_DIR = "models/production"
+    CACHE_METRICS_INTERVAL_SECONDS = 30.0
+    
     def __init__(self, config: ProductionConfig):
         self.config = config
         
         # Core components
-        self.inference_engine = OptimizedInferenceEngine()
+        # Only the default engine persists its embedding cache; variants keep theirs in memory
+        self.inference_engine = OptimizedInferenceEngine(cache_path=os.getenv('EMBEDDING_CACHE_PATH'))
         self.onnx_converter = ONNXConverter()
+        self.benchmark_cache = BenchmarkCache(os.path.join(self.MODELS_DIR, "benchmarks"))
         self.model_monitor = ModelMonitor() if config.monitoring_enabled else None
         self.ab_framework = ABTestingFramework() if config.ab_testing_enabled else None
         
         # Model management
         self.active_models: Dict[str, Any] = {}
         self.model_performance: Dict[str, Dict] = {}
+        self.pending_variants: Dict[str, Any] = {}  # variant name -> (variant config, model path)
+        self.tokenizer = None
         
         # Production state
         self.is_production_ready = False
@@ -63,14 +84,15 @@ class ProductionOrchestrator:
         
         # Thread safety
         self.lock = threading.RLock()
+        self.last_cache_metrics_at = 0.0
     
     async def initialize_production(self):
         """Initialize production deployment"""
         
-        logger.info("Initializing production ML system...")
+        logger.info(f"Initializing production ML system{' (fast start)' if self.config.fast_start else ''}...")
         
         try:
-            # 1. Load and optimize models
+            # 1. Load and optimize models (registered lazily in fast-start mode)
             await self._setup_models()
             
             # 2. Start monitoring if enabled
@@ -78,16 +100,21 @@ class ProductionOrchestrator:
                 self.model_monitor.start_monitoring()
                 logger.info("Model monitoring started")
             
-            # 3. Run performance benchmarks
-            await self._run_initial_benchmarks()
+            # 3. Run performance benchmarks, or reuse cached ones and defer the rest
+            if self.config.fast_start:
+                self._load_cached_benchmarks()
+                if self.config.deferred_benchmarks:
+                    self.start_deferred_benchmarks()
+            else:
+                await self._run_initial_benchmarks()
             
             # 4. Setup A/B testing if enabled
             if self.ab_framework:
-                await self._setup_ab_testing()
+                self._setup_ab_testing()
                 logger.info("A/B testing framework initialized")
             
             # 5. Validate production readiness
-            self.is_production_ready = await self._validate_production_readiness()
+            self.is_production_ready = self._validate_production_readiness()
             
             if self.is_production_ready:
                 logger.info("🚀 Production ML system ready!")
@@ -104,77 +131,222 @@ class ProductionOrchestrator:
         logger.info("Setting up model variants...")
         
         # Load base model
-        self.inference_engine.load_optimized_model()
+        if self.config.fast_start:
+            self.inference_engine.load_lazily(self.inference_engine.load_optimized_model)
+        else:
+            self.inference_engine.load_optimized_model()
         self.inference_engine.load_prototypes('models/category_prototypes.pkl')
         
-        # Create ONNX variants
-        models_dir = "models/production"
-        os.makedirs(models_dir, exist_ok=True)
-        
-        # Generate optimized ONNX models
-        production_models = self.onnx_converter.create_production_models(models_dir)
-        
-        logger.info(f"Created production models: {list(production_models['models'].keys())}")
-        
-        # Load ONNX models for inference
-        for model_type, model_path in production_models['models'].items():
-            try:
-                # Create separate inference engine for each variant
-                if model_type in ['dynamic_quantized', 'static_quantized']:
-                    engine = OptimizedInferenceEngine()
-                    engine.load_onnx_model(model_path)
-                    engine.load_prototypes('models/category_prototypes.pkl')
-                    
-                    self.active_models[model_type] = {
-                        'engine': engine,
-                        'path': model_path,
-                        'type': model_type,
-                        'benchmarks': production_models['benchmarks'].get(model_type, {})
-                    }
-                    
-                    logger.info(f"Loaded {model_type} model: {model_path}")
-            
-            except Exception as e:
-                logger.error(f"Failed to load {model_type} model: {e}")
-        
         # Set default model
         self.active_models['default'] = {
             'engine': self.inference_engine,
             'path': self.config.default_model_path,
+            'source': self.inference_engine.model_source(),
             'type': 'sentence_transformer',
             'benchmarks': {}
         }
+        
+        onnx_variants = [
+            variant for variant in self.config.model_variants
+            if variant.get('type') in self.ONNX_VARIANT_MODELS
+        ]
+        if not onnx_variants:
+            return
+        
+        os.makedirs(self.MODELS_DIR, exist_ok=True)
+        
+        if self.config.fast_start:
+            # Serve what an earlier run or the create_onnx_models task produced; never convert at startup
+            model_paths = ONNXConverter.production_model_paths(self.MODELS_DIR)
+            benchmarks = {}
+        else:
+            # Generate optimized ONNX models from the already-loaded base model
+            self.onnx_converter.use_model(self.inference_engine.sentence_model)
+            production_models = self.onnx_converter.create_production_models(self.MODELS_DIR)
+            model_paths, benchmarks = production_models['models'], production_models['benchmarks']
+            
+            logger.info(f"Created production models: {list(model_paths.keys())}")
+        
+        # Serve each configured variant from its ONNX session
+        for variant in onnx_variants:
+            model_path = model_paths.get(self.ONNX_VARIANT_MODELS[variant['type']])
+            self._add_onnx_variant(variant, model_path, benchmarks, validate=not self.config.fast_start)
+    
+    def _add_onnx_variant(self, variant: Dict[str, Any], model_path: Optional[str],
+                          benchmarks: Optional[Dict] = None, validate: bool = True) -> bool:
+        """
+        Register an engine serving `variant` from its ONNX model once it has
+        passed the parity check. Without `validate`, a model whose parity is
+        not cached yet is left pending for run_benchmarks.
+        """
+        
+        variant_name, variant_type = variant['name'], variant['type']
+        quantized = self.ONNX_VARIANT_MODELS[variant_type] != 'base'
+        
+        try:
+            if model_path is None or not os.path.exists(model_path):
+                if not validate:
+                    self.pending_variants[variant_name] = (variant, model_path)
+                raise FileNotFoundError(f"No {self.ONNX_VARIANT_MODELS[variant_type]} model at {model_path}")
+            
+            parity_passed = (self.benchmark_cache.get(model_path) or {}).get('parity_passed')
+            if parity_passed is None:
+                if not validate:
+                    self.pending_variants[variant_name] = (variant, model_path)
+                    logger.info(f"Deferring {variant_name} until {model_path} passes parity validation")
+                    return False
+                parity_passed = self._validate_parity(model_path, quantized)
+            
+            self.pending_variants.pop(variant_name, None)
+            if not parity_passed:
+                logger.warning(f"Skipping {variant_name}: {model_path} failed parity validation")
+                return False
+            
+            # Create separate inference engine for each variant, sharing the tokenizer and prototypes
+            engine = OptimizedInferenceEngine()
+            engine.set_category_prototypes(self.inference_engine.category_prototypes)
+            
+            def load():
+                engine.load_onnx_model(model_path, quantized=quantized, tokenizer=self._shared_tokenizer())
+            
+            if self.config.fast_start:
+                engine.load_lazily(load)
+            else:
+                load()
+            
+            with self.lock:
+                self.active_models[variant_name] = {
+                    'engine': engine,
+                    'path': model_path,
+                    'source': model_path,
+                    'type': variant_type,
+                    'benchmarks': (benchmarks or {}).get(Path(model_path).stem, {})
+                }
+            
+            logger.info(f"Loaded {variant_name} model: {model_path}")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Failed to load {variant_name} model: {e}")
+            return False
+    
+    def _validate_parity(self, model_path: str, quantized: bool) -> bool:
+        """Parity check against the PyTorch embeddings before taking traffic; cached by model hash"""
+        
+        # Validate against the default engine's model rather than loading a second copy
+        self.inference_engine.ensure_loaded()
+        self.onnx_converter.use_model(self.inference_engine.sentence_model)
+        
+        passed = self.onnx_converter.validate_onnx_model(
+            model_path,
+            min_cosine_similarity=self.QUANTIZED_MIN_COSINE_SIMILARITY if quantized else None
+        )
+        self.benchmark_cache.put(model_path, {'parity_passed': passed})
+        return passed
+    
+    def _shared_tokenizer(self):
+        """One tokenizer for every ONNX engine, without loading PyTorch weights if they are not loaded yet"""
+        with self.lock:
+            if self.tokenizer is None:
+                if self.inference_engine.sentence_model is not None:
+                    self.tokenizer = self.inference_engine.sentence_model.tokenizer
+                else:
+                    self.tokenizer = load_tokenizer(self.inference_engine.model_name)
+            return self.tokenizer
     
     async def _run_initial_benchmarks(self):
         """Run performance benchmarks on all models"""
         
         logger.info("Running initial performance benchmarks...")
         
-        for model_name, model_info in self.active_models.items():
-            engine = model_info['engine']
-            
-            try:
+        for model_name in list(self.active_models):
+            self._benchmark_model(model_name, num_samples=self.config.benchmark_samples, force=True)
+    
+    def _benchmark_model(self, model_name: str, num_samples: int, force: bool = False):
+        """Benchmark one model, reusing results cached for the same model files unless forced"""
+        
+        model_info = self.active_models[model_name]
+        
+        try:
+            cached = None if force else self.benchmark_cache.get(model_info['source'])
+            if cached and cached.get('benchmark_results'):
+                benchmark_results = cached['benchmark_results']
+            else:
                 # Run benchmark
-                benchmark_results = engine.benchmark_performance(num_samples=500)
-                
+                benchmark_results = model_info['engine'].benchmark_performance(num_samples=num_samples)
+                self.benchmark_cache.put(model_info['source'], {'benchmark_results': benchmark_results})
+            
+            self.model_performance[model_name] = {
+                'benchmark_results': benchmark_results,
+                'meets_targets': self._check_performance_targets(benchmark_results),
+                'last_updated': datetime.now().isoformat()
+            }
+            
+            logger.info(f"Benchmark {model_name}: "
+                      f"avg {benchmark_results['single_processing']['avg_time_ms']:.1f}ms, "
+                      f"targets met: {self.model_performance[model_name]['meets_targets']}")
+            
+        except Exception as e:
+            logger.error(f"Benchmark failed for {model_name}: {e}")
+            self.model_performance[model_name] = {
+                'benchmark_results': {},
+                'meets_targets': False,
+                'error': str(e),
+                'last_updated': datetime.now().isoformat()
+            }
+    
+    def _load_cached_benchmarks(self):
+        """Fill model_performance from the benchmark cache without running anything"""
+        
+        for model_name, model_info in self.active_models.items():
+            cached = self.benchmark_cache.get(model_info['source']) or {}
+            if cached.get('benchmark_results'):
                 self.model_performance[model_name] = {
-                    'benchmark_results': benchmark_results,
-                    'meets_targets': self._check_performance_targets(benchmark_results),
-                    'last_updated': datetime.now().isoformat()
+                    'benchmark_results': cached['benchmark_results'],
+                    'meets_targets': self._check_performance_targets(cached['benchmark_results']),
+                    'last_updated': cached.get('last_updated'),
+                    'cached': True
                 }
-                
-                logger.info(f"Benchmark {model_name}: "
-                          f"avg {benchmark_results['single_processing']['avg_time_ms']:.1f}ms, "
-                          f"targets met: {self.model_performance[model_name]['meets_targets']}")
-                
+        
+        logger.info(f"Loaded cached benchmarks for {len(self.model_performance)}/{len(self.active_models)} models")
+    
+    def run_benchmarks(self, force: bool = False, num_samples: Optional[int] = None) -> Dict[str, Dict]:
+        """
+        Validate pending variants and benchmark models without results, or
+        every model with `force`. Safe to call while serving traffic.
+        """
+        
+        num_samples = num_samples or self.config.benchmark_samples
+        
+        for variant_name, (variant, model_path) in list(self.pending_variants.items()):
+            self._add_onnx_variant(variant, model_path)
+        
+        for model_name in list(self.active_models):
+            if force or model_name not in self.model_performance:
+                self._benchmark_model(model_name, num_samples=num_samples, force=force)
+        
+        if self.ab_framework and not self.current_experiment_id:
+            self._setup_ab_testing()
+        
+        self.is_production_ready = self._validate_production_readiness()
+        return self.model_performance
+    
+    def start_deferred_benchmarks(self):
+        """Run whatever benchmarks and parity checks are missing on a background thread"""
+        
+        if not self.pending_variants and len(self.model_performance) == len(self.active_models):
+            return
+        
+        def run():
+            time.sleep(self.config.benchmark_delay_seconds)
+            try:
+                self.run_benchmarks()
+                logger.info("Deferred benchmarks completed")
             except Exception as e:
-                logger.error(f"Benchmark failed for {model_name}: {e}")
-                self.model_performance[model_name] = {
-                    'benchmark_results': {},
-                    'meets_targets': False,
-                    'error': str(e),
-                    'last_updated': datetime.now().isoformat()
-                }
+                logger.error(f"Deferred benchmarks failed: {e}")
+        
+        threading.Thread(target=run, name="ml-deferred-benchmarks", daemon=True).start()
+        logger.info(f"Deferred benchmarks scheduled in {self.config.benchmark_delay_seconds:.0f}s")
     
     def _check_performance_targets(self, benchmark_results: Dict) -> bool:
         """Check if benchmark results meet performance targets"""
@@ -190,7 +362,7 @@ class ProductionOrchestrator:
         
         return all(checks)
     
-    async def _setup_ab_testing(self):
+    def _setup_ab_testing(self):
         """Setup A/B testing experiments"""
         
         if not self.ab_framework:
@@ -241,7 +413,7 @@ class ProductionOrchestrator:
         else:
             logger.warning("Insufficient model variants for A/B testing")
     
-    async def _validate_production_readiness(self) -> bool:
+    def _validate_production_readiness(self) -> bool:
         """Validate system is ready for production"""
         
         checks = []
@@ -251,6 +423,11 @@ class ProductionOrchestrator:
             perf.get('meets_targets', False) 
             for perf in self.model_performance.values()
         )
+        if self.config.fast_start and len(self.model_performance) < len(self.active_models):
+            # Some models are not benchmarked yet; missing numbers are not a failure
+            has_production_ready_model = has_production_ready_model or not any(
+                'error' in perf for perf in self.model_performance.values()
+            )
         checks.append(('performance_targets', has_production_ready_model))
         
         # Check monitoring is working
@@ -265,15 +442,16 @@ class ProductionOrchestrator:
         models_loaded = len(self.active_models) > 0
         checks.append(('models_loaded', models_loaded))
         
-        # Check inference engine
-        try:
-            test_result = self.inference_engine.classify_single_optimized(
-                "test transaction coffee shop", 5.0
-            )
-            inference_working = test_result.inference_time_ms > 0
-            checks.append(('inference_working', inference_working))
-        except:
-            checks.append(('inference_working', False))
+        # Check inference engine, unless that would force a lazy model load
+        if self.inference_engine.is_loaded or not self.config.fast_start:
+            try:
+                test_result = self.inference_engine.classify_single_optimized(
+                    "test transaction coffee shop", 5.0
+                )
+                inference_working = test_result.inference_time_ms > 0
+                checks.append(('inference_working', inference_working))
+            except:
+                checks.append(('inference_working', False))
         
         # Log check results
         for check_name, passed in checks:
@@ -282,6 +460,58 @@ class ProductionOrchestrator:
         
         return all(passed for _, passed in checks)
     
+    def _select_model_name(self, user_id: str = None) -> str:
+        """Model variant serving this user: the A/B assignment if any, else default"""
+        
+        if self.ab_framework and self.current_experiment_id:
+            # A/B testing variant assignment
+            variant = self.ab_framework.assign_variant(
+                self.current_experiment_id,
+                user_id=user_id
+            )
+            
+            if variant and variant.name in self.active_models:
+                return variant.name
+        
+        return 'default'
+    
+    def _record_result(self, selected_model_name: str, user_id: str, result: InferenceResult):
+        """Record monitoring metrics and the A/B result, then tag the result as production"""
+        
+        # Record monitoring metrics
+        if self.model_monitor:
+            self.model_monitor.record_inference(
+                inference_time_ms=result.inference_time_ms,
+                predicted_category=result.predicted_category,
+                confidence=result.confidence,
+                confidence_level=result.confidence_level,
+                model_version=f"{selected_model_name}_{result.model_version}"
+            )
+        
+        # Record A/B test result
+        if self.ab_framework and self.current_experiment_id:
+            self.ab_framework.record_result(
+                experiment_id=self.current_experiment_id,
+                variant_name=selected_model_name,
+                user_id=user_id,
+                prediction=result.predicted_category,
+                confidence=result.confidence,
+                inference_time_ms=result.inference_time_ms
+            )
+        
+        # Add production metadata
+        result.model_version = f"production_{selected_model_name}_{result.model_version}"
+    
+    def _record_failure(self, selected_model_name: str, error: Exception):
+        if self.model_monitor:
+            self.model_monitor.record_error(
+                error_type="inference_error",
+                model_version=f"production_{selected_model_name}",
+                details=str(error)
+            )
+        
+        logger.error(f"Production inference failed: {error}")
+    
     async def classify_transaction(
         self, 
         description: str,
@@ -293,66 +523,71 @@ class ProductionOrchestrator:
         Production transaction classification with A/B testing and monitoring
         """
         
-        start_time = time.perf_counter()
+        # Determine which model to use
+        selected_model_name = self._select_model_name(user_id)
         
         try:
-            # Determine which model to use
-            selected_model_name = 'default'
-            
-            if self.ab_framework and self.current_experiment_id:
-                # A/B testing variant assignment
-                variant = self.ab_framework.assign_variant(
-                    self.current_experiment_id,
-                    user_id=user_id
-                )
-                
-                if variant and variant.name in self.active_models:
-                    selected_model_name = variant.name
-            
             # Get the selected model
-            model_info = self.active_models[selected_model_name]
-            engine = model_info['engine']
+            engine = self.active_models[selected_model_name]['engine']
             
             # Perform inference
             result = engine.classify_single_optimized(description, amount, merchant)
             
-            # Record monitoring metrics
-            if self.model_monitor:
-                self.model_monitor.record_inference(
-                    inference_time_ms=result.inference_time_ms,
-                    predicted_category=result.predicted_category,
-                    confidence=result.confidence,
-                    confidence_level=result.confidence_level,
-                    model_version=f"{selected_model_name}_{result.model_version}"
-                )
-            
-            # Record A/B test result
-            if self.ab_framework and self.current_experiment_id:
-                self.ab_framework.record_result(
-                    experiment_id=self.current_experiment_id,
-                    variant_name=selected_model_name,
-                    user_id=user_id,
-                    prediction=result.predicted_category,
-                    confidence=result.confidence,
-                    inference_time_ms=result.inference_time_ms
-                )
-            
-            # Add production metadata
-            result.model_version = f"production_{selected_model_name}_{result.model_version}"
+            self._report_cache_metrics(engine)
+            self._record_result(selected_model_name, user_id, result)
             
             return result
             
         except Exception as e:
-            # Record error
-            if self.model_monitor:
-                self.model_monitor.record_error(
-                    error_type="inference_error",
-                    model_version=f"production_{selected_model_name}",
-                    details=str(e)
+            self._record_failure(selected_model_name, e)
+            raise
+    
+    async def classify_transactions_batch(self, transactions: List[Dict]) -> List[InferenceResult]:
+        """
+        Classify many transactions with one classify_batch_optimized call per
+        model variant. Results come back in input order; each one's
+        inference_time_ms is its share of its variant's batch time.
+        """
+        
+        groups: Dict[str, List[int]] = {}
+        for i, transaction in enumerate(transactions):
+            groups.setdefault(self._select_model_name(transaction.get('user_id')), []).append(i)
+        
+        results: List[Optional[InferenceResult]] = [None] * len(transactions)
+        loop = asyncio.get_running_loop()
+        
+        for selected_model_name, indices in groups.items():
+            engine = self.active_models[selected_model_name]['engine']
+            
+            try:
+                # Inference is CPU-bound; keep the worker loop free to queue the next batch
+                batch_result = await loop.run_in_executor(
+                    None, engine.classify_batch_optimized, [transactions[i] for i in indices]
                 )
+            except Exception as e:
+                self._record_failure(selected_model_name, e)
+                raise
             
-            logger.error(f"Production inference failed: {e}")
-            raise
+            self._report_cache_metrics(engine)
+            for i, result in zip(indices, batch_result.results):
+                result.inference_time_ms = batch_result.avg_inference_time_ms
+                self._record_result(selected_model_name, transactions[i].get('user_id'), result)
+                results[i] = result
+        
+        return results
+    
+    def _report_cache_metrics(self, engine: OptimizedInferenceEngine):
+        """Feed the embedding cache hit rate to the monitor, at most once per interval"""
+        if not self.model_monitor:
+            return
+        
+        now = time.monotonic()
+        if now - self.last_cache_metrics_at < self.CACHE_METRICS_INTERVAL_SECONDS:
+            return
+        self.last_cache_metrics_at = now
+        
+        hit_rate, cache_size = engine.cache_metrics()
+        self.model_monitor.update_cache_metrics(hit_rate, cache_size)
     
     async def submit_feedback(
         self, 
@@ -380,13 +615,9 @@ class ProductionOrchestrator:
         
         # Update A/B test results if applicable
         if self.ab_framework and self.current_experiment_id:
-            # Find the result to update
-            results = self.ab_framework.results[self.current_experiment_id]
-            for result in reversed(results):
-                if (result.user_id == user_id and 
-                    result.prediction == predicted_category):
-                    result.is_correct = is_correct
-                    break
+            self.ab_framework.record_feedback(
+                self.current_experiment_id, user_id, predicted_category, is_correct
+            )
     
     def get_production_status(self) -> Dict[str, Any]:
         """Get comprehensive production system status"""
@@ -456,18 +687,25 @@ class ProductionOrchestrator:
         # Stop A/B test
         if self.ab_framework and self.current_experiment_id:
             self.ab_framework.stop_experiment(self.current_experiment_id, "system_shutdown")
+        if self.ab_framework:
+            self.ab_framework.close()
         
         # Stop monitoring
         if self.model_monitor:
             self.model_monitor.stop_monitoring()
         
+        # Flush embedding caches
+        for model_info in self.active_models.values():
+            model_info['engine'].close()
+        
         logger.info("Production ML system shutdown complete")
 
 # Usage example and factory function
 def create_production_orchestrator(
     models_config: List[Dict],
     monitoring_enabled: bool = True,
-    ab_testing_enabled: bool = True
+    ab_testing_enabled: bool = True,
+    fast_start: bool = False
 ) -> ProductionOrchestrator:
     """Factory function to create production orchestrator"""
     
@@ -476,6 +714,7 @@ def create_production_orchestrator(
         default_model_path="models/sentence_transformer",
         monitoring_enabled=monitoring_enabled,
         ab_testing_enabled=ab_testing_enabled,
+        fast_start=fast_start,
         performance_targets={
             'max_inference_time_ms': 10.0,
             'min_accuracy': 0.85,
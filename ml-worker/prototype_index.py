@@ -0,0 +1,92 @@
+"""
+Category Prototype Index
+L2-normalized prototype matrix for vectorized cosine similarity scoring
+"""
+
+import logging
+from typing import Dict, List, Tuple, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class PrototypeIndex:
+    """
+    Category prototypes stacked into one L2-normalized (categories x dim) matrix,
+    so scoring a batch of embeddings is a single matrix multiplication.
+
+    Rebuild it whenever the prototypes change; scoring never renormalizes them.
+    Names and matrix are swapped in as one tuple, so concurrent scoring always
+    sees a consistent pair.
+    """
+
+    def __init__(self, dtype=np.float32):
+        self.dtype = dtype
+        self._snapshot: Tuple[List[str], np.ndarray] = ([], np.empty((0, 0), dtype=dtype))
+
+    @property
+    def categories(self) -> List[str]:
+        return self._snapshot[0]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        return self._snapshot[1]
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def rebuild(self, category_prototypes: Dict[str, Dict[str, Any]]):
+        """Rebuild from the {'category': {'prototype': vector, ...}} mapping used by the classifiers"""
+        categories = [
+            category for category, data in category_prototypes.items()
+            if data.get('prototype') is not None
+        ]
+        if not categories:
+            self._snapshot = ([], np.empty((0, 0), dtype=self.dtype))
+            return
+
+        prototypes = np.stack([
+            np.asarray(category_prototypes[category]['prototype'], dtype=self.dtype)
+            for category in categories
+        ])
+        self._snapshot = (categories, np.ascontiguousarray(self._normalize(prototypes)))
+        logger.debug(f"Prototype index rebuilt: {len(categories)} categories x {prototypes.shape[1]} dims")
+
+    def _scores(self, embeddings: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        if matrix.shape[0] == 0:
+            raise ValueError("No category prototypes loaded")
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=self.dtype))
+        return self._normalize(queries) @ matrix.T
+
+    def similarities(self, embeddings: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each embedding (rows) against every category (columns)"""
+        return self._scores(embeddings, self.matrix)
+
+    def _top_k(self, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = max(1, min(k, scores.shape[1]))
+        if k == 1:
+            indices = scores.argmax(axis=1)[:, None]
+        else:
+            # argpartition is O(categories); only the k survivors get sorted
+            indices = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            order = np.argsort(-np.take_along_axis(scores, indices, axis=1), axis=1)
+            indices = np.take_along_axis(indices, order, axis=1)
+        return indices, np.take_along_axis(scores, indices, axis=1)
+
+    def top_k(self, embeddings: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Indices and scores of the k best categories per embedding, best first"""
+        return self._top_k(self.similarities(embeddings), k)
+
+    def classify(self, embeddings: np.ndarray, k: int = 1) -> List[List[Tuple[str, float]]]:
+        """(category, similarity) pairs of the k best categories per embedding, best first"""
+        categories, matrix = self._snapshot
+        indices, scores = self._top_k(self._scores(embeddings, matrix), k)
+        return [
+            [(categories[index], float(score)) for index, score in zip(row_indices, row_scores)]
+            for row_indices, row_scores in zip(indices, scores)
+        ]
@@ -0,0 +1,147 @@
+"""
+ML Worker Runtime
+One long-lived asyncio event loop per worker process, and a micro-batcher that
+coalesces concurrent single-item requests into batch inference calls
+"""
+
+import os
+import asyncio
+import concurrent.futures
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class WorkerEventLoop:
+    """
+    Event loop running forever on a daemon thread, shared by every task in
+    the process. Sync Celery tasks submit coroutines with run().
+
+    The loop is created lazily and recreated after a fork, since the thread
+    driving it does not survive into prefork children.
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[threading.Thread] = None
+        self.pid: Optional[int] = None
+        self.lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self.lock:
+            if self.loop is None or self.pid != os.getpid() or not self.thread.is_alive():
+                self.loop = asyncio.new_event_loop()
+                self.pid = os.getpid()
+                self.thread = threading.Thread(
+                    target=self.loop.run_forever,
+                    name="ml-worker-loop",
+                    daemon=True
+                )
+                self.thread.start()
+                logger.info(f"Started worker event loop in process {self.pid}")
+            return self.loop
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the worker loop and block until it finishes"""
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Don't leave the coroutine running on the loop after the caller gave up
+            future.cancel()
+            raise
+
+    def stop(self):
+        with self.lock:
+            if self.loop is not None and self.pid == os.getpid():
+                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.thread.join(timeout=5)
+            self.loop = None
+
+class InferenceBatcher:
+    """
+    Collects items submitted concurrently and hands them to `handler` in
+    batches of up to max_batch_size, waiting at most max_wait_ms for a batch
+    to fill. The queue and consumer belong to the loop submitting to them and
+    are rebuilt if that loop changes (e.g. after a fork).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Dict]], Awaitable[List[Any]]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0
+    ):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.queue: Optional[asyncio.Queue] = None
+        self.consumer: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = {'items': 0, 'batches': 0, 'max_batch_size_seen': 0, 'failed_batches': 0}
+
+    def _ensure_consumer(self):
+        loop = asyncio.get_running_loop()
+        if self.consumer is None or self.consumer.done() or self.loop is not loop:
+            self.loop = loop
+            self.queue = asyncio.Queue()
+            self.consumer = loop.create_task(self._consume())
+
+    async def submit(self, item: Dict) -> Any:
+        """Queue one item and wait for its result from the next batch"""
+        self._ensure_consumer()
+        future = self.loop.create_future()
+        await self.queue.put((item, future))
+        return await future
+
+    async def _next_batch(self) -> List[Tuple[Dict, asyncio.Future]]:
+        batch = [await self.queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued before waiting for stragglers
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _consume(self):
+        while True:
+            batch = await self._next_batch()
+            items = [item for item, _ in batch]
+
+            try:
+                results = await self.handler(items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"Batch handler returned {len(results)} results for {len(items)} items")
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                self.stats['failed_batches'] += 1
+                logger.error(f"Batch of {len(items)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+            self.stats['items'] += len(items)
+            self.stats['batches'] += 1
+            self.stats['max_batch_size_seen'] = max(self.stats['max_batch_size_seen'], len(items))
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'avg_batch_size': self.stats['items'] / max(1, self.stats['batches']),
+            'queued': self.queue.qsize() if self.queue else 0
+        }